@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Accuracy and speed of the CIE image conversion tables.
+
+Each case converts random 8-bit samples through core/cie_lut.py and through
+the exact per-pixel ColorSpaceEngine conversion setcolor uses, reporting the
+largest and mean difference in output levels and the throughput of both.
+Exits with status 1 if any case differs by more than its tolerance.
+
+Usage:
+    python benchmarks/cie_lut_bench.py
+    python benchmarks/cie_lut_bench.py --cases lab --pixels 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from postforge.core import cie_lut  # noqa: E402
+from postforge.core import types as ps  # noqa: E402
+from postforge.core.color_space import ColorSpaceEngine  # noqa: E402
+
+
+def _proc(source: str) -> ps.Array:
+    """Build an executable procedure from simple PostScript source."""
+    tokens = source.replace('{', ' { ').replace('}', ' } ').split()
+    stack = [ps.Array(None, attrib=ps.ATTRIB_EXEC)]
+    for token in tokens:
+        if token == '{':
+            stack.append(ps.Array(None, attrib=ps.ATTRIB_EXEC))
+            continue
+        if token == '}':
+            obj = stack.pop()
+        else:
+            try:
+                obj = ps.Real(float(token))
+            except ValueError:
+                obj = ps.Name(token.encode(), attrib=ps.ATTRIB_EXEC)
+        stack[-1].val.append(obj)
+        stack[-1].length += 1
+    return stack[0]
+
+
+def _array(items: list) -> ps.Array:
+    array = ps.Array(None)
+    array.val = [item if isinstance(item, ps.PSObject) else ps.Real(float(item)) for item in items]
+    array.length = len(array.val)
+    return array
+
+
+def _table(sizes: list[int]) -> ps.Array:
+    """A smooth CIEBasedDEF/DEFG Table of mostly in-gamut Lab colors."""
+    grids = np.meshgrid(*[np.linspace(0, 1, n) for n in sizes], indexing='ij')
+    abc = np.stack([0.1 + grids[0] * 0.7 + grids[-1] * 0.1,
+                    0.5 + np.sin(grids[1] * 3) * 0.1,
+                    0.4 + grids[2] ** 2 * 0.2], axis=-1)
+    data = np.round(abc * 255).astype(np.uint8).reshape(sizes[0], -1)
+    # Plain bytes stand in for the string objects; both lookups accept them
+    strings = ps.Array(None)
+    strings.val = [row.tobytes() for row in data]
+    strings.length = len(strings.val)
+    return _array(sizes + [strings])
+
+
+_LAB = {
+    b'RangeABC': [0, 100, -128, 127, -128, 127],
+    b'DecodeABC': ['16 add 116 div', '500 div', '200 div'],
+    b'MatrixABC': [1, 1, 1, 1, 0, 0, 0, 0, -1],
+    b'DecodeLMN': ['dup 0.206897 ge {dup dup mul mul} {0.137931 sub 0.128419 mul} ifelse 0.9505 mul',
+                   'dup 0.206897 ge {dup dup mul mul} {0.137931 sub 0.128419 mul} ifelse',
+                   'dup 0.206897 ge {dup dup mul mul} {0.137931 sub 0.128419 mul} ifelse 1.089 mul'],
+    b'WhitePoint': [0.9505, 1, 1.089],
+}
+_CALRGB = {
+    b'DecodeABC': ['2.2 exp', '2.2 exp', '2.2 exp'],
+    b'MatrixABC': [0.4124, 0.2126, 0.0193, 0.3576, 0.7152, 0.1192, 0.1805, 0.0722, 0.9505],
+    b'WhitePoint': [0.9505, 1, 1.089],
+}
+_CALGRAY = {
+    b'DecodeA': '1.8 exp',
+    b'MatrixA': [0.9505, 1, 1.089],
+    b'WhitePoint': [0.9505, 1, 1.089],
+}
+
+# name: (color space, CIE dictionary entries, extra entries, components, tolerance)
+CASES = {
+    'lab': ('CIEBasedABC', _LAB, {}, 3, 1),
+    'calrgb': ('CIEBasedABC', _CALRGB, {}, 3, 1),
+    'calgray': ('CIEBasedA', _CALGRAY, {}, 1, 1),
+    # DEF interpolates converted table entries where setcolor converts the
+    # interpolated ABC values, so it is allowed a few levels
+    'def-lab': ('CIEBasedDEF', _LAB, {b'Table': [17, 17, 17]}, 3, 6),
+    'defg-lab': ('CIEBasedDEFG', _LAB, {b'Table': [9, 9, 9, 9]}, 4, 1),
+}
+
+
+def _cie_dict(entries: dict, extra: dict) -> dict:
+    cie_dict = {}
+    for key, value in entries.items():
+        if isinstance(value, str):
+            cie_dict[key] = _proc(value)
+        elif all(isinstance(v, str) for v in value):
+            cie_dict[key] = _array([_proc(v) for v in value])
+        else:
+            cie_dict[key] = _array(value)
+    for key, sizes in extra.items():
+        cie_dict[key] = _table(sizes)
+    return cie_dict
+
+
+def _exact(space: str, samples: np.ndarray, cie_dict: dict) -> np.ndarray:
+    """Per-pixel conversion to 8-bit RGB through ColorSpaceEngine."""
+    convert = {
+        'CIEBasedABC': ColorSpaceEngine.cie_abc_to_rgb,
+        'CIEBasedA': lambda c, d: ColorSpaceEngine.cie_a_to_rgb(c[0], d),
+        'CIEBasedDEF': ColorSpaceEngine.cie_def_to_rgb,
+        'CIEBasedDEFG': ColorSpaceEngine.cie_defg_to_rgb,
+    }[space]
+    if space == 'CIEBasedABC':
+        range_abc = [cie_dict[b'RangeABC'].val[i].val for i in range(6)] \
+            if b'RangeABC' in cie_dict else [0, 1, 0, 1, 0, 1]
+    else:
+        range_abc = [0, 1] * samples.shape[1]
+    result = np.empty((len(samples), 3), dtype=np.uint8)
+    for n, pixel in enumerate(samples):
+        values = [range_abc[2 * i] + (pixel[i] / 255.0) * (range_abc[2 * i + 1] - range_abc[2 * i])
+                  for i in range(len(pixel))]
+        rgb = convert(values, cie_dict)
+        result[n] = [max(0, min(255, int(v * 255 + 0.5))) for v in rgb]
+    return result
+
+
+def _lut(space: str, samples: np.ndarray, cie_dict: dict, decode: list[float]) -> np.ndarray:
+    convert = {
+        'CIEBasedABC': cie_lut.convert_abc_image,
+        'CIEBasedA': cie_lut.convert_a_image,
+        'CIEBasedDEF': cie_lut.convert_def_image,
+        'CIEBasedDEFG': cie_lut.convert_defg_image,
+    }[space]
+    bgrx = convert(samples.tobytes(), len(samples), decode, cie_dict)
+    return np.frombuffer(bgrx, dtype=np.uint8).reshape(-1, 4)[:, 2::-1]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cases', nargs='*', default=[],
+                        help='Only run cases whose name contains one of these strings')
+    parser.add_argument('--pixels', type=int, default=512 * 512,
+                        help='Pixels per image for the throughput measurement')
+    parser.add_argument('--check-pixels', type=int, default=20000,
+                        help='Pixels compared against the per-pixel conversion')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    failed = False
+    print(f"{'case':10} {'max err':>8} {'mean err':>9} {'exact kpx/s':>12} "
+          f"{'table Mpx/s':>12} {'first ms':>9}")
+    for name, (space, entries, extra, components, tolerance) in CASES.items():
+        if args.cases and not any(part in name for part in args.cases):
+            continue
+        cie_dict = _cie_dict(entries, extra)
+        decode = ([cie_dict[b'RangeABC'].val[i].val for i in range(6)]
+                  if space == 'CIEBasedABC' and b'RangeABC' in cie_dict else [0, 1] * components)
+
+        cie_lut.clear_cache()
+        start = time.perf_counter()
+        _lut(space, rng.integers(0, 256, (1, components), dtype=np.uint8), cie_dict, decode)
+        first = time.perf_counter() - start
+
+        check = rng.integers(0, 256, (args.check_pixels, components), dtype=np.uint8)
+        start = time.perf_counter()
+        exact = _exact(space, check, cie_dict)
+        exact_time = time.perf_counter() - start
+        diff = np.abs(_lut(space, check, cie_dict, decode).astype(int) - exact)
+
+        image = rng.integers(0, 256, (args.pixels, components), dtype=np.uint8)
+        start = time.perf_counter()
+        _lut(space, image, cie_dict, decode)
+        table_time = time.perf_counter() - start
+
+        status = '' if diff.max() <= tolerance else f'  FAILED (tolerance {tolerance})'
+        failed = failed or bool(status)
+        print(f"{name:10} {diff.max():8d} {diff.mean():9.4f} "
+              f"{args.check_pixels / exact_time / 1e3:12.1f} "
+              f"{args.pixels / table_time / 1e6:12.2f} {first * 1e3:9.1f}{status}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
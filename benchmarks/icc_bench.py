@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Accuracy and speed of ICC device links and tiled image conversion.
+
+Each case builds a synthetic ICC profile (no system profile is needed),
+then compares single-color conversion through the device link against
+the transform itself, reports how long the device link takes to build
+and to load from the cache directory, and times image conversion with
+and without worker threads.  Exits with status 1 if any case differs by
+more than its tolerance.
+
+Usage:
+    python benchmarks/icc_bench.py
+    python benchmarks/icc_bench.py --cases cmyk --threads 4
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import struct
+import sys
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image, ImageCms
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from postforge.core import icc_profile  # noqa: E402
+from postforge.utils import worker_pool  # noqa: E402
+
+_D50 = (0.9642, 1.0, 0.8249)
+
+# Linear sRGB → XYZ, Bradford-adapted to D50
+_SRGB_TO_XYZ_D50 = np.array([[0.4360747, 0.3850649, 0.1430804],
+                             [0.2225045, 0.7168786, 0.0606169],
+                             [0.0139322, 0.0971045, 0.7141733]])
+
+
+def _s15(value: float) -> bytes:
+    return struct.pack('>i', int(round(value * 65536)))
+
+
+def _xyz_tag(x: float, y: float, z: float) -> bytes:
+    return b'XYZ ' + bytes(4) + _s15(x) + _s15(y) + _s15(z)
+
+
+def _desc_tag(text: str) -> bytes:
+    ascii_text = text.encode('ascii') + b'\0'
+    return (b'desc' + bytes(4) + struct.pack('>I', len(ascii_text)) + ascii_text
+            + bytes(8) + bytes(3) + bytes(67))
+
+
+def _profile(device_class: bytes, space: bytes, pcs: bytes, tags: dict) -> bytes:
+    """Assemble an ICC v2 profile from tag signature → tag data."""
+    table = b''
+    data = b''
+    offset = 128 + 4 + 12 * len(tags)
+    for signature, tag in tags.items():
+        table += signature + struct.pack('>II', offset + len(data), len(tag))
+        data += tag + bytes(-len(tag) % 4)
+    size = offset + len(data)
+    header = (struct.pack('>I', size) + bytes(4) + struct.pack('>I', 0x02100000)
+              + device_class + space + pcs + bytes(12) + b'acsp' + bytes(24)
+              + struct.pack('>I', 0) + b''.join(_s15(v) for v in _D50) + bytes(48))
+    return header + struct.pack('>I', len(tags)) + table + data
+
+
+def _rgb_profile() -> bytes:
+    """A wide-gamut matrix/TRC RGB profile with gamma 1.8."""
+    primaries = {b'rXYZ': (0.6097, 0.3111, 0.0195),
+                 b'gXYZ': (0.2053, 0.6257, 0.0609),
+                 b'bXYZ': (0.1492, 0.0632, 0.7446)}
+    curve = b'curv' + bytes(4) + struct.pack('>IH', 1, int(1.8 * 256)) + bytes(2)
+    tags = {b'desc': _desc_tag('bench rgb'), b'wtpt': _xyz_tag(*_D50)}
+    tags.update({sig: _xyz_tag(*xyz) for sig, xyz in primaries.items()})
+    tags.update({b'rTRC': curve, b'gTRC': curve, b'bTRC': curve})
+    return _profile(b'mntr', b'RGB ', b'XYZ ', tags)
+
+
+def _lab(rgb: np.ndarray) -> np.ndarray:
+    """Linear sRGB rows → CIE Lab (D50)."""
+    xyz = rgb @ _SRGB_TO_XYZ_D50.T / np.array(_D50)
+    f = np.where(xyz > 216 / 24389, np.cbrt(xyz), (24389 / 27 * xyz + 16) / 116)
+    return np.stack([116 * f[:, 1] - 16, 500 * (f[:, 0] - f[:, 1]), 200 * (f[:, 1] - f[:, 2])], axis=1)
+
+
+def _cmyk_profile(points: int = 9) -> bytes:
+    """A printer profile whose A2B0 table models ink with dot gain."""
+    grid = np.linspace(0, 1, points)
+    c, m, y, k = (axis.reshape(-1) for axis in np.meshgrid(grid, grid, grid, grid, indexing='ij'))
+    gain = lambda v: 1 - (1 - v) ** 1.3  # noqa: E731
+    ink = 1 - gain(k)
+    rgb = np.stack([(1 - gain(c) * 0.95) * ink, (1 - gain(m) * 0.9) * ink,
+                    (1 - gain(y) * 0.85) * ink], axis=1) ** 2.0
+    lab = _lab(rgb)
+    encoded = np.stack([lab[:, 0] / 100 * 0xFF00, (lab[:, 1] + 128) * 256,
+                        (lab[:, 2] + 128) * 256], axis=1)
+    clut = np.clip(np.round(encoded), 0, 0xFFFF).astype('>u2').tobytes()
+    identity = b''.join(_s15(v) for v in (1, 0, 0, 0, 1, 0, 0, 0, 1))
+    ramp = np.array([0, 0xFFFF], dtype='>u2').tobytes()
+    mft2 = (b'mft2' + bytes(4) + bytes([4, 3, points, 0]) + identity
+            + struct.pack('>HH', 2, 2) + ramp * 4 + clut + ramp * 3)
+    tags = {b'desc': _desc_tag('bench cmyk'), b'wtpt': _xyz_tag(*_D50), b'A2B0': mft2}
+    return _profile(b'prtr', b'CMYK', b'Lab ', tags)
+
+
+def _gray_profile() -> bytes:
+    curve = b'curv' + bytes(4) + struct.pack('>IH', 1, int(2.2 * 256)) + bytes(2)
+    tags = {b'desc': _desc_tag('bench gray'), b'wtpt': _xyz_tag(*_D50), b'kTRC': curve}
+    return _profile(b'mntr', b'GRAY', b'XYZ ', tags)
+
+
+# name: (profile builder, components, tolerance in output levels)
+CASES = {
+    'gray': (_gray_profile, 1, 0),
+    'rgb': (_rgb_profile, 3, 0),
+    'cmyk': (_cmyk_profile, 4, 3),
+}
+
+
+def _register(icc_bytes: bytes) -> bytes:
+    profile_hash = hashlib.sha256(icc_bytes).digest()
+    icc_profile._profile_cache[profile_hash] = ImageCms.getOpenProfile(io.BytesIO(icc_bytes))
+    return profile_hash
+
+
+def _exact(profile_hash: bytes, n: int, colors: np.ndarray) -> np.ndarray:
+    """Per-color conversion through the transform, one 1×1 image each."""
+    transform = icc_profile.get_transform(profile_hash, n)
+    mode = icc_profile._N_TO_PIL_MODE[n]
+    result = np.empty((len(colors), 3), dtype=np.uint8)
+    for i, color in enumerate(colors):
+        img = Image.frombytes(mode, (1, 1), color.tobytes())
+        result[i] = ImageCms.applyTransform(img, transform).getpixel((0, 0))[:3]
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cases', nargs='*', default=[],
+                        help='Only run cases whose name contains one of these strings')
+    parser.add_argument('--colors', type=int, default=20000,
+                        help='Random colors compared against the transform')
+    parser.add_argument('--size', type=int, default=2048,
+                        help='Width and height of the converted image')
+    parser.add_argument('--threads', type=int, default=4,
+                        help='Worker threads for the tiled image conversion')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    failed = False
+    print(f"{'case':6} {'max err':>8} {'mean err':>9} {'exact kc/s':>11} {'link kc/s':>10} "
+          f"{'build ms':>9} {'load ms':>8} {'image Mpx/s':>12} {'tiled Mpx/s':>12}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        icc_profile.set_device_link_dir(cache_dir)
+        for name, (build_profile, n, tolerance) in CASES.items():
+            if args.cases and not any(part in name for part in args.cases):
+                continue
+            profile_hash = _register(build_profile())
+
+            start = time.perf_counter()
+            has_link = icc_profile.get_device_link(profile_hash, n) is not None
+            build_time = time.perf_counter() - start
+            icc_profile._device_links.clear()
+            start = time.perf_counter()
+            icc_profile.get_device_link(profile_hash, n)
+            load_time = time.perf_counter() - start
+            # RGB profiles convert through the transform; there is no device link
+            link_times = (f"{build_time * 1e3:9.1f} {load_time * 1e3:8.1f}" if has_link
+                          else f"{'-':>9} {'-':>8}")
+
+            colors = rng.integers(0, 256, (args.colors, n), dtype=np.uint8)
+            start = time.perf_counter()
+            exact = _exact(profile_hash, n, colors)
+            exact_time = time.perf_counter() - start
+            icc_profile._color_cache.clear()
+            start = time.perf_counter()
+            linked = np.array([icc_profile.icc_convert_color(profile_hash, n, list(color / 255.0))
+                               for color in colors])
+            link_time = time.perf_counter() - start
+            diff = np.abs(np.round(linked * 255).astype(int) - exact)
+
+            pixels = args.size * args.size
+            samples = rng.integers(0, 256, pixels * n, dtype=np.uint8).tobytes()
+            times = []
+            for threads in (0, args.threads):
+                worker_pool.set_worker_count(threads)
+                start = time.perf_counter()
+                icc_profile.icc_convert_image(profile_hash, n, samples, args.size, args.size, 8, None)
+                times.append(time.perf_counter() - start)
+            worker_pool.set_worker_count(worker_pool.DEFAULT_WORKERS)
+
+            status = '' if diff.max() <= tolerance else f'  FAILED (tolerance {tolerance})'
+            failed = failed or bool(status)
+            print(f"{name:6} {diff.max():8d} {diff.mean():9.4f} "
+                  f"{args.colors / exact_time / 1e3:11.1f} {args.colors / link_time / 1e3:10.1f} "
+                  f"{link_times} "
+                  f"{pixels / times[0] / 1e6:12.2f} {pixels / times[1] / 1e6:12.2f}{status}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
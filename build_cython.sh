@@ -21,4 +21,9 @@ echo "Build complete."
 
 # Verify the modules can be imported
 python -c "from postforge.operators._control_cy import exec_exec; print('  Cython exec_exec: OK')" 2>/dev/null || echo "  Cython exec_exec: FAILED"
+python -c "from postforge.operators._lzw_cy import LZWDecoder; print('  Cython LZW: OK')" 2>/dev/null || echo "  Cython LZW: FAILED"
+python -c "from postforge.operators._ccitt_cy import CCITTFaxDecoder; print('  Cython CCITT: OK')" 2>/dev/null || echo "  Cython CCITT: FAILED"
+python -c "from postforge.operators._predictor_cy import png_decode_rows; print('  Cython predictor: OK')" 2>/dev/null || echo "  Cython predictor: FAILED"
 python -c "from postforge.devices.common._image_conv_cy import gray8_to_bgrx; print('  Cython image_conv: OK')" 2>/dev/null || echo "  Cython image_conv: FAILED"
+python -c "from postforge.devices.common._path_emit_cy import emit_compiled_path; print('  Cython path_emit: OK')" 2>/dev/null || echo "  Cython path_emit: FAILED"
+python -c "from postforge.core._type1_decrypt_cy import decrypt; print('  Cython type1_decrypt: OK')" 2>/dev/null || echo "  Cython type1_decrypt: FAILED"
@@ -58,9 +58,11 @@ import tempfile
 from .cli_args import build_argument_parser, _parse_page_ranges
 from .cli_runner import run
 from .core import icc_default
+from .core import icc_profile
 from .core import types as ps
 from .core.system_font_cache import SystemFontCache
 from .utils import profiler as ps_profiler
+from .utils import worker_pool
 
 
 def main() -> int:
@@ -133,11 +135,17 @@ def main() -> int:
     if args.no_glyph_cache:
         ps.global_resources.glyph_cache_disabled = True
 
+    # Worker threads for background encoding (0 runs everything inline)
+    if args.threads is not None:
+        worker_pool.set_worker_count(args.threads)
+
     # ICC color management control
     if args.no_icc:
         icc_default.disable()
     if args.cmyk_profile:
         icc_default.set_custom_profile(args.cmyk_profile)
+    if args.no_icc_cache:
+        icc_profile.set_device_link_dir(None)
     # Initialize ICC eagerly so the profile message prints at startup
     icc_default.initialize()
 
@@ -194,6 +194,11 @@ def build_argument_parser(available_devices: list[str]) -> argparse.ArgumentPars
         help="Render text as path outlines instead of native text objects (primarily affects PDF/SVG; "
              "bitmap devices already render text as paths)"
     )
+    parser.add_argument(
+        "--image-downsample", type=float, metavar="K",
+        help="Downsample images to at most K samples per device pixel "
+             "(overrides device default; 0 disables)"
+    )
     parser.add_argument(
         "--multipage-tiff", action="store_true",
         help="Combine all pages into a single multi-page TIFF file (only with tiff device)"
@@ -210,6 +215,16 @@ def build_argument_parser(available_devices: list[str]) -> argparse.ArgumentPars
         "--cmyk-profile",
         help="Path to CMYK ICC profile for color management"
     )
+    parser.add_argument(
+        "--no-icc-cache", action="store_true",
+        help="Do not load or save ICC device links in ~/.cache/postforge/icc"
+    )
+    parser.add_argument(
+        "--threads", type=int, metavar="N",
+        help="Worker threads for filter encoding and ICC image conversion "
+             "(default: one per extra CPU, up to 4; "
+             "0 disables)"
+    )
     parser.add_argument(
         "--rebuild-font-cache", action="store_true",
         help="Force rebuild of the system font discovery cache (font name to file path mapping) and exit"
@@ -22,6 +22,8 @@ from .cli_args import get_output_base_name
 from .core import types as ps
 from .core.context_init import create_context, init_system_params
 from .operators import control as ps_control
+from .operators import image_data as ps_image_data
+from .operators import image_downsample
 from .operators.control import execjob, start
 from .operators.graphics_state import initgraphics
 from .utils import memory as ps_memory
@@ -286,6 +288,10 @@ def _configure_page_device(ctxt: ps.Context, args: argparse.Namespace, inputfile
         if args.text_as_paths:
             ctxt.gstate.page_device[b"TextRenderingMode"] = ps.Name(b"GlyphPaths")
 
+        # Override ImageDownsampleLimit if --image-downsample was provided
+        if args.image_downsample is not None:
+            ctxt.gstate.page_device[b"ImageDownsampleLimit"] = ps.Real(max(args.image_downsample, 0.0))
+
         # Store TIFF-specific flags in page device
         if getattr(args, 'multipage_tiff', False):
             ctxt.gstate.page_device[b"MultiPageTiff"] = ps.Bool(True)
@@ -409,6 +415,22 @@ def _run_batch_jobs(ctxt: ps.Context, args: argparse.Namespace, inputfiles: list
                     print(f"   Glyph bitmap cache: {stats['hits']} hits, {stats['misses']} misses, "
                           f"{stats['hit_rate']:.1%} hit rate, {stats['entries']} entries, "
                           f"{stats['memory_bytes']/1024/1024:.1f}MB used")
+                stats = ps.global_resources.get_charstring_cache().stats()
+                print(f"   CharString cache: {stats['hits']} hits, {stats['misses']} misses, "
+                      f"{stats['hit_rate']:.1%} hit rate, {stats['entries']} entries "
+                      f"in {stats['fonts']} fonts")
+                if ctxt.device_color_cache:
+                    stats = ctxt.device_color_cache.stats()
+                    print(f"   Device color cache: {stats['hits']} hits, {stats['misses']} misses, "
+                          f"{stats['hit_rate']:.1%} hit rate, {stats['entries']} entries")
+                stats = ps_image_data.get_sample_store_stats()
+                print(f"   Image data: {stats['unique']} unique, {stats['shared']} shared "
+                      f"({stats['bytes_shared']/1024/1024:.1f}MB not duplicated)")
+                stats = image_downsample.get_image_downsample_stats()
+                print(f"   Image downsampling: {stats['images']} images reduced, "
+                      f"{stats['dct_draft']} JPEGs decoded at reduced size, "
+                      f"{stats['bytes_saved']/1024/1024:.1f}MB of samples saved")
+                _print_render_stats()
         except ModuleNotFoundError as e:
             print(f"PostForge Error: Missing required Python module: {e}")
             print(
@@ -465,6 +487,38 @@ def _run_batch_jobs(ctxt: ps.Context, args: argparse.Namespace, inputfiles: list
     print(ctxt.e_stack)
 
 
+def _print_render_stats() -> None:
+    """Print Cairo renderer statistics for --cache-stats.
+
+    The renderer is only importable when pycairo is installed, so it is
+    loaded lazily like the output device modules.
+    """
+    try:
+        renderer = importlib.import_module("postforge.devices.common.cairo_renderer")
+    except ImportError:
+        return
+    stats = renderer.get_cull_stats()
+    print(f"   Clip culling: {stats['culled']} of {stats['tested']} elements culled "
+          f"({stats['cull_rate']:.1%})")
+    stats = renderer.get_batch_stats()
+    print(f"   Paint batching: {stats['fills_merged']} fills, {stats['strokes_merged']} strokes "
+          f"merged ({stats['calls_saved']} Cairo calls saved)")
+    print(f"   Gradient strips: {stats['gradient_strips']} strips replaced by "
+          f"{stats['gradient_runs']} axial shadings")
+    stats = renderer.get_form_stats()
+    print(f"   Forms: {stats['recorded']} recorded, {stats['reused']} reused, "
+          f"{stats['expanded']} expanded (vector output)")
+    stats = renderer.get_image_surface_cache_stats()
+    print(f"   Image surfaces: {stats['entries']} entries, {stats['bytes'] / 1024 / 1024:.1f} MB, "
+          f"images {stats['image_hits']} hits / {stats['image_misses']} misses, "
+          f"imagemasks {stats['imagemask_hits']} hits / {stats['imagemask_misses']} misses "
+          f"({stats['hit_rate']:.1%} hit rate)")
+    print(f"   Image sample conversion: {stats['conversion_backend']}")
+    stats = renderer.get_pattern_tile_cache_stats()
+    print(f"   Pattern tiles: {stats['entries']} entries, {stats['bytes'] / 1024:.0f} KB, "
+          f"{stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.1%} hit rate)")
+
+
 def _run_interactive(ctxt: ps.Context, memory_profile: bool, performance_profile: bool, perf_profiler: ps_profiler.PostForgeProfiler) -> None:
     """Run the PostScript interactive interpreter (executive).
 
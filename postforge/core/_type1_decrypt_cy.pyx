@@ -0,0 +1,28 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""
+Cython-accelerated Type 1 decryption.
+
+Compiled version of type1_decrypt._decrypt_py with the same interface.
+"""
+
+
+def decrypt(const unsigned char[::1] data, unsigned int key):
+    """Decrypt data starting from key; returns (plaintext, next key)."""
+    cdef Py_ssize_t n = data.shape[0]
+    cdef bytearray result = bytearray(n)
+    cdef unsigned char[::1] out = result
+    cdef Py_ssize_t i
+    cdef unsigned int r = key & 0xFFFF
+    cdef unsigned char cipher
+
+    with nogil:
+        for i in range(n):
+            cipher = data[i]
+            out[i] = cipher ^ (r >> 8)
+            r = ((cipher + r) * 52845u + 22719u) & 0xFFFF
+
+    return bytes(result), r
@@ -0,0 +1,205 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from __future__ import annotations
+
+# Bulk ASCII Data Decoding
+#
+# Hexadecimal data shows up in three places: <...> string tokens, the
+# readhexstring operator and the ASCIIHexDecode filter; ASCII85 data in
+# <~...~> string tokens and the ASCII85Decode filter.  Uncompressed images
+# from older drivers push megabytes through these paths, so they share the
+# decoders here, which work on whole chunks.  Hex digits are decoded with
+# bytes.translate and binascii, both in C.  CPython has no C ASCII85
+# decoder: base64.a85decode is a Python loop per byte.  Fed pre-cleaned
+# chunks it is still about 2.6x faster than the former tokenizer loop
+# (0.33 s against 0.86 s per MB).
+
+import base64
+import binascii
+
+from . import types as ps
+
+# White-space characters (PLRM Table 3.1)
+_WHITE_SPACE = b"\x00\t\n\x0c\r "
+
+_HEX_DIGITS = b"0123456789ABCDEFabcdef"
+
+# Every byte that is not a hexadecimal digit, for bytes.translate(None, ...)
+_NON_HEX = bytes(b for b in range(256) if b not in _HEX_DIGITS)
+
+# ASCII85 digits '!' through 'u', plus 'z' for a group of four zero bytes
+_A85_CHARS = bytes(range(33, 118)) + b"z"
+_NON_A85 = bytes(b for b in range(256) if b not in _A85_CHARS)
+
+
+class HexDecoder:
+    """
+    Incremental decoder for hexadecimal data terminated by '>'.
+
+    Chunks of encoded data are fed in any size; an odd digit at the end of a
+    chunk is carried into the next one.  White space is ignored everywhere.
+    Other characters raise ValueError in strict mode (<...> tokens) and are
+    skipped otherwise (ASCIIHexDecode).  An odd digit before the '>' or at
+    end of data decodes as if followed by 0.
+    """
+
+    def __init__(self, strict: bool = False) -> None:
+        self.strict = strict
+        self.pending = b""  # odd digit carried over from the previous chunk
+        self.eod_reached = False
+
+    def decode(self, chunk: bytes) -> tuple[bytes, int]:
+        """
+        Decode a chunk of hex data.
+
+        Args:
+            chunk: Encoded bytes
+
+        Returns:
+            (data, end) — the decoded bytes, and the index in chunk just
+            past the '>' marker, or -1 if the chunk holds no marker.
+
+        Raises:
+            ValueError: strict mode and an invalid character precedes '>'.
+        """
+        end = chunk.find(b">")
+        body = chunk if end < 0 else chunk[:end]
+        if self.strict:
+            digits = body.translate(None, _WHITE_SPACE)
+            if digits.translate(None, _HEX_DIGITS):
+                raise ValueError("invalid character in hex data")
+        else:
+            digits = body.translate(None, _NON_HEX)
+
+        digits = self.pending + digits
+        if end >= 0:
+            self.eod_reached = True
+            self.pending = b""
+            if len(digits) % 2:
+                digits += b"0"
+            return binascii.unhexlify(digits), end + 1
+
+        if len(digits) % 2:
+            self.pending = digits[-1:]
+            digits = digits[:-1]
+        else:
+            self.pending = b""
+        return binascii.unhexlify(digits), -1
+
+    def flush(self) -> bytes:
+        """Decode a digit left over at end of data, padded with 0."""
+        pending, self.pending = self.pending, b""
+        return binascii.unhexlify(pending + b"0") if pending else b""
+
+
+class A85Decoder:
+    """
+    Incremental decoder for ASCII85 data terminated by '~>'.
+
+    Chunks of encoded data are fed in any size; an incomplete 5-tuple at
+    the end of a chunk is carried into the next one, as is a '~' that may
+    start the EOD marker.  White space and a '~' not followed by '>' are
+    ignored.  Other characters raise ValueError in strict mode (<~...~>
+    tokens) and are skipped otherwise (ASCII85Decode).  A final partial
+    group of 2 to 4 characters decodes to 1 to 3 bytes.
+
+    Invalid data ('z' inside a group, a group above 2^32-1, a lone final
+    character in strict mode) raises ValueError.
+    """
+
+    def __init__(self, strict: bool = False) -> None:
+        self.strict = strict
+        self.pending = b""  # characters of an incomplete group
+        self.tilde = False  # the last chunk ended with '~'
+        self.eod_reached = False
+
+    def decode(self, chunk: bytes) -> tuple[bytes, int]:
+        """
+        Decode a chunk of ASCII85 data.
+
+        Args:
+            chunk: Encoded bytes
+
+        Returns:
+            (data, end) — the decoded bytes, and the index in chunk just
+            past the '~>' marker, or -1 if the chunk holds no marker.
+        """
+        if self.tilde:
+            self.tilde = False
+            if chunk[:1] == b">":
+                self.eod_reached = True
+                return self._finish(), 1
+        end = chunk.find(b"~>")
+        if end >= 0:
+            body = chunk[:end]
+        elif chunk.endswith(b"~"):
+            body = chunk[:-1]
+            self.tilde = True
+        else:
+            body = chunk
+        chars = self._clean(body)
+
+        if end >= 0:
+            self.eod_reached = True
+            self.pending += chars
+            return self._finish(), end + 2
+
+        chars = self.pending + chars
+        # Complete groups end at a multiple of 5 characters after the last 'z'
+        split = len(chars) - (len(chars) - chars.rfind(b"z") - 1) % 5
+        self.pending = chars[split:]
+        return self._a85decode(chars[:split]), -1
+
+    def flush(self) -> bytes:
+        """Decode a partial group left over at end of data."""
+        return self._finish()
+
+    def _clean(self, body: bytes) -> bytes:
+        if not self.strict:
+            return body.translate(None, _NON_A85)
+        chars = body.translate(None, _WHITE_SPACE + b"~")
+        if chars.translate(None, _A85_CHARS):
+            raise ValueError("invalid character in ASCII85 data")
+        return chars
+
+    def _finish(self) -> bytes:
+        pending, self.pending = self.pending, b""
+        if len(pending) - pending.rfind(b"z") - 1 == 1 and self.strict:
+            raise ValueError("ASCII85 data ends with a single character")
+        return self._a85decode(pending)
+
+    @staticmethod
+    def _a85decode(chars: bytes) -> bytes:
+        # Pure Python in CPython's base64 module; see the note at the top
+        return base64.a85decode(chars, ignorechars=b"") if chars else b""
+
+
+def read_hex_bytes(source: ps.File, ctxt: ps.Context, count: int) -> bytes:
+    """
+    Read up to count bytes of hex data from a file, as readhexstring does.
+
+    Every character that is not a hex digit is skipped, '>' included.  The
+    file is asked only for as many bytes as digits are still missing, so
+    nothing after the last digit used is consumed.  An odd digit at end of
+    file reads as if followed by 0.
+
+    Args:
+        source: File object supporting read_bulk
+        ctxt: Context
+        count: Number of decoded bytes wanted
+
+    Returns:
+        The decoded bytes; shorter than count at end of file.
+    """
+    digits = bytearray()
+    wanted = 2 * count
+    while len(digits) < wanted:
+        chunk = source.read_bulk(ctxt, min(wanted - len(digits), 1024 * 1024))
+        if not chunk:
+            break
+        digits += chunk.translate(None, _NON_HEX)
+    if len(digits) % 2:
+        digits.append(ord("0"))
+    return binascii.unhexlify(digits)
@@ -12,7 +12,9 @@ It provides CharString decryption (key=4330) and execution of Type 1 commands to
 generate PostScript path operations for glyph rendering.
 
 Architecture:
-- CharString decryption using Adobe algorithm with key=4330, skip 1 random byte
+- CharString decryption using Adobe algorithm with key=4330, skip lenIV random bytes
+- Decrypted and parsed commands cached per font (CharStringCache) for
+  CharStrings and Subrs, keyed by font identity and the encrypted bytes
 - Type 1 command interpreter (rmoveto, rlineto, rrcurveto, etc.)
 - Path generation: CharString → PostScript path operations
 - Character width calculation from hsbw/sbw commands
@@ -25,10 +27,77 @@ Based on:
 from . import types as ps
 from . import color_space
 from . import error as ps_error
+from .glyph_cache import font_identity
+from .type1_decrypt import CHARSTRING_KEY, decrypt
 from ..operators.matrix import _transform_point, _transform_delta
 # Direct path manipulation - no longer import PostScript operators to avoid stack issues
 from .display_list_builder import DisplayListBuilder
-        
+
+
+class CharStringCache:
+    """
+    Decrypted and parsed CharString programs, per font.
+
+    A glyph that misses the glyph cache (a new size or rotation, say) runs
+    its CharString again, and every callsubr runs a subroutine again; the
+    command lists are looked up here instead of being decrypted and parsed
+    each time.  Entries are keyed by font identity (as in GlyphCacheKey),
+    lenIV and the encrypted bytes themselves, so fonts redefined under the
+    same name or edited Subrs never see stale commands.  The oldest font is
+    dropped when there are more than max_fonts, and the oldest entry of a
+    font when it has more than max_entries.
+
+    The command lists are shared and must not be modified.
+    """
+    DEFAULT_MAX_FONTS = 64
+    DEFAULT_MAX_ENTRIES = 4096
+
+    def __init__(self, max_fonts: int | None = None, max_entries: int | None = None) -> None:
+        self._fonts = {}
+        self._max_fonts = max_fonts or self.DEFAULT_MAX_FONTS
+        self._max_entries = max_entries or self.DEFAULT_MAX_ENTRIES
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, font_id: object, key: tuple[int, bytes]) -> list[tuple] | None:
+        """Return the commands cached for (lenIV, encrypted bytes), or None."""
+        entries = self._fonts.get(font_id)
+        if entries is not None:
+            commands = entries.get(key)
+            if commands is not None:
+                self._hits += 1
+                return commands
+        self._misses += 1
+        return None
+
+    def put(self, font_id: object, key: tuple[int, bytes], commands: list[tuple]) -> None:
+        """Cache the commands parsed from (lenIV, encrypted bytes)."""
+        entries = self._fonts.get(font_id)
+        if entries is None:
+            if len(self._fonts) >= self._max_fonts:
+                del self._fonts[next(iter(self._fonts))]
+            entries = self._fonts[font_id] = {}
+        elif len(entries) >= self._max_entries:
+            del entries[next(iter(entries))]
+        entries[key] = commands
+
+    def clear(self) -> None:
+        """Clear entire cache and reset statistics."""
+        self._fonts.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def stats(self) -> dict:
+        """Return cache statistics for debugging/profiling."""
+        total = self._hits + self._misses
+        return {
+            'fonts': len(self._fonts),
+            'entries': sum(len(entries) for entries in self._fonts.values()),
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_rate': self._hits / total if total > 0 else 0.0
+        }
+
 
 class CharStringInterpreter:
     """
@@ -68,7 +137,11 @@ class CharStringInterpreter:
         # Flex hint state (OtherSubrs 0, 1, 2)
         self.flex_active = False  # True when in flex hint accumulation mode
         self.flex_points = []  # Accumulated flex points (up to 7 coordinate pairs)
-        
+
+        # Parsed CharStrings and Subrs of this font
+        self.command_cache = ps.global_resources.get_charstring_cache()
+        self.font_id = font_identity(font_dict)
+
     def execute_charstring_for_width(self, encrypted_charstring: bytes) -> float | None:
         """
         Execute CharString, adding paths to graphics state and returning character width
@@ -86,19 +159,34 @@ class CharStringInterpreter:
             CharStringError: On decryption or execution failures
         """
 
-        # 1. Decrypt CharString data (key=4330, skip 1 random byte)
-        decrypted_data = self._decrypt_charstring(encrypted_charstring)
-
-        # 2. Parse CharString commands from decrypted bytes
-        commands = self._parse_charstring_commands(decrypted_data)
+        # 1. Decrypt and parse CharString commands (cached per font)
+        commands = self._get_commands(encrypted_charstring)
 
-        # 3. Execute Type 1 commands - paths added to ctxt.gstate.path automatically
+        # 2. Execute Type 1 commands - paths added to ctxt.gstate.path automatically
         for command_code, args in commands:
             self._execute_type1_command(command_code, args)
 
-        # 4. Return only character width (paths already in graphics state)
+        # 3. Return only character width (paths already in graphics state)
         return self.advance_width
-    
+
+    def _get_commands(self, encrypted_charstring: bytes) -> list[tuple[int, list]]:
+        """Return the parsed commands of a CharString or Subr, from the cache if possible."""
+        key = (self._len_iv(), encrypted_charstring)
+        commands = self.command_cache.get(self.font_id, key)
+        if commands is None:
+            decrypted_data = self._decrypt_charstring(encrypted_charstring)
+            commands = self._parse_charstring_commands(decrypted_data)
+            self.command_cache.put(self.font_id, key, commands)
+        return commands
+
+    def _len_iv(self) -> int:
+        """Number of random bytes at the start of each CharString (lenIV, default 4)."""
+        if self.private:
+            len_iv_obj = self.private.val.get(b'lenIV')
+            if len_iv_obj is not None:
+                return int(len_iv_obj.val)
+        return 4
+
     def _decrypt_charstring(self, encrypted_data: bytes) -> bytes:
         """
         Decrypt CharString data using Adobe Type 1 algorithm
@@ -118,35 +206,16 @@ class CharStringInterpreter:
         """
         if not encrypted_data:
             raise CharStringError("Empty CharString data")
-        
-        # Adobe CharString encryption constants
-        R = 4330  # Initial key for CharString encryption
-        C1 = 52845  # Encryption constant 1
-        C2 = 22719  # Encryption constant 2
-        
-        decrypted_bytes = []
-        
-        # Decrypt each byte using Adobe algorithm
-        for cipher_byte in encrypted_data:
-            # Decrypt this byte
-            plain_byte = cipher_byte ^ (R >> 8)
-            decrypted_bytes.append(plain_byte)
-            
-            # Update encryption key for next byte
-            R = ((cipher_byte + R) * C1 + C2) & 0xFFFF
-        
+
+        decrypted_bytes, _ = decrypt(encrypted_data, CHARSTRING_KEY)
+
         # Skip first n random bytes per Adobe CharString specification
         # n is specified by lenIV in Private dict (default 4)
-        n_iv = 4  # Default lenIV for CharStrings
-        if self.private:
-            len_iv_obj = self.private.val.get(b'lenIV')
-            if len_iv_obj is not None:
-                n_iv = int(len_iv_obj.val)
-
+        n_iv = self._len_iv()
         if len(decrypted_bytes) < n_iv:
             raise CharStringError(f"CharString too short (need {n_iv} random bytes to skip)")
 
-        return bytes(decrypted_bytes[n_iv:])
+        return decrypted_bytes[n_iv:]
     
     def _parse_charstring_commands(self, charstring_data: bytes) -> list[tuple[int, list]]:
         """
@@ -1104,9 +1173,8 @@ class CharStringInterpreter:
         Similar to execute_charstring_for_width but doesn't return width and
         doesn't expect to be the top-level execution.
         """
-        # Decrypt and parse
-        decrypted_data = self._decrypt_charstring(encrypted_charstring)
-        commands = self._parse_charstring_commands(decrypted_data)
+        # Decrypt and parse (cached per font)
+        commands = self._get_commands(encrypted_charstring)
 
         # Execute commands - paths are added to ctxt.gstate.path
         for command_code, args in commands:
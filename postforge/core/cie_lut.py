@@ -0,0 +1,355 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from __future__ import annotations
+
+"""
+Lookup Tables for CIE-Based Image Conversion
+
+Converting image samples through the CIE pipeline one pixel at a time
+(ColorSpaceEngine.cie_abc_to_rgb and friends) costs tens of microseconds
+per pixel.  Instead, the expensive parts of the pipeline are evaluated once
+per color space dictionary and images are converted with NumPy:
+
+- CIEBasedA: a 256-entry sRGB palette for the 8-bit sample levels
+- CIEBasedABC: per-component tables of the 256 sample levels after RangeABC
+  and DecodeABC; the matrices, DecodeLMN and sRGB gamma are then applied
+  to the whole image.  Every stage after DecodeABC is either a 3x3 matrix
+  or a per-component function, so this is exact where an interpolated
+  3D grid would smear the RangeLMN clamps and the Lab cube roots.
+- CIEBasedDEF: the Table entries converted to sRGB, trilinear interpolation
+  as in the per-pixel image path
+- CIEBasedDEFG: the Table entries converted to sRGB, nearest entry as in
+  cie_defg_to_rgb (so images match setcolor exactly)
+
+The vectorized pipeline mirrors ColorSpaceEngine.cie_abc_to_rgb and
+cie_a_to_rgb; keep them in step.  Tables are cached by color space
+dictionary content.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+from . import color_space
+from . import proc_table
+from . import types as ps
+from .color_space import ColorSpaceEngine, _get_cie_float_array
+
+# Interpolated pixels per batch, bounding temporary arrays
+_BATCH_PIXELS = 1 << 16
+
+# (kind, content key of cie_dict, decode) → table; by content, since gsave copies the dict
+_LUT_CACHE_MAX_ENTRIES = 32
+_lut_cache = OrderedDict()
+
+_IDENTITY_MATRIX = [1, 0, 0, 0, 1, 0, 0, 0, 1]
+
+
+def clear_cache() -> None:
+    """Drop all cached tables."""
+    _lut_cache.clear()
+
+
+def _cached(kind: str, cie_dict: dict, build, decode: tuple = ()) -> object:
+    key = (kind, proc_table.content_key(cie_dict), decode)
+    table = _lut_cache.get(key)
+    if table is not None:
+        _lut_cache.move_to_end(key)
+        return table
+    table = build(cie_dict, decode)
+    _lut_cache[key] = table
+    if len(_lut_cache) > _LUT_CACHE_MAX_ENTRIES:
+        _lut_cache.popitem(last=False)
+    return table
+
+
+# ---------------------------------------------------------------------------
+# Vectorized pipeline
+# ---------------------------------------------------------------------------
+
+def _eval_decode_proc(proc_obj, x: np.ndarray, lo: float, hi: float) -> np.ndarray:
+    """Vectorized color_space._eval_cie_decode_proc."""
+    inside = (x >= lo) & (x <= hi)
+    result = color_space._cie_decode_table(proc_obj, lo, hi).evaluate_array(x[:, None])[:, 0]
+    if not inside.all():
+        # Outside the sampled range the procedure is run for each distinct value
+        outside, inverse = np.unique(x[~inside], return_inverse=True)
+        values = [color_space._run_cie_decode_proc(proc_obj, float(v)) for v in outside]
+        result[~inside] = np.array(values)[inverse]
+    return result
+
+
+def _is_procedure(obj) -> bool:
+    return (hasattr(obj, 'TYPE') and obj.TYPE in ps.ARRAY_TYPES
+            and obj.attrib == ps.ATTRIB_EXEC)
+
+
+def _apply_decode_array(cie_dict: dict, key: bytes, values: list[np.ndarray]) -> list[np.ndarray]:
+    """Vectorized color_space._apply_decode_array on per-component arrays."""
+    decode_obj = cie_dict.get(key)
+    if not decode_obj or not hasattr(decode_obj, 'TYPE') or decode_obj.TYPE not in ps.ARRAY_TYPES:
+        return values
+    domain = _get_cie_float_array(cie_dict, color_space._CIE_DECODE_DOMAINS.get(key, b""), [])
+    if len(domain) < 2 * len(values):
+        domain = [0.0, 1.0] * len(values)
+    result = list(values)
+    if decode_obj.attrib == ps.ATTRIB_EXEC:
+        result[0] = _eval_decode_proc(decode_obj, result[0], domain[0], domain[1])
+        return result
+    procs = decode_obj.val[decode_obj.start:decode_obj.start + decode_obj.length]
+    for i in range(min(len(procs), len(result))):
+        if _is_procedure(procs[i]):
+            result[i] = _eval_decode_proc(procs[i], result[i], domain[2 * i], domain[2 * i + 1])
+    return result
+
+
+def _srgb_gamma(u: np.ndarray) -> np.ndarray:
+    u = np.maximum(u, 0.0)
+    return np.clip(np.where(u <= 0.0031308, 12.92 * u,
+                            1.055 * (np.maximum(u, 0.0031308) ** (1.0 / 2.4)) - 0.055),
+                   0.0, 1.0)
+
+
+def _lmn_to_rgb(lmn: list[np.ndarray], cie_dict: dict) -> np.ndarray:
+    """RangeLMN, DecodeLMN, MatrixLMN, XYZ → sRGB; returns an (N, 3) array."""
+    range_lmn = _get_cie_float_array(cie_dict, b"RangeLMN", [0, 1, 0, 1, 0, 1])
+    lmn = [np.clip(lmn[i], range_lmn[2 * i], range_lmn[2 * i + 1]) for i in range(3)]
+    lmn = _apply_decode_array(cie_dict, b"DecodeLMN", lmn)
+
+    mat = _get_cie_float_array(cie_dict, b"MatrixLMN", _IDENTITY_MATRIX)
+    x = mat[0] * lmn[0] + mat[3] * lmn[1] + mat[6] * lmn[2]
+    y = mat[1] * lmn[0] + mat[4] * lmn[1] + mat[7] * lmn[2]
+    z = mat[2] * lmn[0] + mat[5] * lmn[1] + mat[8] * lmn[2]
+
+    m = ColorSpaceEngine._XYZ_TO_LRGB
+    return np.stack([_srgb_gamma(m[i][0] * x + m[i][1] * y + m[i][2] * z)
+                     for i in range(3)], axis=1)
+
+
+def _decode_abc(abc: list[np.ndarray], cie_dict: dict) -> list[np.ndarray]:
+    """RangeABC clamp and DecodeABC on per-component arrays."""
+    range_abc = _get_cie_float_array(cie_dict, b"RangeABC", [0, 1, 0, 1, 0, 1])
+    abc = [np.clip(np.asarray(abc[i], dtype=np.float64), range_abc[2 * i], range_abc[2 * i + 1])
+           for i in range(3)]
+    return _apply_decode_array(cie_dict, b"DecodeABC", abc)
+
+
+def _decoded_abc_to_rgb(a: np.ndarray, b: np.ndarray, c: np.ndarray, cie_dict: dict) -> np.ndarray:
+    mat = _get_cie_float_array(cie_dict, b"MatrixABC", _IDENTITY_MATRIX)
+    return _lmn_to_rgb([mat[0] * a + mat[3] * b + mat[6] * c,
+                        mat[1] * a + mat[4] * b + mat[7] * c,
+                        mat[2] * a + mat[5] * b + mat[8] * c], cie_dict)
+
+
+def abc_to_rgb(abc: np.ndarray, cie_dict: dict) -> np.ndarray:
+    """
+    Convert CIEBasedABC components to sRGB, like ColorSpaceEngine.cie_abc_to_rgb.
+
+    Args:
+        abc: array of shape (N, 3)
+        cie_dict: the CIE dictionary (Python dict with bytes keys)
+
+    Returns:
+        Array of shape (N, 3) with r, g, b values in [0, 1]
+    """
+    a, b, c = _decode_abc([abc[:, 0], abc[:, 1], abc[:, 2]], cie_dict)
+    return _decoded_abc_to_rgb(a, b, c, cie_dict)
+
+
+def a_to_rgb(a: np.ndarray, cie_dict: dict) -> np.ndarray:
+    """Convert CIEBasedA components to sRGB, like ColorSpaceEngine.cie_a_to_rgb."""
+    range_a = _get_cie_float_array(cie_dict, b"RangeA", [0, 1])
+    a = np.clip(np.asarray(a, dtype=np.float64), range_a[0], range_a[1])
+    a = _apply_decode_array(cie_dict, b"DecodeA", [a])[0]
+    mat = _get_cie_float_array(cie_dict, b"MatrixA", [1, 1, 1])
+    return _lmn_to_rgb([mat[0] * a, mat[1] * a, mat[2] * a], cie_dict)
+
+
+# ---------------------------------------------------------------------------
+# Table construction
+# ---------------------------------------------------------------------------
+
+def _sample_levels(decode: tuple, component: int) -> np.ndarray:
+    """The 256 values an 8-bit sample takes under an image Decode array."""
+    lo, hi = decode[2 * component], decode[2 * component + 1]
+    return lo + (np.arange(256) / 255.0) * (hi - lo)
+
+
+def _build_abc_levels(cie_dict: dict, decode: tuple) -> np.ndarray:
+    return np.stack(_decode_abc([_sample_levels(decode, i) for i in range(3)], cie_dict))
+
+
+def _build_a_palette(cie_dict: dict, decode: tuple) -> np.ndarray:
+    return a_to_rgb(_sample_levels(decode, 0), cie_dict)
+
+
+def _table_strings(table_obj, dims: int) -> tuple[list[int], list[bytes]]:
+    """Grid sizes and byte strings of a CIEBasedDEF/DEFG Table."""
+    tv = table_obj.val
+    sizes = [int(tv[i].val) if hasattr(tv[i], 'val') else int(tv[i]) for i in range(dims)]
+    strings_obj = tv[dims]
+    if hasattr(strings_obj, 'val'):
+        strings = strings_obj.val
+        s_start = getattr(strings_obj, 'start', 0)
+    else:
+        strings = strings_obj
+        s_start = 0
+    data = []
+    for i in range(sizes[0]):
+        string_obj = strings[s_start + i]
+        if hasattr(string_obj, 'byte_string'):
+            data.append(string_obj.byte_string())
+        elif hasattr(string_obj, 'val') and isinstance(string_obj.val, (bytes, bytearray)):
+            data.append(bytes(string_obj.val))
+        else:
+            data.append(bytes(string_obj))
+    return sizes, data
+
+
+def _table_bytes(sizes: list[int], data: list[bytes]) -> tuple[np.ndarray, np.ndarray]:
+    """Table entries as an (entries, 3) byte array and a mask of entries present."""
+    entry_bytes = int(np.prod(sizes[1:])) * 3
+    table = np.zeros((sizes[0], entry_bytes), dtype=np.uint8)
+    present = np.zeros((sizes[0], entry_bytes // 3), dtype=bool)
+    for i, string in enumerate(data):
+        n = min(len(string), entry_bytes) // 3
+        table[i, :n * 3] = np.frombuffer(string, dtype=np.uint8, count=n * 3)
+        present[i, :n] = True
+    return table.reshape(-1, 3), present.reshape(-1)
+
+
+def _build_def_table(cie_dict: dict, decode: tuple) -> np.ndarray | None:
+    table_obj = cie_dict.get(b"Table")
+    if not table_obj or not hasattr(table_obj, 'val') or len(table_obj.val) < 4:
+        return None
+    sizes, data = _table_strings(table_obj, 3)
+    entries, present = _table_bytes(sizes, data)
+    range_abc = _get_cie_float_array(cie_dict, b"RangeABC", [0, 1, 0, 1, 0, 1])
+    abc = np.empty(entries.shape)
+    for i in range(3):
+        scale = (range_abc[2 * i + 1] - range_abc[2 * i]) / 255.0
+        abc[:, i] = np.where(present, range_abc[2 * i] + entries[:, i] * scale, range_abc[2 * i])
+    return abc_to_rgb(abc, cie_dict).reshape(sizes + [3])
+
+
+def _build_defg_table(cie_dict: dict, decode: tuple) -> np.ndarray | None:
+    table_obj = cie_dict.get(b"Table")
+    if not table_obj or not hasattr(table_obj, 'val') or len(table_obj.val) < 5:
+        return None
+    sizes, data = _table_strings(table_obj, 4)
+    entries, present = _table_bytes(sizes, data)
+    range_abc = _get_cie_float_array(cie_dict, b"RangeABC", [0, 1, 0, 1, 0, 1])
+    abc = np.empty(entries.shape)
+    for i in range(3):
+        lo, hi = range_abc[2 * i], range_abc[2 * i + 1]
+        abc[:, i] = np.where(present, lo + (entries[:, i] / 255.0) * (hi - lo), lo)
+    return abc_to_rgb(abc, cie_dict).reshape(sizes + [3])
+
+
+# ---------------------------------------------------------------------------
+# Image conversion
+# ---------------------------------------------------------------------------
+
+def _samples(sample_data: bytes | bytearray, components: int, num_pixels: int) -> np.ndarray:
+    """Complete 8-bit pixels of sample_data as an (N, components) array."""
+    available = min(num_pixels, len(sample_data) // components)
+    return np.frombuffer(sample_data, dtype=np.uint8,
+                         count=available * components).reshape(available, components)
+
+
+def _grid_coordinates(values: np.ndarray, domain: list[float], sizes) -> np.ndarray:
+    """Map component values in domain to clamped fractional grid indices."""
+    coords = np.empty(values.shape)
+    for i, size in enumerate(sizes):
+        lo, hi = domain[2 * i], domain[2 * i + 1]
+        span = hi - lo if hi != lo else 1.0
+        coords[:, i] = np.clip((values[:, i] - lo) / span * (size - 1), 0.0, size - 1.0)
+    return coords
+
+
+def _trilinear(table: np.ndarray, coords: np.ndarray) -> np.ndarray:
+    """Interpolate an (m1, m2, m3, 3) table at fractional grid coordinates."""
+    sizes = table.shape[:3]
+    flat = table.reshape(-1, 3)
+    result = np.empty((len(coords), 3))
+    for start in range(0, len(coords), _BATCH_PIXELS):
+        c = coords[start:start + _BATCH_PIXELS]
+        i0 = c.astype(np.intp)
+        i1 = np.minimum(i0 + 1, np.array(sizes) - 1)
+        frac = c - i0
+        out = np.zeros((len(c), 3))
+        for corner in range(8):
+            index = np.zeros(len(c), dtype=np.intp)
+            weight = np.ones(len(c))
+            for axis in range(3):
+                upper = (corner >> (2 - axis)) & 1
+                index = index * sizes[axis] + (i1[:, axis] if upper else i0[:, axis])
+                weight = weight * (frac[:, axis] if upper else 1.0 - frac[:, axis])
+            out += flat[index] * weight[:, None]
+        result[start:start + _BATCH_PIXELS] = out
+    return result
+
+
+def _to_bgrx(rgb: np.ndarray, num_pixels: int) -> bytearray:
+    """Pack (N, 3) sRGB values into Cairo BGRX bytes, rounding to nearest.
+
+    Pixels beyond N (missing sample data) are left transparent black, as in
+    the per-pixel paths.
+    """
+    result = bytearray(num_pixels * 4)
+    out = np.frombuffer(result, dtype=np.uint8).reshape(-1, 4)[:len(rgb)]
+    out[:, :3] = np.clip(rgb[:, ::-1] * 255 + 0.5, 0, 255).astype(np.uint8)
+    out[:, 3] = 255
+    return result
+
+
+def convert_abc_image(sample_data: bytes | bytearray, num_pixels: int,
+                      decode: list[float], cie_dict: dict) -> bytearray:
+    """Convert 8-bit CIEBasedABC samples to BGRX through the cached level tables."""
+    levels = _cached('ABC', cie_dict, _build_abc_levels, tuple(decode[:6]))
+    samples = _samples(sample_data, 3, num_pixels)
+    a, b, c = (levels[i][samples[:, i]] for i in range(3))
+    return _to_bgrx(_decoded_abc_to_rgb(a, b, c, cie_dict), num_pixels)
+
+
+def convert_a_image(sample_data: bytes | bytearray, num_pixels: int,
+                    decode: list[float], cie_dict: dict) -> bytearray:
+    """Convert 8-bit CIEBasedA samples to BGRX through the cached palette."""
+    palette = _cached('A', cie_dict, _build_a_palette, tuple(decode[:2]))
+    samples = _samples(sample_data, 1, num_pixels)
+    return _to_bgrx(palette[samples[:, 0]], num_pixels)
+
+
+def convert_def_image(sample_data: bytes | bytearray, num_pixels: int,
+                      decode: list[float], cie_dict: dict) -> bytearray | None:
+    """Convert 8-bit CIEBasedDEF samples to BGRX, or None without a Table."""
+    table = _cached('DEF', cie_dict, _build_def_table)
+    if table is None:
+        return None
+    range_def = _get_cie_float_array(cie_dict, b"RangeDEF", [0, 1, 0, 1, 0, 1])
+    samples = _samples(sample_data, 3, num_pixels)
+    values = np.stack([decode[2 * i] + samples[:, i] * ((decode[2 * i + 1] - decode[2 * i]) / 255.0)
+                       for i in range(3)], axis=1)
+    rgb = _trilinear(table, _grid_coordinates(values, range_def, table.shape[:3]))
+    return _to_bgrx(rgb, num_pixels)
+
+
+def convert_defg_image(sample_data: bytes | bytearray, num_pixels: int,
+                       decode: list[float], cie_dict: dict) -> bytearray:
+    """Convert 8-bit CIEBasedDEFG samples to BGRX through the cached table."""
+    range_defg = _get_cie_float_array(cie_dict, b"RangeDEFG", [0, 1, 0, 1, 0, 1, 0, 1])
+    samples = _samples(sample_data, 4, num_pixels)
+    values = np.stack([np.clip(decode[2 * i] + (samples[:, i] / 255.0) * (decode[2 * i + 1] - decode[2 * i]),
+                               range_defg[2 * i], range_defg[2 * i + 1])
+                       for i in range(4)], axis=1)
+    table = _cached('DEFG', cie_dict, _build_defg_table)
+    if table is None:
+        # No Table — treated as CMYK, as in cie_defg_to_rgb
+        rgb = 1.0 - np.minimum(1.0, values[:, :3] + values[:, 3:])
+        return _to_bgrx(rgb, num_pixels)
+    sizes = table.shape[:4]
+    coords = _grid_coordinates(values, range_defg, sizes)
+    nearest = np.minimum((coords + 0.5).astype(np.intp), np.array(sizes) - 1)
+    return _to_bgrx(table[tuple(nearest.T)], num_pixels)
@@ -19,6 +19,7 @@ from collections.abc import Callable
 
 from . import icc_default
 from . import icc_profile
+from . import proc_table
 from . import types as ps
 
 
@@ -730,10 +731,83 @@ class ColorSpaceEngine:
             return False
 
 
+# Device color conversions are memoized per context.  Entries are keyed by
+# the device color space, the component values and the space they are
+# actually converted from (see _device_color_key), never by the identity of
+# the color space array, which gsave copies; restore clears the entries.
+_DEVICE_COLOR_CACHE_MAX_ENTRIES = 1024
+
+_DEVICE_SPACE_MAP = {
+    b"DeviceGray": "DeviceGray",
+    b"DeviceRGB": "DeviceRGB",
+    b"DeviceCMYK": "DeviceCMYK"
+}
+
+
+class DeviceColorCache:
+    """Bounded cache of convert_to_device_color results for one context.
+
+    When full, the oldest entry is evicted; lookups do not reorder entries,
+    which keeps a hit cheaper than most of the conversions it replaces.
+    """
+
+    def __init__(self, max_entries: int = _DEVICE_COLOR_CACHE_MAX_ENTRIES) -> None:
+        self._cache = {}
+        self._max_entries = max_entries
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: tuple) -> tuple[float, ...] | None:
+        """Return the cached device color for key, or None."""
+        device_color = self._cache.get(key)
+        if device_color is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return device_color
+
+    def put(self, key: tuple, device_color: list[float]) -> None:
+        """Cache a device color, evicting the oldest entry if full."""
+        if len(self._cache) >= self._max_entries:
+            del self._cache[next(iter(self._cache))]
+        self._cache[key] = tuple(device_color)
+
+    def clear_entries(self) -> None:
+        """Drop all entries, keeping the statistics."""
+        self._cache.clear()
+
+    def clear(self) -> None:
+        """Clear entire cache and reset statistics."""
+        self._cache.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def stats(self) -> dict:
+        """Return entries, max_entries, hits, misses and hit_rate."""
+        total = self._hits + self._misses
+        return {
+            'entries': len(self._cache),
+            'max_entries': self._max_entries,
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_rate': self._hits / total if total > 0 else 0.0
+        }
+
+
+def get_device_color_cache(ctxt: ps.Context) -> DeviceColorCache:
+    """Get or create the device color cache of a context."""
+    if ctxt.device_color_cache is None:
+        ctxt.device_color_cache = DeviceColorCache()
+    return ctxt.device_color_cache
+
+
 def convert_to_device_color(ctxt: ps.Context, gs_color: list, gs_color_space: list) -> list[float]:
     """
     Convert PostScript color to device color space for display list.
 
+    Conversions between different spaces are memoized in the context's
+    DeviceColorCache.
+
     Args:
         ctxt: PostScript context with pagedevice
         gs_color: Graphics state color (list of PostScript objects or floats)
@@ -754,9 +828,69 @@ def convert_to_device_color(ctxt: ps.Context, gs_color: list, gs_color_space: li
     if not device_color_model:
         return source_color  # No ColorModel key, return as-is
 
-    # Get source color space name
+    # Handle both Name objects and raw values
+    color_model_val = device_color_model.val if hasattr(device_color_model, 'val') else device_color_model
+    target_space = _DEVICE_SPACE_MAP.get(color_model_val, "DeviceRGB")
+
     source_space = gs_color_space[0] if isinstance(gs_color_space, list) else gs_color_space
 
+    # Nothing to convert
+    if source_space == target_space:
+        return source_color
+
+    cache = ctxt.device_color_cache or get_device_color_cache(ctxt)
+    key = _device_color_key(source_color, gs_color_space, source_space, target_space)
+    device_color = cache.get(key)
+    if device_color is not None:
+        return list(device_color)
+    device_color = _convert_to_device_color(source_color, gs_color_space, source_space, target_space)
+    cache.put(key, device_color)
+    return device_color
+
+
+def _device_color_key(source_color: list[float], gs_color_space: list,
+                      source_space: str, target_space: str) -> tuple:
+    """
+    Return the DeviceColorCache key of a conversion.
+
+    Indexed, Separation and DeviceN colors are already in the base or
+    alternative space, so only that space's name counts; ICCBased colors
+    depend on the profile and the alternate space.  Lookup tables and tint
+    transforms are left out, since changing them changes the color itself.
+    """
+    if source_space in ("Separation", "DeviceN", "Indexed"):
+        source_space = _alternative_space_name(gs_color_space, source_space)
+    elif source_space == "ICCBased":
+        stream_obj = gs_color_space[1] if len(gs_color_space) > 1 else None
+        source_space = (source_space,
+                        icc_profile.get_profile_hash(stream_obj) if stream_obj else None,
+                        ColorSpaceEngine.resolve_iccbased_space(gs_color_space))
+    return (target_space, source_space, tuple(source_color))
+
+
+def _alternative_space_name(gs_color_space: list, source_space: str) -> str:
+    """Return the base space of Indexed or the alternative space of Separation and DeviceN."""
+    if source_space == "Indexed":
+        alt_space_obj = gs_color_space[1]  # Base space at index 1
+    else:
+        alt_space_obj = gs_color_space[2]  # Alternative space at index 2
+    if hasattr(alt_space_obj, 'TYPE'):
+        # It's a PostScript object
+        if alt_space_obj.TYPE == ps.T_NAME:
+            return alt_space_obj.val.decode('ascii') if isinstance(alt_space_obj.val, bytes) else alt_space_obj.val
+        if hasattr(alt_space_obj, 'val') and len(alt_space_obj.val) > 0:
+            # Array - get first element
+            first = alt_space_obj.val[0]
+            if hasattr(first, 'val'):
+                return first.val.decode('ascii') if isinstance(first.val, bytes) else first.val
+    elif isinstance(alt_space_obj, str):
+        return alt_space_obj
+    return source_space
+
+
+def _convert_to_device_color(source_color: list[float], gs_color_space: list,
+                             source_space: str, target_space: str) -> list[float]:
+    """Convert source_color from its color space family to the device space."""
     # For CIE-based spaces, color is already resolved to sRGB by setcolor
     if source_space in ("CIEBasedABC", "CIEBasedA", "CIEBasedDEF", "CIEBasedDEFG"):
         source_space = "DeviceRGB"
@@ -779,33 +913,7 @@ def convert_to_device_color(ctxt: ps.Context, gs_color: list, gs_color_space: li
     # For Separation, DeviceN, and Indexed, the color values are already in the
     # base/alternative space (resolved in setcolor/setcolorspace)
     if source_space in ("Separation", "DeviceN", "Indexed"):
-        # Get base/alternative space from color space array
-        if source_space == "Indexed":
-            alt_space_obj = gs_color_space[1]  # Base space at index 1
-        else:
-            alt_space_obj = gs_color_space[2]  # Alternative space at index 2
-        if hasattr(alt_space_obj, 'TYPE'):
-            # It's a PostScript object
-            if alt_space_obj.TYPE == ps.T_NAME:
-                source_space = alt_space_obj.val.decode('ascii') if isinstance(alt_space_obj.val, bytes) else alt_space_obj.val
-            elif hasattr(alt_space_obj, 'val') and len(alt_space_obj.val) > 0:
-                # Array - get first element
-                first = alt_space_obj.val[0]
-                if hasattr(first, 'val'):
-                    source_space = first.val.decode('ascii') if isinstance(first.val, bytes) else first.val
-        elif isinstance(alt_space_obj, str):
-            source_space = alt_space_obj
-
-    # Device color model mapping to PostScript color space names
-    device_space_map = {
-        b"DeviceGray": "DeviceGray",
-        b"DeviceRGB": "DeviceRGB",
-        b"DeviceCMYK": "DeviceCMYK"
-    }
-
-    # Handle both Name objects and raw values
-    color_model_val = device_color_model.val if hasattr(device_color_model, 'val') else device_color_model
-    target_space = device_space_map.get(color_model_val, "DeviceRGB")
+        source_space = _alternative_space_name(gs_color_space, source_space)
 
     # If source and target are the same, return as-is
     if source_space == target_space:
@@ -1006,16 +1114,18 @@ def _table_4d_lookup(table_obj: ps.Array, d: float, e: float, f: float, g: float
     return [range_abc[0], range_abc[2], range_abc[4]]
 
 
-_CIE_DECODE_CACHE = {}  # id(proc) → list of pre-evaluated float values
-_CIE_DECODE_CACHE_SIZE = 256  # Matches 8-bit images exactly (i/255 inputs)
+# Input range of each Decode entry; the inputs are clamped to it beforehand
+_CIE_DECODE_DOMAINS = {b"DecodeABC": b"RangeABC", b"DecodeLMN": b"RangeLMN", b"DecodeA": b"RangeA"}
 
 
-def _eval_cie_decode_proc(proc_obj: ps.Array, input_val: float) -> float:
+def _eval_cie_decode_proc(proc_obj: ps.Array, input_val: float,
+                          lo: float = 0.0, hi: float = 1.0) -> float:
     """Evaluate a CIE Decode procedure (DecodeABC, DecodeLMN, etc.) on a single value.
 
-    On first call for a given procedure, pre-evaluates at 256 points in [0, 1]
-    and caches the results. Subsequent calls use fast linear interpolation in the
-    cached table. Falls back to direct evaluation for inputs outside [0, 1].
+    On first call for a given procedure and domain [lo, hi], the procedure is
+    sampled into a 256-point table (see proc_table.py); subsequent calls use
+    linear interpolation in the table. Falls back to direct evaluation for
+    inputs outside the domain.
     """
     if not hasattr(proc_obj, 'TYPE') or proc_obj.TYPE not in ps.ARRAY_TYPES:
         return input_val
@@ -1023,34 +1133,30 @@ def _eval_cie_decode_proc(proc_obj: ps.Array, input_val: float) -> float:
         return input_val
 
     x = float(input_val)
-    cache_key = id(proc_obj)
-    table = _CIE_DECODE_CACHE.get(cache_key)
-
-    if table is None:
-        # Pre-evaluate procedure at N evenly-spaced points in [0, 1]
-        N = _CIE_DECODE_CACHE_SIZE
-        table = [0.0] * N
-        for i in range(N):
-            v = i / (N - 1)
-            stack = [v]
-            _exec_cie_tokens(proc_obj, stack)
-            table[i] = float(stack[-1]) if stack and isinstance(stack[-1], (int, float)) else v
-        _CIE_DECODE_CACHE[cache_key] = table
-
-    # Fast path: linear interpolation in cached table for inputs in [0, 1]
-    if 0.0 <= x <= 1.0:
-        N = len(table)
-        idx = x * (N - 1)
-        i0 = min(int(idx), N - 2)
-        frac = idx - i0
-        return table[i0] + (table[i0 + 1] - table[i0]) * frac
+
+    # Fast path: linear interpolation in the sampled table
+    if lo <= x <= hi:
+        table = _cie_decode_table(proc_obj, lo, hi).values
+        idx = (x - lo) / (hi - lo) * (len(table) - 1) if hi != lo else 0.0
+        i0 = min(int(idx), len(table) - 2)
+        return table[i0] + (table[i0 + 1] - table[i0]) * (idx - i0)
 
     # Slow path: direct evaluation for out-of-range inputs
+    return _run_cie_decode_proc(proc_obj, x)
+
+
+def _run_cie_decode_proc(proc_obj: ps.Array, x: float) -> float:
     stack = [x]
     _exec_cie_tokens(proc_obj, stack)
     return float(stack[-1]) if stack and isinstance(stack[-1], (int, float)) else x
 
 
+def _cie_decode_table(proc_obj: ps.Array, lo: float = 0.0, hi: float = 1.0) -> proc_table.ProcTable:
+    """Return a CIE Decode procedure sampled over [lo, hi], cached by procedure content."""
+    return proc_table.get_table(proc_obj, lambda point: [_run_cie_decode_proc(proc_obj, point[0])],
+                                1, 1, (lo, hi))
+
+
 _CIE_MARK = object()  # Sentinel for [ ... ] array construction in CIE procedures
 
 
@@ -1279,11 +1385,16 @@ def _apply_decode_array(cie_dict: dict, key: bytes, values: list[float]) -> list
     if not decode_obj or not hasattr(decode_obj, 'TYPE') or decode_obj.TYPE not in ps.ARRAY_TYPES:
         return values
 
+    # Procedures are sampled over the Range their inputs were clamped to
+    domain = _get_cie_float_array(cie_dict, _CIE_DECODE_DOMAINS.get(key, b""), [])
+    if len(domain) < 2 * len(values):
+        domain = [0.0, 1.0] * len(values)
+
     # Single executable procedure (DecodeA): apply to first value
     if decode_obj.attrib == ps.ATTRIB_EXEC:
         result = list(values)
         if result:
-            result[0] = _eval_cie_decode_proc(decode_obj, result[0])
+            result[0] = _eval_cie_decode_proc(decode_obj, result[0], domain[0], domain[1])
         return result
 
     # Literal array of procedures (DecodeABC, DecodeLMN): apply each to its value
@@ -1292,6 +1403,6 @@ def _apply_decode_array(cie_dict: dict, key: bytes, values: list[float]) -> list
     for i in range(min(len(procs), len(result))):
         proc = procs[i]
         if hasattr(proc, 'TYPE') and proc.TYPE in ps.ARRAY_TYPES and proc.attrib == ps.ATTRIB_EXEC:
-            result[i] = _eval_cie_decode_proc(proc, result[i])
+            result[i] = _eval_cie_decode_proc(proc, result[i], domain[2 * i], domain[2 * i + 1])
 
     return result
\ No newline at end of file
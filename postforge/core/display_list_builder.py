@@ -16,13 +16,548 @@ Architecture:
 - Automatically inserts ClipElement objects when clipping state changes  
 - Provides centralized clipping management for all graphics operations
 - Maintains clean separation between PostScript semantics and device rendering
+- Records device-space bounding boxes on paths, strokes and images so that
+  renderers can cull elements lying entirely outside the current clip
+- Merges runs of identically painted fills and strokes into compound paths
+  (merge_paint_runs) so devices issue one paint operation per run
+- Replaces stepped-color gradient strip runs with axial shadings
+  (replace_gradient_strips)
 """
 
+import copy
+import math
 from typing import Any
 
 from . import types as ps
 
 
+def path_device_bbox(path: ps.Path) -> tuple[float, float, float, float] | None:
+    """
+    Compute the device-space bounding box of a path.
+
+    Curve control points are included, so the box is conservative (the convex
+    hull of a Bezier segment contains the curve).
+
+    Args:
+        path: Path whose points are already in device space
+
+    Returns:
+        (x0, y0, x1, y1) or None if the path has no points
+    """
+    xs = []
+    ys = []
+    for subpath in path:
+        for pc_item in subpath:
+            if isinstance(pc_item, (ps.MoveTo, ps.LineTo)):
+                xs.append(pc_item.p.x)
+                ys.append(pc_item.p.y)
+            elif isinstance(pc_item, ps.CurveTo):
+                xs.extend((pc_item.p1.x, pc_item.p2.x, pc_item.p3.x))
+                ys.extend((pc_item.p1.y, pc_item.p2.y, pc_item.p3.y))
+    if not xs:
+        return None
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def stroke_device_bbox(bbox: tuple[float, float, float, float] | None,
+                       stroke: ps.Stroke) -> tuple[float, float, float, float] | None:
+    """
+    Expand a path bounding box by the area a stroke can paint outside it.
+
+    The half line width is scaled by the largest CTM scale factor (bounded by
+    the Frobenius norm) and multiplied by the worst case of miter joins and
+    projecting square caps.
+
+    Args:
+        bbox: Device-space bounding box of the stroked path
+        stroke: Stroke element carrying line width, joins, caps and CTM
+
+    Returns:
+        Expanded (x0, y0, x1, y1) or None if bbox is None
+    """
+    if bbox is None:
+        return None
+    a, b, c, d = stroke.ctm[0], stroke.ctm[1], stroke.ctm[2], stroke.ctm[3]
+    half_width = 0.5 * stroke.line_width * math.sqrt(a * a + b * b + c * c + d * d)
+    extent = math.sqrt(2.0)  # projecting square cap at 45 degrees
+    if stroke.line_join == ps.LINE_JOIN_MITER:
+        extent = max(extent, stroke.miter_limit)
+    pad = half_width * extent
+    return (bbox[0] - pad, bbox[1] - pad, bbox[2] + pad, bbox[3] + pad)
+
+
+def image_device_bbox(image_element: ps.ImageElement) -> tuple[float, float, float, float] | None:
+    """
+    Compute the device-space bounding box of an image's unit square.
+
+    The source rectangle (0, 0, width, height) is mapped to device space
+    through the inverse image matrix and the CTM stored on the element.
+
+    Args:
+        image_element: Image element with width, height, image_matrix and ctm
+
+    Returns:
+        (x0, y0, x1, y1) or None if the image matrix is singular
+    """
+    if image_element.image_matrix is None or image_element.ctm is None:
+        return None
+    try:
+        image_to_user = image_element._calculate_inverse_matrix(image_element.image_matrix)
+    except ValueError:
+        return None
+    ia, ib, ic, id_, itx, ity = image_element._matrix_multiply(
+        image_to_user, list(image_element.ctm))
+    w = image_element.width
+    h = image_element.height
+    xs = []
+    ys = []
+    for x, y in ((0, 0), (w, 0), (0, h), (w, h)):
+        xs.append(ia * x + ic * y + itx)
+        ys.append(ib * x + id_ * y + ity)
+    return (min(xs), min(ys), max(xs), max(ys))
+
+# Longest run of fills merged into one compound path.  Each fill is checked
+# against every other fill of its run for overlap, so this bounds the cost.
+MAX_FILL_RUN = 64
+
+
+def _boxes_overlap(a: tuple, b: tuple) -> bool:
+    """Return True if two bounding boxes share interior area."""
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _union_bbox(boxes: list) -> tuple[float, float, float, float] | None:
+    """Return the union of bounding boxes, or None if any is unknown."""
+    if any(bbox is None for bbox in boxes):
+        return None
+    return (min(bbox[0] for bbox in boxes), min(bbox[1] for bbox in boxes),
+            max(bbox[2] for bbox in boxes), max(bbox[3] for bbox in boxes))
+
+
+def _fill_mergeable(path: ps.Path) -> bool:
+    """
+    Return True if a filled path can share a compound path with other fills.
+
+    Paths without a known, non-empty bounding box are excluded, as are
+    subpaths that cannot enclose area: devices paint zero-area fills as
+    hairlines, which only works when the path is filled on its own.
+    """
+    bbox = path.device_bbox
+    if bbox is None or bbox[0] >= bbox[2] or bbox[1] >= bbox[3]:
+        return False
+    for subpath in path:
+        segments = 0
+        for pc_item in subpath:
+            seg = pc_item.SEG_TYPE
+            if seg == ps.SEG_CURVETO:
+                segments = 3
+                break
+            if seg != ps.SEG_CLOSEPATH:
+                segments += 1
+        if segments < 3:
+            return False
+    return True
+
+
+def _paints_compatible(a: Any, b: Any) -> bool:
+    """Return True if two Fill or two Stroke elements paint identically."""
+    if a.DL_TYPE == ps.DL_FILL:
+        return a.winding_rule == b.winding_rule and a.color == b.color
+    return (a.color == b.color and a.line_width == b.line_width and
+            a.line_cap == b.line_cap and a.line_join == b.line_join and
+            a.miter_limit == b.miter_limit and a.dash_pattern == b.dash_pattern and
+            a.ctm == b.ctm and a.stroke_adjust == b.stroke_adjust)
+
+
+def merge_paint_runs(display_list: list) -> tuple[list, int, int]:
+    """
+    Merge runs of Path+Fill or Path+Stroke pairs that paint identically.
+
+    Consecutive pairs whose paint elements have the same color and state are
+    replaced by one compound Path followed by a single paint element, so
+    devices issue one paint operation per run.  Painting order is preserved:
+    only adjacent pairs are merged and any other element ends a run.
+
+    Strokes merge unconditionally — stroking the union of opaque,
+    same-colored paths paints the union of the individual strokes.  Fills
+    merge only when their bounding boxes do not overlap, since the winding
+    rule would otherwise combine the subpaths differently.
+
+    Args:
+        display_list: Display list to optimize (not modified)
+
+    Returns:
+        (elements, merged_fills, merged_strokes) where elements is the
+        optimized list and the counts are paint elements folded into a
+        preceding one
+    """
+    merged_fills = 0
+    merged_strokes = 0
+    out = []
+    n_items = len(display_list)
+    i = 0
+    while i < n_items:
+        item = display_list[i]
+        if (item.DL_TYPE != ps.DL_PATH or i + 1 >= n_items or
+                display_list[i + 1].DL_TYPE not in (ps.DL_FILL, ps.DL_STROKE)):
+            out.append(item)
+            i += 1
+            continue
+
+        paint = display_list[i + 1]
+        is_fill = paint.DL_TYPE == ps.DL_FILL
+        if is_fill and not _fill_mergeable(item):
+            out.append(item)
+            out.append(paint)
+            i += 2
+            continue
+
+        run_paths = [item]
+        run_paints = [paint]
+        j = i + 2
+        while j + 1 < n_items:
+            path = display_list[j]
+            next_paint = display_list[j + 1]
+            if (path.DL_TYPE != ps.DL_PATH or next_paint.DL_TYPE != paint.DL_TYPE or
+                    not _paints_compatible(paint, next_paint)):
+                break
+            if is_fill:
+                if len(run_paths) >= MAX_FILL_RUN or not _fill_mergeable(path):
+                    break
+                bbox = path.device_bbox
+                if any(_boxes_overlap(bbox, p.device_bbox) for p in run_paths):
+                    break
+            run_paths.append(path)
+            run_paints.append(next_paint)
+            j += 2
+
+        if len(run_paths) == 1:
+            out.append(item)
+            out.append(paint)
+        else:
+            merged_path = ps.Path()
+            for path in run_paths:
+                merged_path.extend(path)
+            merged_path.device_bbox = _union_bbox([path.device_bbox for path in run_paths])
+            out.append(merged_path)
+            if is_fill:
+                out.append(paint)
+                merged_fills += len(run_paths) - 1
+            else:
+                merged_stroke = copy.copy(paint)
+                merged_stroke.device_bbox = _union_bbox([s.device_bbox for s in run_paints])
+                out.append(merged_stroke)
+                merged_strokes += len(run_paths) - 1
+        i = j
+
+    return out, merged_fills, merged_strokes
+
+
+# Gradient strip detection.  Runs shorter than MIN_STRIP_RUN are left alone.
+# Strips must be at most MAX_STRIP_WIDTH device units wide and advance by a
+# near-constant width, and their colors must change by a near-constant step
+# of at most MAX_STRIP_STEP per component.  Bar charts, color swatches and
+# tables of similar colors fail one of these; gradients pass all of them.
+MIN_STRIP_RUN = 8
+MAX_STRIP_WIDTH = 4.0
+MAX_STRIP_STEP = 4.0 / 255
+_STRIP_TOL = 0.05        # device units, band and edge alignment
+_STRIP_GAP = 0.5         # device units, largest gap between adjacent strips
+_STRIP_WIDTH_TOL = 0.1   # relative variation allowed in strip advance
+_STEP_TOL = 1.5 / 255    # variation allowed in the per-strip color step
+_STOP_TOL = 0.5 / 255    # color error allowed when dropping gradient stops
+
+
+def _rect_corners(path: ps.Path) -> tuple | None:
+    """
+    Return the four corners of a path that is a single filled rectangle.
+
+    Accepts the moveto/lineto x3 shape produced by rectfill and rectangle
+    paths, optionally returning to the start point and/or closed.  The
+    rectangle may be rotated.
+
+    Returns:
+        ((x0, y0), (x1, y1), (x2, y2), (x3, y3)) or None
+    """
+    if len(path) != 1:
+        return None
+    subpath = path[0]
+    n = len(subpath)
+    if n and subpath[-1].SEG_TYPE == ps.SEG_CLOSEPATH:
+        n -= 1
+    if n not in (4, 5) or subpath[0].SEG_TYPE != ps.SEG_MOVETO:
+        return None
+    if n == 5:
+        if subpath[4].SEG_TYPE != ps.SEG_LINETO:
+            return None
+        p0 = subpath[0].p
+        p4 = subpath[4].p
+        if abs(p4.x - p0.x) > 1e-6 or abs(p4.y - p0.y) > 1e-6:
+            return None
+    for k in (1, 2, 3):
+        if subpath[k].SEG_TYPE != ps.SEG_LINETO:
+            return None
+    pts = [(subpath[k].p.x, subpath[k].p.y) for k in range(4)]
+    (x0, y0), (x1, y1), (x2, y2), (x3, y3) = pts
+    e1x, e1y = x1 - x0, y1 - y0
+    e2x, e2y = x3 - x0, y3 - y0
+    len1 = math.hypot(e1x, e1y)
+    len2 = math.hypot(e2x, e2y)
+    if len1 < 1e-9 or len2 < 1e-9:
+        return None
+    # Parallelogram with a right angle
+    if abs(x0 + x2 - x1 - x3) > 1e-6 * (len1 + len2) or abs(y0 + y2 - y1 - y3) > 1e-6 * (len1 + len2):
+        return None
+    if abs(e1x * e2x + e1y * e2y) > 1e-3 * len1 * len2:
+        return None
+    return pts
+
+
+def _strip_extent(corners: tuple, ux: float, uy: float) -> tuple | None:
+    """
+    Project rectangle corners onto the (u, v) frame with v = u rotated by 90°.
+
+    Returns:
+        (u_min, u_max, v_min, v_max), or None if the rectangle's edges are
+        not aligned with the frame
+    """
+    us = [x * ux + y * uy for x, y in corners]
+    vs = [y * ux - x * uy for x, y in corners]
+    u_min, u_max, v_min, v_max = min(us), max(us), min(vs), max(vs)
+    (x0, y0), (x1, y1), _, (x3, y3) = corners
+    area = math.hypot(x1 - x0, y1 - y0) * math.hypot(x3 - x0, y3 - y0)
+    if abs((u_max - u_min) * (v_max - v_min) - area) > 1e-3 * area:
+        return None
+    return u_min, u_max, v_min, v_max
+
+
+def _strip_rgb(color: list) -> tuple | None:
+    """Return a strip's device color as an RGB tuple, or None if not gray/RGB."""
+    if len(color) == 3:
+        return (color[0], color[1], color[2])
+    if len(color) == 1:
+        return (color[0], color[0], color[0])
+    return None
+
+
+def _simplify_stops(stops: list) -> list:
+    """Drop gradient stops that lie on the line between their neighbors."""
+    if len(stops) <= 2:
+        return stops
+    kept = [stops[0]]
+    anchor = 0
+    k = 2
+    while k < len(stops):
+        t0, c0 = stops[anchor]
+        t1, c1 = stops[k]
+        span = t1 - t0
+        for m in range(anchor + 1, k):
+            tm, cm = stops[m]
+            f = (tm - t0) / span if span > 0 else 0.0
+            if any(abs(c0[ch] + (c1[ch] - c0[ch]) * f - cm[ch]) > _STOP_TOL for ch in range(3)):
+                anchor = k - 1
+                kept.append(stops[anchor])
+                break
+        k += 1
+    kept.append(stops[-1])
+    return kept
+
+
+def _strip_run_shading(strips: list, ux: float, uy: float) -> ps.AxialShadingFill:
+    """
+    Build an axial shading equivalent to a run of gradient strips.
+
+    The shading lives in a local frame whose x axis runs along the strips'
+    stepping direction, so rotated runs need no special handling: the CTM
+    maps the frame to device space and the bbox covers the strips' union.
+
+    Args:
+        strips: (u_min, u_max, v_min, v_max, rgb) per strip, in order
+        ux: Stepping direction (unit vector) x component
+        uy: Stepping direction (unit vector) y component
+    """
+    u_start = strips[0][0]
+    u_end = strips[-1][1]
+    v_min = strips[0][2]
+    v_max = strips[0][3]
+    length = u_end - u_start
+
+    # Each strip shows from its start up to where the next one begins
+    stops = []
+    for k, strip in enumerate(strips):
+        visible_end = strips[k + 1][0] if k + 1 < len(strips) else strip[1]
+        center = 0.5 * (strip[0] + visible_end)
+        stops.append(((center - u_start) / length, strip[4]))
+
+    # Frame origin: u = u_start, v = v_min.  v axis is u rotated by 90°.
+    vx, vy = -uy, ux
+    ox = u_start * ux + v_min * vx
+    oy = u_start * uy + v_min * vy
+    return ps.AxialShadingFill(
+        0.0, 0.0, length, 0.0, _simplify_stops(stops), True, True,
+        (ux, uy, vx, vy, ox, oy), (0.0, 0.0, length, v_max - v_min))
+
+
+def replace_gradient_strips(display_list: list) -> tuple[list, int, int]:
+    """
+    Replace runs of stepped-color strips with axial shadings.
+
+    Applications such as Illustrator draw smooth shading as hundreds of thin
+    rectangles, each filled with a slightly different color.  A run is at
+    least MIN_STRIP_RUN consecutive Path+Fill pairs whose paths are
+    rectangles covering the same band, stepping in one direction
+    (axis-aligned or rotated) by a uniform width of a few device units
+    without gaps, and whose colors change monotonically by a near-constant
+    small step.  Each run becomes one AxialShadingFill with a color stop per
+    strip (collinear stops are dropped).
+
+    Strips may overlap as long as each one ends no earlier than the one
+    before it; the colors used are those left visible by later strips.
+
+    Args:
+        display_list: Display list to optimize (not modified)
+
+    Returns:
+        (elements, runs, strips) where elements is the optimized list, runs
+        the number of shadings created and strips the Path+Fill pairs they
+        replaced
+    """
+    runs = 0
+    replaced = 0
+    out = []
+    n_items = len(display_list)
+    i = 0
+    while i < n_items:
+        corners = None
+        item = display_list[i]
+        if (item.DL_TYPE == ps.DL_PATH and i + 3 < n_items and
+                display_list[i + 1].DL_TYPE == ps.DL_FILL):
+            corners = _rect_corners(item)
+        if corners is None:
+            out.append(item)
+            i += 1
+            continue
+
+        run_end = _scan_strip_run(display_list, i, corners)
+        if run_end is None:
+            out.append(item)
+            out.append(display_list[i + 1])
+            i += 2
+            continue
+
+        shading, j = run_end
+        out.append(shading)
+        runs += 1
+        replaced += (j - i) // 2
+        i = j
+
+    return out, runs, replaced
+
+
+def _scan_strip_run(display_list: list, start: int, corners: tuple) -> tuple | None:
+    """
+    Collect the gradient strip run beginning at display_list[start].
+
+    Returns:
+        (shading, end_index) if a run of at least MIN_STRIP_RUN strips was
+        found, else None
+    """
+    rgb = _strip_rgb(display_list[start + 1].color)
+    nxt = display_list[start + 2]
+    if rgb is None or nxt.DL_TYPE != ps.DL_PATH or display_list[start + 3].DL_TYPE != ps.DL_FILL:
+        return None
+    corners2 = _rect_corners(nxt)
+    if corners2 is None:
+        return None
+
+    # The stepping direction is whichever rectangle edge the centers move along
+    cx1 = sum(p[0] for p in corners) * 0.25
+    cy1 = sum(p[1] for p in corners) * 0.25
+    dx = sum(p[0] for p in corners2) * 0.25 - cx1
+    dy = sum(p[1] for p in corners2) * 0.25 - cy1
+    (x0, y0), (x1, y1), _, (x3, y3) = corners
+    best = None
+    for ex, ey in ((x1 - x0, y1 - y0), (x3 - x0, y3 - y0)):
+        elen = math.hypot(ex, ey)
+        proj = (dx * ex + dy * ey) / elen
+        if best is None or abs(proj) > abs(best[0]):
+            best = (proj, ex / elen, ey / elen)
+    proj, ux, uy = best
+    if abs(proj) < _STRIP_TOL:
+        return None
+    if proj < 0:
+        ux, uy = -ux, -uy
+
+    extent = _strip_extent(corners, ux, uy)
+    if extent is None:
+        return None
+    strips = [extent + (rgb,)]
+    direction = [0, 0, 0]
+    advance0 = None
+    step0 = None
+    j = start + 2
+    n_items = len(display_list)
+    while j + 1 < n_items:
+        path = display_list[j]
+        fill = display_list[j + 1]
+        if path.DL_TYPE != ps.DL_PATH or fill.DL_TYPE != ps.DL_FILL:
+            break
+        corners = _rect_corners(path)
+        rgb = _strip_rgb(fill.color)
+        if corners is None or rgb is None:
+            break
+        extent = _strip_extent(corners, ux, uy)
+        if extent is None:
+            break
+        prev = strips[-1]
+        u_min, u_max, v_min, v_max = extent
+        # Same band, advancing start, no gap, never ending before the previous strip
+        if (abs(v_min - prev[2]) > _STRIP_TOL or abs(v_max - prev[3]) > _STRIP_TOL or
+                u_min <= prev[0] + _STRIP_TOL or u_min > prev[1] + _STRIP_GAP or
+                u_max < prev[1] - _STRIP_TOL):
+            break
+        # Thin strips advancing by a uniform width
+        advance = u_min - prev[0]
+        if advance > MAX_STRIP_WIDTH:
+            break
+        if advance0 is None:
+            advance0 = advance
+        elif abs(advance - advance0) > _STRIP_WIDTH_TOL * advance0 + _STRIP_TOL:
+            break
+        # Small, monotonic color steps of near-constant size
+        prev_rgb = prev[4]
+        steps = (rgb[0] - prev_rgb[0], rgb[1] - prev_rgb[1], rgb[2] - prev_rgb[2])
+        if step0 is None:
+            step0 = steps
+        ok = True
+        for ch in range(3):
+            step = steps[ch]
+            if abs(step) > MAX_STRIP_STEP or abs(step - step0[ch]) > _STEP_TOL:
+                ok = False
+                break
+            if abs(step) > 1e-9:
+                sign = 1 if step > 0 else -1
+                if direction[ch] == 0:
+                    direction[ch] = sign
+                elif direction[ch] != sign:
+                    ok = False
+                    break
+        if not ok:
+            break
+        strips.append(extent + (rgb,))
+        j += 2
+
+    # The last strip is shown in full, so it must be as thin as the others
+    if len(strips) > 1:
+        last = strips[-1]
+        if last[1] - last[0] > advance0 * (1 + _STRIP_WIDTH_TOL) + _STRIP_TOL:
+            strips.pop()
+            j -= 2
+    if len(strips) < MIN_STRIP_RUN or strips[-1][4] == strips[0][4]:
+        return None
+    return _strip_run_shading(strips, ux, uy), j
+
+
 class DisplayListBuilder:
     """
     Manages display list generation with automatic clipping path optimization.
@@ -58,6 +593,15 @@ class DisplayListBuilder:
         if b".NullDevice" in ctxt.gstate.page_device:
             return
 
+        # Record device-space bounds for renderer clip culling.  A Stroke
+        # always follows the Path it paints.
+        if isinstance(graphics_element, ps.Path):
+            graphics_element.device_bbox = path_device_bbox(graphics_element)
+        elif isinstance(graphics_element, ps.Stroke):
+            if ctxt.display_list and isinstance(ctxt.display_list[-1], ps.Path):
+                graphics_element.device_bbox = stroke_device_bbox(
+                    ctxt.display_list[-1].device_bbox, graphics_element)
+
         # Add the actual graphics operation directly to context's current display list
         # Note: ClipElements are now created directly by clipping operators (clip, eoclip, initclip)
         # so we don't need to create them here
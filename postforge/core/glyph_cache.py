@@ -275,35 +275,11 @@ class GlyphBitmapCache:
         return len(self._cache)
 
 
-def make_cache_key(font_dict: Any, char_selector: bytes, ctm: Any, color: list[float], position_y: float = 0.0) -> GlyphCacheKey:
-    """Create cache key from font, character, transformation, color, and sub-pixel Y.
-
-    The cache key captures everything that affects glyph appearance:
-    - font identity: FontName (+ FID when available) uniquely identifies the font
-    - char_selector: Different characters produce different glyphs
-    - CTM scale/rotation: Different scales/rotations produce different paths
-    - color: Different colors produce different output (for imagemask glyphs)
-    - font_matrix: Different font sizes from scalefont
-    - subpixel_y: Sub-pixel Y offset (0.0 or 0.5) - Cairo's antialiasing produces
-      different ink extents at different sub-pixel positions
-
-    Translation (tx, ty) is intentionally excluded because the same glyph
-    drawn at different positions should use the same cached data. However,
-    sub-pixel Y is included because it affects antialiasing and ink extents.
+def font_identity(font_dict: Any) -> object:
+    """Return the stable identity of a font, the font_id of its cache keys.
 
-    FontName is used instead of id() because id() values can be reused after
-    garbage collection, causing cache collisions between different fonts.
-    FID disambiguates fonts that are redefined with the same name.
-
-    Args:
-        font_dict: PostScript font dictionary object
-        char_selector: Glyph name or character code as bytes
-        ctm: Current Transformation Matrix (Array with 6 numeric elements)
-        color: Current color as list of floats
-        position_y: Y position in device space (used for sub-pixel quantization)
-
-    Returns:
-        GlyphCacheKey suitable for cache lookup
+    FontName bytes, or a (FontName, FID) tuple for fonts with an FID.
+    Fonts without FontName fall back to id() of an internal structure.
     """
     # Use a stable font identifier that survives scalefont, font copies,
     # and garbage collection.  Previous code used id() of internal objects
@@ -346,6 +322,41 @@ def make_cache_key(font_dict: Any, char_selector: bytes, ctm: Any, color: list[f
         else:
             font_id = id(font_dict)
 
+    return font_id
+
+
+def make_cache_key(font_dict: Any, char_selector: bytes, ctm: Any, color: list[float], position_y: float = 0.0) -> GlyphCacheKey:
+    """Create cache key from font, character, transformation, color, and sub-pixel Y.
+
+    The cache key captures everything that affects glyph appearance:
+    - font identity: FontName (+ FID when available) uniquely identifies the font
+    - char_selector: Different characters produce different glyphs
+    - CTM scale/rotation: Different scales/rotations produce different paths
+    - color: Different colors produce different output (for imagemask glyphs)
+    - font_matrix: Different font sizes from scalefont
+    - subpixel_y: Sub-pixel Y offset (0.0 or 0.5) - Cairo's antialiasing produces
+      different ink extents at different sub-pixel positions
+
+    Translation (tx, ty) is intentionally excluded because the same glyph
+    drawn at different positions should use the same cached data. However,
+    sub-pixel Y is included because it affects antialiasing and ink extents.
+
+    FontName is used instead of id() because id() values can be reused after
+    garbage collection, causing cache collisions between different fonts.
+    FID disambiguates fonts that are redefined with the same name.
+
+    Args:
+        font_dict: PostScript font dictionary object
+        char_selector: Glyph name or character code as bytes
+        ctm: Current Transformation Matrix (Array with 6 numeric elements)
+        color: Current color as list of floats
+        position_y: Y position in device space (used for sub-pixel quantization)
+
+    Returns:
+        GlyphCacheKey suitable for cache lookup
+    """
+    font_id = font_identity(font_dict)
+
     # Extract and quantize scale/rotation components (ignore translation)
     # ctm.val is a list of PostScript numeric objects
     # Translation is handled at render time, so exclude tx (ctm[4]) and ty (ctm[5])
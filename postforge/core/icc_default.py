@@ -183,9 +183,9 @@ def _ensure_initialized() -> None:
         except Exception:
             return
 
-    # Verify we can build the transform
-    transform = icc_profile.get_transform(profile_hash, 4)
-    if transform is None:
+    # Verify we can convert colors; a persisted device link avoids
+    # building the transform until an image needs it
+    if icc_profile.get_device_link(profile_hash, 4) is None:
         return
 
     _default_cmyk_hash = profile_hash
@@ -18,12 +18,26 @@ Apply ICC transforms at render time via the functions in this module.
 Stream identity approach: Maintain id(stream_obj) → profile_hash mapping so that
 the same stream object in gstate.color_space or shading dictionaries resolves to
 the same cached profile.
+
+Device links: single gray and CMYK colors are converted through a device
+link, the profile → sRGB transform sampled on a grid in one batch and
+interpolated.  Device links are saved in a cache directory keyed by profile
+hash, so later runs load them instead of building the transform.  RGB
+profiles keep converting through the transform, since their gamut clipping
+does not interpolate well and matrix/TRC transforms are cheap to build.
+Images are converted with the transform itself, split into row tiles on the
+shared worker pool when they are large.
 """
 
 import hashlib
 import io
+import os
 from typing import Any
 
+import numpy as np
+
+from ..utils import worker_pool
+
 try:
     from PIL import ImageCms, Image
     _IMAGECMS_AVAILABLE = True
@@ -46,6 +60,22 @@ _COLOR_CACHE_MAX = 4096
 # PIL mode mapping by number of components
 _N_TO_PIL_MODE = {1: 'L', 3: 'RGB', 4: 'CMYK'}
 
+# Device link grid points per input, by number of components.  The grid
+# steps (1 and 15 levels) divide 255, so 8-bit values on grid points,
+# including 0 and 255, convert exactly; gray device links are exact.
+_DEVICE_LINK_GRID = {1: 256, 4: 18}
+_DEVICE_LINK_VERSION = 1
+
+# Device link cache: (profile_hash, n_components) → _DeviceLink
+_device_links = {}
+
+# Directory device links are persisted in, or None to keep them in memory
+_device_link_dir = os.path.join(os.path.expanduser("~"), ".cache", "postforge", "icc")
+
+# Images of at least twice this many pixels are converted in row tiles of
+# about this many pixels when worker threads are available
+_TILE_PIXELS = 1 << 18
+
 
 def is_available() -> bool:
     """Return True if Pillow ImageCms (lcms2) is available."""
@@ -204,7 +234,9 @@ def get_transform(profile_hash: bytes, n_components: int) -> Any:
 def icc_convert_color(profile_hash: bytes, n_components: int, components: list[float]) -> tuple[float, float, float] | None:
     """Convert a single color from ICC profile space to sRGB.
 
-    Uses a 1×1 Pillow image for the transform, with LRU color cache.
+    Gray and CMYK colors interpolate the profile's device link; RGB colors
+    use a 1×1 Pillow image for the transform.  Results go in an LRU color
+    cache.
 
     Args:
         profile_hash: SHA-256 hash of the ICC profile bytes
@@ -225,6 +257,30 @@ def icc_convert_color(profile_hash: bytes, n_components: int, components: list[f
     if cached is not None:
         return cached
 
+    if n_components in _DEVICE_LINK_GRID:
+        device_link = get_device_link(profile_hash, n_components)
+        if device_link is None or len(quantized) != n_components:
+            return None
+        result = device_link.convert(quantized)
+    else:
+        result = _transform_color(profile_hash, n_components, quantized)
+        if result is None:
+            return None
+
+    # Cache with eviction
+    if len(_color_cache) >= _COLOR_CACHE_MAX:
+        # Evict oldest quarter
+        keys = list(_color_cache.keys())
+        for k in keys[:_COLOR_CACHE_MAX // 4]:
+            del _color_cache[k]
+
+    _color_cache[cache_key] = result
+    return result
+
+
+def _transform_color(profile_hash: bytes, n_components: int,
+                     quantized: tuple[int, ...]) -> tuple[float, float, float] | None:
+    """Convert one 8-bit color through the transform itself."""
     transform = get_transform(profile_hash, n_components)
     if transform is None:
         return None
@@ -240,19 +296,165 @@ def icc_convert_color(profile_hash: bytes, n_components: int, components: list[f
         # Cannot use inPlace when input/output modes differ (e.g. CMYK→RGB)
         out = ImageCms.applyTransform(img, transform)
         r_byte, g_byte, b_byte = out.getpixel((0, 0))[:3]
-        result = (r_byte / 255.0, g_byte / 255.0, b_byte / 255.0)
+        return (r_byte / 255.0, g_byte / 255.0, b_byte / 255.0)
+    except Exception:
+        return None
 
-        # Cache with eviction
-        if len(_color_cache) >= _COLOR_CACHE_MAX:
-            # Evict oldest quarter
-            keys = list(_color_cache.keys())
-            for k in keys[:_COLOR_CACHE_MAX // 4]:
-                del _color_cache[k]
 
-        _color_cache[cache_key] = result
-        return result
+class _DeviceLink:
+    """A profile → sRGB transform sampled on a grid of 8-bit colors.
+
+    Gray device links have a point for every level.  CMYK device links are
+    interpolated tetrahedrally in C, M and Y (as LittleCMS does) and
+    linearly in K.
+    """
+
+    def __init__(self, n_components: int, size: int, samples: np.ndarray) -> None:
+        self.n_components = n_components
+        self.size = size
+        self.step = 255 // (size - 1)
+        # Flat r, g, b floats per grid point, first component varying fastest
+        self.values = (samples.reshape(-1) / 255.0).tolist()
+
+    def convert(self, quantized: tuple[int, ...]) -> tuple[float, float, float]:
+        """Return the sRGB color of an 8-bit gray or CMYK color."""
+        values = self.values
+        if self.n_components == 1:
+            base = quantized[0] * 3
+            return (values[base], values[base + 1], values[base + 2])
+
+        step = self.step
+        last = self.size - 2
+        base = 0
+        stride = 3
+        axes = []
+        for q in quantized:
+            i = min(q // step, last)
+            base += i * stride
+            axes.append(((q - i * step) / step, stride))
+            stride *= self.size
+        fk, k_stride = axes.pop()
+        axes.sort(reverse=True)
+        (f1, s1), (f2, s2), (f3, s3) = axes
+        o1 = s1
+        o2 = o1 + s2
+        o3 = o2 + s3
+        w0 = 1.0 - f1
+        w1 = f1 - f2
+        w2 = f2 - f3
+
+        result = []
+        for j in range(3):
+            b = base + j
+            low = values[b] * w0 + values[b + o1] * w1 + values[b + o2] * w2 + values[b + o3] * f3
+            if fk:
+                b += k_stride
+                high = values[b] * w0 + values[b + o1] * w1 + values[b + o2] * w2 + values[b + o3] * f3
+                low += (high - low) * fk
+            result.append(low)
+        return (result[0], result[1], result[2])
+
+
+def set_device_link_dir(path: str | None) -> None:
+    """Set the directory device links are persisted in; None disables persistence."""
+    global _device_link_dir
+    _device_link_dir = path
+
+
+def get_device_link(profile_hash: bytes, n_components: int) -> _DeviceLink | None:
+    """Get the device link of a gray or CMYK profile, loading or building it on first use.
+
+    Args:
+        profile_hash: SHA-256 hash of the ICC profile bytes
+        n_components: Number of input components (1 or 4)
+
+    Returns:
+        The device link, or None on failure or for other component counts
+    """
+    key = (profile_hash, n_components)
+    device_link = _device_links.get(key)
+    if device_link is not None:
+        return device_link
+
+    size = _DEVICE_LINK_GRID.get(n_components)
+    if size is None:
+        return None
+
+    path = None
+    if _device_link_dir is not None:
+        path = os.path.join(_device_link_dir,
+                            f"{profile_hash.hex()}-{n_components}-v{_DEVICE_LINK_VERSION}.npy")
+    samples = _load_device_link(path, size ** n_components)
+    if samples is None:
+        samples = _build_device_link(profile_hash, n_components, size)
+        if samples is None:
+            return None
+        _save_device_link(path, samples)
+
+    device_link = _DeviceLink(n_components, size, samples)
+    _device_links[key] = device_link
+    return device_link
+
+
+def _build_device_link(profile_hash: bytes, n_components: int, size: int) -> np.ndarray | None:
+    """Convert every device link grid point in one transform call.
+
+    Returns an (size ** n_components, 3) uint8 array with the first
+    component varying fastest, or None on failure.
+    """
+    transform = get_transform(profile_hash, n_components)
+    if transform is None:
+        return None
+
+    count = size ** n_components
+    index = np.arange(count)
+    grid = np.empty((count, n_components), dtype=np.uint8)
+    step = 255 // (size - 1)
+    for i in range(n_components):
+        grid[:, i] = (index // size ** i) % size * step
+
+    try:
+        img = Image.frombytes(_N_TO_PIL_MODE[n_components], (count, 1), grid.tobytes())
+        rgb = ImageCms.applyTransform(img, transform)
+        return np.frombuffer(rgb.tobytes(), dtype=np.uint8).reshape(count, 3)
+    except Exception:
+        return None
+
+
+def _load_device_link(path: str | None, count: int) -> np.ndarray | None:
+    """Load a persisted device link, or None if missing, unreadable or the wrong shape.
+
+    Any failure to load (a truncated or empty file raises EOFError, a
+    damaged header ValueError or SyntaxError) counts as missing, so the
+    device link is rebuilt and the file replaced.
+    """
+    if path is None or not os.path.exists(path):
+        return None
+    try:
+        samples = np.load(path, allow_pickle=False)
     except Exception:
         return None
+    if samples.dtype != np.uint8 or samples.shape != (count, 3):
+        return None
+    return samples
+
+
+def _save_device_link(path: str | None, samples: np.ndarray) -> None:
+    """Persist a device link, ignoring failures (the cache is optional)."""
+    if path is None:
+        return
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            np.save(f, samples, allow_pickle=False)
+        os.replace(temp_path, path)
+    except (OSError, ValueError):
+        # Leave no partial file behind
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
 
 
 def icc_convert_image(profile_hash: bytes, n_components: int, sample_data: bytes,
@@ -301,16 +503,65 @@ def icc_convert_image(profile_hash: bytes, n_components: int, sample_data: bytes
             luts = _build_decode_lut(decode_array, n_components)
             raw = _apply_decode_luts(raw, luts, n_components)
 
-        img = Image.frombytes(in_mode, (width, height), raw)
-        # Cannot use inPlace when input/output modes differ (e.g. CMYK→RGB)
-        rgb_img = ImageCms.applyTransform(img, transform)
-        rgba_img = rgb_img.convert('RGBA')
-        rgba_bytes = rgba_img.tobytes('raw', 'BGRA')
-        return bytearray(rgba_bytes)
+        row_bytes = width * n_components
+        bands = _row_bands(width, height)
+        executor = worker_pool.get_executor() if len(bands) > 1 else None
+        if executor is None:
+            return bytearray(_convert_rows(raw, in_mode, width, height, transform))
+        futures = [executor.submit(_convert_rows, raw[y0 * row_bytes:y1 * row_bytes],
+                                   in_mode, width, y1 - y0, transform)
+                   for y0, y1 in bands]
+        return bytearray(b''.join(future.result() for future in futures))
     except Exception:
         return None
 
 
+def apply_transform(img: Any, transform: Any, out_mode: str) -> Any:
+    """Apply an ImageCms transform to a PIL image.
+
+    Large images are split into row tiles converted on the shared worker
+    pool; LittleCMS releases the GIL while it transforms.
+
+    Args:
+        img: PIL image in the transform's input mode
+        transform: ImageCms transform
+        out_mode: PIL mode of the transform's output
+
+    Returns:
+        The converted PIL image
+    """
+    width, height = img.size
+    bands = _row_bands(width, height)
+    executor = worker_pool.get_executor() if len(bands) > 1 else None
+    if executor is None:
+        return ImageCms.applyTransform(img, transform)
+    futures = [executor.submit(ImageCms.applyTransform, img.crop((0, y0, width, y1)), transform)
+               for y0, y1 in bands]
+    result = Image.new(out_mode, (width, height))
+    for (y0, _), future in zip(bands, futures):
+        result.paste(future.result(), (0, y0))
+    return result
+
+
+def _row_bands(width: int, height: int) -> list[tuple[int, int]]:
+    """Split image rows into (first, end) bands of about _TILE_PIXELS pixels.
+
+    Returns a single band for images under twice that size.
+    """
+    if width * height < 2 * _TILE_PIXELS:
+        return [(0, height)]
+    rows = max(1, _TILE_PIXELS // max(width, 1))
+    return [(y, min(y + rows, height)) for y in range(0, height, rows)]
+
+
+def _convert_rows(raw: bytes, in_mode: str, width: int, rows: int, transform: Any) -> bytes:
+    """Convert rows of 8-bit samples to Cairo BGRX bytes."""
+    img = Image.frombytes(in_mode, (width, rows), raw)
+    # Cannot use inPlace when input/output modes differ (e.g. CMYK→RGB)
+    rgb_img = ImageCms.applyTransform(img, transform)
+    return rgb_img.convert('RGBA').tobytes('raw', 'BGRA')
+
+
 def _is_identity_decode(decode_array: list[float] | None, n_components: int) -> bool:
     """Check if decode array is identity ([0 1] per component, or [0 1 0 1 ...] for CMYK)."""
     if not decode_array:
@@ -358,11 +609,14 @@ def _build_decode_lut(decode_array: list[float], n_components: int) -> list[byte
 
 def _apply_decode_luts(raw_data: bytes, luts: list[bytearray], n_components: int) -> bytes:
     """Apply per-component decode LUTs to interleaved sample data."""
-    result = bytearray(len(raw_data))
-    for i, b in enumerate(raw_data):
-        comp = i % n_components
-        result[i] = luts[comp][b]
-    return bytes(result)
+    samples = np.frombuffer(raw_data, dtype=np.uint8)
+    usable = len(samples) - len(samples) % n_components
+    table = np.array([list(lut) for lut in luts], dtype=np.uint8)
+    result = samples.copy()
+    pixels = result[:usable].reshape(-1, n_components)
+    for comp in range(n_components):
+        pixels[:, comp] = table[comp][pixels[:, comp]]
+    return result.tobytes()
 
 
 def clear_caches() -> None:
@@ -371,3 +625,4 @@ def clear_caches() -> None:
     _transform_cache.clear()
     _stream_to_hash.clear()
     _color_cache.clear()
+    _device_links.clear()
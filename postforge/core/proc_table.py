@@ -0,0 +1,264 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from __future__ import annotations
+
+"""
+Sampled Procedure Tables
+
+Procedures that map a few numbers to a few numbers and are called over and
+over — CIE Decode procedures and Separation/DeviceN tint transforms — are
+run once at each point of a regular grid over their domain and afterwards
+evaluated by multilinear interpolation, like a Type 0 sampled function
+(ps_function._eval_type0), instead of being interpreted on every call.
+
+GRID_SIZES gives the points per input; 1-input tables have 256 points so
+that 8-bit sample values land on grid points and are exact.  Procedures
+with more than MAX_INPUTS inputs are not sampled.
+
+Tables are cached by procedure content (content_key) plus the save level
+current when they were built.  Content rather than identity, because gsave
+deep-copies the color space and with it every procedure inside, and because
+a procedure changed in place with put, or put back by restore, must not find
+the table of what it held before.  restore calls discard_newer() so that a
+save level reused after a restore never finds tables built at the old one;
+other caches keyed the same way register with track() to be pruned along
+with the tables.
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable
+
+import numpy as np
+
+from . import types as ps
+
+# Grid points per input, by number of inputs
+GRID_SIZES = {1: 256, 2: 33, 3: 17, 4: 9}
+MAX_INPUTS = 4
+
+# (content_key(proc), save level, n_in, n_out, domain) → table, oldest first
+_TABLE_CACHE_MAX_ENTRIES = 256
+_table_cache = OrderedDict()
+
+# Caches whose keys are (content key, save level, ...), pruned by discard_newer()
+_tracked_caches = [_table_cache]
+
+
+def content_key(obj: object) -> object:
+    """
+    Return a hashable key that is equal for objects with equal contents.
+
+    Arrays and dictionaries are keyed by what they hold, recursively, so a
+    deep copy has the key of its original and a changed object a new one.
+    Objects without contents of their own (files, fonts, gstates) are keyed
+    by their creation stamp, or failing that their identity.
+    """
+    return _content_key(obj, set())
+
+
+def _content_key(obj: object, active: set) -> object:
+    type_ = getattr(obj, 'TYPE', None)
+    if type_ is None:
+        if isinstance(obj, (list, tuple)):
+            return tuple(_content_key(item, active) for item in obj)
+        if isinstance(obj, dict):
+            return tuple((key, _content_key(value, active)) for key, value in obj.items())
+        return obj if isinstance(obj, (bytes, str, int, float, bool, type(None))) else ('id', id(obj))
+    if type_ in (ps.T_INT, ps.T_REAL, ps.T_BOOL, ps.T_NAME, ps.T_OPERATOR):
+        return (type_, obj.attrib, obj.val)
+    if type_ in (ps.T_NULL, ps.T_MARK):
+        return (type_,)
+    if type_ == ps.T_STRING:
+        return (type_, obj.attrib, obj.byte_string())
+    if type_ in ps.ARRAY_TYPES or type_ == ps.T_DICT:
+        if id(obj.val) in active:
+            # A composite that contains itself
+            return (type_, 'cycle')
+        active.add(id(obj.val))
+        if type_ == ps.T_DICT:
+            contents = tuple((key, _content_key(value, active)) for key, value in obj.val.items())
+        else:
+            contents = tuple(_content_key(item, active)
+                             for item in obj.val[obj.start:obj.start + obj.length])
+        active.discard(id(obj.val))
+        return (type_, obj.attrib, contents)
+    return (type_, getattr(obj, 'created', None) or id(obj))
+
+
+def save_level(proc: ps.PSObject) -> int:
+    """Return the save level of the context that owns proc, or -1."""
+    ctxt_id = getattr(proc, 'ctxt_id', None)
+    if ctxt_id is None:
+        return -1
+    ctxt = ps.contexts[ctxt_id]
+    return ctxt.save_id if ctxt is not None else -1
+
+
+def grid_points(n_in: int) -> int:
+    """Return the number of points sampled for a table with n_in inputs."""
+    return GRID_SIZES[n_in] ** n_in
+
+
+def clear_cache() -> None:
+    """Drop all cached tables."""
+    _table_cache.clear()
+
+
+def track(cache: dict) -> None:
+    """Have discard_newer() prune cache, whose keys start (content key, save level)."""
+    _tracked_caches.append(cache)
+
+
+def discard_newer(level: int) -> None:
+    """Drop entries built above save level, after a restore to that level."""
+    for cache in _tracked_caches:
+        for key in [key for key in cache if key[1] > level]:
+            del cache[key]
+
+
+class ProcTable:
+    """A procedure sampled on a regular grid over its domain.
+
+    values holds n_out floats per grid point, with the first input varying
+    fastest (the Type 0 sample order).
+    """
+
+    def __init__(self, n_in: int, n_out: int, domain: tuple[float, ...],
+                 values: list[float]) -> None:
+        self.n_in = n_in
+        self.n_out = n_out
+        self.domain = domain
+        self.size = GRID_SIZES[n_in]
+        self.values = values
+
+    def evaluate(self, inputs: list[float]) -> list[float]:
+        """Interpolate the table at one point; inputs are clamped to the domain."""
+        last = self.size - 1
+        n_out = self.n_out
+        values = self.values
+        if self.n_in == 1:
+            lo, hi = self.domain
+            x = inputs[0]
+            t = (x - lo) / (hi - lo) * last if hi != lo else 0.0
+            t = 0.0 if t < 0.0 else last if t > last else t
+            i0 = min(int(t), last - 1)
+            frac = t - i0
+            base = i0 * n_out
+            return [values[base + j] + (values[base + n_out + j] - values[base + j]) * frac
+                    for j in range(n_out)]
+
+        lows = []
+        fracs = []
+        for i in range(self.n_in):
+            lo, hi = self.domain[2 * i], self.domain[2 * i + 1]
+            t = (inputs[i] - lo) / (hi - lo) * last if hi != lo else 0.0
+            t = 0.0 if t < 0.0 else last if t > last else t
+            i0 = min(int(t), last - 1)
+            lows.append(i0)
+            fracs.append(t - i0)
+
+        result = [0.0] * n_out
+        for corner in range(1 << self.n_in):
+            index = 0
+            stride = 1
+            weight = 1.0
+            for i in range(self.n_in):
+                if corner & (1 << i):
+                    index += (lows[i] + 1) * stride
+                    weight *= fracs[i]
+                else:
+                    index += lows[i] * stride
+                    weight *= 1.0 - fracs[i]
+                stride *= self.size
+            if weight:
+                base = index * n_out
+                for j in range(n_out):
+                    result[j] += weight * values[base + j]
+        return result
+
+    def evaluate_array(self, inputs: np.ndarray) -> np.ndarray:
+        """Interpolate the table at each row of an (N, n_in) array."""
+        last = self.size - 1
+        table = np.asarray(self.values, dtype=np.float64).reshape(-1, self.n_out)
+        lows = []
+        fracs = []
+        for i in range(self.n_in):
+            lo, hi = self.domain[2 * i], self.domain[2 * i + 1]
+            span = hi - lo if hi != lo else 1.0
+            t = np.clip((inputs[:, i] - lo) / span * last, 0.0, last)
+            i0 = np.minimum(t.astype(np.intp), last - 1)
+            lows.append(i0)
+            fracs.append(t - i0)
+
+        result = np.zeros((len(inputs), self.n_out))
+        for corner in range(1 << self.n_in):
+            index = np.zeros(len(inputs), dtype=np.intp)
+            weight = np.ones(len(inputs))
+            stride = 1
+            for i in range(self.n_in):
+                if corner & (1 << i):
+                    index += (lows[i] + 1) * stride
+                    weight *= fracs[i]
+                else:
+                    index += lows[i] * stride
+                    weight *= 1.0 - fracs[i]
+                stride *= self.size
+            result += table[index] * weight[:, None]
+        return result
+
+
+def _sample(run: Callable[[list[float]], list[float]], n_in: int, n_out: int,
+            domain: tuple[float, ...]) -> ProcTable:
+    size = GRID_SIZES[n_in]
+    axes = [[domain[2 * i] + (domain[2 * i + 1] - domain[2 * i]) * k / (size - 1)
+             for k in range(size)] for i in range(n_in)]
+    values = []
+    for index in range(size ** n_in):
+        point = []
+        for i in range(n_in):
+            point.append(axes[i][index % size])
+            index //= size
+        result = list(run(point))[:n_out]
+        values.extend(result + [0.0] * (n_out - len(result)))
+    return ProcTable(n_in, n_out, domain, values)
+
+
+def _cache_key(proc: ps.PSObject, n_in: int, n_out: int,
+               domain: tuple[float, ...] | None) -> tuple:
+    return (content_key(proc), save_level(proc), n_in, n_out, domain or (0.0, 1.0) * n_in)
+
+
+def lookup(proc: ps.PSObject, n_in: int, n_out: int,
+           domain: tuple[float, ...] | None = None) -> ProcTable | None:
+    """Return the cached table for proc, or None if it has not been sampled."""
+    return _table_cache.get(_cache_key(proc, n_in, n_out, domain))
+
+
+def get_table(proc: ps.PSObject, run: Callable[[list[float]], list[float]], n_in: int,
+              n_out: int, domain: tuple[float, ...] | None = None) -> ProcTable | None:
+    """
+    Return the table for proc, sampling it with run() on first use.
+
+    Args:
+        proc: the procedure; identifies the table together with the save level
+        run: runs the procedure on a list of n_in inputs, returning its outputs
+        n_in, n_out: number of inputs and outputs
+        domain: (lo, hi) per input, default [0, 1] for each
+
+    Returns:
+        The table, or None if proc has more than MAX_INPUTS inputs
+    """
+    if n_in < 1 or n_in > MAX_INPUTS:
+        return None
+    domain = domain or (0.0, 1.0) * n_in
+    key = _cache_key(proc, n_in, n_out, domain)
+    table = _table_cache.get(key)
+    if table is not None:
+        return table
+    table = _sample(run, n_in, n_out, domain)
+    _table_cache[key] = table
+    if len(_table_cache) > _TABLE_CACHE_MAX_ENTRIES:
+        _table_cache.popitem(last=False)
+    return table
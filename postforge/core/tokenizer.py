@@ -7,6 +7,7 @@ from __future__ import annotations
 import math
 
 from ..operators import dict as ps_dict
+from . import ascii_codecs
 from . import error as ps_error
 from . import types as ps
 from . import binary_token
@@ -99,60 +100,42 @@ escapes = {
 }
 
 
-def _decode_ascii85_group(values: list[int]) -> list[int]:
+def _read_ascii85_string(source: ps.File, ctxt: ps.Context) -> bytes | None:
     """
-    Decode ASCII85 5-tuple to binary bytes - PLRM algorithm for tokenizer.
+    Read and decode the rest of a <~...~> string after the opening <~.
 
-    This function implements the same ASCII85 decoding algorithm as the
-    ASCII85DecodeFilter but for use in the tokenizer where we decode
-    ASCII85 strings directly into the string buffer.
-
-    Args:
-        values (list): List of 2-5 ASCII85 digit values (0-84 range)
+    Disk files are read in chunks and the bytes after ~> are put back;
+    other sources are read a byte at a time up to the ~>.
 
     Returns:
-        list: List of decoded bytes (1-4 bytes depending on input length)
+        The decoded bytes, or None if the source ends before ~>.
 
     Raises:
-        ValueError: If the group is invalid (wrong length, impossible value)
+        ValueError: If the data is not valid ASCII85
     """
-    group_len = len(values)
-
-    # PLRM: Partial final group must have at least 2 characters
-    if group_len < 2 or group_len > 5:
-        raise ValueError(f"Invalid ASCII85 group length: {group_len} (need 2-5)")
-
-    # Pad to 5 values if needed (pad with 84 = 'u' - '!')
-    padded_values = values[:]
-    while len(padded_values) < 5:
-        padded_values.append(84)
-
-    # Convert base-85 to 32-bit integer: c1*85^4 + c2*85^3 + c3*85^2 + c4*85^1 + c5*85^0
-    value = 0
-    for digit in padded_values:
-        if digit < 0 or digit > 84:
-            raise ValueError(f"Invalid ASCII85 digit value: {digit} (must be 0-84)")
-        value = value * 85 + digit
-
-    # PLRM: Check for impossible combinations (value > 2^32-1)
-    if value > 0xFFFFFFFF:
-        raise ValueError(f"ASCII85 5-tuple value {value} exceeds 2^32-1 (impossible combination)")
-
-    # Convert to 4 bytes (big-endian: most significant byte first)
-    byte1 = (value >> 24) & 0xFF
-    byte2 = (value >> 16) & 0xFF
-    byte3 = (value >> 8) & 0xFF
-    byte4 = value & 0xFF
-
-    # Return appropriate number of bytes for partial groups
-    if group_len == 2:
-        return [byte1]  # 2 chars → 1 byte
-    elif group_len == 3:
-        return [byte1, byte2]  # 3 chars → 2 bytes
-    elif group_len == 4:
-        return [byte1, byte2, byte3]  # 4 chars → 3 bytes
-    else:
-        return [byte1, byte2, byte3, byte4]  # 5 chars → 4 bytes
+    decoder = ascii_codecs.A85Decoder(strict=True)
+    if type(source) in (ps.File, ps.Run) and source.is_real_file:
+        decoded = bytearray()
+        chunk_size = 256
+        while True:
+            chunk = source.read_bulk(ctxt, chunk_size)
+            if not chunk:
+                return None
+            data, end = decoder.decode(chunk)
+            decoded += data
+            if end >= 0:
+                source.putback(chunk[end:])
+                return bytes(decoded)
+            chunk_size = min(chunk_size * 2, 65536)
+
+    encoded = bytearray()
+    while True:
+        b = source.read(ctxt)
+        if b is None:
+            return None
+        encoded.append(b)
+        if b == GREATER_THAN and encoded[-2:-1] == b"~":
+            return decoder.decode(bytes(encoded))[0]
 
 
 def syntax_error(ctxt: ps.Context, source: ps.File, command: str) -> tuple[bool, int, str, None]:
@@ -432,83 +415,19 @@ def __token(ctxt: ps.Context, stack: list[ps.PSObject]) -> tuple[bool, int | Non
             if b == ord('~'):
                 # an ASCII85 string - decode it according to PLRM Section 3.2
                 offset = len(strings)
-                length = 0
-                ascii85_chars = []
-                group_chars = []
-
-                while True:
-                    b = source.read(ctxt)
-                    if b is None:
-                        return syntax_error(ctxt, source, "unbalanced <~")
-
-                    # Check for end of ASCII85 data '~>'
-                    if b == ord('~'):
-                        next_b = source.read(ctxt)
-                        if next_b == ord('>'):
-                            # End of ASCII85 string found
-
-                            # Handle any remaining partial group (at least 2 chars needed)
-                            if group_chars and len(group_chars) >= 2:
-                                try:
-                                    decoded_bytes = _decode_ascii85_group(group_chars)
-                                    strings.extend(decoded_bytes)
-                                    length += len(decoded_bytes)
-                                except (ValueError, OverflowError):
-                                    return syntax_error(ctxt, source, "invalid ASCII85 group")
-                            elif group_chars and len(group_chars) == 1:
-                                return syntax_error(ctxt, source, "invalid ASCII85 partial group")
-
-                            # Create and push the string object
-                            ctxt.o_stack.append(
-                                ps.String(
-                                    ctxt.id, offset, length, is_global=ctxt.vm_alloc_mode
-                                )
-                            )
-                            return TOKEN_SUCCESS(ctxt, stack)
-                        else:
-                            # Single '~' without '>' - treat as invalid character and ignore
-                            if next_b is not None:
-                                source.unread()
-                            continue
-
-                    # Handle special 'z' case (four zero bytes)
-                    if b == ord('z'):
-                        # If we have a partial group, process it first
-                        if group_chars:
-                            try:
-                                decoded_bytes = _decode_ascii85_group(group_chars)
-                                strings.extend(decoded_bytes)
-                                length += len(decoded_bytes)
-                                group_chars = []
-                            except (ValueError, OverflowError):
-                                return syntax_error(ctxt, source, "invalid ASCII85 group")
-
-                        # Add four zero bytes
-                        strings.extend([0, 0, 0, 0])
-                        length += 4
-                        continue
-
-                    # Check for valid ASCII85 character (!-u, 33-117)
-                    if ord('!') <= b <= ord('u'):
-                        group_chars.append(b - ord('!'))  # Convert to 0-84 range
-
-                        # Process complete 5-character group
-                        if len(group_chars) == 5:
-                            try:
-                                decoded_bytes = _decode_ascii85_group(group_chars)
-                                strings.extend(decoded_bytes)
-                                length += len(decoded_bytes)
-                                group_chars = []
-                            except (ValueError, OverflowError):
-                                return syntax_error(ctxt, source, "invalid ASCII85 group")
-
-                    # Ignore whitespace characters (space, tab, CR, LF, FF, null)
-                    elif b in [ord(' '), ord('\t'), ord('\r'), ord('\n'), ord('\f'), 0]:
-                        continue
-
-                    # Any other character is invalid for ASCII85
-                    else:
-                        return syntax_error(ctxt, source, "invalid character in ASCII85 string")
+                try:
+                    decoded = _read_ascii85_string(source, ctxt)
+                except ValueError:
+                    return syntax_error(ctxt, source, "invalid ASCII85 string")
+                if decoded is None:
+                    return syntax_error(ctxt, source, "unbalanced <~")
+                strings.extend(decoded)
+                ctxt.o_stack.append(
+                    ps.String(
+                        ctxt.id, offset, len(decoded), is_global=ctxt.vm_alloc_mode
+                    )
+                )
+                return TOKEN_SUCCESS(ctxt, stack)
             else:
                 # This is a hex string - handle it
                 # PLRM: "If a hexadecimal string contains characters outside
@@ -518,6 +437,34 @@ def __token(ctxt: ps.Context, stack: list[ps.PSObject]) -> tuple[bool, int | Non
                 length = 0
                 hex_bytes = bytearray(2)
                 byte_num = 0
+                if type(source) in (ps.File, ps.Run) and source.is_real_file:
+                    # Disk files: decode whole chunks and hand back what follows '>'
+                    decoder = ascii_codecs.HexDecoder(strict=True)
+                    chunk_size = 256
+                    while True:
+                        chunk = source.read_bulk(ctxt, chunk_size)
+                        if not chunk:
+                            return syntax_error(ctxt, source, "unbalanced <")
+                        try:
+                            decoded, end = decoder.decode(chunk)
+                        except ValueError:
+                            # Let the byte loop below find and report the bad character
+                            source.putback(chunk)
+                            if decoder.pending:
+                                hex_bytes[0] = decoder.pending[0]
+                                byte_num = 1
+                            break
+                        strings.extend(decoded)
+                        length += len(decoded)
+                        if end >= 0:
+                            source.putback(chunk[end:])
+                            ctxt.o_stack.append(
+                                ps.String(
+                                    ctxt.id, offset, length, is_global=ctxt.vm_alloc_mode
+                                )
+                            )
+                            return TOKEN_SUCCESS(ctxt, stack)
+                        chunk_size = min(chunk_size * 2, 65536)
                 while True:
                     b = source.read(ctxt)
                     if b is None:
@@ -0,0 +1,97 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from __future__ import annotations
+
+"""
+Type 1 Decryption
+
+eexec sections and CharStrings are encrypted with the same cipher and
+different initial keys (Adobe Type 1 Font Format, chapter 7):
+
+    plain[i] = cipher[i] XOR (R >> 8)
+    R = ((cipher[i] + R) * C1 + C2) & 0xFFFF
+
+The key recurrence is affine, R' = C1*R + B[i] with B[i] = C1*cipher[i] + C2,
+and C1 is odd so it has an inverse modulo 2^16.  That gives every key in
+closed form,
+
+    R[i] = C1^i * R0 + C1^(i-1) * sum(C1^-j * B[j] for j < i)
+
+which numpy evaluates with a cumulative product and a cumulative sum.
+uint64 arithmetic wraps modulo 2^64, a multiple of 2^16, so nothing needs
+reducing until the end.  Short inputs are decrypted by the byte loop,
+which is faster below NUMPY_MIN_BYTES.  The compiled loop in
+_type1_decrypt_cy is used instead of both when that extension is built.
+"""
+
+import numpy as np
+
+try:
+    from ._type1_decrypt_cy import decrypt as _decrypt_cy
+    _CYTHON_DECRYPT = True
+except ImportError:
+    _CYTHON_DECRYPT = False
+
+EEXEC_KEY = 55665
+CHARSTRING_KEY = 4330
+C1 = 52845
+C2 = 22719
+
+_C1_INVERSE = pow(C1, -1, 0x10000)
+
+# Inputs at least this long are decrypted with numpy
+NUMPY_MIN_BYTES = 128
+
+
+def _decrypt_py(data: bytes, key: int) -> tuple[bytes, int]:
+    plain = bytearray(len(data))
+    for i, cipher in enumerate(data):
+        plain[i] = cipher ^ (key >> 8)
+        key = ((cipher + key) * C1 + C2) & 0xFFFF
+    return bytes(plain), key
+
+
+def _decrypt_np(data: bytes, key: int) -> tuple[bytes, int]:
+    cipher = np.frombuffer(data, dtype=np.uint8)
+    n = len(cipher)
+    powers = np.empty(n + 1, dtype=np.uint64)
+    powers[0] = 1
+    powers[1:] = C1
+    np.cumprod(powers, out=powers)
+    inverse_powers = np.empty(n, dtype=np.uint64)
+    inverse_powers[0] = 1
+    inverse_powers[1:] = _C1_INVERSE
+    np.cumprod(inverse_powers, out=inverse_powers)
+
+    terms = cipher.astype(np.uint64) * np.uint64(C1) + np.uint64(C2)
+    terms *= inverse_powers
+    np.cumsum(terms, out=terms)
+
+    keys = np.empty(n + 1, dtype=np.uint64)
+    keys[0] = key
+    keys[1:] = powers[:n] * terms + powers[1:] * np.uint64(key)
+    keys &= np.uint64(0xFFFF)
+    plain = cipher ^ (keys[:n] >> np.uint64(8)).astype(np.uint8)
+    return plain.tobytes(), int(keys[n])
+
+
+def decrypt(data: bytes, key: int) -> tuple[bytes, int]:
+    """
+    Decrypt Type 1 encrypted bytes.
+
+    Args:
+        data: ciphertext
+        key: the key R before the first byte (EEXEC_KEY or CHARSTRING_KEY
+            at the start of a section)
+
+    Returns:
+        (plaintext, key after the last byte), so that a section can be
+        decrypted a block at a time
+    """
+    if _CYTHON_DECRYPT:
+        return _decrypt_cy(data, key)
+    if len(data) >= NUMPY_MIN_BYTES:
+        return _decrypt_np(data, key)
+    return _decrypt_py(data, key)
@@ -112,6 +112,10 @@ class Dict(PSObject):
         new_dict.name = self.name
         new_dict.max_length = self.max_length
         new_dict.created = self.created
+        # Pattern instances carry their makepattern data as an attribute
+        pattern_impl = self.__dict__.get('_pattern_impl')
+        if pattern_impl is not None:
+            new_dict._pattern_impl = pattern_impl
         return new_dict
 
     def __deepcopy__(self, memo: dict[int, object]) -> Dict:
@@ -96,6 +96,40 @@ LINE_JOIN_MITER = 0
 LINE_JOIN_ROUND = 1
 LINE_JOIN_BEVEL = 2
 
+# Display list element type tags (DL_TYPE class attribute on display list
+# elements).  Renderers index handler tables with these, so they must stay
+# dense and start at 0.
+DL_OTHER = 0              # Elements the renderer ignores (ErasePage, ShowPage)
+DL_PATH = 1
+DL_FILL = 2
+DL_STROKE = 3
+DL_PATTERN_FILL = 4
+DL_CLIP = 5
+DL_IMAGE = 6
+DL_IMAGEMASK = 7
+DL_COLORIMAGE = 8
+DL_TEXT = 9
+DL_GLYPH_REF = 10
+DL_GLYPH_START = 11
+DL_GLYPH_END = 12
+DL_ACTUAL_TEXT_START = 13
+DL_ACTUAL_TEXT_END = 14
+DL_AXIAL_SHADING = 15
+DL_RADIAL_SHADING = 16
+DL_FUNCTION_SHADING = 17
+DL_MESH_SHADING = 18
+DL_PATCH_SHADING = 19
+DL_FORM_START = 20
+DL_FORM_END = 21
+DL_TYPE_COUNT = 22
+
+# Path segment type tags (SEG_TYPE class attribute on subpath elements).
+# Values match Cairo's PATH_MOVE_TO .. PATH_CLOSE_PATH.
+SEG_MOVETO = 0
+SEG_LINETO = 1
+SEG_CURVETO = 2
+SEG_CLOSEPATH = 3
+
 # points per inch
 PPI = 72.0
 
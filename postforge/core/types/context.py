@@ -48,6 +48,7 @@ class GlobalResources:
         self.stderr_file = None                     # Shared stderr file across all contexts
         self._glyph_cache = None                    # Lazy-initialized glyph cache for Type 3 fonts
         self._glyph_bitmap_cache = None             # Lazy-initialized bitmap cache for glyph rendering
+        self._charstring_cache = None               # Lazy-initialized parsed Type 1 CharStrings
         self.glyph_cache_disabled = False           # Enabled by default
         self._system_params = None                  # Reference to system params dict (set by create_context)
         self._initialized = True
@@ -120,6 +121,20 @@ class GlobalResources:
             self._glyph_bitmap_cache = GlyphBitmapCache(max_bytes=max_bytes)
         return self._glyph_bitmap_cache
 
+    def get_charstring_cache(self) -> Any:
+        """Get or create the global cache of parsed Type 1 CharStrings and Subrs.
+
+        Shared across contexts like the glyph caches, since font definitions
+        are typically global.
+
+        Returns:
+            CharStringCache instance
+        """
+        if self._charstring_cache is None:
+            from ..charstring_interpreter import CharStringCache
+            self._charstring_cache = CharStringCache()
+        return self._charstring_cache
+
 
 class Context(object):
     """
@@ -174,6 +189,7 @@ class Context(object):
         self.cow_snapshots = {}          # save_id -> dict mapping created -> backing_store reference
 
         self.display_list = None
+        self.device_color_cache = None                      # Lazily created by color_space.get_device_color_cache()
 
         # Execution history for debugging - zero overhead when disabled via function pointer pattern
         self.execution_history = collections.deque(maxlen=20)         # Circular buffer of (input_obj, resolved_obj) tuples
@@ -14,6 +14,7 @@ standard file operations and specialized PostScript file types.
 
 import sys
 import io
+import re
 import errno
 import threading
 import time
@@ -33,6 +34,10 @@ from .constants import (
 # Import primitive types and context infrastructure (for file operations)
 from .primitive import Bool, Int
 from .context import Context, contexts, global_resources
+from .. import type1_decrypt
+
+# Ends the ASCII hex form of an eexec section
+_EEXEC_NOT_HEX = re.compile(rb"[^0-9A-Fa-f \t\r\n]")
 
 
 # Forward reference to String class (will be in composite.py)
@@ -64,6 +69,7 @@ class File(Stream):
         self._putback_buf = bytearray()  # Buffer for bytes pushed back by filter chains
         self._putback_pos = 0
         self._last_read_from_putback = None  # Track last byte read from putback for unread()
+        self._last_bulk_read = None  # (file position after, bytes from handle) of last read_bulk
 
         if self.name == "%statementedit":
             self.is_global = True
@@ -271,6 +277,7 @@ class File(Stream):
                 data = self.val.read(remaining)
                 if data:
                     result.extend(data)
+                    self._last_bulk_read = (self.val.tell(), len(data))
                 return bytes(result)
             except OSError:
                 return bytes(result)
@@ -318,7 +325,21 @@ class File(Stream):
         Used by filter chains (e.g. ASCII85Decode) that read past their
         end-of-data marker and need to return unconsumed bytes to the
         underlying file so subsequent reads (by the tokenizer) find them.
+
+        When the bytes are the tail of the last read_bulk from a disk file,
+        the file position is moved back instead, so every copy of this File
+        (which share the file handle but not the putback buffer) sees them.
         """
+        if data and self.is_real_file and self._last_bulk_read is not None:
+            end, from_handle = self._last_bulk_read
+            self._last_bulk_read = None
+            try:
+                if self.val is not None and self.val.tell() == end:
+                    rewind = min(len(data), from_handle)
+                    self.val.seek(-rewind, 1)
+                    data = data[:len(data) - rewind]
+            except (OSError, ValueError):
+                pass
         if data:
             # Compact existing buffer
             if self._putback_pos > 0:
@@ -346,7 +367,7 @@ class File(Stream):
     _ALL_ATTRS = ('val', 'access', 'attrib', 'is_composite', 'is_global',
                   'line_num', 'name', 'mode', 'created', 'ctxt_id', 'is_real_file',
                   'ps_section_end', '_putback_buf', '_putback_pos',
-                  '_last_read_from_putback')
+                  '_last_read_from_putback', '_last_bulk_read')
 
     def __copy__(self) -> File:
         # Custom copy method for regular copying (dup, etc.)
@@ -367,6 +388,7 @@ class File(Stream):
         new_file._putback_buf = bytearray()
         new_file._putback_pos = 0
         new_file._last_read_from_putback = None
+        new_file._last_bulk_read = None
         return new_file
 
     def __getstate__(self) -> dict[str, object]:
@@ -655,6 +677,7 @@ class StandardFile(File):
         new_file._putback_buf = bytearray()
         new_file._putback_pos = 0
         new_file._last_read_from_putback = None
+        new_file._last_bulk_read = None
         return new_file
 
     def __getstate__(self) -> dict[str, object]:
@@ -709,8 +732,17 @@ class EexecDecryptionFilter(File):
     - Random bytes to skip n = 4
     - Constants: c1 = 52845, c2 = 22719
     - Decryption: plain = cipher ^ (R >> 8); R = (cipher + R) * c1 + c2
+
+    Disk files and strings are read and decrypted BLOCK_SIZE bytes at a
+    time (core/type1_decrypt.py); R is the key for the next block.  The
+    source bytes of the current block that were not read through the
+    filter are put back on the source when the filter is closed, so that
+    the interpreter continues right after the encrypted section.  Other
+    sources are read one byte at a time.
     """
-    
+
+    BLOCK_SIZE = 4096
+
     def __init__(
         self,
         ctxt_id: int,
@@ -729,159 +761,142 @@ class EexecDecryptionFilter(File):
         self.ctxt = ctxt
         
         # Adobe eexec encryption constants
-        self.R = 55665  # Initial encryption key
-        self.c1 = 52845  # Constant 1
-        self.c2 = 22719  # Constant 2
+        self.R = type1_decrypt.EEXEC_KEY  # Key for the next block
         self.random_bytes_to_skip = 4  # Number of random bytes at start
-        
+
+        # String sources are always binary; files are checked on first read
+        self.is_string_source = getattr(source_file, '_is_string_source', False)
+        self.block_size = (self.BLOCK_SIZE if self.is_string_source or
+                           (type(source_file) in (File, Run) and source_file.is_real_file) else 1)
+
         # State tracking
-        self.bytes_read = 0
+        self.bytes_read = 0  # Cipher bytes decrypted so far
         self.is_ascii_hex = None  # Will be determined on first read
-        self.hex_buffer = ""  # For ASCII hex parsing
+        self.hex_digit = b""  # Odd hex digit left over from the last block
+        self.source_done = False
         self.is_closed = False
         self.systemdict_pushed = False
-        self.format_determined = False
-        
-        # Unread support - buffer the last decrypted byte
-        self.last_decrypted_byte = None
-        self.has_unread_byte = False
-        
-    
-    def _determine_format_from_first_bytes(self) -> None:
-        """
-        Determine format by reading first few bytes and buffering them.
-        
-        For string sources: Always binary (strings contain the encrypted data directly)
-        For file sources: Detect ASCII hex vs binary based on content
-        """
-        self.first_bytes_buffer = []
-        
-        # String sources are always binary encrypted data
-        if hasattr(self.source_file, '_is_string_source') and self.source_file._is_string_source:
-            self.is_ascii_hex = False  # String content is binary encrypted data
-            self.format_determined = True
-            self.buffer_index = 0
-            return
-        
-        # For files, read first 8 bytes to determine format
-        for i in range(8):
+
+        # Current block: decrypted bytes, read position, and the source bytes
+        # it came from (for putback); block_hex_digit is the odd digit carried
+        # into it from the block before
+        self.plain = b""
+        self.plain_pos = 0
+        self.block_start = 0
+        self.raw_block = b""
+        self.block_hex_digit = b""
+
+    def _read_raw(self, count: int) -> bytes:
+        """Read up to count bytes from the source."""
+        if self.block_size > 1:
+            return self.source_file.read_bulk(self.ctxt, count)
+        data = bytearray()
+        for _ in range(count):
             byte = self.source_file.read(self.ctxt)
             if byte is None:
                 break
-            self.first_bytes_buffer.append(byte)
-        
-        if not self.first_bytes_buffer:
-            self.is_ascii_hex = True  # Default to hex for empty files
-            self.format_determined = True
-            self.buffer_index = 0
-            return
-        
-        # Check if all bytes are valid hex characters or whitespace
-        all_hex = True
-        for byte in self.first_bytes_buffer:
-            char = chr(byte) if isinstance(byte, int) else byte
-            if not (char.isdigit() or char.upper() in 'ABCDEF' or char in ' \t\r\n'):
-                all_hex = False
+            data.append(byte)
+        return bytes(data)
+
+    def _fill(self) -> bool:
+        """Decrypt the next block; False at the end of the encrypted data."""
+        while not self.source_done:
+            if self.is_ascii_hex is None:
+                # Format is determined from the first 8 bytes: ASCII hex if
+                # they are all hex digits or whitespace
+                raw = self._read_raw(max(8, self.block_size))
+                self.is_ascii_hex = not self.is_string_source and _EEXEC_NOT_HEX.search(raw[:8]) is None
+            else:
+                raw = self._read_raw(self.block_size)
+            if not raw:
+                self.source_done = True
                 break
-        
-        self.is_ascii_hex = all_hex
-        self.format_determined = True
-        self.buffer_index = 0  # Track position in buffered bytes
-    
-    def _read_raw_byte(self) -> int | None:
-        """Read one raw byte, using buffer first if available."""
-        # Use buffered bytes first
-        if hasattr(self, 'first_bytes_buffer') and self.buffer_index < len(self.first_bytes_buffer):
-            byte = self.first_bytes_buffer[self.buffer_index]
-            self.buffer_index += 1
-            return byte
-        
-        # Read from source file
-        return self.source_file.read(self.ctxt)
-    
-    def _read_hex_byte(self) -> int | None:
-        """Read a single byte from ASCII hexadecimal format."""
-        while len(self.hex_buffer) < 2:
-            char_byte = self._read_raw_byte()
-            if char_byte is None:
-                return None
-            
-            char = chr(char_byte) if isinstance(char_byte, int) else char_byte
-            
-            # Skip whitespace in hex format
-            if char in ' \t\r\n':
+
+            carried = b""
+            if self.is_ascii_hex:
+                # Any character other than a hex digit or whitespace ends the
+                # encrypted section; it is put back with the rest of the block
+                end = _EEXEC_NOT_HEX.search(raw)
+                if end is not None:
+                    self.source_done = True
+                carried = self.hex_digit
+                digits = carried + raw[:end.start() if end else len(raw)].translate(None, b" \t\r\n")
+                even = len(digits) & ~1
+                self.hex_digit = digits[even:]
+                cipher = bytes.fromhex(digits[:even].decode("ascii"))
+            else:
+                cipher = raw
+            self.raw_block = raw
+            self.block_hex_digit = carried
+            if not cipher:
+                self.plain = b""
+                self.plain_pos = self.block_start = 0
                 continue
-            
-            # Validate hex character
-            if char.upper() not in '0123456789ABCDEF':
-                # Invalid hex character indicates end of encrypted section
-                return None
-            
-            self.hex_buffer += char
-        
-        # Convert two hex characters to byte
-        hex_pair = self.hex_buffer[:2]
-        self.hex_buffer = self.hex_buffer[2:]
-        
-        try:
-            return int(hex_pair, 16)
-        except ValueError:
-            return None
-    
-    def _decrypt_byte(self, cipher_byte: int) -> int:
-        """Decrypt a single byte using Adobe algorithm."""
-        plain_byte = cipher_byte ^ (self.R >> 8)
-        self.R = ((cipher_byte + self.R) * self.c1 + self.c2) & 0xFFFF
-        return plain_byte
-    
+
+            self.plain, self.R = type1_decrypt.decrypt(cipher, self.R)
+            self.block_start = self.plain_pos = min(
+                max(self.random_bytes_to_skip - self.bytes_read, 0), len(cipher))
+            self.bytes_read += len(cipher)
+            if self.plain_pos < len(self.plain):
+                return True
+        return False
+
     def read(self, ctxt: Context) -> int | None:
-        """Read and decrypt one byte from the source."""
+        """Read one decrypted byte."""
         if self.is_closed:
             return None
-        
-        # Return unread byte if available
-        if self.has_unread_byte:
-            self.has_unread_byte = False
-            return self.last_decrypted_byte
-        
-        # Determine format on first read to avoid file positioning issues
-        if not self.format_determined:
-            self._determine_format_from_first_bytes()
-        
-        # Read cipher byte based on format
-        if self.is_ascii_hex:
-            cipher_byte = self._read_hex_byte()
-        else:
-            cipher_byte = self._read_raw_byte()
-        
-        if cipher_byte is None:
+        if self.plain_pos >= len(self.plain) and not self._fill():
             # End of input - close the filter
             self.close()
             return None
-        
-        # Decrypt the byte
-        plain_byte = self._decrypt_byte(cipher_byte)
-        self.bytes_read += 1
-        
-        # Skip the first n random bytes
-        if self.bytes_read <= self.random_bytes_to_skip:
-            return self.read(ctxt)  # Recursively read next byte
-        
-        # Store this byte for potential unread
-        self.last_decrypted_byte = plain_byte
-        
-        return plain_byte
-    
+        byte = self.plain[self.plain_pos]
+        self.plain_pos += 1
+        return byte
+
+    def read_bulk(self, ctxt: Context, count: int) -> bytes:
+        """Read up to count decrypted bytes."""
+        result = bytearray()
+        while len(result) < count and not self.is_closed:
+            if self.plain_pos >= len(self.plain) and not self._fill():
+                self.close()
+                break
+            take = min(count - len(result), len(self.plain) - self.plain_pos)
+            result += self.plain[self.plain_pos:self.plain_pos + take]
+            self.plain_pos += take
+        return bytes(result)
+
     def unread(self) -> None:
         """Put a byte back - required by tokenizer."""
-        if self.last_decrypted_byte is not None and not self.has_unread_byte:
-            self.has_unread_byte = True
-    
+        if not self.is_closed and self.plain_pos > self.block_start:
+            self.plain_pos -= 1
+
+    def _unread_source(self) -> bytes:
+        """Source bytes of the current block not yet read through the filter."""
+        if not self.is_ascii_hex:
+            return self.raw_block[self.plain_pos:]
+        if self.plain_pos == 0:
+            return self.block_hex_digit + self.raw_block
+        # Skip the hex digits (and whitespace) of the bytes already read
+        digits = 2 * self.plain_pos - len(self.block_hex_digit)
+        for offset, char in enumerate(self.raw_block):
+            if char not in b" \t\r\n":
+                digits -= 1
+                if not digits:
+                    return self.raw_block[offset + 1:]
+        return b""
+
     def close(self) -> None:
         """Close the decryption filter."""
         if not self.is_closed:
             self.is_closed = True
-            
+
+            if not self.is_string_source and self.block_size > 1:
+                rest = self._unread_source()
+                if rest:
+                    self.source_file.putback(rest)
+            self.plain = self.raw_block = b""
+            self.plain_pos = self.block_start = 0
+
             # Pop systemdict if we pushed it
             if self.systemdict_pushed and len(self.ctxt.d_stack) > 3:
                 if hasattr(self.ctxt.d_stack[-1], 'name') and self.ctxt.d_stack[-1].name == b"systemdict":
@@ -890,24 +905,21 @@ class EexecDecryptionFilter(File):
     
     _ALL_ATTRS = ('val', 'access', 'attrib', 'is_composite', 'is_global',
                   'line_num', 'name', 'mode', 'created', 'ctxt_id', 'is_real_file',
-                  'source_file', 'ctxt', 'R', 'c1', 'c2', 'random_bytes_to_skip',
-                  'bytes_read', 'is_ascii_hex', 'hex_buffer', 'is_closed',
-                  'systemdict_pushed', 'format_determined',
-                  'last_decrypted_byte', 'has_unread_byte')
+                  'source_file', 'ctxt', 'R', 'random_bytes_to_skip',
+                  'is_string_source', 'block_size', 'bytes_read', 'is_ascii_hex',
+                  'hex_digit', 'source_done', 'is_closed', 'systemdict_pushed',
+                  'plain', 'plain_pos', 'block_start', 'raw_block', 'block_hex_digit')
 
     def __copy__(self) -> EexecDecryptionFilter:
         """Optimized copy for EexecDecryptionFilter - complex file filter."""
         new_obj = EexecDecryptionFilter.__new__(EexecDecryptionFilter)
         for attr in EexecDecryptionFilter._ALL_ATTRS:
             setattr(new_obj, attr, getattr(self, attr))
-        # Copy optional attrs that may exist after _determine_format_from_first_bytes
-        if hasattr(self, 'first_bytes_buffer'):
-            new_obj.first_bytes_buffer = self.first_bytes_buffer
-            new_obj.buffer_index = self.buffer_index
         # Fresh putback state (inherited from File)
         new_obj._putback_buf = bytearray()
         new_obj._putback_pos = 0
         new_obj._last_read_from_putback = None
+        new_obj._last_bulk_read = None
         return new_obj
     
     def __str__(self) -> str:
@@ -951,6 +963,7 @@ class Run(File):
         new_obj._putback_buf = bytearray()
         new_obj._putback_pos = 0
         new_obj._last_read_from_putback = None
+        new_obj._last_bulk_read = None
         return new_obj
 
     def __str__(self) -> str:
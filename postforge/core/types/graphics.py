@@ -22,7 +22,14 @@ from .. import color_space
 # Import base classes and constants
 from .base import PSObject
 from .constants import (
-    LINE_CAP_BUTT, LINE_JOIN_MITER, WINDING_NON_ZERO, T_GSTATE
+    LINE_CAP_BUTT, LINE_JOIN_MITER, WINDING_NON_ZERO, T_GSTATE,
+    DL_OTHER, DL_PATH, DL_FILL, DL_STROKE, DL_PATTERN_FILL, DL_CLIP,
+    DL_IMAGE, DL_IMAGEMASK, DL_COLORIMAGE, DL_TEXT,
+    DL_GLYPH_REF, DL_GLYPH_START, DL_GLYPH_END,
+    DL_ACTUAL_TEXT_START, DL_ACTUAL_TEXT_END,
+    DL_AXIAL_SHADING, DL_RADIAL_SHADING, DL_FUNCTION_SHADING,
+    DL_MESH_SHADING, DL_PATCH_SHADING, DL_FORM_START, DL_FORM_END,
+    SEG_MOVETO, SEG_LINETO, SEG_CURVETO, SEG_CLOSEPATH,
 )
 
 # Import composite and context types for dependencies
@@ -136,6 +143,10 @@ class DisplayList(list):
         self.width = width
         self.height = height
 
+        # False while capturing form or pattern content, whose CTM is not
+        # the final device transform (see operators/image_downsample.py).
+        self.device_space = True
+
     """
     This is a list of elements like Paths, Fills, Strokes, etc...
     A Path is a list of SubPaths.
@@ -145,9 +156,19 @@ class DisplayList(list):
 
 # Path Elements
 class Path(list):
+    DL_TYPE = DL_PATH
+
     def __init__(self) -> None:
         super().__init__()
 
+        # Device-space bounding box (x0, y0, x1, y1), computed when the path
+        # is committed to the display list.  None means unknown.
+        self.device_bbox = None
+
+        # Renderer-private compiled form (segment opcodes + packed coordinates),
+        # filled on first emission.  None means not compiled yet.
+        self.compiled = None
+
 
 class SubPath(list):
     def __init__(self) -> None:
@@ -156,6 +177,8 @@ class SubPath(list):
 
 
 class Fill:
+    DL_TYPE = DL_FILL
+
     def __init__(self, device_color: list, winding_rule: int) -> None:
         # Store device-ready color values as primitive Python floats
         self.color = device_color
@@ -164,6 +187,8 @@ class Fill:
 
 class PatternFill:
     """Display list element for pattern-filled areas."""
+    DL_TYPE = DL_PATTERN_FILL
+
     def __init__(self, pattern_dict, winding_rule: int, gs: "GraphicsState",
                  underlying_color: list = None) -> None:
         """
@@ -186,6 +211,8 @@ class PatternFill:
 
 
 class Stroke:
+    DL_TYPE = DL_STROKE
+
     def __init__(self, device_color: list, gs: "GraphicsState") -> None:
         # Store device-ready color values as primitive Python floats
         self.color = device_color
@@ -210,18 +237,28 @@ class Stroke:
         ctm = gs.CTM.val
         self.ctm = (ctm[0].val, ctm[1].val, ctm[2].val, ctm[3].val, ctm[4].val, ctm[5].val)
 
+        # Device-space bounding box of the painted stroke (path bbox expanded
+        # by the line width, joins and caps).  None means unknown.
+        self.device_bbox = None
+
 
 class ErasePage:
+    DL_TYPE = DL_OTHER
+
     def __init__(self, gs: "GraphicsState") -> None:
         pass
 
 
 class ShowPage:
+    DL_TYPE = DL_OTHER
+
     def __init__(self, gs: "GraphicsState") -> None:
         pass
 
 
 class ClipElement:
+    DL_TYPE = DL_CLIP
+
     def __init__(self, gs: "GraphicsState", winding_rule: int = WINDING_NON_ZERO, is_initclip: bool = False):
         """
         Display list element for clipping operations.
@@ -248,16 +285,22 @@ class Point(object):
 
 
 class MoveTo(object):
+    SEG_TYPE = SEG_MOVETO
+
     def __init__(self, p: Point) -> None:
         self.p = p
 
 
 class LineTo(object):
+    SEG_TYPE = SEG_LINETO
+
     def __init__(self, p: Point) -> None:
         self.p = p
 
 
 class CurveTo(object):
+    SEG_TYPE = SEG_CURVETO
+
     def __init__(self, p1: Point, p2: Point, p3: Point) -> None:
         self.p1 = p1
         self.p2 = p2
@@ -265,6 +308,8 @@ class CurveTo(object):
 
 
 class ClosePath(object):
+    SEG_TYPE = SEG_CLOSEPATH
+
     def __init__(self):
         pass
 
@@ -277,6 +322,7 @@ class GlyphRef:
     The renderer blits the cached Cairo surface at the given position.
     """
     __slots__ = ('cache_key', 'position_x', 'position_y')
+    DL_TYPE = DL_GLYPH_REF
 
     def __init__(self, cache_key, position_x, position_y):
         self.cache_key = cache_key
@@ -291,6 +337,7 @@ class GlyphStart:
     The renderer uses this to begin tracking glyph elements for bitmap capture.
     """
     __slots__ = ('cache_key', 'position_x', 'position_y')
+    DL_TYPE = DL_GLYPH_START
 
     def __init__(self, cache_key, position_x, position_y):
         self.cache_key = cache_key
@@ -304,11 +351,13 @@ class GlyphEnd:
     The renderer uses this to finalize bitmap capture and store in cache.
     """
     __slots__ = ()
+    DL_TYPE = DL_GLYPH_END
 
 
 # Image Display List Elements for PostScript image processing operators
 class ImageElement:
     """PostScript image display list element with device space coordinate handling"""
+    DL_TYPE = DL_IMAGE
     
     def __init__(self, device_color: list, gs: "GraphicsState", image_type: str):
         # Copy relevant graphics state at time of image call - PRIMITIVE VALUES ONLY
@@ -328,6 +377,13 @@ class ImageElement:
         self.decode_array = None          # list of floats
         self.interpolate = False          # boolean
         self.sample_data = None           # bytes - ALL IMAGE DATA STORED HERE
+        self.sample_digest = None         # bytes - content digest of sample_data, None = not computed
+        self.device_bbox = None           # (x0, y0, x1, y1) device space, None = unknown
+
+        # Deferred decoding: compressed samples kept until render time
+        self.encoded_data = None          # bytes - compressed samples (sample_data is None)
+        self.encoded_format = None        # string - 'jpeg'
+        self.sample_decoder = None        # callable(encoded_data) -> bytes | None
         
         # imagemask specific
         self.polarity = None              # boolean
@@ -336,6 +392,17 @@ class ImageElement:
         self.color_space_name = None      # string
         self.multi_data_sources = False   # boolean
     
+    def get_sample_data(self) -> bytes | None:
+        """
+        Return the image samples, decoding deferred data on demand.
+
+        Decoded samples of a deferred image are not kept on the element, so
+        the display list only ever holds the compressed form.
+        """
+        if self.sample_data is not None or self.encoded_data is None:
+            return self.sample_data
+        return self.sample_decoder(self.encoded_data)
+
     def get_device_image_matrix(self) -> list[float]:
         """
         Calculate final image matrix for device space rendering.
@@ -383,6 +450,7 @@ class ImageElement:
 
 class ImageMaskElement(ImageElement):
     """Specialized element for imagemask operator"""
+    DL_TYPE = DL_IMAGEMASK
     
     def __init__(self, device_color: list, gs: "GraphicsState"):
         super().__init__(device_color, gs, 'imagemask')
@@ -392,6 +460,7 @@ class ImageMaskElement(ImageElement):
 
 class ColorImageElement(ImageElement):
     """Specialized element for colorimage operator"""
+    DL_TYPE = DL_COLORIMAGE
     
     def __init__(self, device_color: list, gs: "GraphicsState", ncomp: int):
         super().__init__(device_color, gs, 'colorimage')
@@ -408,6 +477,7 @@ class ColorImageElement(ImageElement):
 class AxialShadingFill:
     """Display list element for Type 2 axial (linear) gradient shading."""
     __slots__ = ('x0', 'y0', 'x1', 'y1', 'color_stops', 'extend_start', 'extend_end', 'ctm', 'bbox')
+    DL_TYPE = DL_AXIAL_SHADING
 
     def __init__(self, x0, y0, x1, y1, color_stops, extend_start, extend_end, ctm, bbox=None):
         self.x0 = x0
@@ -424,6 +494,7 @@ class AxialShadingFill:
 class RadialShadingFill:
     """Display list element for Type 3 radial (circular) gradient shading."""
     __slots__ = ('x0', 'y0', 'r0', 'x1', 'y1', 'r1', 'color_stops', 'extend_start', 'extend_end', 'ctm', 'bbox')
+    DL_TYPE = DL_RADIAL_SHADING
 
     def __init__(self, x0, y0, r0, x1, y1, r1, color_stops, extend_start, extend_end, ctm, bbox=None):
         self.x0 = x0
@@ -442,6 +513,7 @@ class RadialShadingFill:
 class MeshShadingFill:
     """Display list element for Type 4/5 triangle mesh shading."""
     __slots__ = ('triangles', 'ctm', 'bbox')
+    DL_TYPE = DL_MESH_SHADING
 
     def __init__(self, triangles, ctm, bbox=None):
         self.triangles = triangles  # list of (v0, v1, v2) where each v is ((x,y), (r,g,b))
@@ -452,6 +524,7 @@ class MeshShadingFill:
 class PatchShadingFill:
     """Display list element for Type 6/7 Coons/tensor-product patch shading."""
     __slots__ = ('patches', 'ctm', 'bbox')
+    DL_TYPE = DL_PATCH_SHADING
 
     def __init__(self, patches, ctm, bbox=None):
         self.patches = patches  # list of (points, colors) — 12 or 16 control points + 4 RGB colors
@@ -466,6 +539,7 @@ class FunctionShadingFill:
     processing.  The renderer paints it as an image with the stored matrix.
     """
     __slots__ = ('pixel_data', 'width', 'height', 'matrix', 'ctm', 'bbox')
+    DL_TYPE = DL_FUNCTION_SHADING
 
     def __init__(self, pixel_data, width, height, matrix, ctm, bbox=None):
         self.pixel_data = pixel_data  # bytearray of ARGB32 pixels (BGRA on LE)
@@ -487,6 +561,7 @@ class TextObj:
     """
     __slots__ = ('text', 'start_x', 'start_y', 'font_dict', 'font_name',
                  'font_size', 'color', 'color_space', 'ctm', 'font_matrix')
+    DL_TYPE = DL_TEXT
 
     def __init__(self, text: bytes, start_x: float, start_y: float,
                  font_dict, font_name: bytes, font_size: float,
@@ -536,6 +611,7 @@ class ActualTextStart:
     __slots__ = ('unicode_text', 'start_x', 'start_y', 'font_size', 'ctm',
                  'font_matrix', 'font_bbox', 'visual_start_x', 'visual_width',
                  'advance_width')
+    DL_TYPE = DL_ACTUAL_TEXT_START
 
     def __init__(self, unicode_text: str, start_x: float, start_y: float,
                  font_size: float, ctm: list, font_matrix: list = None,
@@ -555,4 +631,29 @@ class ActualTextStart:
 
 class ActualTextEnd:
     """Marks end of a searchable text span in PDF output."""
-    __slots__ = ()
\ No newline at end of file
+    __slots__ = ()
+    DL_TYPE = DL_ACTUAL_TEXT_END
+
+
+# Form Display List Elements for vector output reuse of execform forms
+class FormStart:
+    """Marks the beginning of an execform invocation in the display list.
+
+    The elements that follow, up to the matching FormEnd, are the form's
+    cached display list transformed to device space, so devices that ignore
+    the markers render the form normally.  Vector devices can instead render
+    the form-space elements once and place them with the form CTM.
+    """
+    __slots__ = ('elements', 'bbox', 'ctm')
+    DL_TYPE = DL_FORM_START
+
+    def __init__(self, elements: list, bbox: tuple, ctm: tuple):
+        self.elements = elements  # form-space display list shared by every invocation
+        self.bbox = bbox          # (llx, lly, urx, ury) in form space
+        self.ctm = ctm            # 6-float tuple: form space → device transform
+
+
+class FormEnd:
+    """Marks the end of an execform invocation in the display list."""
+    __slots__ = ()
+    DL_TYPE = DL_FORM_END
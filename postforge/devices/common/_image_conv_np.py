@@ -0,0 +1,260 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+NumPy image sample conversion for Cairo BGRX format.
+
+Vectorized versions of the _image_conv_cy functions with the same names,
+arguments and results, used when the Cython module is not built.  Each
+converter unpacks the samples into an array, maps them through a
+per-component lookup table built with the same arithmetic as the Cython
+loops, and writes the B, G, R and alpha planes through strided views of
+the output bytearray.  If you change the rounding or padding rules in
+_image_conv_cy.pyx, update this file to match.
+
+Short sample data is treated as padded with zero bytes.
+"""
+
+import numpy as np
+
+
+def _byte_rows(src, rows: int, row_bytes: int) -> np.ndarray:
+    """View src as rows of row_bytes bytes, zero-padding short data."""
+    needed = rows * row_bytes
+    data = np.frombuffer(src, dtype=np.uint8, count=min(len(src), needed))
+    if len(data) < needed:
+        data = np.concatenate((data, np.zeros(needed - len(data), dtype=np.uint8)))
+    return data.reshape(rows, row_bytes)
+
+
+def _unpack(src, samples_per_row: int, rows: int, bits: int) -> np.ndarray:
+    """Unpack rows of samples, each row padded to a byte boundary."""
+    row_bytes = (samples_per_row * bits + 7) // 8
+    raw = _byte_rows(src, rows, row_bytes)
+    if bits == 8:
+        return raw
+    if bits == 12:
+        # Every 3 bytes hold two samples
+        if row_bytes % 3:
+            raw = np.pad(raw, ((0, 0), (0, 3 - row_bytes % 3)))
+        triples = raw.reshape(rows, -1, 3).astype(np.uint16)
+        samples = np.empty((rows, triples.shape[1], 2), dtype=np.uint16)
+        samples[:, :, 0] = (triples[:, :, 0] << 4) | (triples[:, :, 1] >> 4)
+        samples[:, :, 1] = ((triples[:, :, 1] & 0x0F) << 8) | triples[:, :, 2]
+    else:
+        shifts = np.arange(8 - bits, -1, -bits, dtype=np.uint8)
+        samples = (raw[:, :, None] >> shifts) & ((1 << bits) - 1)
+    return samples.reshape(rows, -1)[:, :samples_per_row]
+
+
+def _level_lut(d_min: float, d_max: float, bits: int) -> np.ndarray:
+    """Lookup table of <int>((d_min + i * scale) * 255.0), clamped to 0-255."""
+    scale = (d_max - d_min) / ((1 << bits) - 1)
+    levels = (d_min + np.arange(1 << bits) * scale) * 255.0
+    return np.clip(np.trunc(levels), 0, 255).astype(np.uint8)
+
+
+def _decoded_levels(d_min: float, d_max: float, bits: int) -> np.ndarray:
+    """Decoded value d_min + i * scale of each sample level."""
+    scale = (d_max - d_min) / ((1 << bits) - 1)
+    return d_min + np.arange(1 << bits) * scale
+
+
+def _to_byte(values: np.ndarray) -> np.ndarray:
+    """Convert 0-1 values as <int>(v * 255.0), clamped to 0-255."""
+    return np.clip(np.trunc(values * 255.0), 0, 255).astype(np.uint8)
+
+
+def _bgrx(num_pixels: int, b: np.ndarray, g: np.ndarray, r: np.ndarray) -> bytearray:
+    """Interleave B, G, R planes into a new BGRX bytearray."""
+    result = bytearray(num_pixels * 4)
+    out = np.frombuffer(result, dtype=np.uint8).reshape(num_pixels, 4)
+    out[:, 0] = b.reshape(-1)
+    out[:, 1] = g.reshape(-1)
+    out[:, 2] = r.reshape(-1)
+    out[:, 3] = 0xFF
+    return result
+
+
+def _gray(num_pixels: int, gray: np.ndarray) -> bytearray:
+    gray = gray.reshape(-1)
+    return _bgrx(num_pixels, gray, gray, gray)
+
+
+# ---------------------------------------------------------------------------
+# 8-bit conversions
+# ---------------------------------------------------------------------------
+
+def gray8_to_bgrx(src, num_pixels: int) -> bytearray:
+    """Convert 8-bit grayscale with identity decode [0,1] to BGRX."""
+    return _gray(num_pixels, _byte_rows(src, 1, num_pixels))
+
+
+def gray8_decode_to_bgrx(src, num_pixels: int, lut) -> bytearray:
+    """Convert 8-bit grayscale with custom decode via 256-byte LUT to BGRX."""
+    lut = np.frombuffer(lut, dtype=np.uint8)
+    return _gray(num_pixels, lut[_byte_rows(src, 1, num_pixels)])
+
+
+def rgb8_to_bgrx(src, num_pixels: int) -> bytearray:
+    """Convert 8-bit RGB with identity decode [0,1,0,1,0,1] to BGRX."""
+    rgb = _byte_rows(src, num_pixels, 3)
+    return _bgrx(num_pixels, rgb[:, 2], rgb[:, 1], rgb[:, 0])
+
+
+def rgb8_decode_to_bgrx(src, num_pixels: int, r_lut, g_lut, b_lut) -> bytearray:
+    """Convert 8-bit RGB with custom decode via per-channel 256-byte LUTs to BGRX."""
+    rgb = _byte_rows(src, num_pixels, 3)
+    return _bgrx(num_pixels,
+                 np.frombuffer(b_lut, dtype=np.uint8)[rgb[:, 2]],
+                 np.frombuffer(g_lut, dtype=np.uint8)[rgb[:, 1]],
+                 np.frombuffer(r_lut, dtype=np.uint8)[rgb[:, 0]])
+
+
+def _cmyk8_bgrx(num_pixels: int, c, m, y, k) -> bytearray:
+    """R = 255 - min(255, C + K) etc. on 8-bit component planes."""
+    k = k.astype(np.int16)
+    return _bgrx(num_pixels,
+                 np.maximum(255 - y - k, 0),
+                 np.maximum(255 - m - k, 0),
+                 np.maximum(255 - c - k, 0))
+
+
+def cmyk8_to_bgrx(src, num_pixels: int) -> bytearray:
+    """Convert 8-bit CMYK with identity decode [0,1,...] to BGRX using integer CMYK->RGB."""
+    cmyk = _byte_rows(src, num_pixels, 4)
+    return _cmyk8_bgrx(num_pixels, cmyk[:, 0], cmyk[:, 1], cmyk[:, 2], cmyk[:, 3])
+
+
+def cmyk8_decode_to_bgrx(src, num_pixels: int, c_lut, m_lut, y_lut, k_lut) -> bytearray:
+    """Convert 8-bit CMYK with custom decode via per-channel 256-byte LUTs to BGRX."""
+    cmyk = _byte_rows(src, num_pixels, 4)
+    return _cmyk8_bgrx(num_pixels,
+                       np.frombuffer(c_lut, dtype=np.uint8)[cmyk[:, 0]],
+                       np.frombuffer(m_lut, dtype=np.uint8)[cmyk[:, 1]],
+                       np.frombuffer(y_lut, dtype=np.uint8)[cmyk[:, 2]],
+                       np.frombuffer(k_lut, dtype=np.uint8)[cmyk[:, 3]])
+
+
+# ---------------------------------------------------------------------------
+# Sub-byte and 12-bit grayscale conversions
+# ---------------------------------------------------------------------------
+
+def gray1_to_bgrx(src, width: int, height: int,
+                  decode_min_val: float, decode_max_val: float) -> bytearray:
+    """Convert 1-bit grayscale to BGRX. No row padding, MSB-first."""
+    total = width * height
+    lut = _to_byte(np.array([decode_min_val, decode_max_val], dtype=np.float64))
+    return _gray(total, lut[_unpack(src, total, 1, 1)])
+
+
+def gray2_to_bgrx(src, width: int, height: int,
+                  decode_min_val: float, decode_max_val: float) -> bytearray:
+    """Convert 2-bit grayscale to BGRX. No row padding."""
+    total = width * height
+    return _gray(total, _level_lut(decode_min_val, decode_max_val, 2)[_unpack(src, total, 1, 2)])
+
+
+def gray4_to_bgrx(src, width: int, height: int,
+                  decode_min_val: float, decode_max_val: float) -> bytearray:
+    """Convert 4-bit grayscale to BGRX. No row padding."""
+    total = width * height
+    return _gray(total, _level_lut(decode_min_val, decode_max_val, 4)[_unpack(src, total, 1, 4)])
+
+
+def gray12_to_bgrx(src, width: int, height: int, decode_array) -> bytearray:
+    """Convert 12-bit grayscale to BGRX. Row-padded to byte boundary."""
+    lut = _level_lut(decode_array[0], decode_array[1], 12)
+    return _gray(width * height, lut[_unpack(src, width, height, 12)])
+
+
+# ---------------------------------------------------------------------------
+# Sub-byte RGB conversions (4-bit, 12-bit)
+# ---------------------------------------------------------------------------
+
+def _rgb_bgrx(src, width: int, height: int, decode_array, bits: int) -> bytearray:
+    samples = _unpack(src, width * 3, height, bits).reshape(height, width, 3)
+    planes = [_level_lut(decode_array[2 * i], decode_array[2 * i + 1], bits)[samples[:, :, i]]
+              for i in range(3)]
+    return _bgrx(width * height, planes[2], planes[1], planes[0])
+
+
+def rgb4_to_bgrx(src, width: int, height: int, decode_array) -> bytearray:
+    """Convert 4-bit RGB to BGRX. Row-padded to byte boundary."""
+    return _rgb_bgrx(src, width, height, decode_array, 4)
+
+
+def rgb12_to_bgrx(src, width: int, height: int, decode_array) -> bytearray:
+    """Convert 12-bit RGB to BGRX. Row-padded to byte boundary."""
+    return _rgb_bgrx(src, width, height, decode_array, 12)
+
+
+# ---------------------------------------------------------------------------
+# Sub-byte CMYK conversions (4-bit, 12-bit)
+# ---------------------------------------------------------------------------
+
+def _decoded_cmyk(samples: np.ndarray, decode_array, bits: int) -> list:
+    return [_decoded_levels(decode_array[2 * i], decode_array[2 * i + 1], bits)[samples[..., i]]
+            for i in range(4)]
+
+
+def cmyk4_to_bgrx(src, width: int, height: int, decode_array) -> bytearray:
+    """Convert 4-bit CMYK to BGRX. NO row padding (2 bytes per pixel exact)."""
+    total = width * height
+    c, m, y, k = _decoded_cmyk(_unpack(src, total * 4, 1, 4).reshape(total, 4), decode_array, 4)
+    return _bgrx(total,
+                 _to_byte(np.clip(1.0 - y - k, 0.0, 1.0)),
+                 _to_byte(np.clip(1.0 - m - k, 0.0, 1.0)),
+                 _to_byte(np.clip(1.0 - c - k, 0.0, 1.0)))
+
+
+def cmyk12_to_bgrx(src, width: int, height: int, decode_array) -> bytearray:
+    """Convert 12-bit CMYK to BGRX. Row-padded. Uses multiplicative formula R=(1-C)*(1-K)."""
+    samples = _unpack(src, width * 4, height, 12).reshape(height, width, 4)
+    c, m, y, k = _decoded_cmyk(samples, decode_array, 12)
+    return _bgrx(width * height,
+                 _to_byte((1.0 - y) * (1.0 - k)),
+                 _to_byte((1.0 - m) * (1.0 - k)),
+                 _to_byte((1.0 - c) * (1.0 - k)))
+
+
+# ---------------------------------------------------------------------------
+# Color key masking
+# ---------------------------------------------------------------------------
+
+def _apply_color_key_mask(pixel_data, samples: np.ndarray, components: int,
+                          mask_color, is_range: bool) -> None:
+    """Clear the alpha of pixels whose raw samples match mask_color."""
+    samples = samples.reshape(-1, components)
+    if is_range:
+        lo = np.array(mask_color[0::2][:components])
+        hi = np.array(mask_color[1::2][:components])
+        matches = np.all((samples >= lo) & (samples <= hi), axis=1)
+    else:
+        matches = np.all(samples == np.array(mask_color[:components]), axis=1)
+    alpha = np.frombuffer(pixel_data, dtype=np.uint8)[3::4]
+    count = min(len(alpha), len(matches))
+    alpha[:count][matches[:count]] = 0
+
+
+def apply_color_key_mask_8(pixel_data, sample_data, width: int, height: int, components: int,
+                           mask_color, is_range: bool) -> None:
+    """Apply color key masking for 8-bit samples. Modifies pixel_data in place."""
+    pixels = min(width * height, len(sample_data) // components)
+    samples = np.frombuffer(sample_data, dtype=np.uint8, count=pixels * components)
+    _apply_color_key_mask(pixel_data, samples, components, mask_color, is_range)
+
+
+def apply_color_key_mask_4(pixel_data, sample_data, width: int, height: int, components: int,
+                           mask_color, is_range: bool) -> None:
+    """Apply color key masking for 4-bit samples. Row-padded."""
+    samples = _unpack(sample_data, width * components, height, 4)
+    _apply_color_key_mask(pixel_data, samples, components, mask_color, is_range)
+
+
+def apply_color_key_mask_12(pixel_data, sample_data, width: int, height: int, components: int,
+                            mask_color, is_range: bool) -> None:
+    """Apply color key masking for 12-bit samples. Row-padded."""
+    samples = _unpack(sample_data, width * components, height, 12)
+    _apply_color_key_mask(pixel_data, samples, components, mask_color, is_range)
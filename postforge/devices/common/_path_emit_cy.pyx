@@ -0,0 +1,43 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# cython: boundscheck=False, wraparound=False
+"""
+Cython-accelerated emission of precompiled display list paths to Cairo.
+
+Replays the (ops, coords) form produced by cairo_path.compile_path().  The
+segment loop and coordinate arithmetic run in C; each segment is still a
+single call into pycairo.  Must stay functionally equivalent to the pure
+Python loop in cairo_path.emit_path().
+"""
+
+
+def emit_compiled_path(ctx, const unsigned char[::1] ops, const double[::1] coords,
+                       double dx, double dy):
+    """Append a compiled path to ctx, offsetting every point by (dx, dy)."""
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n = ops.shape[0]
+    cdef Py_ssize_t c = 0
+    cdef unsigned char seg
+
+    move_to = ctx.move_to
+    line_to = ctx.line_to
+    curve_to = ctx.curve_to
+    close_path = ctx.close_path
+
+    for i in range(n):
+        seg = ops[i]
+        if seg == 1:    # SEG_LINETO
+            line_to(coords[c] + dx, coords[c + 1] + dy)
+            c += 2
+        elif seg == 0:  # SEG_MOVETO
+            move_to(coords[c] + dx, coords[c + 1] + dy)
+            c += 2
+        elif seg == 2:  # SEG_CURVETO
+            curve_to(coords[c] + dx, coords[c + 1] + dy,
+                     coords[c + 2] + dx, coords[c + 3] + dy,
+                     coords[c + 4] + dx, coords[c + 5] + dy)
+            c += 6
+        else:           # SEG_CLOSEPATH
+            close_path()
@@ -12,11 +12,16 @@ Handles grayscale, RGB, CMYK, and imagemask conversions from PostScript
 sample data to Cairo surface formats.
 
 Performance:
-- Imagemask glyphs are cached as pre-rendered Cairo ARGB32 surfaces
-- Cache key uses content of sample_data to avoid id() reuse after garbage collection
-- Optional Cython accelerators for common pixel format conversions
+- Converted images and imagemasks share one byte-limited LRU cache of
+  Cairo surfaces, so logos and backgrounds repeated on every page are
+  converted once
+- Cache keys use a digest of sample_data (not id()) to avoid stale hits
+  after garbage collection
+- Common pixel format conversions run in the optional Cython module or,
+  when it is not built, in NumPy (IMAGE_CONV_BACKEND names the tier in use)
 """
 
+import hashlib
 import math
 from collections import OrderedDict
 
@@ -24,11 +29,15 @@ from .cairo_utils import _safe_rgb
 
 import cairo
 
+from ...core import cie_lut
 from ...core import icc_default
 from ...core import icc_profile
+from ...core import proc_table
 from ...core import types as ps
 from ...core.color_space import ColorSpaceEngine, _get_cie_float_array, _apply_decode_array
 
+# Sample conversion tiers: the Cython converters when built, otherwise their
+# NumPy equivalents, otherwise the per-pixel Python loops below
 try:
     from ._image_conv_cy import (
         gray8_to_bgrx, gray8_decode_to_bgrx,
@@ -39,50 +48,242 @@ try:
         cmyk4_to_bgrx, cmyk12_to_bgrx,
         apply_color_key_mask_8, apply_color_key_mask_4, apply_color_key_mask_12,
     )
-    _CYTHON_IMAGE_CONV = True
+    IMAGE_CONV_BACKEND = 'cython'
 except ImportError:
-    _CYTHON_IMAGE_CONV = False
-
-
-# Cairo surface cache for imagemask glyphs (LRU with size limit)
-# Key: (sample_data_bytes, width, height, polarity, color_key)
-# Value: (cairo.ImageSurface, backing_bytearray, pattern, matrix)
-_IMAGEMASK_CACHE_MAX_ENTRIES = 2048
-_imagemask_surface_cache = OrderedDict()
-_imagemask_cache_hits = 0
-_imagemask_cache_misses = 0
-
-
-def get_imagemask_cache_stats() -> dict:
-    """Return imagemask surface cache statistics."""
-    total = _imagemask_cache_hits + _imagemask_cache_misses
-    return {
-        'entries': len(_imagemask_surface_cache),
-        'max_entries': _IMAGEMASK_CACHE_MAX_ENTRIES,
-        'hits': _imagemask_cache_hits,
-        'misses': _imagemask_cache_misses,
-        'hit_rate': _imagemask_cache_hits / total if total > 0 else 0.0
+    try:
+        from ._image_conv_np import (
+            gray8_to_bgrx, gray8_decode_to_bgrx,
+            gray1_to_bgrx, gray2_to_bgrx, gray4_to_bgrx, gray12_to_bgrx,
+            rgb8_to_bgrx, rgb8_decode_to_bgrx,
+            rgb4_to_bgrx, rgb12_to_bgrx,
+            cmyk8_to_bgrx, cmyk8_decode_to_bgrx,
+            cmyk4_to_bgrx, cmyk12_to_bgrx,
+            apply_color_key_mask_8, apply_color_key_mask_4, apply_color_key_mask_12,
+        )
+        IMAGE_CONV_BACKEND = 'numpy'
+    except ImportError:
+        IMAGE_CONV_BACKEND = 'python'
+_FAST_IMAGE_CONV = IMAGE_CONV_BACKEND != 'python'
+
+
+# Cairo surface cache shared by images and imagemasks (LRU with size limits)
+# Key: (kind, sample_digest, ...) — see _image_cache_key() and _render_imagemask_element()
+# Value: (nbytes, surface, backing_bytearray, ...) — extra items are per kind
+_IMAGE_SURFACE_CACHE_MAX_BYTES = 128 * 1024 * 1024
+_IMAGE_SURFACE_CACHE_MAX_ENTRIES = 4096
+_image_surface_cache = OrderedDict()
+_image_surface_cache_bytes = 0
+_image_surface_cache_stats = {
+    'image': {'hits': 0, 'misses': 0},
+    'imagemask': {'hits': 0, 'misses': 0},
+}
+
+
+def get_image_surface_cache_stats() -> dict:
+    """Return image surface cache statistics, overall and per kind."""
+    stats = {
+        'conversion_backend': IMAGE_CONV_BACKEND,
+        'entries': len(_image_surface_cache),
+        'bytes': _image_surface_cache_bytes,
+        'max_bytes': _IMAGE_SURFACE_CACHE_MAX_BYTES,
     }
+    hits = misses = 0
+    for kind, counts in _image_surface_cache_stats.items():
+        stats[f'{kind}_hits'] = counts['hits']
+        stats[f'{kind}_misses'] = counts['misses']
+        hits += counts['hits']
+        misses += counts['misses']
+    total = hits + misses
+    stats['hits'] = hits
+    stats['misses'] = misses
+    stats['hit_rate'] = hits / total if total > 0 else 0.0
+    return stats
+
+
+def clear_image_surface_cache() -> None:
+    """Clear the image surface cache and its statistics."""
+    global _image_surface_cache_bytes
+    _image_surface_cache.clear()
+    _image_surface_cache_bytes = 0
+    for counts in _image_surface_cache_stats.values():
+        counts['hits'] = 0
+        counts['misses'] = 0
+
+
+def _sample_digest(element: ps.ImageElement, data: bytes | bytearray | None = None) -> bytes:
+    """Content digest used in surface cache keys.
+
+    Uses the digest recorded when the element's samples were read (see
+    image_data.intern_sample_data) unless other data is given.
+    """
+    if data is None:
+        if element.sample_digest is not None:
+            return element.sample_digest
+        data = element.get_sample_data()
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _set_unique_id(surface: cairo.ImageSurface, cache_key: tuple) -> None:
+    """Tag a surface with an ID derived from its cache key.
+
+    Cairo's PDF backend writes one image XObject per unique ID, so every
+    occurrence of the same converted image across the document shares a
+    single embedded copy, even after the cache entry has been evicted.
+    """
+    uid = hashlib.blake2b(repr(cache_key).encode(), digest_size=16).hexdigest()
+    surface.set_mime_data(cairo.MIME_TYPE_UNIQUE_ID, uid.encode('ascii'))
+
+
+def _cache_lookup(kind: str, key: tuple) -> tuple | None:
+    """Look up a cached surface entry, counting the hit or miss."""
+    cached = _image_surface_cache.get(key)
+    if cached is not None:
+        _image_surface_cache_stats[kind]['hits'] += 1
+        _image_surface_cache.move_to_end(key)  # LRU: mark as recently used
+    else:
+        _image_surface_cache_stats[kind]['misses'] += 1
+    return cached
+
+
+def _cache_store(key: tuple, entry: tuple) -> None:
+    """Insert a surface entry (entry[0] is its size in bytes), evicting LRU entries."""
+    global _image_surface_cache_bytes
+    nbytes = entry[0]
+    if nbytes > _IMAGE_SURFACE_CACHE_MAX_BYTES // 4:
+        return  # Too large to be worth keeping
+    while _image_surface_cache and (
+            _image_surface_cache_bytes + nbytes > _IMAGE_SURFACE_CACHE_MAX_BYTES
+            or len(_image_surface_cache) >= _IMAGE_SURFACE_CACHE_MAX_ENTRIES):
+        _, evicted = _image_surface_cache.popitem(last=False)
+        _image_surface_cache_bytes -= evicted[0]
+    _image_surface_cache[key] = entry
+    _image_surface_cache_bytes += nbytes
+
+
+def _jpeg_passthrough(image_element: ps.ImageElement) -> bool:
+    """Whether a deferred JPEG can stand in for the converted surface.
+
+    True for gray and RGB images painted with identity decode and no
+    masking, where the JPEG decodes to exactly the surface pixels.  Cairo
+    then embeds the JPEG itself in PDF and SVG output instead of
+    re-encoding the pixels.
+    """
+    if image_element.encoded_format != 'jpeg':
+        return False
+    if (getattr(image_element, 'mask_color', None) is not None
+            or getattr(image_element, 'stencil_mask', None) is not None):
+        return False
+    ncomp = image_element.components
+    if not _is_identity_decode(image_element.decode_array, ncomp):
+        return False
+    if image_element.image_type == 'colorimage':
+        return ncomp in (1, 3)
+    color_space = getattr(image_element, 'color_space', None)
+    family = color_space[0] if color_space and isinstance(color_space, list) else None
+    return (family, ncomp) in (("DeviceGray", 1), ("DeviceRGB", 3))
+
+
+def _color_space_key(obj: object) -> object:
+    """Reduce a display list color space to a hashable cache key component.
+
+    ICCBased spaces with a registered profile are keyed by the profile
+    hash; everything else, tint transforms and CIE dictionaries included,
+    by content (proc_table.content_key), so that images painted with a
+    copy of the color space made by gsave find the same surface.
+    """
+    if (isinstance(obj, (list, tuple)) and len(obj) >= 2
+            and isinstance(obj[0], str) and obj[0] == "ICCBased"):
+        profile_hash = icc_profile.get_profile_hash(obj[1])
+        if profile_hash is not None:
+            return ("ICCBased", profile_hash)
+    return proc_table.content_key(obj)
+
 
+def _pad_to_stride(pixel_data: bytearray, row_bytes: int, height: int, stride: int) -> bytearray:
+    """Pad each row of packed pixel data out to Cairo's stride."""
+    if stride <= row_bytes:
+        return pixel_data
+    view = memoryview(pixel_data)
+    padding = bytes(stride - row_bytes)
+    padded = bytearray()
+    for row in range(height):
+        start = row * row_bytes
+        padded += view[start:start + row_bytes]
+        padded += padding
+    return padded
+
+
+def _image_cache_key(image_element: ps.ImageElement) -> tuple:
+    """Surface cache key: everything that affects the converted pixels."""
+    stencil_mask = getattr(image_element, 'stencil_mask', None)
+    if stencil_mask is not None:
+        stencil_key = (_sample_digest(image_element, stencil_mask),
+                       getattr(image_element, 'stencil_mask_width', image_element.width),
+                       getattr(image_element, 'stencil_mask_height', image_element.height),
+                       getattr(image_element, 'stencil_mask_polarity', True))
+    else:
+        stencil_key = None
+    mask_color = getattr(image_element, 'mask_color', None)
+    return (image_element.image_type, _sample_digest(image_element),
+            image_element.width, image_element.height,
+            image_element.bits_per_component, image_element.components,
+            tuple(image_element.decode_array or ()),
+            _color_space_key(getattr(image_element, 'color_space', None)),
+            tuple(mask_color) if mask_color is not None else None,
+            stencil_key)
+
+
+def _paint_image_surface(image_element: ps.ImageElement, surface: cairo.ImageSurface, cairo_ctx: cairo.Context) -> None:
+    """Paint a converted image surface through the element's CTM and image matrix."""
+    cairo_ctx.save()
+    try:
+        # Apply PostScript CTM at time of image creation
+        cairo_ctx.transform(cairo.Matrix(*image_element.ctm))
+
+        # Apply interpolation setting from PostScript
+        pattern = cairo.SurfacePattern(surface)
+
+        # Use the original PostScript image matrix as-is
+        pattern.set_matrix(cairo.Matrix(*image_element.image_matrix))
+
+        if image_element.interpolate:
+            pattern.set_filter(cairo.FILTER_BILINEAR)
+        else:
+            pattern.set_filter(cairo.FILTER_NEAREST)
 
-def clear_imagemask_cache() -> None:
-    """Clear the imagemask surface cache."""
-    global _imagemask_surface_cache, _imagemask_cache_hits, _imagemask_cache_misses
-    _imagemask_surface_cache.clear()
-    _imagemask_cache_hits = 0
-    _imagemask_cache_misses = 0
+        cairo_ctx.set_source(pattern)
+        cairo_ctx.paint()
+
+    except (cairo.Error, ValueError) as e:
+        print(f"Image rendering error: {e}")
+    finally:
+        cairo_ctx.restore()
 
 
 def _render_image_element(image_element: ps.ImageElement, cairo_ctx: cairo.Context, page_height: int) -> None:
     """Render PostScript image using Cairo with correct matrix handling"""
 
+    if not image_element.sample_data and image_element.encoded_data is None:
+        return
+
     try:
+        cache_key = _image_cache_key(image_element)
+        cached = _cache_lookup('image', cache_key)
+        if cached is not None:
+            _paint_image_surface(image_element, cached[1], cairo_ctx)
+            return
+
+        # Decodes deferred (e.g. DCTDecode) samples; the result is not kept
+        sample_data = image_element.get_sample_data()
+        if not sample_data:
+            return
+
         # Get mask_color for ImageType 4 (color key masking)
         mask_color = getattr(image_element, 'mask_color', None)
 
         # 1. Convert PostScript samples to Cairo pixel data with color space transformation
         pixel_data = _convert_samples_to_cairo_format(
-            image_element.sample_data,
+            sample_data,
             image_element.bits_per_component,
             image_element.width,
             image_element.height,
@@ -117,54 +318,24 @@ def _render_image_element(image_element: ps.ImageElement, cairo_ctx: cairo.Conte
         if isinstance(pixel_data, bytes):
             pixel_data = bytearray(pixel_data)
 
-        # Calculate required stride for this format and width
-        required_stride = cairo.ImageSurface.format_stride_for_width(cairo_format, image_element.width)
+        # Pad rows if Cairo's stride for this format and width is wider
+        stride = cairo.ImageSurface.format_stride_for_width(cairo_format, image_element.width)
         bytes_per_pixel = 4 if cairo_format == cairo.FORMAT_ARGB32 else (3 if cairo_format == cairo.FORMAT_RGB24 else 1)
-        actual_stride = image_element.width * bytes_per_pixel
-
-        # Check if we need to add padding to meet Cairo's stride requirements
-        if required_stride > actual_stride:
-            padded_data = bytearray()
-            for row in range(image_element.height):
-                row_start = row * actual_stride
-                row_end = row_start + actual_stride
-                row_data = pixel_data[row_start:row_end]
-                padded_data.extend(row_data)
-                padding_needed = required_stride - actual_stride
-                padded_data.extend([0] * padding_needed)
-            pixel_data = padded_data
+        pixel_data = _pad_to_stride(pixel_data, image_element.width * bytes_per_pixel,
+                                    image_element.height, stride)
 
         surface = cairo.ImageSurface.create_for_data(
             pixel_data, cairo_format,
-            image_element.width, image_element.height
+            image_element.width, image_element.height, stride
         )
+        _set_unique_id(surface, cache_key)
+        if _jpeg_passthrough(image_element):
+            surface.set_mime_data(cairo.MIME_TYPE_JPEG, image_element.encoded_data)
 
-        # 3. Apply device space image matrix (CTM)
-        cairo_ctx.save()
-        try:
-            # Apply PostScript CTM at time of image creation
-            cairo_ctx.transform(cairo.Matrix(*image_element.ctm))
-
-            # 4. Apply interpolation setting from PostScript
-            pattern = cairo.SurfacePattern(surface)
+        _cache_store(cache_key, (len(pixel_data), surface, pixel_data))
 
-            # Use the original PostScript image matrix as-is
-            ps_matrix = image_element.image_matrix
-            pattern.set_matrix(cairo.Matrix(*ps_matrix))
-
-            if image_element.interpolate:
-                pattern.set_filter(cairo.FILTER_BILINEAR)
-            else:
-                pattern.set_filter(cairo.FILTER_NEAREST)
-
-            # 5. Render image
-            cairo_ctx.set_source(pattern)
-            cairo_ctx.paint()
-
-        except (cairo.Error, ValueError) as e:
-            print(f"Image rendering error: {e}")
-        finally:
-            cairo_ctx.restore()
+        # 3. Apply device space image matrix (CTM) and render
+        _paint_image_surface(image_element, surface, cairo_ctx)
 
     except (cairo.Error, ValueError, TypeError, IndexError) as e:
         print(f"Image element rendering failed: {e}")
@@ -227,8 +398,6 @@ def _render_imagemask_element(mask_element: ps.ImageMaskElement, cairo_ctx: cair
 
     Cache key includes color since color is baked into the surface.
     """
-    global _imagemask_surface_cache, _imagemask_cache_hits, _imagemask_cache_misses
-
     try:
         mask_data = mask_element.sample_data
         if not mask_data:
@@ -244,17 +413,14 @@ def _render_imagemask_element(mask_element: ps.ImageMaskElement, cairo_ctx: cair
         # Quantize color for cache key (same as glyph cache)
         color_key = (round(r_f, 3), round(g_f, 3), round(b_f, 3))
 
-        # Cache key uses content bytes (not id()) to avoid stale hits after GC
-        cache_key = (mask_data, width, height, polarity, color_key)
+        # Cache key uses a content digest (not id()) to avoid stale hits after GC
+        cache_key = ('imagemask', _sample_digest(mask_element), len(mask_data),
+                     width, height, polarity, color_key)
 
-        cached = _imagemask_surface_cache.get(cache_key)
+        cached = _cache_lookup('imagemask', cache_key)
         if cached is not None:
-            _imagemask_cache_hits += 1
-            _imagemask_surface_cache.move_to_end(cache_key)  # LRU: mark as recently used
-            colored_surface, argb_data, cached_pattern, cached_matrix = cached
+            cached_pattern = cached[3]
         else:
-            _imagemask_cache_misses += 1
-
             # Convert color to bytes (Cairo ARGB32 is BGRA in memory on little-endian)
             r = int(r_f * 255)
             g = int(g_f * 255)
@@ -296,24 +462,22 @@ def _render_imagemask_element(mask_element: ps.ImageMaskElement, cairo_ctx: cair
                 argb_data, cairo.FORMAT_ARGB32,
                 width, height, cairo_stride
             )
+            _set_unique_id(colored_surface, cache_key)
 
-            # Pre-create pattern and matrix (reused on every render)
+            # Pre-create pattern (reused on every render)
             cached_pattern = cairo.SurfacePattern(colored_surface)
             # Use BEST for smooth scaling of bitmap fonts (e.g., DVIPS 300dpi
             # fonts rendered at screen resolution). NEAREST causes jagged text.
             cached_pattern.set_filter(cairo.FILTER_BEST)
-            cached_matrix = cairo.Matrix(*mask_element.image_matrix)
-            cached_pattern.set_matrix(cached_matrix)
 
-            # LRU eviction: remove oldest entry if at capacity
-            if len(_imagemask_surface_cache) >= _IMAGEMASK_CACHE_MAX_ENTRIES:
-                _imagemask_surface_cache.popitem(last=False)
-            _imagemask_surface_cache[cache_key] = (colored_surface, argb_data, cached_pattern, cached_matrix)
+            _cache_store(cache_key, (len(argb_data), colored_surface, argb_data, cached_pattern))
 
-        # Render - just transform and paint the pre-colored surface
+        # Render - just transform and paint the pre-colored surface.  The
+        # image matrix is set per render since the cache key does not include it.
         cairo_ctx.save()
         try:
             cairo_ctx.transform(cairo.Matrix(*mask_element.ctm))
+            cached_pattern.set_matrix(cairo.Matrix(*mask_element.image_matrix))
             cairo_ctx.set_source(cached_pattern)
             cairo_ctx.paint()
         except (cairo.Error, ValueError) as e:
@@ -328,34 +492,48 @@ def _render_imagemask_element(mask_element: ps.ImageMaskElement, cairo_ctx: cair
 def _render_colorimage_element(color_element: ps.ColorImageElement, cairo_ctx: cairo.Context, page_height: int) -> None:
     """Render PostScript colorimage using Cairo color formats"""
 
+    if not color_element.sample_data and color_element.encoded_data is None:
+        return
+
     try:
+        cache_key = _image_cache_key(color_element)
+        cached = _cache_lookup('image', cache_key)
+        if cached is not None:
+            _paint_image_surface(color_element, cached[1], cairo_ctx)
+            return
+
+        # Decodes deferred (e.g. DCTDecode) samples; the result is not kept
+        sample_data = color_element.get_sample_data()
+        if not sample_data:
+            return
+
         # 1. Convert color samples based on component count
 
         if color_element.components == 1:  # Grayscale
-            # Cython fast paths: return BGRX directly
-            if _CYTHON_IMAGE_CONV and color_element.bits_per_component == 8:
+            # Fast paths: return BGRX directly
+            if _FAST_IMAGE_CONV and color_element.bits_per_component == 8:
                 num_pixels = color_element.width * color_element.height
                 if _is_identity_decode(color_element.decode_array, 1):
-                    pixel_data = gray8_to_bgrx(color_element.sample_data, num_pixels)
+                    pixel_data = gray8_to_bgrx(sample_data, num_pixels)
                 else:
                     lut = _build_decode_lut(color_element.decode_array[0], color_element.decode_array[1])
-                    pixel_data = gray8_decode_to_bgrx(color_element.sample_data, num_pixels, lut)
+                    pixel_data = gray8_decode_to_bgrx(sample_data, num_pixels, lut)
                 cairo_format = cairo.FORMAT_ARGB32
-            elif _CYTHON_IMAGE_CONV and color_element.bits_per_component in (1, 2, 4, 12):
+            elif _FAST_IMAGE_CONV and color_element.bits_per_component in (1, 2, 4, 12):
                 bpc = color_element.bits_per_component
                 da = color_element.decode_array
                 if bpc == 1:
-                    pixel_data = gray1_to_bgrx(color_element.sample_data, color_element.width, color_element.height, da[0], da[1])
+                    pixel_data = gray1_to_bgrx(sample_data, color_element.width, color_element.height, da[0], da[1])
                 elif bpc == 2:
-                    pixel_data = gray2_to_bgrx(color_element.sample_data, color_element.width, color_element.height, da[0], da[1])
+                    pixel_data = gray2_to_bgrx(sample_data, color_element.width, color_element.height, da[0], da[1])
                 elif bpc == 4:
-                    pixel_data = gray4_to_bgrx(color_element.sample_data, color_element.width, color_element.height, da[0], da[1])
+                    pixel_data = gray4_to_bgrx(sample_data, color_element.width, color_element.height, da[0], da[1])
                 else:
-                    pixel_data = gray12_to_bgrx(color_element.sample_data, color_element.width, color_element.height, da)
+                    pixel_data = gray12_to_bgrx(sample_data, color_element.width, color_element.height, da)
                 cairo_format = cairo.FORMAT_ARGB32
             else:
                 grayscale_data = _convert_grayscale_samples(
-                    color_element.sample_data, color_element.bits_per_component,
+                    sample_data, color_element.bits_per_component,
                     color_element.width, color_element.height,
                     color_element.decode_array,
                     getattr(color_element, 'color_space', None)
@@ -370,7 +548,7 @@ def _render_colorimage_element(color_element: ps.ColorImageElement, cairo_ctx: c
 
         elif color_element.components == 3:  # RGB
             pixel_data = _convert_rgb_samples(
-                color_element.sample_data, color_element.bits_per_component,
+                sample_data, color_element.bits_per_component,
                 color_element.width, color_element.height,
                 color_element.decode_array
             )
@@ -378,7 +556,7 @@ def _render_colorimage_element(color_element: ps.ColorImageElement, cairo_ctx: c
 
         elif color_element.components == 4:  # CMYK
             pixel_data = _convert_cmyk_to_rgb(
-                color_element.sample_data, color_element.bits_per_component,
+                sample_data, color_element.bits_per_component,
                 color_element.width, color_element.height,
                 color_element.decode_array
             )
@@ -394,47 +572,22 @@ def _render_colorimage_element(color_element: ps.ColorImageElement, cairo_ctx: c
         if isinstance(pixel_data, bytes):
             pixel_data = bytearray(pixel_data)
 
-        required_stride = cairo.ImageSurface.format_stride_for_width(cairo_format, color_element.width)
-        bytes_per_pixel = 4 if cairo_format == cairo.FORMAT_RGB24 else 4
-        actual_stride = color_element.width * bytes_per_pixel
-
-        if required_stride > actual_stride:
-            padded_data = bytearray()
-            for row in range(color_element.height):
-                row_start = row * actual_stride
-                row_end = row_start + actual_stride
-                padded_data.extend(pixel_data[row_start:row_end])
-                padding_needed = required_stride - actual_stride
-                padded_data.extend([0] * padding_needed)
-            pixel_data = padded_data
+        stride = cairo.ImageSurface.format_stride_for_width(cairo_format, color_element.width)
+        pixel_data = _pad_to_stride(pixel_data, color_element.width * 4,
+                                    color_element.height, stride)
 
         surface = cairo.ImageSurface.create_for_data(
             pixel_data, cairo_format,
-            color_element.width, color_element.height
+            color_element.width, color_element.height, stride
         )
+        _set_unique_id(surface, cache_key)
+        if _jpeg_passthrough(color_element):
+            surface.set_mime_data(cairo.MIME_TYPE_JPEG, color_element.encoded_data)
 
-        # 3. Apply transformation and render
-        cairo_ctx.save()
-        try:
-            cairo_ctx.transform(cairo.Matrix(*color_element.ctm))
-
-            pattern = cairo.SurfacePattern(surface)
-
-            ps_matrix = color_element.image_matrix
-            pattern.set_matrix(cairo.Matrix(*ps_matrix))
-
-            if color_element.interpolate:
-                pattern.set_filter(cairo.FILTER_BILINEAR)
-            else:
-                pattern.set_filter(cairo.FILTER_NEAREST)
+        _cache_store(cache_key, (len(pixel_data), surface, pixel_data))
 
-            cairo_ctx.set_source(pattern)
-            cairo_ctx.paint()
-
-        except (cairo.Error, ValueError) as e:
-            print(f"Colorimage rendering error: {e}")
-        finally:
-            cairo_ctx.restore()
+        # 3. Apply transformation and render
+        _paint_image_surface(color_element, surface, cairo_ctx)
 
     except (cairo.Error, ValueError, TypeError, IndexError) as e:
         print(f"Colorimage element rendering failed: {e}")
@@ -507,8 +660,8 @@ def _convert_samples_to_cairo_format(sample_data: bytes | bytearray, bits_per_co
             components = ColorSpaceEngine.COMPONENT_COUNTS.get(device_space, 3)
 
         if components == 1:  # Grayscale
-            # Cython fast paths: return BGRX directly
-            if _CYTHON_IMAGE_CONV and mask_color is None:
+            # Fast paths: return BGRX directly
+            if _FAST_IMAGE_CONV and mask_color is None:
                 if bits_per_component == 8:
                     num_pixels = width * height
                     if _is_identity_decode(decode_array, 1):
@@ -571,8 +724,8 @@ def _apply_color_key_mask(pixel_data: bytearray, sample_data: bytes | bytearray,
         n = components
         is_range = len(mask_color) == 2 * n
 
-        # Cython fast paths
-        if _CYTHON_IMAGE_CONV:
+        # Fast paths
+        if _FAST_IMAGE_CONV:
             if bits_per_component == 8:
                 apply_color_key_mask_8(pixel_data, sample_data, width, height, n, mask_color, is_range)
                 return
@@ -1006,7 +1159,8 @@ def _convert_cie_image(sample_data: bytes | bytearray, bits_per_component: int,
     """Convert CIEBasedABC or CIEBasedA image samples to Cairo BGRX format.
 
     For the common case where CIE wraps identity sRGB, delegates to the fast
-    RGB or grayscale path. Otherwise, converts each pixel through the CIE pipeline.
+    RGB or grayscale path. Otherwise, converts the samples through the CIE
+    pipeline with the tables in core/cie_lut.py.
     """
     try:
         space_name = color_space[0]
@@ -1033,193 +1187,57 @@ def _convert_cie_image(sample_data: bytes | bytearray, bits_per_component: int,
                                           width, height, components, mask_color)
                 return pixel_data
 
-        # Slow path: full CIE conversion per pixel
-        if space_name == "CIEBasedABC" and bits_per_component == 8:
-            # 8-bit 3-component CIE image
-            r_min, r_max = decode_array[0], decode_array[1]
-            g_min, g_max = decode_array[2], decode_array[3]
-            b_min, b_max = decode_array[4], decode_array[5]
-
-            pixel_data = bytearray(width * height * 4)
-            pixel_idx = 0
-
-            for i in range(0, width * height * 3, 3):
-                if i + 2 >= len(sample_data):
-                    break
-                raw_a = sample_data[i]
-                raw_b = sample_data[i + 1]
-                raw_c = sample_data[i + 2]
-
-                a = r_min + (raw_a / 255.0) * (r_max - r_min)
-                b = g_min + (raw_b / 255.0) * (g_max - g_min)
-                c = b_min + (raw_c / 255.0) * (b_max - b_min)
-
-                r, g, b_ = ColorSpaceEngine.cie_abc_to_rgb([a, b, c], cie_dict)
-                pixel_data[pixel_idx] = max(0, min(255, int(b_ * 255 + 0.5)))
-                pixel_data[pixel_idx + 1] = max(0, min(255, int(g * 255 + 0.5)))
-                pixel_data[pixel_idx + 2] = max(0, min(255, int(r * 255 + 0.5)))
-                pixel_data[pixel_idx + 3] = 255
-                pixel_idx += 4
-
-            if mask_color is not None:
-                _apply_color_key_mask(pixel_data, sample_data, bits_per_component,
-                                      width, height, components, mask_color)
-            return pixel_data
-
-        elif space_name == "CIEBasedA" and bits_per_component == 8:
-            # 8-bit 1-component CIE grayscale image
-            d_min, d_max = decode_array[0], decode_array[1]
-
-            pixel_data = bytearray(width * height * 4)
-            pixel_idx = 0
-
-            for i in range(width * height):
-                if i >= len(sample_data):
-                    break
-                raw = sample_data[i]
-                a = d_min + (raw / 255.0) * (d_max - d_min)
-
-                r, g, b_ = ColorSpaceEngine.cie_a_to_rgb(a, cie_dict)
-                pixel_data[pixel_idx] = max(0, min(255, int(b_ * 255 + 0.5)))
-                pixel_data[pixel_idx + 1] = max(0, min(255, int(g * 255 + 0.5)))
-                pixel_data[pixel_idx + 2] = max(0, min(255, int(r * 255 + 0.5)))
-                pixel_data[pixel_idx + 3] = 255
-                pixel_idx += 4
-
-            if mask_color is not None:
-                _apply_color_key_mask(pixel_data, sample_data, bits_per_component,
-                                      width, height, components, mask_color)
-            return pixel_data
-
-        else:
-            # For other bit depths, decode samples first then convert through CIE
+        # Otherwise convert through the CIE pipeline, with the per-sample-level
+        # stages tabulated once per color space (see core/cie_lut.py)
+        num_pixels = width * height
+        if bits_per_component == 8:
             if space_name == "CIEBasedABC":
-                # Use RGB sample extraction, then convert each pixel
-                # First get decoded float RGB-like values by treating as generic 3-component
-                pixel_data = _convert_rgb_samples(sample_data, bits_per_component,
-                                                  width, height, decode_array)
-                if pixel_data is None:
-                    return None
-
-                # pixel_data is BGRX format — extract RGB, run through CIE, write back
-                for px in range(0, len(pixel_data), 4):
-                    if px + 3 >= len(pixel_data):
-                        break
-                    # Extract from BGRX
-                    b_val = pixel_data[px] / 255.0
-                    g_val = pixel_data[px + 1] / 255.0
-                    r_val = pixel_data[px + 2] / 255.0
-
-                    r, g, b_ = ColorSpaceEngine.cie_abc_to_rgb([r_val, g_val, b_val], cie_dict)
-                    pixel_data[px] = max(0, min(255, int(b_ * 255 + 0.5)))
-                    pixel_data[px + 1] = max(0, min(255, int(g * 255 + 0.5)))
-                    pixel_data[px + 2] = max(0, min(255, int(r * 255 + 0.5)))
-
-                if mask_color is not None:
-                    _apply_color_key_mask(pixel_data, sample_data, bits_per_component,
-                                          width, height, components, mask_color)
-                return pixel_data
+                pixel_data = cie_lut.convert_abc_image(sample_data, num_pixels,
+                                                       decode_array, cie_dict)
+            else:
+                pixel_data = cie_lut.convert_a_image(sample_data, num_pixels,
+                                                     decode_array, cie_dict)
 
-            else:  # CIEBasedA
-                grayscale_data = _convert_grayscale_samples(sample_data, bits_per_component,
-                                                            width, height, decode_array, None)
-                if grayscale_data is None:
-                    return None
-
-                pixel_data = bytearray(width * height * 4)
-                pixel_idx = 0
-                for gray_byte in grayscale_data:
-                    a = gray_byte / 255.0
-                    r, g, b_ = ColorSpaceEngine.cie_a_to_rgb(a, cie_dict)
-                    pixel_data[pixel_idx] = max(0, min(255, int(b_ * 255 + 0.5)))
-                    pixel_data[pixel_idx + 1] = max(0, min(255, int(g * 255 + 0.5)))
-                    pixel_data[pixel_idx + 2] = max(0, min(255, int(r * 255 + 0.5)))
-                    pixel_data[pixel_idx + 3] = 255
-                    pixel_idx += 4
+        # For other bit depths, decode samples to bytes first, then treat each
+        # byte as a component in [0, 1]
+        elif space_name == "CIEBasedABC":
+            rgb_data = _convert_rgb_samples(sample_data, bits_per_component,
+                                            width, height, decode_array)
+            if rgb_data is None:
+                return None
+            # rgb_data is BGRX format; reorder to RGB samples
+            rgb_samples = bytearray(len(rgb_data) // 4 * 3)
+            rgb_samples[0::3] = rgb_data[2::4]
+            rgb_samples[1::3] = rgb_data[1::4]
+            rgb_samples[2::3] = rgb_data[0::4]
+            pixel_data = cie_lut.convert_abc_image(rgb_samples, num_pixels,
+                                                   [0, 1, 0, 1, 0, 1], cie_dict)
+        else:  # CIEBasedA
+            grayscale_data = _convert_grayscale_samples(sample_data, bits_per_component,
+                                                        width, height, decode_array, None)
+            if grayscale_data is None:
+                return None
+            pixel_data = cie_lut.convert_a_image(grayscale_data, num_pixels, [0, 1], cie_dict)
 
-                if mask_color is not None:
-                    _apply_color_key_mask(pixel_data, sample_data, bits_per_component,
-                                          width, height, components, mask_color)
-                return pixel_data
+        if mask_color is not None:
+            _apply_color_key_mask(pixel_data, sample_data, bits_per_component,
+                                  width, height, components, mask_color)
+        return pixel_data
 
     except (ValueError, TypeError, IndexError, KeyError, ZeroDivisionError) as e:
         return None
 
 
-def _preconvert_cie_def_table(cie_dict: dict) -> tuple | None:
-    """Pre-convert all CIEBasedDEF Table entries through the full CIE→sRGB pipeline.
-
-    Evaluates DecodeABC, MatrixABC, DecodeLMN, MatrixLMN, XYZ→sRGB once per table
-    entry (~36K entries for 33×33×33) instead of per pixel. Returns flat arrays of
-    pre-converted R, G, B float values for trilinear interpolation.
-
-    Returns (r_table, g_table, b_table, m1, m2, m3) or None if no Table.
-    """
-    table_obj = cie_dict.get(b"Table")
-    if not table_obj or not hasattr(table_obj, 'val') or len(table_obj.val) < 4:
-        return None
-
-    tv = table_obj.val
-    m1 = int(tv[0].val) if hasattr(tv[0], 'val') else int(tv[0])
-    m2 = int(tv[1].val) if hasattr(tv[1], 'val') else int(tv[1])
-    m3 = int(tv[2].val) if hasattr(tv[2], 'val') else int(tv[2])
-    strings_obj = tv[3]
-
-    if hasattr(strings_obj, 'val'):
-        strings = strings_obj.val
-        s_start = getattr(strings_obj, 'start', 0)
-    else:
-        strings = strings_obj
-        s_start = 0
-
-    range_abc = _get_cie_float_array(cie_dict, b"RangeABC", [0, 1, 0, 1, 0, 1])
-    abc_min = [range_abc[0], range_abc[2], range_abc[4]]
-    abc_scale = [(range_abc[1] - range_abc[0]) / 255.0,
-                 (range_abc[3] - range_abc[2]) / 255.0,
-                 (range_abc[5] - range_abc[4]) / 255.0]
-
-    total = m1 * m2 * m3
-    r_table = [0.0] * total
-    g_table = [0.0] * total
-    b_table = [0.0] * total
-
-    idx = 0
-    for di in range(m1):
-        string_obj = strings[s_start + di]
-        if hasattr(string_obj, 'byte_string'):
-            data = string_obj.byte_string()
-        elif hasattr(string_obj, 'val') and isinstance(string_obj.val, (bytes, bytearray)):
-            data = string_obj.val
-        else:
-            data = bytes(string_obj) if not isinstance(string_obj, (bytes, bytearray)) else string_obj
-
-        for ei in range(m2):
-            for fi in range(m3):
-                offset = (ei * m3 + fi) * 3
-                if offset + 2 < len(data):
-                    a = abc_min[0] + data[offset] * abc_scale[0]
-                    b = abc_min[1] + data[offset + 1] * abc_scale[1]
-                    c = abc_min[2] + data[offset + 2] * abc_scale[2]
-                else:
-                    a, b, c = abc_min[0], abc_min[1], abc_min[2]
-
-                r, g, b_ = ColorSpaceEngine.cie_abc_to_rgb([a, b, c], cie_dict)
-                r_table[idx] = r
-                g_table[idx] = g
-                b_table[idx] = b_
-                idx += 1
-
-    return (r_table, g_table, b_table, m1, m2, m3)
-
-
 def _convert_cie_def_image(sample_data: bytes | bytearray, bits_per_component: int, width: int, height: int,
                            decode_array: list, color_space: list, components: int,
                            mask_color: list | None) -> bytearray | None:
     """Convert CIEBasedDEF or CIEBasedDEFG image samples to Cairo BGRX format.
 
-    Pre-converts the CIE Table to sRGB once, then uses fast trilinear interpolation
-    per pixel in the pre-converted table. This avoids evaluating Decode procedures
-    (which may be complex Lab→XYZ functions) for every pixel.
+    The CIE Table is converted to sRGB once per color space (see
+    core/cie_lut.py) and pixels are looked up in it: trilinear interpolation
+    for DEF, nearest entry for DEFG as in ColorSpaceEngine.cie_defg_to_rgb.
+    This avoids evaluating Decode procedures (which may be complex Lab→XYZ
+    functions) for every pixel.
     """
     try:
         space_name = color_space[0]
@@ -1227,111 +1245,21 @@ def _convert_cie_def_image(sample_data: bytes | bytearray, bits_per_component: i
         cie_dict = dict_obj.val if hasattr(dict_obj, 'val') and isinstance(dict_obj.val, dict) else {}
 
         if space_name == "CIEBasedDEF" and bits_per_component == 8:
-            preconv = _preconvert_cie_def_table(cie_dict)
-            if preconv is None:
+            pixel_data = cie_lut.convert_def_image(sample_data, width * height,
+                                                   decode_array, cie_dict)
+            if pixel_data is None:
                 # No Table — fallback to treating as RGB
                 return _convert_rgb_samples(sample_data, bits_per_component,
                                             width, height, decode_array)
 
-            r_tab, g_tab, b_tab, m1, m2, m3 = preconv
-            range_def = _get_cie_float_array(cie_dict, b"RangeDEF", [0, 1, 0, 1, 0, 1])
-
-            d_min, d_max = decode_array[0], decode_array[1]
-            e_min, e_max = decode_array[2], decode_array[3]
-            f_min, f_max = decode_array[4], decode_array[5]
-
-            # Precompute normalization: pixel byte → table index
-            d_range = range_def[1] - range_def[0] if range_def[1] != range_def[0] else 1.0
-            e_range = range_def[3] - range_def[2] if range_def[3] != range_def[2] else 1.0
-            f_range = range_def[5] - range_def[4] if range_def[5] != range_def[4] else 1.0
-            d_scale = (d_max - d_min) / 255.0
-            e_scale = (e_max - e_min) / 255.0
-            f_scale = (f_max - f_min) / 255.0
-            m1_f = float(m1 - 1)
-            m2_f = float(m2 - 1)
-            m3_f = float(m3 - 1)
-            stride_e = m3
-            stride_d = m2 * m3
-
-            pixel_data = bytearray(width * height * 4)
-            pixel_idx = 0
-            num_pixels = width * height
-
-            for i in range(0, num_pixels * 3, 3):
-                if i + 2 >= len(sample_data):
-                    break
-
-                # Decode bytes to DEF range, then normalize to table indices
-                d = d_min + sample_data[i] * d_scale
-                e = e_min + sample_data[i + 1] * e_scale
-                f = f_min + sample_data[i + 2] * f_scale
-
-                di = max(0.0, min(m1_f, (d - range_def[0]) / d_range * m1_f))
-                ei = max(0.0, min(m2_f, (e - range_def[2]) / e_range * m2_f))
-                fi = max(0.0, min(m3_f, (f - range_def[4]) / f_range * m3_f))
-
-                di0 = int(di); ei0 = int(ei); fi0 = int(fi)
-                di1 = min(di0 + 1, m1 - 1)
-                ei1 = min(ei0 + 1, m2 - 1)
-                fi1 = min(fi0 + 1, m3 - 1)
-                dd = di - di0; de = ei - ei0; df = fi - fi0
-                dd1 = 1.0 - dd; de1 = 1.0 - de; df1 = 1.0 - df
-
-                # 8 corner indices
-                i000 = di0 * stride_d + ei0 * stride_e + fi0
-                i001 = di0 * stride_d + ei0 * stride_e + fi1
-                i010 = di0 * stride_d + ei1 * stride_e + fi0
-                i011 = di0 * stride_d + ei1 * stride_e + fi1
-                i100 = di1 * stride_d + ei0 * stride_e + fi0
-                i101 = di1 * stride_d + ei0 * stride_e + fi1
-                i110 = di1 * stride_d + ei1 * stride_e + fi0
-                i111 = di1 * stride_d + ei1 * stride_e + fi1
-
-                # Trilinear interpolation for each channel
-                r = (((r_tab[i000] * df1 + r_tab[i001] * df) * de1 +
-                      (r_tab[i010] * df1 + r_tab[i011] * df) * de) * dd1 +
-                     ((r_tab[i100] * df1 + r_tab[i101] * df) * de1 +
-                      (r_tab[i110] * df1 + r_tab[i111] * df) * de) * dd)
-                g = (((g_tab[i000] * df1 + g_tab[i001] * df) * de1 +
-                      (g_tab[i010] * df1 + g_tab[i011] * df) * de) * dd1 +
-                     ((g_tab[i100] * df1 + g_tab[i101] * df) * de1 +
-                      (g_tab[i110] * df1 + g_tab[i111] * df) * de) * dd)
-                b_ = (((b_tab[i000] * df1 + b_tab[i001] * df) * de1 +
-                       (b_tab[i010] * df1 + b_tab[i011] * df) * de) * dd1 +
-                      ((b_tab[i100] * df1 + b_tab[i101] * df) * de1 +
-                       (b_tab[i110] * df1 + b_tab[i111] * df) * de) * dd)
-
-                pixel_data[pixel_idx] = max(0, min(255, int(b_ * 255 + 0.5)))
-                pixel_data[pixel_idx + 1] = max(0, min(255, int(g * 255 + 0.5)))
-                pixel_data[pixel_idx + 2] = max(0, min(255, int(r * 255 + 0.5)))
-                pixel_data[pixel_idx + 3] = 255
-                pixel_idx += 4
-
             if mask_color is not None:
                 _apply_color_key_mask(pixel_data, sample_data, bits_per_component,
                                       width, height, components, mask_color)
             return pixel_data
 
         elif space_name == "CIEBasedDEFG" and bits_per_component == 8:
-            # 4-component: per-pixel DEFG conversion (DEFG Tables are less common)
-            pixel_data = bytearray(width * height * 4)
-            pixel_idx = 0
-
-            for i in range(0, width * height * 4, 4):
-                if i + 3 >= len(sample_data):
-                    break
-                d = decode_array[0] + (sample_data[i] / 255.0) * (decode_array[1] - decode_array[0])
-                e = decode_array[2] + (sample_data[i+1] / 255.0) * (decode_array[3] - decode_array[2])
-                f = decode_array[4] + (sample_data[i+2] / 255.0) * (decode_array[5] - decode_array[4])
-                g = decode_array[6] + (sample_data[i+3] / 255.0) * (decode_array[7] - decode_array[6])
-
-                r, gv, b_ = ColorSpaceEngine.cie_defg_to_rgb([d, e, f, g], cie_dict)
-                pixel_data[pixel_idx] = max(0, min(255, int(b_ * 255 + 0.5)))
-                pixel_data[pixel_idx + 1] = max(0, min(255, int(gv * 255 + 0.5)))
-                pixel_data[pixel_idx + 2] = max(0, min(255, int(r * 255 + 0.5)))
-                pixel_data[pixel_idx + 3] = 255
-                pixel_idx += 4
-
+            pixel_data = cie_lut.convert_defg_image(sample_data, width * height,
+                                                    decode_array, cie_dict)
             if mask_color is not None:
                 _apply_color_key_mask(pixel_data, sample_data, bits_per_component,
                                       width, height, components, mask_color)
@@ -1519,8 +1447,8 @@ def _convert_rgb_samples(sample_data: bytes | bytearray, bits_per_component: int
     """Convert RGB PostScript samples to Cairo RGB24 format"""
     try:
         if bits_per_component == 8:
-            # Cython fast path
-            if _CYTHON_IMAGE_CONV:
+            # Fast path
+            if _FAST_IMAGE_CONV:
                 num_pixels = width * height
                 if _is_identity_decode(decode_array, 3):
                     return rgb8_to_bgrx(sample_data, num_pixels)
@@ -1574,8 +1502,8 @@ def _convert_rgb_samples(sample_data: bytes | bytearray, bits_per_component: int
             return output
 
         elif bits_per_component == 4:
-            # Cython fast path
-            if _CYTHON_IMAGE_CONV:
+            # Fast path
+            if _FAST_IMAGE_CONV:
                 return rgb4_to_bgrx(sample_data, width, height, decode_array)
 
             # 4-bit RGB: each sample is 4 bits, 3 components = 12 bits per pixel
@@ -1627,8 +1555,8 @@ def _convert_rgb_samples(sample_data: bytes | bytearray, bits_per_component: int
             return output
 
         elif bits_per_component == 12:
-            # Cython fast path
-            if _CYTHON_IMAGE_CONV:
+            # Fast path
+            if _FAST_IMAGE_CONV:
                 return rgb12_to_bgrx(sample_data, width, height, decode_array)
 
             # 12-bit RGB: each sample is 12 bits (0-4095 range)
@@ -1716,8 +1644,8 @@ def _convert_cmyk_to_rgb(sample_data: bytes | bytearray, bits_per_component: int
                 return icc_result
 
         if bits_per_component == 8:
-            # Cython fast path
-            if _CYTHON_IMAGE_CONV:
+            # Fast path
+            if _FAST_IMAGE_CONV:
                 num_pixels = width * height
                 if _is_identity_decode(decode_array, 4):
                     return cmyk8_to_bgrx(sample_data, num_pixels)
@@ -1784,8 +1712,8 @@ def _convert_cmyk_to_rgb(sample_data: bytes | bytearray, bits_per_component: int
             return output
 
         elif bits_per_component == 4:
-            # Cython fast path
-            if _CYTHON_IMAGE_CONV:
+            # Fast path
+            if _FAST_IMAGE_CONV:
                 return cmyk4_to_bgrx(sample_data, width, height, decode_array)
 
             output = bytearray()
@@ -1833,8 +1761,8 @@ def _convert_cmyk_to_rgb(sample_data: bytes | bytearray, bits_per_component: int
             return output
 
         elif bits_per_component == 12:
-            # Cython fast path
-            if _CYTHON_IMAGE_CONV:
+            # Fast path
+            if _FAST_IMAGE_CONV:
                 return cmyk12_to_bgrx(sample_data, width, height, decode_array)
 
             # 12-bit CMYK: each sample is 12 bits (0-4095 range)
@@ -0,0 +1,124 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from __future__ import annotations
+
+"""
+Precompiled path emission for Cairo.
+
+Display list paths are lists of SubPaths holding MoveTo/LineTo/CurveTo/
+ClosePath objects.  Walking that structure and dispatching on each segment
+is a large part of the cost of rendering pages with many small elements, so
+each Path is compiled once into a flat segment opcode string and a packed
+coordinate array.  The compiled form is cached on the Path (display list
+paths are not modified after they are committed) and replayed by a tight
+loop — the Cython version in _path_emit_cy.pyx when it is built.
+
+Opcodes are the SEG_* segment tags, which match Cairo's PATH_* values.
+"""
+
+from array import array
+
+from ...core import types as ps
+
+try:
+    from ._path_emit_cy import emit_compiled_path as _emit_compiled_path_cy
+    _CYTHON_PATH_EMIT = True
+except ImportError:
+    _CYTHON_PATH_EMIT = False
+
+
+# Offset applied to the closing endpoint of an unclosed subpath on vector
+# surfaces, see compile_path().
+_NUDGE = 0.01
+
+
+def compile_path(path: ps.Path) -> tuple[bytes, array, tuple[int, ...]]:
+    """
+    Compile a device-space path into opcodes and packed coordinates.
+
+    On vector surfaces (PDF/SVG), Cairo auto-closes subpaths whose last point
+    coincides with the first, creating an unwanted line join.  The renderer
+    prevents this by nudging the endpoint; the coordinate indices of those
+    endpoints are returned so the nudge can be applied at emission time.
+
+    Args:
+        path: Path whose points are in device space
+
+    Returns:
+        (ops, coords, nudge_indices) where ops holds one SEG_* byte per
+        segment, coords holds 2 doubles per MoveTo/LineTo and 6 per CurveTo,
+        and nudge_indices are the x coordinate indices to nudge.
+    """
+    ops = bytearray()
+    coords = array('d')
+    nudge_indices = []
+    for subpath in path:
+        for pc_item in subpath:
+            seg = pc_item.SEG_TYPE
+            ops.append(seg)
+            if seg == ps.SEG_CURVETO:
+                coords.extend((pc_item.p1.x, pc_item.p1.y,
+                               pc_item.p2.x, pc_item.p2.y,
+                               pc_item.p3.x, pc_item.p3.y))
+            elif seg != ps.SEG_CLOSEPATH:
+                coords.append(pc_item.p.x)
+                coords.append(pc_item.p.y)
+
+        if len(subpath) >= 2:
+            first = subpath[0]
+            last = subpath[-1]
+            if first.SEG_TYPE == ps.SEG_MOVETO and last.SEG_TYPE in (ps.SEG_LINETO, ps.SEG_CURVETO):
+                end = last.p3 if last.SEG_TYPE == ps.SEG_CURVETO else last.p
+                if abs(end.x - first.p.x) < 1e-6 and abs(end.y - first.p.y) < 1e-6:
+                    nudge_indices.append(len(coords) - 2)
+
+    return bytes(ops), coords, tuple(nudge_indices)
+
+
+def emit_path(cairo_ctx, path: ps.Path, nudge_closing: bool = False,
+              dx: float = 0.0, dy: float = 0.0) -> None:
+    """
+    Append a display list path to the Cairo context's current path.
+
+    Args:
+        cairo_ctx: Cairo context
+        path: Path whose points are in device space
+        nudge_closing: Nudge coincident endpoints of unclosed subpaths
+            (vector surfaces only)
+        dx: X offset added to every point
+        dy: Y offset added to every point
+    """
+    compiled = path.compiled
+    if compiled is None:
+        compiled = path.compiled = compile_path(path)
+    ops, coords, nudge_indices = compiled
+
+    if nudge_closing and nudge_indices:
+        coords = array('d', coords)
+        for i in nudge_indices:
+            coords[i] += _NUDGE
+
+    if _CYTHON_PATH_EMIT:
+        _emit_compiled_path_cy(cairo_ctx, ops, coords, dx, dy)
+        return
+
+    move_to = cairo_ctx.move_to
+    line_to = cairo_ctx.line_to
+    curve_to = cairo_ctx.curve_to
+    c = 0
+    for seg in ops:
+        if seg == 1:    # SEG_LINETO
+            line_to(coords[c] + dx, coords[c + 1] + dy)
+            c += 2
+        elif seg == 0:  # SEG_MOVETO
+            move_to(coords[c] + dx, coords[c + 1] + dy)
+            c += 2
+        elif seg == 2:  # SEG_CURVETO
+            curve_to(coords[c] + dx, coords[c + 1] + dy,
+                     coords[c + 2] + dx, coords[c + 3] + dy,
+                     coords[c + 4] + dx, coords[c + 5] + dy)
+            c += 6
+        else:           # SEG_CLOSEPATH
+            cairo_ctx.close_path()
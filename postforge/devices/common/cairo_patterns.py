@@ -11,23 +11,61 @@ Renders Type 1 (tiling) and Type 2 (shading) pattern fills
 from PostScript display list elements to Cairo contexts.
 """
 
+from collections import OrderedDict
+
 import cairo
 
 from ...core import types as ps
+from .cairo_path import emit_path
 from .cairo_shading import _add_gradient_stops
 from .cairo_utils import _safe_rgb
 
 
+# Device-resolution pattern tile cache (LRU with byte limit), shared across
+# fills and pages.
+# Key: (id(impl), cell_width, cell_height, tile_color)
+# Value: (impl, cairo.SurfacePattern, nbytes) — holding impl keeps its id
+# from being reused while the entry is alive
+_PATTERN_TILE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_pattern_tile_cache = OrderedDict()
+_pattern_tile_cache_bytes = 0
+_pattern_tile_stats = {'hits': 0, 'misses': 0}
+
+
+def get_pattern_tile_cache_stats() -> dict:
+    """Return pattern tile cache statistics."""
+    hits = _pattern_tile_stats['hits']
+    misses = _pattern_tile_stats['misses']
+    total = hits + misses
+    return {
+        'entries': len(_pattern_tile_cache),
+        'bytes': _pattern_tile_cache_bytes,
+        'max_bytes': _PATTERN_TILE_CACHE_MAX_BYTES,
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / total if total > 0 else 0.0,
+    }
+
+
+def clear_pattern_tile_cache() -> None:
+    """Clear the pattern tile cache."""
+    global _pattern_tile_cache_bytes
+    _pattern_tile_cache.clear()
+    _pattern_tile_cache_bytes = 0
+    _pattern_tile_stats['hits'] = 0
+    _pattern_tile_stats['misses'] = 0
+
+
 def _render_pattern_fill(item: ps.PatternFill, cairo_ctx: cairo.Context, ctxt: ps.Context) -> None:
     """
     Render a pattern fill using Cairo surface patterns.
 
     This function:
     1. Gets pattern parameters from the pattern dictionary
-    2. Creates an offscreen surface for the pattern cell
-    3. Renders the cached display list (from makepattern) to the cell
-    4. Creates a Cairo surface pattern for tiling
-    5. Fills the current path with the pattern
+    2. Looks up the device-resolution tile in the pattern tile cache
+    3. On a miss, renders the cached display list (from makepattern) to an
+       offscreen cell and wraps it in a repeating Cairo surface pattern
+    4. Fills the current path with the pattern
 
     The PaintProc is executed during makepattern (not here) to ensure
     all dictionary definitions are in scope at execution time.
@@ -64,7 +102,6 @@ def _render_pattern_fill(item: ps.PatternFill, cairo_ctx: cairo.Context, ctxt: p
         return
 
     # Type 1 (tiling) pattern handling
-    bbox = impl['bbox']
     xstep = impl['xstep']
     ystep = impl['ystep']
 
@@ -75,10 +112,6 @@ def _render_pattern_fill(item: ps.PatternFill, cairo_ctx: cairo.Context, ctxt: p
     # The pattern matrix transforms from pattern space to device space
     a, b, c, d, tx, ty = pattern_matrix
 
-    # Transform BBox to get cell size
-    # BBox is [left, bottom, right, top] in pattern coordinates
-    llx, lly, urx, ury = bbox
-
     # Calculate device cell dimensions using the pattern matrix
     # We need to determine appropriate cell size for rendering
     cell_width = abs(xstep * a + 0 * c)
@@ -107,6 +140,47 @@ def _render_pattern_fill(item: ps.PatternFill, cairo_ctx: cairo.Context, ctxt: p
         cairo_ctx.fill()
         return
 
+    # Tiles are cached at device resolution, keyed by pattern instance, cell
+    # size and (for uncolored patterns) the color supplied to setpattern
+    tile_color = tuple(_safe_rgb(underlying_color)) if paint_type == 2 else None
+    cache_key = (id(impl), cell_width, cell_height, tile_color)
+    cached = _pattern_tile_cache.get(cache_key)
+    if cached is not None:
+        _pattern_tile_stats['hits'] += 1
+        _pattern_tile_cache.move_to_end(cache_key)  # LRU: mark as recently used
+        pattern = cached[1]
+    else:
+        _pattern_tile_stats['misses'] += 1
+        pattern = _build_pattern_tile(impl, cell_width, cell_height, tile_color)
+        _store_pattern_tile(cache_key, impl, pattern, cell_width, cell_height)
+
+    # Apply the pattern fill
+    cairo_ctx.set_source(pattern)
+    cairo_ctx.set_fill_rule(winding_rule)
+    cairo_ctx.fill()
+
+
+def _build_pattern_tile(impl: dict, cell_width: int, cell_height: int,
+                        tile_color: tuple | None) -> cairo.SurfacePattern:
+    """
+    Render one pattern cell and wrap it in a repeating surface pattern.
+
+    Args:
+        impl: Pattern implementation data from makepattern
+        cell_width: Cell width in device pixels
+        cell_height: Cell height in device pixels
+        tile_color: RGB color for uncolored (PaintType 2) patterns, which
+            replaces every color used by the PaintProc; None for colored
+            patterns
+
+    Returns:
+        SurfacePattern with EXTEND_REPEAT mapping device space to the cell
+    """
+    a, b, c, d, tx, ty = impl['pattern_matrix']
+    llx, lly = impl['bbox'][0], impl['bbox'][1]
+    xstep = impl['xstep']
+    ystep = impl['ystep']
+
     # Create offscreen surface for pattern cell
     pattern_surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, cell_width, cell_height)
     pattern_ctx = cairo.Context(pattern_surface)
@@ -132,26 +206,15 @@ def _render_pattern_fill(item: ps.PatternFill, cairo_ctx: cairo.Context, ctxt: p
 
     # Render the cached display list to the pattern surface
     for dl_item in cached_dl:
-        if isinstance(dl_item, ps.Path):
-            for subpath in dl_item:
-                for pc_item in subpath:
-                    if isinstance(pc_item, ps.MoveTo):
-                        pattern_ctx.move_to(pc_item.p.x, pc_item.p.y)
-                    elif isinstance(pc_item, ps.LineTo):
-                        pattern_ctx.line_to(pc_item.p.x, pc_item.p.y)
-                    elif isinstance(pc_item, ps.CurveTo):
-                        pattern_ctx.curve_to(
-                            pc_item.p1.x, pc_item.p1.y,
-                            pc_item.p2.x, pc_item.p2.y,
-                            pc_item.p3.x, pc_item.p3.y)
-                    elif isinstance(pc_item, ps.ClosePath):
-                        pattern_ctx.close_path()
-        elif isinstance(dl_item, ps.Fill):
-            pattern_ctx.set_source_rgb(*_safe_rgb(dl_item.color))
+        dl_type = dl_item.DL_TYPE
+        if dl_type == ps.DL_PATH:
+            emit_path(pattern_ctx, dl_item)
+        elif dl_type == ps.DL_FILL:
+            pattern_ctx.set_source_rgb(*(tile_color or _safe_rgb(dl_item.color)))
             pattern_ctx.set_fill_rule(dl_item.winding_rule)
             pattern_ctx.fill()
-        elif isinstance(dl_item, ps.Stroke):
-            pattern_ctx.set_source_rgb(*_safe_rgb(dl_item.color))
+        elif dl_type == ps.DL_STROKE:
+            pattern_ctx.set_source_rgb(*(tile_color or _safe_rgb(dl_item.color)))
             # Line width is already in pattern space from cached display list
             pattern_ctx.set_line_width(dl_item.line_width)
             pattern_ctx.set_line_cap(dl_item.line_cap)
@@ -236,10 +299,21 @@ def _render_pattern_fill(item: ps.PatternFill, cairo_ctx: cairo.Context, ctxt: p
         m = cairo.Matrix(ma, mb, mc, md, mtx, mty)
         pattern.set_matrix(m)
 
-    # Apply the pattern fill
-    cairo_ctx.set_source(pattern)
-    cairo_ctx.set_fill_rule(winding_rule)
-    cairo_ctx.fill()
+    return pattern
+
+
+def _store_pattern_tile(cache_key: tuple, impl: dict, pattern: cairo.SurfacePattern,
+                        cell_width: int, cell_height: int) -> None:
+    """Add a tile to the cache, evicting least recently used tiles over the byte limit."""
+    global _pattern_tile_cache_bytes
+    nbytes = cell_width * cell_height * 4
+    if nbytes > _PATTERN_TILE_CACHE_MAX_BYTES:
+        return
+    while _pattern_tile_cache and _pattern_tile_cache_bytes + nbytes > _PATTERN_TILE_CACHE_MAX_BYTES:
+        _, evicted = _pattern_tile_cache.popitem(last=False)
+        _pattern_tile_cache_bytes -= evicted[2]
+    _pattern_tile_cache[cache_key] = (impl, pattern, nbytes)
+    _pattern_tile_cache_bytes += nbytes
 
 
 def _render_shading_pattern_fill(item: ps.PatternFill, cairo_ctx: cairo.Context, impl: dict) -> None:
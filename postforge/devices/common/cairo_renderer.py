@@ -12,10 +12,18 @@ logic used by multiple output devices (PNG, PDF, SVG, Qt).
 
 Architecture:
 - render_display_list() is the main entry point for device implementations
+- Elements are dispatched on their DL_TYPE tag through handler tables;
+  paths are emitted from a cached compiled form (see cairo_path)
 - Text rendering maps PostScript fonts to system fonts via Cairo
 - Glyph bitmap caching captures glyph regions for reuse
+- Elements whose device-space bounding box lies entirely outside the current
+  clip are culled without issuing any Cairo calls
+- Runs of identically painted fills and strokes are merged into one compound
+  path per paint operation, and stepped-color gradient strips are replaced
+  by axial shadings, before rendering
 
 Submodules:
+- cairo_path: Compiled path emission
 - cairo_images: Image rendering and pixel format conversion
 - cairo_shading: Gradient and shading fill rendering
 - cairo_patterns: Tiling and shading pattern fills
@@ -23,25 +31,136 @@ Submodules:
 
 import copy
 import math
+from collections import OrderedDict
 
 import cairo
 
 from ...core import types as ps
+from ...core.display_list_builder import merge_paint_runs, replace_gradient_strips
 from ...core.glyph_cache import CachedBitmap
 from ...core.types.context import global_resources
 from .cairo_images import (
     _render_image_element, _render_imagemask_element, _render_colorimage_element,
-    get_imagemask_cache_stats, clear_imagemask_cache,
+    get_image_surface_cache_stats, clear_image_surface_cache,
 )
 from .cairo_shading import (
     _render_axial_shading, _render_radial_shading,
     _render_mesh_shading_batch, _render_mesh_shading,
     _render_patch_shading, _render_function_shading,
 )
-from .cairo_patterns import _render_pattern_fill
+from .cairo_path import emit_path
+from .cairo_patterns import (
+    _render_pattern_fill, get_pattern_tile_cache_stats, clear_pattern_tile_cache,
+)
 from .cairo_utils import _safe_rgb
 
 
+# Clip culling statistics, accumulated across pages.
+# 'tested' counts elements with a known bounding box, 'culled' those skipped.
+_cull_stats = {'tested': 0, 'culled': 0}
+
+
+def get_cull_stats() -> dict:
+    """Return clip culling statistics."""
+    tested = _cull_stats['tested']
+    culled = _cull_stats['culled']
+    return {
+        'tested': tested,
+        'culled': culled,
+        'cull_rate': culled / tested if tested > 0 else 0.0,
+    }
+
+
+def clear_cull_stats() -> None:
+    """Reset clip culling statistics."""
+    _cull_stats['tested'] = 0
+    _cull_stats['culled'] = 0
+
+
+# Paint batching statistics, accumulated across pages.  Each paint element
+# folded into a run saves the state setup and paint calls it would have
+# issued on its own (the isotropic stroke case; anisotropic strokes save more).
+_FILL_PAINT_CALLS = 4     # set_source_rgb, set_fill_rule, fill_extents, fill
+_STROKE_PAINT_CALLS = 7   # set_source_rgb, set_line_join, set_line_cap,
+                          # set_miter_limit, set_line_width, set_dash, stroke
+_batch_stats = {'fills_merged': 0, 'strokes_merged': 0,
+                'gradient_runs': 0, 'gradient_strips': 0}
+
+
+def get_batch_stats() -> dict:
+    """Return paint batching and gradient strip statistics."""
+    fills = _batch_stats['fills_merged']
+    strokes = _batch_stats['strokes_merged']
+    return {
+        'fills_merged': fills,
+        'strokes_merged': strokes,
+        'calls_saved': fills * _FILL_PAINT_CALLS + strokes * _STROKE_PAINT_CALLS,
+        'gradient_runs': _batch_stats['gradient_runs'],
+        'gradient_strips': _batch_stats['gradient_strips'],
+    }
+
+
+def clear_batch_stats() -> None:
+    """Reset paint batching and gradient strip statistics."""
+    for key in _batch_stats:
+        _batch_stats[key] = 0
+
+
+# Form reuse on vector surfaces.  An execform form's form-space display list
+# is recorded once into a RecordingSurface bounded by the form BBox.  Cairo's
+# PDF and SVG backends write a recording surface used as a source once per
+# document (a Form XObject painted with Do, an SVG <defs> group placed with
+# <use>), so each further invocation only adds a reference.
+# Text that the device defers for injection (see _render_text_obj) is left
+# out of the recording and deferred from the expanded elements on each
+# invocation instead, so recordings are kept per text deferral mode.
+# The minimum line width is recorded in form space, so recordings are also
+# kept per invocation scale, in steps of 1/_FORM_SCALE_STEPS of a doubling.
+# Key: (id(FormStart.elements), deferral mode, scale step or None)
+# Value: (elements, RecordingSurface) — surface is None for forms that must
+# be expanded; holding elements keeps its id from being reused
+_FORM_SURFACE_CACHE_MAX = 256
+_FORM_SCALE_STEPS = 64
+_form_surface_cache = OrderedDict()
+_form_stats = {'recorded': 0, 'reused': 0, 'expanded': 0}
+
+# Element types that prevent recording a form: glyph bitmaps and pattern
+# tiles are built at device resolution.
+_FORM_UNRECORDABLE_TYPES = frozenset({ps.DL_GLYPH_REF, ps.DL_PATTERN_FILL})
+
+
+def get_form_stats() -> dict:
+    """Return form reuse statistics for vector surfaces."""
+    return {
+        'recorded': _form_stats['recorded'],
+        'reused': _form_stats['reused'],
+        'expanded': _form_stats['expanded'],
+        'entries': len(_form_surface_cache),
+    }
+
+
+def clear_form_stats() -> None:
+    """Reset form reuse statistics and drop recorded form surfaces."""
+    _form_surface_cache.clear()
+    for key in _form_stats:
+        _form_stats[key] = 0
+
+
+def _outside_clip(bbox: tuple, clip_bbox: tuple, margin: float) -> bool:
+    """Return True if bbox lies entirely outside clip_bbox grown by margin."""
+    return (bbox[2] < clip_bbox[0] - margin or bbox[0] > clip_bbox[2] + margin or
+            bbox[3] < clip_bbox[1] - margin or bbox[1] > clip_bbox[3] + margin)
+
+
+class _RenderState:
+    """Per-call state shared by the display list element handlers."""
+    __slots__ = ('ctxt', 'cairo_ctx', 'display_list', 'n_items', 'page_height',
+                 'min_line_width', 'deferred_text_objs', 'defer_all_text',
+                 'is_vector_surface', 'handlers', 'next_index',
+                 'glyph_capture_stack', 'clip_path', 'clip_winding',
+                 'clip_bbox', 'cull_margin', 'tested', 'culled')
+
+
 def render_display_list(ctxt: ps.Context, cairo_ctx, page_height: int, min_line_width: float = 1,
                         deferred_text_objs: list = None, defer_all_text: bool = False) -> None:
     """
@@ -53,6 +172,11 @@ def render_display_list(ctxt: ps.Context, cairo_ctx, page_height: int, min_line_
     3. Call this function to render the display list
     4. Finalize output (write to file, display to screen, etc.)
 
+    Each element is dispatched on its DL_TYPE tag through a handler table.
+    Handlers may advance rs.next_index past elements they consume (a culled
+    path's paint operation, a batch of mesh shadings, the expanded elements
+    of a form placed from its recording on vector surfaces).
+
     Args:
         ctxt: PostScript context with display_list to render
         cairo_ctx: Cairo context to render to
@@ -65,362 +189,547 @@ def render_display_list(ctxt: ps.Context, cairo_ctx, page_height: int, min_line_
         defer_all_text: If True, ALL TextObjs are deferred (not just non-Standard 14).
             Used by SVG device to capture all text for native SVG text elements.
     """
-    _glyph_capture_stack = []
-    _inside_glyph_capture = False
-
     # On vector surfaces (PDF), skip bitmap glyph caching and render paths directly.
     # Bitmap blitting loses vector fidelity and has coordinate issues with PDF scaling.
-    _is_vector_surface = isinstance(cairo_ctx.get_target(), (cairo.PDFSurface, cairo.SVGSurface))
+    is_vector_surface = isinstance(cairo_ctx.get_target(), (cairo.PDFSurface, cairo.SVGSurface))
+    _render_elements(ctxt, cairo_ctx, ctxt.display_list, page_height, min_line_width,
+                     deferred_text_objs, defer_all_text, is_vector_surface)
+
+
+def _render_elements(ctxt: ps.Context, cairo_ctx, elements: list, page_height: int,
+                     min_line_width: float, deferred_text_objs: list | None,
+                     defer_all_text: bool, is_vector_surface: bool) -> None:
+    """
+    Render a list of display list elements to a Cairo context.
+
+    Shared by page rendering and by form recording on vector surfaces, where
+    the target is a RecordingSurface in form space.  Arguments are as for
+    render_display_list(); is_vector_surface selects the handler table.
+    """
+    rs = _RenderState()
+    rs.ctxt = ctxt
+    rs.cairo_ctx = cairo_ctx
+
+    # Replace stepped-color gradient strips with axial shadings, then fold
+    # runs of identically painted fills and strokes into compound paths.
+    # The page's own display list is left untouched.
+    display_list, gradient_runs, gradient_strips = replace_gradient_strips(elements)
+    display_list, merged_fills, merged_strokes = merge_paint_runs(display_list)
+    _batch_stats['gradient_runs'] += gradient_runs
+    _batch_stats['gradient_strips'] += gradient_strips
+    _batch_stats['fills_merged'] += merged_fills
+    _batch_stats['strokes_merged'] += merged_strokes
+
+    rs.display_list = display_list
+    rs.n_items = n_items = len(display_list)
+    rs.page_height = page_height
+    rs.min_line_width = min_line_width
+    rs.deferred_text_objs = deferred_text_objs
+    rs.defer_all_text = defer_all_text
+
+    rs.is_vector_surface = is_vector_surface
+    rs.handlers = _VECTOR_HANDLERS if rs.is_vector_surface else _RASTER_HANDLERS
+    rs.glyph_capture_stack = []
 
     # Track current clip state for deferred text objects (PDF injection)
-    _current_clip_path = None
-    _current_clip_winding = None
-
-    for display_index, item in enumerate(ctxt.display_list):
-        if isinstance(item, ps.ClipElement):
-            # If this is initclip, only reset Cairo's clipping and skip path processing
-            if item.is_initclip:
-                _current_clip_path = None
-                _current_clip_winding = None
-                cairo_ctx.reset_clip()
-                continue
-
-            # Apply clipping path with winding rule for regular clip/eoclip
-            if item.path:
-                _current_clip_path = item.path
-                _current_clip_winding = item.winding_rule
-                # Start a new path for clipping
-                cairo_ctx.new_path()
-
-                # Build clipping path from PostScript path
-                for subpath in item.path:
-                    for pc_item in subpath:
-                        if isinstance(pc_item, ps.MoveTo):
-                            cairo_ctx.move_to(pc_item.p.x, pc_item.p.y)
-                            continue
-                        elif isinstance(pc_item, ps.LineTo):
-                            cairo_ctx.line_to(pc_item.p.x, pc_item.p.y)
-                            continue
-                        elif isinstance(pc_item, ps.CurveTo):
-                            cairo_ctx.curve_to(
-                                pc_item.p1.x, pc_item.p1.y,
-                                pc_item.p2.x, pc_item.p2.y,
-                                pc_item.p3.x, pc_item.p3.y,
-                            )
-                            continue
-                        elif isinstance(pc_item, ps.ClosePath):
-                            cairo_ctx.close_path()
-
-                # Check for degenerate clip paths (zero or near-zero width/height)
-                # GhostScript handles these by giving them minimum pixel width
-                x1, y1, x2, y2 = cairo_ctx.path_extents()
-                path_width = abs(x2 - x1)
-                path_height = abs(y2 - y1)
-                # Use 0.1 device pixel — catches truly degenerate (zero-area)
-                # paths while preserving legitimate narrow gradient strips
-                # (e.g., Illustrator EPS gradients use ~1 device pixel strips).
-                MIN_CLIP_DIMENSION = 0.1
-
-                if path_width < MIN_CLIP_DIMENSION or path_height < MIN_CLIP_DIMENSION:
-                    # Expand degenerate path to have minimum dimensions
-                    # Calculate expansion needed
-                    expand_x = (MIN_CLIP_DIMENSION - path_width) / 2 if path_width < MIN_CLIP_DIMENSION else 0
-                    expand_y = (MIN_CLIP_DIMENSION - path_height) / 2 if path_height < MIN_CLIP_DIMENSION else 0
-
-                    # Create expanded rectangular clip region
-                    cairo_ctx.new_path()
-                    cairo_ctx.rectangle(x1 - expand_x, y1 - expand_y,
-                                       path_width + 2 * expand_x, path_height + 2 * expand_y)
-
-                # Set fill rule based on winding rule
-                if item.winding_rule == ps.WINDING_EVEN_ODD:
-                    cairo_ctx.set_fill_rule(cairo.FILL_RULE_EVEN_ODD)
-                else:
-                    cairo_ctx.set_fill_rule(cairo.FILL_RULE_WINDING)
-
-                # Apply clipping
-                cairo_ctx.clip()
-            continue
-
-        # Glyph bitmap cache elements — must be checked before the capture skip
-        if isinstance(item, ps.GlyphRef):
-            if _is_vector_surface:
-                _render_glyph_ref_vector(item, cairo_ctx)
-            else:
-                _render_glyph_ref(item, cairo_ctx)
-            continue
-
-        if isinstance(item, ps.GlyphStart):
-            if _is_vector_surface:
-                # On vector surfaces, skip bitmap capture — let Path+Fill render directly
-                continue
-            # Begin tracking glyph elements for bitmap capture.
-            # Suppress normal rendering — glyph will be rendered offscreen at GlyphEnd.
-            _glyph_capture_stack.append(_GlyphCaptureState(
-                cache_key=item.cache_key,
-                position_x=item.position_x,
-                position_y=item.position_y,
-                start_index=display_index,
-            ))
-            _inside_glyph_capture = True
-            continue
-
-        if isinstance(item, ps.GlyphEnd):
-            if _is_vector_surface:
-                continue
-            _inside_glyph_capture = False
-            if _glyph_capture_stack:
-                state = _glyph_capture_stack.pop()
-                _capture_glyph_bitmap(cairo_ctx, ctxt.display_list, display_index, state)
-                # Blit the just-captured bitmap to the main surface
-                _render_glyph_ref_by_key(state.cache_key, state.position_x, state.position_y, cairo_ctx)
-            continue
-
-        # Skip normal rendering when inside GlyphStart..GlyphEnd capture region.
-        # These elements will be rendered offscreen at GlyphEnd instead.
-        if _inside_glyph_capture:
-            continue
-
-        if isinstance(item, ps.Path):
-            for subpath in item:
-                # On vector surfaces (PDF/SVG), Cairo auto-closes subpaths
-                # when the last point coincides with the first, creating an
-                # unwanted line join. Nudge the endpoint to prevent this.
-                _nudge_last_idx = -1
-                if _is_vector_surface and len(subpath) >= 2 and not isinstance(subpath[-1], ps.ClosePath):
-                    _first = subpath[0]
-                    _last = subpath[-1]
-                    if isinstance(_first, ps.MoveTo):
-                        _sx, _sy = _first.p.x, _first.p.y
-                        if isinstance(_last, ps.LineTo):
-                            _ex, _ey = _last.p.x, _last.p.y
-                        elif isinstance(_last, ps.CurveTo):
-                            _ex, _ey = _last.p3.x, _last.p3.y
-                        else:
-                            _ex, _ey = _sx + 1, _sy  # won't match
-                        if abs(_ex - _sx) < 1e-6 and abs(_ey - _sy) < 1e-6:
-                            _nudge_last_idx = len(subpath) - 1
-
-                for _sp_i, pc_item in enumerate(subpath):
-                    if isinstance(pc_item, ps.MoveTo):
-                        cairo_ctx.move_to(pc_item.p.x, pc_item.p.y)
-                        continue
-                    if isinstance(pc_item, ps.LineTo):
-                        if _sp_i == _nudge_last_idx:
-                            cairo_ctx.line_to(pc_item.p.x + 0.01, pc_item.p.y)
-                        else:
-                            cairo_ctx.line_to(pc_item.p.x, pc_item.p.y)
-                        continue
-                    if isinstance(pc_item, ps.CurveTo):
-                        if _sp_i == _nudge_last_idx:
-                            cairo_ctx.curve_to(
-                                pc_item.p1.x, pc_item.p1.y,
-                                pc_item.p2.x, pc_item.p2.y,
-                                pc_item.p3.x + 0.01, pc_item.p3.y,
-                            )
-                        else:
-                            cairo_ctx.curve_to(
-                                pc_item.p1.x, pc_item.p1.y,
-                                pc_item.p2.x, pc_item.p2.y,
-                                pc_item.p3.x, pc_item.p3.y,
-                            )
-                        continue
-                    if isinstance(pc_item, ps.ClosePath):
-                        cairo_ctx.close_path()
-                        continue
-
-        if isinstance(item, ps.Fill):
-            cairo_ctx.set_source_rgb(*_safe_rgb(item.color))
-            cairo_ctx.set_fill_rule(item.winding_rule)
-            # PLRM 7.5.1: "A shape is scan-converted by painting any pixel
-            # whose square region intersects the shape, no matter how small
-            # the intersection is."  Cairo's fill() produces nothing for
-            # zero-area paths (e.g. bare line segments).  Detect this by
-            # comparing fill_extents (empty for degenerate paths) against
-            # path_extents (non-empty if any segments exist) and fall back
-            # to a 1-device-pixel hairline stroke.
-            #
-            # KNOWN LIMITATION: This only handles fully degenerate paths
-            # (where fill_extents is empty).  Mixed paths containing both
-            # enclosed areas and zero-area segments (e.g. a rectangle plus
-            # a bare line, or coincident edges between subpaths) will fill
-            # the enclosed areas correctly but the zero-area segments will
-            # not be painted.  Fixing this would require detecting shared
-            # edges between subpaths geometrically.
-            fx1, fy1, fx2, fy2 = cairo_ctx.fill_extents()
-            if fx1 == fx2 and fy1 == fy2:
-                # Fill would produce nothing — check if path has extent
-                px1, py1, px2, py2 = cairo_ctx.path_extents()
-                if px1 != px2 or py1 != py2:
-                    cairo_ctx.save()
-                    cairo_ctx.identity_matrix()
-                    cairo_ctx.set_line_width(1.0)
-                    cairo_ctx.stroke()
-                    cairo_ctx.restore()
-                    continue
-            cairo_ctx.fill()
-            continue
-
-        if isinstance(item, ps.PatternFill):
-            _render_pattern_fill(item, cairo_ctx, ctxt)
-            continue
-
-        if isinstance(item, ps.AxialShadingFill):
-            _render_axial_shading(item, cairo_ctx)
-            continue
-
-        if isinstance(item, ps.RadialShadingFill):
-            _render_radial_shading(item, cairo_ctx)
-            continue
-
-        if isinstance(item, ps.FunctionShadingFill):
-            _render_function_shading(item, cairo_ctx)
-            continue
-
-        if isinstance(item, ps.MeshShadingFill):
-            # Batch consecutive MeshShadingFill items with same CTM for efficiency.
-            # Many PS generators emit thousands of 1-triangle meshes; batching them
-            # into a single Cairo MeshPattern is much faster.
-            batch = [item]
-            batch_ctm = item.ctm
-            # Look ahead for more meshes with same CTM
-            for j in range(display_index + 1, len(ctxt.display_list)):
-                next_item = ctxt.display_list[j]
-                if isinstance(next_item, ps.MeshShadingFill) and next_item.ctm == batch_ctm:
-                    batch.append(next_item)
-                else:
-                    break
-            # Mark batched items as processed by replacing them with None
-            for j in range(1, len(batch)):
-                ctxt.display_list[display_index + j] = None
-            _render_mesh_shading_batch(batch, cairo_ctx)
-            continue
-
-        # Skip items that were batched (replaced with None)
-        if item is None:
-            continue
-
-        if isinstance(item, ps.PatchShadingFill):
-            _render_patch_shading(item, cairo_ctx)
-            continue
-
-        if isinstance(item, ps.Stroke):
-            ctm = item.ctm
-            a, b, c, d, tx, ty = ctm
-
-            cairo_ctx.set_source_rgb(*_safe_rgb(item.color))
-            cairo_ctx.set_line_join(item.line_join)
-            cairo_ctx.set_line_cap(item.line_cap)
-            cairo_ctx.set_miter_limit(item.miter_limit)
-
-            # Compute singular values of the CTM to detect anisotropy.
-            # Singular values give the true max/min scale factors regardless
-            # of rotation, unlike column-vector lengths which can appear
-            # equal when rotation mixes the X/Y components.
-            sum_sq = a*a + b*b + c*c + d*d
-            diff_term = math.sqrt((a*a + b*b - c*c - d*d)**2 + 4*(a*c + b*d)**2)
-            s_max = math.sqrt(max(0, 0.5 * (sum_sq + diff_term)))
-            s_min = math.sqrt(max(0, 0.5 * (sum_sq - diff_term)))
-
-            # Use anisotropic path when max/min scale ratio exceeds threshold
-            det = a * d - b * c
-            is_anisotropic = (s_min > 1e-10 and s_max / s_min > 1.01
-                              and abs(det) > 1e-10)
-
-            if is_anisotropic:
-                # Anisotropic stroke: use Cairo's matrix to get correct
-                # directional line widths.  Path points are in device space,
-                # so we set Cairo's matrix to the CTM and transform each
-                # point back to user space before stroking.
-                inv_a = d / det
-                inv_b = -b / det
-                inv_c = -c / det
-                inv_d = a / det
-
-                # Extract current path from Cairo, transform to user space
-                cairo_path = cairo_ctx.copy_path()
-                cairo_ctx.new_path()
-
-                # Compose CTM with existing base matrix (identity for bitmap,
-                # device-to-PDF scaling for PDF surfaces) so the stroke
-                # renders in the correct coordinate space.
-                cairo_ctx.save()
-                cairo_ctx.transform(cairo.Matrix(a, b, c, d, tx, ty))
-
-                # Rebuild path in user space
-                for path_type, points in cairo_path:
-                    if path_type == 0:  # MOVE_TO
-                        x, y = points
-                        ux = inv_a * (x - tx) + inv_c * (y - ty)
-                        uy = inv_b * (x - tx) + inv_d * (y - ty)
-                        cairo_ctx.move_to(ux, uy)
-                    elif path_type == 1:  # LINE_TO
-                        x, y = points
-                        ux = inv_a * (x - tx) + inv_c * (y - ty)
-                        uy = inv_b * (x - tx) + inv_d * (y - ty)
-                        cairo_ctx.line_to(ux, uy)
-                    elif path_type == 2:  # CURVE_TO
-                        x1, y1, x2, y2, x3, y3 = points
-                        cairo_ctx.curve_to(
-                            inv_a * (x1 - tx) + inv_c * (y1 - ty),
-                            inv_b * (x1 - tx) + inv_d * (y1 - ty),
-                            inv_a * (x2 - tx) + inv_c * (y2 - ty),
-                            inv_b * (x2 - tx) + inv_d * (y2 - ty),
-                            inv_a * (x3 - tx) + inv_c * (y3 - ty),
-                            inv_b * (x3 - tx) + inv_d * (y3 - ty),
-                        )
-                    elif path_type == 3:  # CLOSE_PATH
-                        cairo_ctx.close_path()
-
-                # Stroke in user space — Cairo applies the CTM for
-                # correct anisotropic line widths.
-                # Ensure minimum 1 device pixel along the thinnest axis.
-                min_user_lw = min_line_width / s_max if s_max > 0 else min_line_width
-                cairo_ctx.set_line_width(max(item.line_width, min_user_lw))
-                user_dashes = item.dash_pattern[0]
-                user_offset = item.dash_pattern[1]
-                cairo_ctx.set_dash(user_dashes, user_offset)
-                cairo_ctx.stroke()
-                cairo_ctx.restore()
-                continue
-
-            # Isotropic stroke: simple uniform scale
-            scale_factor = s_max if s_max > 0 else 1.0
-            device_line_width = item.line_width * scale_factor
-            device_dashes = [dd * scale_factor for dd in item.dash_pattern[0]]
-            device_offset = item.dash_pattern[1] * scale_factor
-
-            cairo_ctx.set_line_width(max(min_line_width, device_line_width))
-            cairo_ctx.set_dash(device_dashes, device_offset)
+    rs.clip_path = None
+    rs.clip_winding = None
+
+    # Running clip bounding box in device space (Cairo user space).  Elements
+    # whose device_bbox misses it entirely are skipped.  The margin covers
+    # antialiasing and the minimum line width applied to hairlines.
+    rs.clip_bbox = cairo_ctx.clip_extents()
+    rs.cull_margin = max(1.0, min_line_width)
+    rs.tested = 0
+    rs.culled = 0
+
+    display_index = 0
+    while display_index < n_items:
+        item = display_list[display_index]
+        rs.next_index = display_index + 1
+        rs.handlers[item.DL_TYPE](rs, item, display_index)
+        display_index = rs.next_index
+
+    _cull_stats['tested'] += rs.tested
+    _cull_stats['culled'] += rs.culled
+
+
+def _handle_noop(rs: _RenderState, item: object, display_index: int) -> None:
+    """Elements with nothing to render (or suppressed in the current mode)."""
+
+
+def _handle_clip(rs: _RenderState, item: ps.ClipElement, display_index: int) -> None:
+    cairo_ctx = rs.cairo_ctx
+
+    # If this is initclip, only reset Cairo's clipping and skip path processing
+    if item.is_initclip:
+        rs.clip_path = None
+        rs.clip_winding = None
+        cairo_ctx.reset_clip()
+        rs.clip_bbox = cairo_ctx.clip_extents()
+        return
+
+    # Apply clipping path with winding rule for regular clip/eoclip
+    if not item.path:
+        return
+    rs.clip_path = item.path
+    rs.clip_winding = item.winding_rule
+
+    # Build clipping path from PostScript path
+    cairo_ctx.new_path()
+    emit_path(cairo_ctx, item.path)
+
+    # Check for degenerate clip paths (zero or near-zero width/height)
+    # GhostScript handles these by giving them minimum pixel width
+    x1, y1, x2, y2 = cairo_ctx.path_extents()
+    path_width = abs(x2 - x1)
+    path_height = abs(y2 - y1)
+    # Use 0.1 device pixel — catches truly degenerate (zero-area)
+    # paths while preserving legitimate narrow gradient strips
+    # (e.g., Illustrator EPS gradients use ~1 device pixel strips).
+    MIN_CLIP_DIMENSION = 0.1
+
+    if path_width < MIN_CLIP_DIMENSION or path_height < MIN_CLIP_DIMENSION:
+        # Expand degenerate path to have minimum dimensions
+        # Calculate expansion needed
+        expand_x = (MIN_CLIP_DIMENSION - path_width) / 2 if path_width < MIN_CLIP_DIMENSION else 0
+        expand_y = (MIN_CLIP_DIMENSION - path_height) / 2 if path_height < MIN_CLIP_DIMENSION else 0
+
+        # Create expanded rectangular clip region
+        cairo_ctx.new_path()
+        cairo_ctx.rectangle(x1 - expand_x, y1 - expand_y,
+                           path_width + 2 * expand_x, path_height + 2 * expand_y)
+
+    # Set fill rule based on winding rule
+    if item.winding_rule == ps.WINDING_EVEN_ODD:
+        cairo_ctx.set_fill_rule(cairo.FILL_RULE_EVEN_ODD)
+    else:
+        cairo_ctx.set_fill_rule(cairo.FILL_RULE_WINDING)
+
+    # Apply clipping
+    cairo_ctx.clip()
+    rs.clip_bbox = cairo_ctx.clip_extents()
+
+
+# Paint operations consumed together with the Path that precedes them
+_PATH_PAINT_TYPES = frozenset({ps.DL_FILL, ps.DL_STROKE, ps.DL_PATTERN_FILL})
+
+
+def _handle_path(rs: _RenderState, item: ps.Path, display_index: int) -> None:
+    # Cull the path together with the paint operation that follows it.
+    # Strokes carry their own bbox expanded by the line width.
+    paint = rs.display_list[display_index + 1] if display_index + 1 < rs.n_items else None
+    bbox = paint.device_bbox if paint is not None and paint.DL_TYPE == ps.DL_STROKE else item.device_bbox
+    if bbox is not None:
+        rs.tested += 1
+        if _outside_clip(bbox, rs.clip_bbox, rs.cull_margin):
+            rs.culled += 1
+            if paint is not None and paint.DL_TYPE in _PATH_PAINT_TYPES:
+                rs.next_index = display_index + 2
+            return
+
+    emit_path(rs.cairo_ctx, item, rs.is_vector_surface)
+
+
+def _handle_fill(rs: _RenderState, item: ps.Fill, display_index: int) -> None:
+    cairo_ctx = rs.cairo_ctx
+    cairo_ctx.set_source_rgb(*_safe_rgb(item.color))
+    cairo_ctx.set_fill_rule(item.winding_rule)
+    # PLRM 7.5.1: "A shape is scan-converted by painting any pixel
+    # whose square region intersects the shape, no matter how small
+    # the intersection is."  Cairo's fill() produces nothing for
+    # zero-area paths (e.g. bare line segments).  Detect this by
+    # comparing fill_extents (empty for degenerate paths) against
+    # path_extents (non-empty if any segments exist) and fall back
+    # to a 1-device-pixel hairline stroke.
+    #
+    # KNOWN LIMITATION: This only handles fully degenerate paths
+    # (where fill_extents is empty).  Mixed paths containing both
+    # enclosed areas and zero-area segments (e.g. a rectangle plus
+    # a bare line, or coincident edges between subpaths) will fill
+    # the enclosed areas correctly but the zero-area segments will
+    # not be painted.  Fixing this would require detecting shared
+    # edges between subpaths geometrically.
+    fx1, fy1, fx2, fy2 = cairo_ctx.fill_extents()
+    if fx1 == fx2 and fy1 == fy2:
+        # Fill would produce nothing — check if path has extent
+        px1, py1, px2, py2 = cairo_ctx.path_extents()
+        if px1 != px2 or py1 != py2:
+            cairo_ctx.save()
+            cairo_ctx.identity_matrix()
+            cairo_ctx.set_line_width(1.0)
             cairo_ctx.stroke()
-            continue
-
-        # Check specific image types first before base ImageElement
-        if isinstance(item, ps.ImageMaskElement):
-            _render_imagemask_element(item, cairo_ctx, page_height)
-            continue
-        if isinstance(item, ps.ColorImageElement):
-            _render_colorimage_element(item, cairo_ctx, page_height)
-            continue
-        if isinstance(item, ps.ImageElement):
-            _render_image_element(item, cairo_ctx, page_height)
-            continue
-
-        # ActualText markers for Type 3 font searchability in PDF
-        # Defer to PDF injector for invisible text rendering (text render mode 3)
-        if isinstance(item, ps.ActualTextStart):
-            if deferred_text_objs is not None:
-                clip_info = (_current_clip_path, _current_clip_winding) if _current_clip_path else None
-                deferred_text_objs.append((item, clip_info))
-            continue
-        if isinstance(item, ps.ActualTextEnd):
-            continue
-
-        # TextObj - native text rendering for PDF/SVG output
-        if isinstance(item, ps.TextObj):
-            _render_text_obj(item, cairo_ctx, page_height, deferred_text_objs,
-                             _current_clip_path, _current_clip_winding, defer_all_text)
-            continue
+            cairo_ctx.restore()
+            return
+    cairo_ctx.fill()
+
+
+def _handle_pattern_fill(rs: _RenderState, item: ps.PatternFill, display_index: int) -> None:
+    _render_pattern_fill(item, rs.cairo_ctx, rs.ctxt)
+
+
+def _handle_axial_shading(rs: _RenderState, item: ps.AxialShadingFill, display_index: int) -> None:
+    _render_axial_shading(item, rs.cairo_ctx)
+
+
+def _handle_radial_shading(rs: _RenderState, item: ps.RadialShadingFill, display_index: int) -> None:
+    _render_radial_shading(item, rs.cairo_ctx)
+
+
+def _handle_function_shading(rs: _RenderState, item: ps.FunctionShadingFill, display_index: int) -> None:
+    _render_function_shading(item, rs.cairo_ctx)
+
+
+def _handle_mesh_shading(rs: _RenderState, item: ps.MeshShadingFill, display_index: int) -> None:
+    # Batch consecutive MeshShadingFill items with same CTM for efficiency.
+    # Many PS generators emit thousands of 1-triangle meshes; batching them
+    # into a single Cairo MeshPattern is much faster.
+    display_list = rs.display_list
+    batch = [item]
+    batch_ctm = item.ctm
+    # Look ahead for more meshes with same CTM
+    for j in range(display_index + 1, rs.n_items):
+        next_item = display_list[j]
+        if next_item.DL_TYPE == ps.DL_MESH_SHADING and next_item.ctm == batch_ctm:
+            batch.append(next_item)
+        else:
+            break
+    # Resume after the batched items
+    rs.next_index = display_index + len(batch)
+    _render_mesh_shading_batch(batch, rs.cairo_ctx)
+
+
+def _handle_patch_shading(rs: _RenderState, item: ps.PatchShadingFill, display_index: int) -> None:
+    _render_patch_shading(item, rs.cairo_ctx)
+
+
+def _handle_stroke(rs: _RenderState, item: ps.Stroke, display_index: int) -> None:
+    cairo_ctx = rs.cairo_ctx
+    min_line_width = rs.min_line_width
+    ctm = item.ctm
+    a, b, c, d, tx, ty = ctm
+
+    cairo_ctx.set_source_rgb(*_safe_rgb(item.color))
+    cairo_ctx.set_line_join(item.line_join)
+    cairo_ctx.set_line_cap(item.line_cap)
+    cairo_ctx.set_miter_limit(item.miter_limit)
+
+    # Compute singular values of the CTM to detect anisotropy.
+    # Singular values give the true max/min scale factors regardless
+    # of rotation, unlike column-vector lengths which can appear
+    # equal when rotation mixes the X/Y components.
+    sum_sq = a*a + b*b + c*c + d*d
+    diff_term = math.sqrt((a*a + b*b - c*c - d*d)**2 + 4*(a*c + b*d)**2)
+    s_max = math.sqrt(max(0, 0.5 * (sum_sq + diff_term)))
+    s_min = math.sqrt(max(0, 0.5 * (sum_sq - diff_term)))
+
+    # Use anisotropic path when max/min scale ratio exceeds threshold
+    det = a * d - b * c
+    is_anisotropic = (s_min > 1e-10 and s_max / s_min > 1.01
+                      and abs(det) > 1e-10)
+
+    if is_anisotropic:
+        # Anisotropic stroke: use Cairo's matrix to get correct
+        # directional line widths.  Path points are in device space,
+        # so we set Cairo's matrix to the CTM and transform each
+        # point back to user space before stroking.
+        inv_a = d / det
+        inv_b = -b / det
+        inv_c = -c / det
+        inv_d = a / det
+
+        # Extract current path from Cairo, transform to user space
+        cairo_path = cairo_ctx.copy_path()
+        cairo_ctx.new_path()
+
+        # Compose CTM with existing base matrix (identity for bitmap,
+        # device-to-PDF scaling for PDF surfaces) so the stroke
+        # renders in the correct coordinate space.
+        cairo_ctx.save()
+        cairo_ctx.transform(cairo.Matrix(a, b, c, d, tx, ty))
+
+        # Rebuild path in user space
+        for path_type, points in cairo_path:
+            if path_type == 0:  # MOVE_TO
+                x, y = points
+                ux = inv_a * (x - tx) + inv_c * (y - ty)
+                uy = inv_b * (x - tx) + inv_d * (y - ty)
+                cairo_ctx.move_to(ux, uy)
+            elif path_type == 1:  # LINE_TO
+                x, y = points
+                ux = inv_a * (x - tx) + inv_c * (y - ty)
+                uy = inv_b * (x - tx) + inv_d * (y - ty)
+                cairo_ctx.line_to(ux, uy)
+            elif path_type == 2:  # CURVE_TO
+                x1, y1, x2, y2, x3, y3 = points
+                cairo_ctx.curve_to(
+                    inv_a * (x1 - tx) + inv_c * (y1 - ty),
+                    inv_b * (x1 - tx) + inv_d * (y1 - ty),
+                    inv_a * (x2 - tx) + inv_c * (y2 - ty),
+                    inv_b * (x2 - tx) + inv_d * (y2 - ty),
+                    inv_a * (x3 - tx) + inv_c * (y3 - ty),
+                    inv_b * (x3 - tx) + inv_d * (y3 - ty),
+                )
+            elif path_type == 3:  # CLOSE_PATH
+                cairo_ctx.close_path()
+
+        # Stroke in user space — Cairo applies the CTM for
+        # correct anisotropic line widths.
+        # Ensure minimum 1 device pixel along the thinnest axis.
+        min_user_lw = min_line_width / s_max if s_max > 0 else min_line_width
+        cairo_ctx.set_line_width(max(item.line_width, min_user_lw))
+        user_dashes = item.dash_pattern[0]
+        user_offset = item.dash_pattern[1]
+        cairo_ctx.set_dash(user_dashes, user_offset)
+        cairo_ctx.stroke()
+        cairo_ctx.restore()
+        return
+
+    # Isotropic stroke: simple uniform scale
+    scale_factor = s_max if s_max > 0 else 1.0
+    device_line_width = item.line_width * scale_factor
+    device_dashes = [dd * scale_factor for dd in item.dash_pattern[0]]
+    device_offset = item.dash_pattern[1] * scale_factor
+
+    cairo_ctx.set_line_width(max(min_line_width, device_line_width))
+    cairo_ctx.set_dash(device_dashes, device_offset)
+    cairo_ctx.stroke()
+
+
+def _image_culled(rs: _RenderState, item: ps.ImageElement) -> bool:
+    """Count an image against the cull statistics; True if it can be skipped."""
+    bbox = item.device_bbox
+    if bbox is None:
+        return False
+    rs.tested += 1
+    if _outside_clip(bbox, rs.clip_bbox, rs.cull_margin):
+        rs.culled += 1
+        return True
+    return False
+
+
+def _handle_image(rs: _RenderState, item: ps.ImageElement, display_index: int) -> None:
+    if not _image_culled(rs, item):
+        _render_image_element(item, rs.cairo_ctx, rs.page_height)
+
+
+def _handle_imagemask(rs: _RenderState, item: ps.ImageMaskElement, display_index: int) -> None:
+    if not _image_culled(rs, item):
+        _render_imagemask_element(item, rs.cairo_ctx, rs.page_height)
+
+
+def _handle_colorimage(rs: _RenderState, item: ps.ColorImageElement, display_index: int) -> None:
+    if not _image_culled(rs, item):
+        _render_colorimage_element(item, rs.cairo_ctx, rs.page_height)
+
+
+def _handle_actual_text_start(rs: _RenderState, item: ps.ActualTextStart, display_index: int) -> None:
+    # ActualText markers for Type 3 font searchability in PDF
+    # Defer to PDF injector for invisible text rendering (text render mode 3)
+    if rs.deferred_text_objs is not None:
+        clip_info = (rs.clip_path, rs.clip_winding) if rs.clip_path else None
+        rs.deferred_text_objs.append((item, clip_info))
+
+
+def _handle_text(rs: _RenderState, item: ps.TextObj, display_index: int) -> None:
+    # TextObj - native text rendering for PDF/SVG output
+    _render_text_obj(item, rs.cairo_ctx, rs.page_height, rs.deferred_text_objs,
+                     rs.clip_path, rs.clip_winding, rs.defer_all_text)
+
+
+def _handle_glyph_ref(rs: _RenderState, item: ps.GlyphRef, display_index: int) -> None:
+    _render_glyph_ref(item, rs.cairo_ctx)
+
+
+def _handle_glyph_ref_vector(rs: _RenderState, item: ps.GlyphRef, display_index: int) -> None:
+    _render_glyph_ref_vector(item, rs.cairo_ctx)
+
+
+def _handle_glyph_start(rs: _RenderState, item: ps.GlyphStart, display_index: int) -> None:
+    # Begin tracking glyph elements for bitmap capture.
+    # Suppress normal rendering — glyph will be rendered offscreen at GlyphEnd.
+    rs.glyph_capture_stack.append(_GlyphCaptureState(
+        cache_key=item.cache_key,
+        position_x=item.position_x,
+        position_y=item.position_y,
+        start_index=display_index,
+    ))
+    rs.handlers = _CAPTURE_HANDLERS
+
+
+def _handle_glyph_end(rs: _RenderState, item: ps.GlyphEnd, display_index: int) -> None:
+    rs.handlers = _RASTER_HANDLERS
+    if rs.glyph_capture_stack:
+        state = rs.glyph_capture_stack.pop()
+        _capture_glyph_bitmap(rs.cairo_ctx, rs.display_list, display_index, state)
+        # Blit the just-captured bitmap to the main surface
+        _render_glyph_ref_by_key(state.cache_key, state.position_x, state.position_y, rs.cairo_ctx)
+
+
+def _handle_form_start(rs: _RenderState, item: ps.FormStart, display_index: int) -> None:
+    # Vector surfaces only.  Place the recorded form and skip the expanded
+    # device-space elements up to the matching FormEnd; forms that cannot be
+    # recorded fall through and the expanded elements render normally.
+    end_index = _form_end_index(rs.display_list, display_index)
+    a, b, c, d, tx, ty = item.ctm
+    if end_index is None or abs(a * d - b * c) < 1e-12:
+        _form_stats['expanded'] += 1
+        return
+    surface = _form_surface(rs, item)
+    if surface is None:
+        return
+
+    rs.next_index = end_index + 1
+    cairo_ctx = rs.cairo_ctx
+    cairo_ctx.save()
+    cairo_ctx.transform(cairo.Matrix(a, b, c, d, tx, ty))
+    cairo_ctx.set_source_surface(surface, 0, 0)
+    cairo_ctx.paint()
+    cairo_ctx.restore()
+    if rs.deferred_text_objs is not None:
+        _defer_form_text(rs, display_index + 1, end_index)
+
+
+def _defer_form_text(rs: _RenderState, start_index: int, end_index: int) -> None:
+    """Defer the text of a placed form from its expanded device-space elements.
+
+    Tracks the form's own clips so each deferred item carries the clip it
+    would have had if the form were rendered expanded.
+    """
+    display_list = rs.display_list
+    deferred_text_objs = rs.deferred_text_objs
+    clip_path = rs.clip_path
+    clip_winding = rs.clip_winding
+    for j in range(start_index, end_index):
+        elem = display_list[j]
+        dl_type = elem.DL_TYPE
+        if dl_type == ps.DL_CLIP:
+            if elem.is_initclip:
+                clip_path = clip_winding = None
+            elif elem.path:
+                clip_path = elem.path
+                clip_winding = elem.winding_rule
+        elif dl_type == ps.DL_ACTUAL_TEXT_START or (
+                dl_type == ps.DL_TEXT and _text_is_deferred(elem, rs.defer_all_text)):
+            clip_info = (clip_path, clip_winding) if clip_path else None
+            deferred_text_objs.append((elem, clip_info))
+
+
+def _form_end_index(display_list: list, start_index: int) -> int | None:
+    """Return the index of the FormEnd matching the FormStart at start_index."""
+    depth = 0
+    for j in range(start_index + 1, len(display_list)):
+        dl_type = display_list[j].DL_TYPE
+        if dl_type == ps.DL_FORM_START:
+            depth += 1
+        elif dl_type == ps.DL_FORM_END:
+            if depth == 0:
+                return j
+            depth -= 1
+    return None
+
+
+def _form_surface(rs: _RenderState, item: ps.FormStart):
+    """Return the recorded surface for a form, recording it on first use.
+
+    Returns None (and counts the invocation as expanded) when the form holds
+    elements that cannot be rendered in form space or is placed with a
+    singular CTM.
+    """
+    elements = item.elements
+    a, b, c, d = item.ctm[:4]
+    form_scale = math.sqrt(abs(a * d - b * c))
+    if form_scale == 0.0:
+        _form_stats['expanded'] += 1
+        return None
+    if rs.deferred_text_objs is None:
+        defer_mode = None
+    else:
+        defer_mode = 'all' if rs.defer_all_text else 'fonts'
+    # Without a minimum line width the recording does not depend on scale
+    scale_step = round(math.log2(form_scale) * _FORM_SCALE_STEPS) if rs.min_line_width else None
+    key = (id(elements), defer_mode, scale_step)
+    cached = _form_surface_cache.get(key)
+    if cached is not None and cached[0] is elements:
+        _form_surface_cache.move_to_end(key)  # LRU: mark as recently used
+        surface = cached[1]
+        _form_stats['reused' if surface is not None else 'expanded'] += 1
+        return surface
+
+    if any(elem.DL_TYPE in _FORM_UNRECORDABLE_TYPES for elem in elements):
+        surface = None
+        _form_stats['expanded'] += 1
+    else:
+        llx, lly, urx, ury = item.bbox
+        x0, x1 = min(llx, urx), max(llx, urx)
+        y0, y1 = min(lly, ury), max(lly, ury)
+        surface = cairo.RecordingSurface(
+            cairo.CONTENT_COLOR_ALPHA, cairo.Rectangle(x0, y0, x1 - x0, y1 - y0))
+        form_ctx = cairo.Context(surface)
+        form_ctx.set_tolerance(rs.cairo_ctx.get_tolerance())
+        # Minimum line width is in device units; express it in form space
+        # at the scale of the invocation that records the form.
+        # Text the page defers goes to a scratch list; it is deferred from
+        # the expanded elements each time the form is placed.
+        _render_elements(rs.ctxt, form_ctx, elements, rs.page_height,
+                         rs.min_line_width / form_scale,
+                         [] if defer_mode else None, rs.defer_all_text, True)
+        _form_stats['recorded'] += 1
+
+    if len(_form_surface_cache) >= _FORM_SURFACE_CACHE_MAX:
+        _form_surface_cache.popitem(last=False)
+    _form_surface_cache[key] = (elements, surface)
+    return surface
+
+
+def _build_handler_table(entries: dict) -> list:
+    """Build a DL_TYPE-indexed handler list; unlisted types are no-ops."""
+    table = [_handle_noop] * ps.DL_TYPE_COUNT
+    for dl_type, handler in entries.items():
+        table[dl_type] = handler
+    return table
+
+
+# Raster surfaces: glyphs between GlyphStart and GlyphEnd are captured to
+# the bitmap cache and blitted.
+_RASTER_HANDLERS = _build_handler_table({
+    ps.DL_PATH: _handle_path,
+    ps.DL_FILL: _handle_fill,
+    ps.DL_STROKE: _handle_stroke,
+    ps.DL_PATTERN_FILL: _handle_pattern_fill,
+    ps.DL_CLIP: _handle_clip,
+    ps.DL_IMAGE: _handle_image,
+    ps.DL_IMAGEMASK: _handle_imagemask,
+    ps.DL_COLORIMAGE: _handle_colorimage,
+    ps.DL_TEXT: _handle_text,
+    ps.DL_GLYPH_REF: _handle_glyph_ref,
+    ps.DL_GLYPH_START: _handle_glyph_start,
+    ps.DL_GLYPH_END: _handle_glyph_end,
+    ps.DL_ACTUAL_TEXT_START: _handle_actual_text_start,
+    ps.DL_AXIAL_SHADING: _handle_axial_shading,
+    ps.DL_RADIAL_SHADING: _handle_radial_shading,
+    ps.DL_FUNCTION_SHADING: _handle_function_shading,
+    ps.DL_MESH_SHADING: _handle_mesh_shading,
+    ps.DL_PATCH_SHADING: _handle_patch_shading,
+})
+
+# Vector surfaces (PDF/SVG): skip bitmap capture — glyph Path+Fill elements
+# render directly and cache hits replay the cached paths.
+_VECTOR_HANDLERS = list(_RASTER_HANDLERS)
+_VECTOR_HANDLERS[ps.DL_GLYPH_REF] = _handle_glyph_ref_vector
+_VECTOR_HANDLERS[ps.DL_GLYPH_START] = _handle_noop
+_VECTOR_HANDLERS[ps.DL_GLYPH_END] = _handle_noop
+_VECTOR_HANDLERS[ps.DL_FORM_START] = _handle_form_start
+
+# Inside a GlyphStart..GlyphEnd capture region on raster surfaces: elements
+# are rendered offscreen at GlyphEnd instead, only clipping and glyph
+# markers are processed.
+_CAPTURE_HANDLERS = _build_handler_table({
+    ps.DL_CLIP: _handle_clip,
+    ps.DL_GLYPH_REF: _handle_glyph_ref,
+    ps.DL_GLYPH_START: _handle_glyph_start,
+    ps.DL_GLYPH_END: _handle_glyph_end,
+})
 
 
 # TextObj rendering for searchable PDF text
@@ -541,34 +850,32 @@ def _render_text_obj(text_obj: ps.TextObj, cairo_ctx: cairo.Context, page_height
         defer_all_text: If True, defer ALL TextObjs (used by SVG device)
     """
 
-    # Build clip info tuple for deferred text (None if no active clip)
-    clip_info = (clip_path, clip_winding) if clip_path else None
-
-    # SVG mode: defer all text for native SVG text elements
-    if defer_all_text and deferred_text_objs is not None:
+    if deferred_text_objs is not None and _text_is_deferred(text_obj, defer_all_text):
+        # Build clip info tuple for deferred text (None if no active clip)
+        clip_info = (clip_path, clip_winding) if clip_path else None
         deferred_text_objs.append((text_obj, clip_info))
         return
 
-    # Check if this font needs embedding via PDF injection
-    font_name = text_obj.font_name
-    if deferred_text_objs is not None:
-        if font_name not in _STANDARD_14_FONTS:
-            # Non-Standard 14 font: defer for direct PDF injection
-            deferred_text_objs.append((text_obj, clip_info))
-            return
-        # Standard 14 font with custom encoding array (e.g., DiacriticEncoding):
-        # must be embedded so the PDF viewer uses the correct encoding.
-        # Cairo doesn't respect PostScript re-encoding, so character codes
-        # would map to wrong glyphs if we let Cairo handle it.
-        encoding = text_obj.font_dict.val.get(b'Encoding')
-        if encoding is not None and encoding.TYPE in ps.ARRAY_TYPES:
-            deferred_text_objs.append((text_obj, clip_info))
-            return
-
     # Standard 14 fonts (or no deferral): Use Cairo text APIs
     _render_standard_text_obj(text_obj, cairo_ctx, page_height)
 
 
+def _text_is_deferred(text_obj: ps.TextObj, defer_all_text: bool) -> bool:
+    """Return True if a device that defers text would defer this TextObj."""
+    # SVG mode: defer all text for native SVG text elements
+    if defer_all_text:
+        return True
+    # Non-Standard 14 font: defer for direct PDF injection
+    if text_obj.font_name not in _STANDARD_14_FONTS:
+        return True
+    # Standard 14 font with custom encoding array (e.g., DiacriticEncoding):
+    # must be embedded so the PDF viewer uses the correct encoding.
+    # Cairo doesn't respect PostScript re-encoding, so character codes
+    # would map to wrong glyphs if we let Cairo handle it.
+    encoding = text_obj.font_dict.val.get(b'Encoding')
+    return encoding is not None and encoding.TYPE in ps.ARRAY_TYPES
+
+
 def _render_standard_text_obj(text_obj: ps.TextObj, cairo_ctx: cairo.Context, page_height: int) -> None:
     """
     Render text using Cairo's native text APIs.
@@ -684,26 +991,14 @@ def _render_glyph_ref_vector(glyph_ref: ps.GlyphRef, cairo_ctx: cairo.Context) -
     oy = glyph_ref.position_y
 
     for element in cached.display_elements:
-        if isinstance(element, ps.Path):
-            for subpath in element:
-                for pc_item in subpath:
-                    if isinstance(pc_item, ps.MoveTo):
-                        cairo_ctx.move_to(pc_item.p.x + ox, pc_item.p.y + oy)
-                    elif isinstance(pc_item, ps.LineTo):
-                        cairo_ctx.line_to(pc_item.p.x + ox, pc_item.p.y + oy)
-                    elif isinstance(pc_item, ps.CurveTo):
-                        cairo_ctx.curve_to(
-                            pc_item.p1.x + ox, pc_item.p1.y + oy,
-                            pc_item.p2.x + ox, pc_item.p2.y + oy,
-                            pc_item.p3.x + ox, pc_item.p3.y + oy,
-                        )
-                    elif isinstance(pc_item, ps.ClosePath):
-                        cairo_ctx.close_path()
-        elif isinstance(element, ps.Fill):
+        dl_type = element.DL_TYPE
+        if dl_type == ps.DL_PATH:
+            emit_path(cairo_ctx, element, dx=ox, dy=oy)
+        elif dl_type == ps.DL_FILL:
             cairo_ctx.set_source_rgb(*_safe_rgb(element.color))
             cairo_ctx.set_fill_rule(element.winding_rule)
             cairo_ctx.fill()
-        elif isinstance(element, ps.ImageMaskElement):
+        elif dl_type == ps.DL_IMAGEMASK:
             # Translate the cached imagemask CTM to the glyph position
             elem = copy.copy(element)
             if element.ctm is not None:
@@ -897,26 +1192,14 @@ def _capture_glyph_elements(cache_key: object, position_x: float, position_y: fl
 def _replay_glyph_elements(ctx: cairo.Context, elements: list) -> None:
     """Replay a sequence of display list elements (Path, Fill, Stroke, ImageMask, etc.) to a Cairo context."""
     for elem in elements:
-        if isinstance(elem, ps.Path):
-            for subpath in elem:
-                for pc_item in subpath:
-                    if isinstance(pc_item, ps.MoveTo):
-                        ctx.move_to(pc_item.p.x, pc_item.p.y)
-                    elif isinstance(pc_item, ps.LineTo):
-                        ctx.line_to(pc_item.p.x, pc_item.p.y)
-                    elif isinstance(pc_item, ps.CurveTo):
-                        ctx.curve_to(
-                            pc_item.p1.x, pc_item.p1.y,
-                            pc_item.p2.x, pc_item.p2.y,
-                            pc_item.p3.x, pc_item.p3.y,
-                        )
-                    elif isinstance(pc_item, ps.ClosePath):
-                        ctx.close_path()
-        elif isinstance(elem, ps.Fill):
+        dl_type = elem.DL_TYPE
+        if dl_type == ps.DL_PATH:
+            emit_path(ctx, elem)
+        elif dl_type == ps.DL_FILL:
             ctx.set_source_rgb(*_safe_rgb(elem.color))
             ctx.set_fill_rule(elem.winding_rule)
             ctx.fill()
-        elif isinstance(elem, ps.Stroke):
+        elif dl_type == ps.DL_STROKE:
             ctm = elem.ctm
             scale_factor = math.sqrt(ctm[0]**2 + ctm[1]**2)
             device_line_width = elem.line_width * scale_factor
@@ -929,9 +1212,9 @@ def _replay_glyph_elements(ctx: cairo.Context, elements: list) -> None:
             ctx.set_miter_limit(elem.miter_limit)
             ctx.set_dash(device_dashes, device_offset)
             ctx.stroke()
-        elif isinstance(elem, ps.ImageMaskElement):
+        elif dl_type == ps.DL_IMAGEMASK:
             _render_imagemask_element(elem, ctx, 0)
-        elif isinstance(elem, ps.ColorImageElement):
+        elif dl_type == ps.DL_COLORIMAGE:
             _render_colorimage_element(elem, ctx, 0)
-        elif isinstance(elem, ps.ImageElement):
+        elif dl_type == ps.DL_IMAGE:
             _render_image_element(elem, ctx, 0)
@@ -11,6 +11,7 @@ Reconstructs Type 1 fonts from parsed PostScript font dictionaries for PDF embed
 This works for fonts loaded from files OR embedded in PostScript documents.
 """
 
+from ...core import type1_decrypt
 from ...core import types as ps
 from ...core.unicode_mapping import glyph_name_to_unicode
 
@@ -715,17 +716,8 @@ class FontEmbedder:
         if len(encrypted_data) < len_iv + 2:
             return None
 
-        R = 4330
-        C1 = 52845
-        C2 = 22719
-
-        decrypted = bytearray()
-        for cipher_byte in encrypted_data:
-            plain_byte = cipher_byte ^ (R >> 8)
-            decrypted.append(plain_byte)
-            R = ((cipher_byte + R) * C1 + C2) & 0xFFFF
-
-        return bytes(decrypted[len_iv:])
+        decrypted, _ = type1_decrypt.decrypt(encrypted_data, type1_decrypt.CHARSTRING_KEY)
+        return decrypted[len_iv:]
 
     def _extract_charstring_width(self, encrypted_charstring: bytes,
                                     len_iv: int = 4,
@@ -21,6 +21,7 @@ import cairo
 from PIL import Image
 
 from ...core import icc_default
+from ...core import icc_profile
 from ...core import types as ps
 from ..common.cairo_renderer import render_display_list
 
@@ -140,8 +141,8 @@ def _cairo_surface_to_pil(surface: cairo.ImageSurface, cmyk: bool,
     img = img.convert("RGB")
 
     if cmyk and cmyk_transform is not None:
-        # ImageCms.applyTransform with inPlace=False since modes differ (RGB→CMYK)
-        img = ImageCms.applyTransform(img, cmyk_transform)
+        # Converted in row tiles on worker threads for large pages
+        img = icc_profile.apply_transform(img, cmyk_transform, "CMYK")
 
     return img
 
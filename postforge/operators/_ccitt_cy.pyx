@@ -0,0 +1,415 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""
+Cython-accelerated CCITT fax decoder.
+
+Compiled version of ccitt_codec._CCITTFaxDecoderPy with the same
+interface.  If you modify the row or EOL handling there, update this file
+to match.
+
+Codes are looked up in the tables built by ccitt_codec, copied into C
+arrays on first use.  Rows are held as arrays of changing elements, the
+reference line followed by three end sentinels.
+"""
+
+from libc.stdlib cimport malloc, realloc, free
+from libc.string cimport memset, memcpy, memmove
+
+cdef enum:
+    EOL = 1
+    WHITE_BITS = 12
+    BLACK_BITS = 13
+    MODE_BITS = 7
+    MODE_PASS = 7
+    MODE_HORIZONTAL = 8
+    PAD = 8                 # zero bytes kept after the data for peeks
+    OK = 0
+    NEED_INPUT = 1
+    DAMAGED = 2
+
+cdef unsigned int white_table[1 << WHITE_BITS]
+cdef unsigned int black_table[1 << BLACK_BITS]
+cdef unsigned int mode_table[1 << MODE_BITS]
+cdef bint tables_loaded = False
+
+
+cdef int _load_tables() except -1:
+    # Imported here: ccitt_codec imports this module before defining them
+    global tables_loaded
+    from . import ccitt_codec
+    cdef Py_ssize_t i
+    for i in range(1 << WHITE_BITS):
+        white_table[i] = ccitt_codec.WHITE_TABLE[i]
+    for i in range(1 << BLACK_BITS):
+        black_table[i] = ccitt_codec.BLACK_TABLE[i]
+    for i in range(1 << MODE_BITS):
+        mode_table[i] = ccitt_codec.MODE_TABLE[i]
+    tables_loaded = True
+    return 0
+
+
+cdef inline void _fill(unsigned char *p, int start, int end) noexcept nogil:
+    """Set bits start to end - 1 of p, most significant bit first."""
+    cdef int first, last
+    cdef unsigned char start_mask, end_mask
+    if start >= end:
+        return
+    first = start >> 3
+    last = (end - 1) >> 3
+    start_mask = 0xFF >> (start & 7)
+    end_mask = (0xFF << (7 - ((end - 1) & 7))) & 0xFF
+    if first == last:
+        p[first] |= start_mask & end_mask
+    else:
+        p[first] |= start_mask
+        memset(p + first + 1, 0xFF, last - first - 1)
+        p[last] |= end_mask
+
+
+cdef class CCITTFaxDecoder:
+    """Incremental CCITT fax decoder (see ccitt_codec._CCITTFaxDecoderPy)."""
+
+    cdef readonly int k, columns, rows, damaged_rows_before_error
+    cdef readonly bint end_of_block, end_of_line, encoded_byte_align, black_is_1
+    cdef readonly Py_ssize_t row_bytes
+    cdef public bint eod, needs_input
+    cdef public bytes unused_data
+
+    cdef unsigned char *data
+    cdef Py_ssize_t capacity    # bytes allocated for data
+    cdef Py_ssize_t size, pos   # bits of data, and the bit being decoded
+    cdef bint final, started, next_2d
+    cdef int *ref               # reference line changing elements
+    cdef int *cur               # row being decoded
+    cdef int count              # changing elements in cur
+    cdef int row, damaged
+    cdef unsigned char last_mask
+
+    def __cinit__(self, *args, **kwargs):
+        self.data = NULL
+        self.ref = NULL
+        self.cur = NULL
+
+    def __init__(self, int k=0, int columns=1728, int rows=0, bint end_of_block=True,
+                 bint end_of_line=False, bint encoded_byte_align=False,
+                 bint black_is_1=False, int damaged_rows_before_error=0):
+        cdef int i
+        if not tables_loaded:
+            _load_tables()
+        self.k = k
+        self.columns = columns
+        self.rows = rows
+        self.end_of_block = end_of_block
+        self.end_of_line = end_of_line
+        self.encoded_byte_align = encoded_byte_align
+        self.black_is_1 = black_is_1
+        self.damaged_rows_before_error = damaged_rows_before_error
+        self.row_bytes = (columns + 7) // 8
+        self.eod = False
+        self.unused_data = b''
+        self.needs_input = True
+
+        self.capacity = 4096
+        self.data = <unsigned char *>malloc(self.capacity)
+        self.ref = <int *>malloc((columns + 4) * sizeof(int))
+        self.cur = <int *>malloc((columns + 4) * sizeof(int))
+        if self.data == NULL or self.ref == NULL or self.cur == NULL:
+            raise MemoryError()
+        memset(self.data, 0, PAD)
+        self.size = 0
+        self.pos = 0
+        self.final = False
+        self.started = False
+        self.next_2d = k < 0
+        # Reference line all white
+        for i in range(3):
+            self.ref[i] = columns
+        self.count = 0
+        self.row = 0
+        self.damaged = 0
+        self.last_mask = (0xFF << (self.row_bytes * 8 - columns)) & 0xFF
+
+    def __dealloc__(self):
+        free(self.data)
+        free(self.ref)
+        free(self.cur)
+
+    def decode(self, data=b'', bint final=False, Py_ssize_t max_rows=-1):
+        """
+        Decode the rows that data completes.
+
+        Raises:
+            ValueError: A damaged row, beyond DamagedRowsBeforeError.
+        """
+        cdef Py_ssize_t pos, count = 0
+        cdef bint next_2d, started, started_row, damaged, at_end
+        cdef int status, i
+        cdef int *swap
+        cdef bytearray out
+        cdef unsigned char *row_out
+        cdef Py_ssize_t out_size
+
+        if self.eod:
+            return b''
+        if data:
+            self._append(data)
+        if final:
+            self.final = True
+
+        out = bytearray()
+        self.needs_input = False
+        while count != max_rows:
+            pos, next_2d, started = self.pos, self.next_2d, self.started
+            self.count = 0
+            started_row = False
+            damaged = False
+            status = OK
+            if not self.started:
+                self.started = True
+                status = self._line_end(False)
+            if status == OK:
+                status = self._end_of_block(&at_end)
+                if status == OK and at_end:
+                    self.eod = True
+                    break
+            if status == OK:
+                started_row = True
+                status = self._decode_row()
+                if status == DAMAGED:
+                    # Only EOLs allow skipping to the next row
+                    if (not self.end_of_line or self.k < 0
+                            or self.damaged >= self.damaged_rows_before_error):
+                        raise ValueError("damaged CCITTFax data")
+                    damaged = True
+                    status = OK
+                    while self._peek(12) != EOL:
+                        if self.pos + 12 > self.size:
+                            status = NEED_INPUT
+                            break
+                        self.pos += 1
+            if status == OK:
+                if self.rows > 0 and self.row + 1 >= self.rows:
+                    if self.end_of_block:
+                        status = self._end_of_block(&at_end)
+                    if status == OK:
+                        self.eod = True
+                else:
+                    status = self._line_end(not damaged)
+            if status == NEED_INPUT:
+                if not self.final:
+                    self.pos, self.next_2d, self.started = pos, next_2d, started
+                    self.needs_input = True
+                    break
+                self.eod = True
+                if not started_row:
+                    break
+
+            self.damaged = self.damaged + 1 if damaged else 0
+            self.row += 1
+            swap = self.ref
+            self.ref = self.cur
+            self.cur = swap
+            for i in range(3):
+                self.ref[self.count + i] = self.columns
+            out_size = len(out)
+            out.extend(bytes(self.row_bytes))
+            row_out = out
+            self._pack(row_out + out_size)
+            count += 1
+            if self.eod:
+                break
+
+        if self.eod:
+            if self.pos < self.size:
+                self.unused_data = self.data[(self.pos + 7) >> 3:self.size >> 3]
+            self.size = self.pos = 0
+            memset(self.data, 0, PAD)
+        return bytes(out)
+
+    cdef int _append(self, const unsigned char[::1] data) except -1:
+        cdef Py_ssize_t consumed = self.pos >> 3
+        cdef Py_ssize_t length = self.size >> 3
+        cdef Py_ssize_t n = data.shape[0]
+        cdef Py_ssize_t needed
+        cdef unsigned char *grown
+        if consumed:
+            memmove(self.data, self.data + consumed, length - consumed)
+            length -= consumed
+            self.pos -= consumed * 8
+        needed = length + n + PAD
+        if needed > self.capacity:
+            while self.capacity < needed:
+                self.capacity *= 2
+            grown = <unsigned char *>realloc(self.data, self.capacity)
+            if grown == NULL:
+                raise MemoryError()
+            self.data = grown
+        if n:
+            memcpy(self.data + length, &data[0], n)
+        memset(self.data + length + n, 0, PAD)
+        self.size = (length + n) * 8
+        return 0
+
+    cdef inline unsigned int _peek(self, int n) noexcept nogil:
+        """The next n bits (at most 17), zero past the end of the data."""
+        cdef Py_ssize_t i = self.pos >> 3
+        cdef unsigned int word = ((<unsigned int>self.data[i] << 16)
+                                  | (<unsigned int>self.data[i + 1] << 8) | self.data[i + 2])
+        return (word >> (24 - (self.pos & 7) - n)) & ((1u << n) - 1)
+
+    cdef int _skip_fill(self) noexcept nogil:
+        """Skip zero bits that pad out to an EOL."""
+        while self._peek(12) == 0:
+            if self.pos + 12 > self.size:
+                return NEED_INPUT
+            self.pos += 1
+        return OK
+
+    cdef int _line_end(self, bint align) noexcept nogil:
+        """Read the EOL (if any) and the 1-D/2-D tag bit that precede a row."""
+        cdef Py_ssize_t pos
+        if align and self.encoded_byte_align and not (self.end_of_line and self.k >= 0):
+            self.pos = (self.pos + 7) & ~7
+        pos = self.pos
+        if self._skip_fill() != OK:
+            return NEED_INPUT
+        if self._peek(12) == EOL:
+            self.pos += 12
+        else:
+            self.pos = pos
+        if self.k > 0:
+            if self.pos >= self.size:
+                return NEED_INPUT
+            self.next_2d = not self._peek(1)
+            self.pos += 1
+        return OK
+
+    cdef int _end_of_block(self, bint *at_end) noexcept nogil:
+        """Consume EOFB or RTC (consecutive EOLs) if it follows."""
+        cdef Py_ssize_t pos = self.pos
+        at_end[0] = False
+        if self._skip_fill() != OK:
+            return NEED_INPUT
+        if self._peek(12) != EOL:
+            self.pos = pos
+            return OK
+        at_end[0] = True
+        while True:
+            self.pos += 13 if self.k > 0 else 12
+            pos = self.pos
+            if self._skip_fill() != OK:
+                return NEED_INPUT
+            if self._peek(12) != EOL:
+                self.pos = pos
+                return OK
+
+    cdef inline int _read_code(self, unsigned int *table, int bits, int *value) noexcept nogil:
+        cdef unsigned int entry = table[self._peek(bits)]
+        if not entry:
+            if self.pos + bits > self.size:
+                return NEED_INPUT
+            return DAMAGED
+        self.pos += entry >> 16
+        if self.pos > self.size:
+            return NEED_INPUT
+        value[0] = entry & 0xFFFF
+        return OK
+
+    cdef inline int _read_run(self, int black, int *total) noexcept nogil:
+        """Read one run length: make-up codes followed by a terminating code."""
+        cdef unsigned int *table = white_table
+        cdef int bits = WHITE_BITS
+        cdef int run, status
+        if black:
+            table = black_table
+            bits = BLACK_BITS
+        total[0] = 0
+        while True:
+            status = self._read_code(table, bits, &run)
+            if status != OK:
+                return status
+            total[0] += run
+            if run < 64:
+                return OK
+
+    cdef inline void _change(self, int position) noexcept nogil:
+        if position < self.columns:
+            # Two changes at one position are an empty run
+            if self.count and self.cur[self.count - 1] == position:
+                self.count -= 1
+            else:
+                self.cur[self.count] = position
+                self.count += 1
+
+    cdef int _decode_row(self) noexcept nogil:
+        """Decode one row into cur."""
+        cdef int columns = self.columns
+        cdef int *ref = self.ref
+        cdef int a0, a1, a2, b1, run, mode, status
+        cdef int black = 0
+        cdef Py_ssize_t i = 0
+
+        if not self.next_2d:
+            a0 = 0
+            while a0 < columns:
+                status = self._read_run(black, &run)
+                if status != OK:
+                    return status
+                a0 += run
+                if a0 > columns:
+                    return DAMAGED
+                self._change(a0)
+                black ^= 1
+            return OK
+
+        a0 = -1  # imaginary changing element before the row
+        while a0 < columns:
+            # b1: first changing element on the reference line right of a0
+            # and of the opposite colour, which is at an index of parity black
+            while i and ref[i - 1] > a0:
+                i -= 1
+            while ref[i] <= a0 or (i & 1) != black:
+                i += 1
+            b1 = ref[i]
+            status = self._read_code(mode_table, MODE_BITS, &mode)
+            if status != OK:
+                return status
+            if mode == MODE_PASS:
+                a0 = ref[i + 1]
+            elif mode == MODE_HORIZONTAL:
+                status = self._read_run(black, &run)
+                if status != OK:
+                    return status
+                a1 = (a0 if a0 > 0 else 0) + run
+                status = self._read_run(black ^ 1, &run)
+                if status != OK:
+                    return status
+                a2 = a1 + run
+                if a2 > columns:
+                    return DAMAGED
+                self._change(a1)
+                self._change(a2)
+                a0 = a2
+            else:
+                a1 = b1 + mode - 3
+                if a1 < a0 or a1 < 0 or a1 > columns:
+                    return DAMAGED
+                self._change(a1)
+                a0 = a1
+                black ^= 1
+        return OK
+
+    cdef void _pack(self, unsigned char *out) noexcept nogil:
+        """Set the black runs of ref in out, which is zeroed, then apply BlackIs1."""
+        cdef int j
+        cdef Py_ssize_t b
+        cdef int n = self.count
+        for j in range(0, n, 2):
+            _fill(out, self.ref[j], self.ref[j + 1] if j + 1 < n else self.columns)
+        if not self.black_is_1 and self.row_bytes:
+            for b in range(self.row_bytes):
+                out[b] ^= 0xFF
+            out[self.row_bytes - 1] &= self.last_mask
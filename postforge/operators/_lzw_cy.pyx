@@ -0,0 +1,301 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""
+Cython-accelerated table-driven LZW codec.
+
+Compiled versions of lzw_codec._LZWDecoderPy and _LZWEncoderPy with the
+same interface.  If you modify the code width rules there, update this
+file to match.
+
+The decoder keeps each table entry as a prefix code plus a final byte and
+writes strings backwards along the prefix chain.  The encoder finds
+(prefix code, byte) pairs in an open-addressed hash table.
+"""
+
+from libc.stdlib cimport malloc, realloc, free
+from libc.string cimport memset
+
+cdef enum:
+    MAX_CODE_LENGTH = 12
+    TABLE_SIZE = 4096
+    HASH_SIZE = 8192        # power of two, at least twice TABLE_SIZE
+    NO_CODE = 0xFFFF
+
+
+cdef class _OutputBuffer:
+    """Growable byte buffer returned to Python as bytes."""
+    cdef unsigned char *data
+    cdef Py_ssize_t size
+    cdef Py_ssize_t capacity
+
+    def __cinit__(self, Py_ssize_t capacity):
+        self.capacity = capacity if capacity > 64 else 64
+        self.data = <unsigned char *>malloc(self.capacity)
+        if self.data == NULL:
+            raise MemoryError()
+        self.size = 0
+
+    def __dealloc__(self):
+        free(self.data)
+
+    cdef int reserve(self, Py_ssize_t extra) except -1:
+        cdef Py_ssize_t needed = self.size + extra
+        cdef unsigned char *grown
+        if needed <= self.capacity:
+            return 0
+        while self.capacity < needed:
+            self.capacity *= 2
+        grown = <unsigned char *>realloc(self.data, self.capacity)
+        if grown == NULL:
+            raise MemoryError()
+        self.data = grown
+        return 0
+
+    cdef bytes take(self):
+        return self.data[:self.size]
+
+
+cdef class LZWDecoder:
+    """Incremental table-driven LZW decoder (see lzw_codec._LZWDecoderPy)."""
+
+    cdef int unit_length, early_change, clear_code, eod_code
+    cdef bint low_bit_first
+    cdef public bint eod
+    cdef public Py_ssize_t unused
+    cdef unsigned long bit_buffer
+    cdef int bits, code_length, next_code, prev
+    cdef unsigned short prefix[TABLE_SIZE]
+    cdef unsigned short length[TABLE_SIZE]
+    cdef unsigned char suffix[TABLE_SIZE]
+    cdef unsigned char first[TABLE_SIZE]
+
+    def __init__(self, int unit_length=8, int early_change=1, bint low_bit_first=False):
+        cdef int i
+        self.unit_length = unit_length
+        self.early_change = early_change
+        self.low_bit_first = low_bit_first
+        self.clear_code = 1 << unit_length
+        self.eod_code = self.clear_code + 1
+        self.eod = False
+        self.unused = 0
+        self.bit_buffer = 0
+        self.bits = 0
+        for i in range(self.clear_code):
+            self.prefix[i] = NO_CODE
+            self.length[i] = 1
+            self.suffix[i] = i
+            self.first[i] = i
+        self._reset()
+
+    cdef void _reset(self) noexcept nogil:
+        self.next_code = self.clear_code + 2
+        self.code_length = self.unit_length + 1
+        self.prev = -1
+
+    cdef inline Py_ssize_t _write_string(self, unsigned char *out, int code) noexcept nogil:
+        """Write the string for code at out, returning its length."""
+        cdef int n = self.length[code]
+        cdef int i = n - 1
+        while i >= 0:
+            out[i] = self.suffix[code]
+            code = self.prefix[code]
+            i -= 1
+        return n
+
+    def decode(self, const unsigned char[::1] data):
+        """
+        Decode a chunk of LZW data.
+
+        Raises:
+            ValueError: A code refers to a table entry that does not exist.
+        """
+        cdef Py_ssize_t n = data.shape[0]
+        cdef Py_ssize_t index
+        cdef _OutputBuffer out = _OutputBuffer(n * 3)
+        cdef unsigned long buffer = self.bit_buffer
+        cdef int bits = self.bits
+        cdef int code_length = self.code_length
+        cdef int code, entry_code, c
+        cdef bint invalid = False
+
+        if self.eod:
+            return b''
+
+        for index in range(n):
+            if self.low_bit_first:
+                buffer |= (<unsigned long>data[index]) << bits
+            else:
+                buffer = (buffer << 8) | data[index]
+            bits += 8
+            while bits >= code_length:
+                bits -= code_length
+                if self.low_bit_first:
+                    code = buffer & ((1 << code_length) - 1)
+                    buffer >>= code_length
+                else:
+                    code = buffer >> bits
+                    buffer &= (1UL << bits) - 1
+
+                if code == self.clear_code:
+                    self._reset()
+                    code_length = self.code_length
+                    continue
+                if code == self.eod_code:
+                    self.eod = True
+                    self.unused = n - index - 1
+                    self.bit_buffer = 0
+                    self.bits = 0
+                    self.code_length = code_length
+                    return out.take()
+
+                if code < self.next_code:
+                    out.reserve(self.length[code])
+                    out.size += self._write_string(out.data + out.size, code)
+                    c = self.first[code]
+                elif code == self.next_code and self.prev >= 0:
+                    out.reserve(self.length[self.prev] + 1)
+                    out.size += self._write_string(out.data + out.size, self.prev)
+                    c = self.first[self.prev]
+                    out.data[out.size] = c
+                    out.size += 1
+                else:
+                    invalid = True
+                    break
+
+                if self.prev >= 0 and self.next_code < TABLE_SIZE:
+                    entry_code = self.next_code
+                    self.prefix[entry_code] = self.prev
+                    self.suffix[entry_code] = c
+                    self.length[entry_code] = self.length[self.prev] + 1
+                    self.first[entry_code] = self.first[self.prev]
+                    self.next_code += 1
+                self.prev = code
+                if (code_length < MAX_CODE_LENGTH
+                        and self.next_code + self.early_change >= (1 << code_length)):
+                    code_length += 1
+            if invalid:
+                break
+
+        if invalid:
+            raise ValueError("invalid LZW code")
+        self.bit_buffer = buffer
+        self.bits = bits
+        self.code_length = code_length
+        return out.take()
+
+
+cdef class LZWEncoder:
+    """Incremental table-driven LZW encoder (see lzw_codec._LZWEncoderPy)."""
+
+    cdef int unit_length, early_change, clear_code, eod_code
+    cdef bint low_bit_first
+    cdef unsigned long bit_buffer
+    cdef int bits, code_length, next_code, prefix_code
+    cdef int keys[HASH_SIZE]
+    cdef unsigned short values[HASH_SIZE]
+    cdef _OutputBuffer output
+
+    def __init__(self, int unit_length=8, int early_change=1, bint low_bit_first=False):
+        self.unit_length = unit_length
+        self.early_change = early_change
+        self.low_bit_first = low_bit_first
+        self.clear_code = 1 << unit_length
+        self.eod_code = self.clear_code + 1
+        self.bit_buffer = 0
+        self.bits = 0
+        self.prefix_code = -1
+        self.output = _OutputBuffer(4096)
+        self._reset()
+        self._write_code(self.clear_code)
+
+    cdef void _reset(self) noexcept nogil:
+        memset(self.keys, 0xFF, sizeof(self.keys))  # all -1
+        self.next_code = self.clear_code + 2
+        self.code_length = self.unit_length + 1
+
+    cdef int _write_code(self, int code) except -1:
+        self.output.reserve(4)
+        if self.low_bit_first:
+            self.bit_buffer |= (<unsigned long>code) << self.bits
+            self.bits += self.code_length
+            while self.bits >= 8:
+                self.output.data[self.output.size] = self.bit_buffer & 0xFF
+                self.output.size += 1
+                self.bit_buffer >>= 8
+                self.bits -= 8
+        else:
+            self.bit_buffer = (self.bit_buffer << self.code_length) | code
+            self.bits += self.code_length
+            while self.bits >= 8:
+                self.bits -= 8
+                self.output.data[self.output.size] = (self.bit_buffer >> self.bits) & 0xFF
+                self.output.size += 1
+            self.bit_buffer &= (1UL << self.bits) - 1
+        return 0
+
+    cdef bytes _take_output(self):
+        cdef bytes result = self.output.take()
+        self.output.size = 0
+        return result
+
+    def encode(self, const unsigned char[::1] data):
+        """Encode a chunk of data, returning the complete bytes produced."""
+        cdef Py_ssize_t n = data.shape[0]
+        cdef Py_ssize_t index
+        cdef int prefix = self.prefix_code
+        cdef int mask = self.clear_code - 1
+        cdef int byte, key, slot
+
+        for index in range(n):
+            byte = data[index] & mask
+            if prefix < 0:
+                prefix = byte
+                continue
+            key = (prefix << 8) | byte
+            slot = (key * 40503) & (HASH_SIZE - 1)
+            while self.keys[slot] != -1 and self.keys[slot] != key:
+                slot = (slot + 1) & (HASH_SIZE - 1)
+            if self.keys[slot] == key:
+                prefix = self.values[slot]
+                continue
+
+            self._write_code(prefix)
+            if self.next_code < TABLE_SIZE:
+                self.keys[slot] = key
+                self.values[slot] = self.next_code
+                self.next_code += 1
+                # The decoder adds this entry one code later
+                if (self.code_length < MAX_CODE_LENGTH
+                        and self.next_code - 1 + self.early_change >= (1 << self.code_length)):
+                    self.code_length += 1
+            else:
+                # Table full - issue clear-table code and reset
+                self._write_code(self.clear_code)
+                self._reset()
+            prefix = byte
+        self.prefix_code = prefix
+        return self._take_output()
+
+    def finish(self):
+        """Flush the pending string and write end of data, padded to a byte."""
+        if self.prefix_code >= 0:
+            self._write_code(self.prefix_code)
+            self.prefix_code = -1
+            # The decoder adds an entry on reading that code
+            if (self.code_length < MAX_CODE_LENGTH
+                    and self.next_code + self.early_change >= (1 << self.code_length)):
+                self.code_length += 1
+        self._write_code(self.eod_code)
+        if self.bits:
+            self.output.reserve(1)
+            if self.low_bit_first:
+                self.output.data[self.output.size] = self.bit_buffer & 0xFF
+            else:
+                self.output.data[self.output.size] = (self.bit_buffer << (8 - self.bits)) & 0xFF
+            self.output.size += 1
+            self.bit_buffer = 0
+            self.bits = 0
+        return self._take_output()
@@ -0,0 +1,78 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""
+Cython-accelerated PNG predictor decoding.
+
+Compiled version of the row loop in filter_predictor.PredictorDecoder.
+If you modify the filter handling there, update this file to match.
+"""
+
+
+def png_decode_rows(const unsigned char[::1] raw, int nrows, int row_width, int bpp,
+                    const unsigned char[::1] prev_row):
+    """
+    Decode nrows PNG-predicted rows, each a filter type byte plus row_width bytes.
+
+    prev_row is the reconstructed row before the first one (zeros at the
+    start of the stream).  Returns the reconstructed rows as a bytearray.
+    """
+    cdef bytearray result = bytearray(nrows * row_width)
+    cdef unsigned char[::1] out = result
+    cdef int r, i, src, dst, prv
+    cdef int a, b, c, p, pa, pb, pc
+    cdef unsigned char filter_type
+
+    with nogil:
+        for r in range(nrows):
+            src = r * (row_width + 1)
+            filter_type = raw[src]
+            src += 1
+            dst = r * row_width
+            prv = dst - row_width
+
+            if filter_type == 1:
+                # Sub
+                for i in range(row_width):
+                    a = out[dst + i - bpp] if i >= bpp else 0
+                    out[dst + i] = <unsigned char>(raw[src + i] + a)
+            elif filter_type == 2:
+                # Up
+                for i in range(row_width):
+                    b = out[prv + i] if r else prev_row[i]
+                    out[dst + i] = <unsigned char>(raw[src + i] + b)
+            elif filter_type == 3:
+                # Average
+                for i in range(row_width):
+                    a = out[dst + i - bpp] if i >= bpp else 0
+                    b = out[prv + i] if r else prev_row[i]
+                    out[dst + i] = <unsigned char>(raw[src + i] + ((a + b) >> 1))
+            elif filter_type == 4:
+                # Paeth
+                for i in range(row_width):
+                    b = out[prv + i] if r else prev_row[i]
+                    if i >= bpp:
+                        a = out[dst + i - bpp]
+                        c = out[prv + i - bpp] if r else prev_row[i - bpp]
+                    else:
+                        a = 0
+                        c = 0
+                    p = a + b - c
+                    pa = p - a if p >= a else a - p
+                    pb = p - b if p >= b else b - p
+                    pc = p - c if p >= c else c - p
+                    if pa <= pb and pa <= pc:
+                        p = a
+                    elif pb <= pc:
+                        p = b
+                    else:
+                        p = c
+                    out[dst + i] = <unsigned char>(raw[src + i] + p)
+            else:
+                # None, or an unknown filter type passed through as-is
+                for i in range(row_width):
+                    out[dst + i] = raw[src + i]
+
+    return result
@@ -0,0 +1,395 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from __future__ import annotations
+
+# CCITT Group 3 and Group 4 Fax Decoder
+#
+# Decodes the ITU-T T.4 (Group 3, one- and two-dimensional) and T.6
+# (Group 4) encodings for the CCITTFaxDecode filter.  A row is held as its
+# changing elements: the positions where the colour switches, starting from
+# white.  Two-dimensional rows are coded against the previous row, the
+# reference line.
+#
+# The decoder is incremental: data is fed in any size and the rows that
+# could be completed are returned, packed 8 pixels per byte.  A row whose
+# codes run past the data received so far is decoded again once more data
+# arrives, so no row count is needed up front.  The version in _ccitt_cy is
+# used when that extension is built; the class here is the pure Python
+# fallback with the same interface.
+
+try:
+    from ._ccitt_cy import CCITTFaxDecoder as _CCITTFaxDecoderCy
+    _CYTHON_CCITT = True
+except ImportError:
+    _CYTHON_CCITT = False
+
+# Terminating codes for run lengths 0-63
+WHITE_TERMINATING = (
+    '00110101', '000111', '0111', '1000', '1011', '1100', '1110', '1111',
+    '10011', '10100', '00111', '01000', '001000', '000011', '110100', '110101',
+    '101010', '101011', '0100111', '0001100', '0001000', '0010111', '0000011', '0000100',
+    '0101000', '0101011', '0010011', '0100100', '0011000', '00000010', '00000011', '00011010',
+    '00011011', '00010010', '00010011', '00010100', '00010101', '00010110', '00010111', '00101000',
+    '00101001', '00101010', '00101011', '00101100', '00101101', '00000100', '00000101', '00001010',
+    '00001011', '01010010', '01010011', '01010100', '01010101', '00100100', '00100101', '01011000',
+    '01011001', '01011010', '01011011', '01001010', '01001011', '00110010', '00110011', '00110100',
+)
+BLACK_TERMINATING = (
+    '0000110111', '010', '11', '10', '011', '0011', '0010', '00011',
+    '000101', '000100', '0000100', '0000101', '0000111', '00000100', '00000111', '000011000',
+    '0000010111', '0000011000', '0000001000', '00001100111', '00001101000', '00001101100',
+    '00000110111', '00000101000', '00000010111', '00000011000', '000011001010', '000011001011',
+    '000011001100', '000011001101', '000001101000', '000001101001', '000001101010',
+    '000001101011', '000011010010', '000011010011', '000011010100', '000011010101',
+    '000011010110', '000011010111', '000001101100', '000001101101', '000011011010',
+    '000011011011', '000001010100', '000001010101', '000001010110', '000001010111',
+    '000001100100', '000001100101', '000001010010', '000001010011', '000000100100',
+    '000000110111', '000000111000', '000000100111', '000000101000', '000001011000',
+    '000001011001', '000000101011', '000000101100', '000001011010', '000001100110',
+    '000001100111',
+)
+
+# Make-up codes for multiples of 64
+WHITE_MAKEUP = {
+    64: '11011', 128: '10010', 192: '010111', 256: '0110111', 320: '00110110',
+    384: '00110111', 448: '01100100', 512: '01100101', 576: '01101000', 640: '01100111',
+    704: '011001100', 768: '011001101', 832: '011010010', 896: '011010011',
+    960: '011010100', 1024: '011010101', 1088: '011010110', 1152: '011010111',
+    1216: '011011000', 1280: '011011001', 1344: '011011010', 1408: '011011011',
+    1472: '010011000', 1536: '010011001', 1600: '010011010', 1664: '011000',
+    1728: '010011011',
+}
+BLACK_MAKEUP = {
+    64: '0000001111', 128: '000011001000', 192: '000011001001', 256: '000001011011',
+    320: '000000110011', 384: '000000110100', 448: '000000110101', 512: '0000001101100',
+    576: '0000001101101', 640: '0000001001010', 704: '0000001001011', 768: '0000001001100',
+    832: '0000001001101', 896: '0000001110010', 960: '0000001110011', 1024: '0000001110100',
+    1088: '0000001110101', 1152: '0000001110110', 1216: '0000001110111', 1280: '0000001010010',
+    1344: '0000001010011', 1408: '0000001010100', 1472: '0000001010101', 1536: '0000001011010',
+    1600: '0000001011011', 1664: '0000001100100', 1728: '0000001100101',
+}
+# Extended make-up codes, shared by both colours
+EXTENDED_MAKEUP = {
+    1792: '00000001000', 1856: '00000001100', 1920: '00000001101', 1984: '000000010010',
+    2048: '000000010011', 2112: '000000010100', 2176: '000000010101', 2240: '000000010110',
+    2304: '000000010111', 2368: '000000011100', 2432: '000000011101', 2496: '000000011110',
+    2560: '000000011111',
+}
+
+# Two-dimensional coding modes.  Vertical modes are a1 - b1 + 3.
+MODE_PASS = 7
+MODE_HORIZONTAL = 8
+MODE_CODES = {
+    MODE_PASS: '0001', MODE_HORIZONTAL: '001',
+    0: '0000010', 1: '000010', 2: '010', 3: '1', 4: '011', 5: '000011', 6: '0000011',
+}
+
+EOL = 1  # 000000000001, as read by peeking 12 bits
+WHITE_BITS = 12
+BLACK_BITS = 13
+MODE_BITS = 7
+
+
+def _code_table(codes: dict[int, str], bits: int) -> list[int]:
+    """Lookup table indexed by the next bits bits: code length << 16 | value, 0 if invalid."""
+    table = [0] * (1 << bits)
+    for value, code in codes.items():
+        shift = bits - len(code)
+        first = int(code, 2) << shift
+        table[first:first + (1 << shift)] = [(len(code) << 16) | value] * (1 << shift)
+    return table
+
+
+WHITE_TABLE = _code_table({**dict(enumerate(WHITE_TERMINATING)), **WHITE_MAKEUP,
+                           **EXTENDED_MAKEUP}, WHITE_BITS)
+BLACK_TABLE = _code_table({**dict(enumerate(BLACK_TERMINATING)), **BLACK_MAKEUP,
+                           **EXTENDED_MAKEUP}, BLACK_BITS)
+MODE_TABLE = _code_table(MODE_CODES, MODE_BITS)
+
+# Zero bytes after the data so peeks near its end need no bounds checks
+_PAD = bytes(4)
+
+
+class _NeedInput(Exception):
+    """The codes being decoded run past the end of the data."""
+
+
+class _Damaged(Exception):
+    """An invalid code, or a row whose runs do not add up to Columns."""
+
+
+class _CCITTFaxDecoderPy:
+    """
+    Incremental CCITT fax decoder.
+
+    Parameters are those of the CCITTFaxDecode filter.  Rows are returned
+    with BlackIs1 polarity and padded to a byte boundary with zero bits.
+
+    Attributes:
+        row_bytes: Length of a decoded row.
+        eod: Decoding has finished, at the end-of-block pattern, after Rows
+            rows, or at the end of the data.
+        unused_data: After eod, the bytes fed in after the encoded data.
+        needs_input: The last decode call stopped for lack of data rather
+            than at max_rows.
+    """
+
+    def __init__(self, k: int = 0, columns: int = 1728, rows: int = 0,
+                 end_of_block: bool = True, end_of_line: bool = False,
+                 encoded_byte_align: bool = False, black_is_1: bool = False,
+                 damaged_rows_before_error: int = 0) -> None:
+        self.k = k
+        self.columns = columns
+        self.rows = rows
+        self.end_of_block = end_of_block
+        self.end_of_line = end_of_line
+        self.encoded_byte_align = encoded_byte_align
+        self.black_is_1 = black_is_1
+        self.damaged_rows_before_error = damaged_rows_before_error
+        self.row_bytes = (columns + 7) // 8
+        self.eod = False
+        self.unused_data = b''
+        self.needs_input = True
+
+        self._data = bytearray(_PAD)
+        self._size = 0  # bits of data in _data, before the padding
+        self._pos = 0
+        self._final = False
+        self._started = False
+        self._next_2d = k < 0
+        self._ref = [columns] * 3  # reference line, all white, with end sentinels
+        self._row = 0
+        self._damaged = 0
+        # Every pixel of a row set, for inverting to PostScript's 0 = black
+        self._row_mask = ((1 << columns) - 1) << (self.row_bytes * 8 - columns)
+
+    def decode(self, data: bytes = b'', final: bool = False, max_rows: int = -1) -> bytes:
+        """
+        Decode the rows that data completes.
+
+        Args:
+            data: More encoded data.
+            final: No data follows; a row cut short by the end is returned as is.
+            max_rows: Stop after this many rows, -1 for no limit.  Call again
+                without data to continue.
+
+        Raises:
+            ValueError: A damaged row, beyond DamagedRowsBeforeError.
+        """
+        if self.eod:
+            return b''
+        if data:
+            self._append(data)
+        if final:
+            self._final = True
+
+        out = bytearray()
+        self.needs_input = False
+        count = 0
+        while count != max_rows:
+            pos, next_2d, started = self._pos, self._next_2d, self._started
+            row = []
+            started_row = False
+            damaged = False
+            try:
+                if not self._started:
+                    self._started = True
+                    self._line_end(align=False)
+                if self._end_of_block():
+                    self.eod = True
+                    break
+                started_row = True
+                try:
+                    self._decode_row(row)
+                except _Damaged:
+                    # Only EOLs allow skipping to the next row
+                    if (not self.end_of_line or self.k < 0
+                            or self._damaged >= self.damaged_rows_before_error):
+                        raise ValueError("damaged CCITTFax data")
+                    damaged = True
+                    while self._peek(12) != EOL:
+                        if self._pos + 12 > self._size:
+                            raise _NeedInput
+                        self._pos += 1
+                if self.rows > 0 and self._row + 1 >= self.rows:
+                    if self.end_of_block:
+                        self._end_of_block()
+                    self.eod = True
+                else:
+                    self._line_end(align=not damaged)
+            except _NeedInput:
+                if not self._final:
+                    self._pos, self._next_2d, self._started = pos, next_2d, started
+                    self.needs_input = True
+                    break
+                self.eod = True
+                if not started_row:
+                    break
+
+            self._damaged = self._damaged + 1 if damaged else 0
+            self._row += 1
+            self._ref = row + [self.columns] * 3
+            out += self._pack(row)
+            count += 1
+            if self.eod:
+                break
+
+        if self.eod:
+            self.unused_data = bytes(self._data[(self._pos + 7) >> 3:self._size >> 3])
+            self._data = bytearray(_PAD)
+            self._size = self._pos = 0
+        return bytes(out)
+
+    def _append(self, data: bytes) -> None:
+        consumed = self._pos >> 3
+        del self._data[:consumed]
+        self._pos -= consumed * 8
+        self._size -= consumed * 8
+        del self._data[self._size >> 3:]
+        self._data += data
+        self._data += _PAD
+        self._size += len(data) * 8
+
+    def _peek(self, n: int) -> int:
+        """The next n bits (at most 17), zero past the end of the data."""
+        pos = self._pos
+        i = pos >> 3
+        data = self._data
+        word = (data[i] << 16) | (data[i + 1] << 8) | data[i + 2]
+        return (word >> (24 - (pos & 7) - n)) & ((1 << n) - 1)
+
+    def _skip_fill(self) -> None:
+        """Skip zero bits that pad out to an EOL."""
+        while self._peek(12) == 0:
+            if self._pos + 12 > self._size:
+                raise _NeedInput
+            self._pos += 1
+
+    def _line_end(self, align: bool) -> None:
+        """Read the EOL (if any) and the 1-D/2-D tag bit that precede a row."""
+        # With required EOLs the fill goes before each EOL, so it ends on a
+        # byte boundary; otherwise the row itself starts on one, and its fill
+        # followed by the row's first code can look like an EOL
+        if align and self.encoded_byte_align and not (self.end_of_line and self.k >= 0):
+            self._pos = (self._pos + 7) & ~7
+        pos = self._pos
+        self._skip_fill()
+        if self._peek(12) == EOL:
+            self._pos += 12
+        else:
+            self._pos = pos
+        if self.k > 0:
+            if self._pos >= self._size:
+                raise _NeedInput
+            self._next_2d = not self._peek(1)
+            self._pos += 1
+
+    def _end_of_block(self) -> bool:
+        """Consume EOFB or RTC (consecutive EOLs) if it follows; return whether it did."""
+        pos = self._pos
+        self._skip_fill()
+        if self._peek(12) != EOL:
+            self._pos = pos
+            return False
+        while True:
+            self._pos += 13 if self.k > 0 else 12
+            pos = self._pos
+            self._skip_fill()
+            if self._peek(12) != EOL:
+                self._pos = pos
+                return True
+
+    def _read_code(self, table: list[int], bits: int) -> int:
+        entry = table[self._peek(bits)]
+        if not entry:
+            if self._pos + bits > self._size:
+                raise _NeedInput
+            raise _Damaged
+        self._pos += entry >> 16
+        if self._pos > self._size:
+            raise _NeedInput
+        return entry & 0xFFFF
+
+    def _read_run(self, black: int) -> int:
+        """Read one run length: make-up codes followed by a terminating code."""
+        table, bits = (BLACK_TABLE, BLACK_BITS) if black else (WHITE_TABLE, WHITE_BITS)
+        total = 0
+        while True:
+            run = self._read_code(table, bits)
+            total += run
+            if run < 64:
+                return total
+
+    def _decode_row(self, row: list[int]) -> None:
+        """Decode one row, appending its changing elements to row."""
+        columns = self.columns
+
+        def change(position: int) -> None:
+            if position < columns:
+                # Two changes at one position are an empty run
+                if row and row[-1] == position:
+                    row.pop()
+                else:
+                    row.append(position)
+
+        if not self._next_2d:
+            a0 = 0
+            black = 0
+            while a0 < columns:
+                a0 += self._read_run(black)
+                if a0 > columns:
+                    raise _Damaged
+                change(a0)
+                black ^= 1
+            return
+
+        ref = self._ref
+        i = 0
+        a0 = -1  # imaginary changing element before the row
+        black = 0
+        while a0 < columns:
+            # b1: first changing element on the reference line right of a0
+            # and of the opposite colour, which is at an index of parity black
+            while i and ref[i - 1] > a0:
+                i -= 1
+            while ref[i] <= a0 or (i & 1) != black:
+                i += 1
+            b1 = ref[i]
+            mode = self._read_code(MODE_TABLE, MODE_BITS)
+            if mode == MODE_PASS:
+                a0 = ref[i + 1]
+            elif mode == MODE_HORIZONTAL:
+                a1 = max(a0, 0) + self._read_run(black)
+                a2 = a1 + self._read_run(black ^ 1)
+                if a2 > columns:
+                    raise _Damaged
+                change(a1)
+                change(a2)
+                a0 = a2
+            else:
+                a1 = b1 + mode - 3
+                if a1 < a0 or a1 < 0 or a1 > columns:
+                    raise _Damaged
+                change(a1)
+                a0 = a1
+                black ^= 1
+
+    def _pack(self, row: list[int]) -> bytes:
+        columns = self.columns
+        width = self.row_bytes * 8
+        bits = 0
+        for j in range(0, len(row), 2):
+            start = row[j]
+            end = row[j + 1] if j + 1 < len(row) else columns
+            bits |= ((1 << (end - start)) - 1) << (width - end)
+        if not self.black_is_1:
+            bits ^= self._row_mask
+        return bits.to_bytes(self.row_bytes, 'big')
+
+
+if _CYTHON_CCITT:
+    CCITTFaxDecoder = _CCITTFaxDecoderCy
+else:
+    CCITTFaxDecoder = _CCITTFaxDecoderPy
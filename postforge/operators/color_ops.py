@@ -5,9 +5,11 @@
 from __future__ import annotations
 
 import copy
+from collections import OrderedDict
 
 from ..core import error as ps_error
 from ..core import icc_profile
+from ..core import proc_table
 from ..core import types as ps
 from ..core import color_space
 from ..core.color_space import ColorSpaceEngine
@@ -686,12 +688,84 @@ def _execute_tint_transform(ctxt: ps.Context, tint_values: list[float], tint_tra
     Returns:
         List of Python float color values in the alternative color space
     """
+    alt_component_count = color_space.ColorSpaceEngine.COMPONENT_COUNTS.get(alt_space_name, 3)
+    return evaluate_tint_transform(ctxt, tint_transform, tint_values, alt_component_count)
+
+
+# A tint transform is run directly, with its results memoized per tint
+# tuple under the content of the procedure (see core/proc_table.py), so
+# setcolor always gets exactly what the procedure returns.  Shadings and
+# images, which map many tints, may instead use a table sampled over the
+# whole domain, but only once the transform has been run for as many
+# distinct tints as sampling it would take.
+_TINT_MEMO_MAX_RESULTS = 8192
+_TINT_MEMO_MAX_ENTRIES = 256
+
+# (content key, save level, n_out) → {tints: outputs}
+_tint_memo = OrderedDict()
+proc_table.track(_tint_memo)
+
+
+def evaluate_tint_transform(ctxt: ps.Context, tint_transform: ps.Array, tints: list[float], n_out: int,
+                            sampled: bool = False) -> list[float]:
+    """
+    Map tint values through a tint transform.
+
+    Args:
+        ctxt: PostScript context (to run the procedure)
+        tint_transform: PostScript procedure (Array)
+        tints: tint values, already clamped to [0, 1]
+        n_out: number of components in the alternative space
+        sampled: allow the sampled table to stand in for the procedure
+
+    Returns:
+        List of n_out float values clamped to [0, 1]
+    """
+    n_in = len(tints)
+    can_sample = sampled and n_in <= proc_table.MAX_INPUTS
+    if can_sample:
+        table = proc_table.lookup(tint_transform, n_in, n_out)
+        if table is not None:
+            return table.evaluate(tints)
+
+    key = (proc_table.content_key(tint_transform), proc_table.save_level(tint_transform), n_out)
+    results = _tint_memo.get(key)
+    if results is None:
+        results = {}
+        _tint_memo[key] = results
+        if len(_tint_memo) > _TINT_MEMO_MAX_ENTRIES:
+            _tint_memo.popitem(last=False)
+
+    tint_key = tuple(tints)
+    result = results.get(tint_key)
+    if result is None:
+        if can_sample and len(results) >= proc_table.grid_points(n_in):
+            return tint_table(ctxt, tint_transform, n_in, n_out).evaluate(tints)
+        result = _run_tint_transform(ctxt, tint_transform, tints, n_out)
+        if len(results) >= _TINT_MEMO_MAX_RESULTS:
+            results.clear()
+        results[tint_key] = result
+    return list(result)
+
+
+def tint_table(ctxt: ps.Context, tint_transform: ps.Array, n_in: int, n_out: int) -> proc_table.ProcTable | None:
+    """Return the sampled table of a tint transform, building it if needed.
+
+    Returns None if the transform has too many inputs to be sampled.
+    """
+    return proc_table.get_table(
+        tint_transform, lambda tints: _run_tint_transform(ctxt, tint_transform, tints, n_out),
+        n_in, n_out)
+
+
+def _run_tint_transform(ctxt: ps.Context, tint_transform: ps.Array, tints: list[float], n_out: int) -> list[float]:
+    """Run a tint transform procedure once through the interpreter."""
 
     # Local import to avoid circular dependency
     from . import control as ps_control
 
     # Push tint values onto operand stack
-    for tint in tint_values:
+    for tint in tints:
         ctxt.o_stack.append(ps.Real(tint))
 
     # Execute the tint transform procedure
@@ -699,12 +773,9 @@ def _execute_tint_transform(ctxt: ps.Context, tint_values: list[float], tint_tra
     ctxt.e_stack.append(copy.copy(tint_transform))
     ps_control.exec_exec(ctxt, ctxt.o_stack, ctxt.e_stack)
 
-    # Get expected component count for alternative space
-    alt_component_count = color_space.ColorSpaceEngine.COMPONENT_COUNTS.get(alt_space_name, 3)
-
     # Pop results from operand stack
     result = []
-    for _ in range(alt_component_count):
+    for _ in range(n_out):
         if ctxt.o_stack:
             val = ctxt.o_stack.pop()
             if val.TYPE in ps.NUMERIC_TYPES:
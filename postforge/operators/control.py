@@ -32,6 +32,7 @@ from . import matrix as ps_matrix
 from ..core import tokenizer as ps_token
 from ..core import types as ps
 from . import vm as ps_vm
+from . import image_data as ps_image_data
 
 def ps_break(ctxt: ps.Context, ostack: ps.Stack) -> None:
     """
@@ -146,6 +147,9 @@ def execjob(ctxt: ps.Context, filepath: str) -> None:
     job_start_time = time.perf_counter()
     ctxt.user_wait_time = 0.0  # Reset accumulated wait time for this job
 
+    # Image sample data is deduplicated per job
+    ps_image_data.clear_sample_store()
+
     # PLRM 3.7.7 Job Start Sequence:
     # 1. save  2. clear  3. cleardictstack  4. initgraphics  5. false setglobal
 
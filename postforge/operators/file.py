@@ -9,6 +9,7 @@ import glob
 import os
 import struct
 
+from ..core import ascii_codecs
 from ..core import error as ps_error
 from ..core import types as ps
 from ..core.binary_token import _SYSTEM_NAME_TABLE
@@ -642,14 +643,21 @@ def readstring(ctxt: ps.Context, ostack: ps.Stack) -> None:
         chars_read = 0
         eof_encountered = False
         
-        for i in range(chars_to_read):
-            char_code = file_obj.read(ctxt)
-            if char_code is None:  # EOF
-                eof_encountered = True
-                break
-            # Write directly to string buffer
-            dst[target_string.offset + target_string.start + i] = char_code
-            chars_read += 1
+        if type(file_obj) is ps.EexecDecryptionFilter:
+            # eexec decrypts a block at a time - copy whole runs (Type 1 RD strings)
+            data = file_obj.read_bulk(ctxt, chars_to_read)
+            start = target_string.offset + target_string.start
+            dst[start:start + len(data)] = data
+            chars_read = len(data)
+        else:
+            for i in range(chars_to_read):
+                char_code = file_obj.read(ctxt)
+                if char_code is None:  # EOF
+                    eof_encountered = True
+                    break
+                # Write directly to string buffer
+                dst[target_string.offset + target_string.start + i] = char_code
+                chars_read += 1
         
         # Create substring representing what was actually read
         result_substring = copy.copy(target_string)
@@ -716,47 +724,12 @@ def readhexstring(ctxt: ps.Context, ostack: ps.Stack) -> None:
         # Get string buffer to write into
         dst = ps.global_resources.global_strings if target_string.is_global else ctxt.local_strings
         
-        # Read hex characters and convert to binary
+        # Read hex digits (ignoring non-hex characters) and convert to binary
         bytes_to_read = target_string.length
-        bytes_read = 0
-        eof_encountered = False
-        hex_digits = "0123456789ABCDEFabcdef"
-        
-        for i in range(bytes_to_read):
-            # Read two hex digits to form one byte
-            hex_chars = []
-            
-            # Read hex digits (ignoring non-hex characters)
-            while len(hex_chars) < 2 and not eof_encountered:
-                char_code = file_obj.read(ctxt)
-                if char_code is None:  # EOF
-                    eof_encountered = True
-                    break
-                
-                char = chr(char_code)
-                if char in hex_digits:
-                    hex_chars.append(char)
-                # Ignore non-hex characters (spaces, newlines, etc.)
-            
-            if len(hex_chars) == 2:
-                # Convert two hex digits to byte value
-                hex_string = ''.join(hex_chars)
-                byte_value = int(hex_string, 16)
-                # Write directly to string buffer
-                dst[target_string.offset + target_string.start + i] = byte_value
-                bytes_read += 1
-            elif len(hex_chars) == 1:
-                # Odd number of hex digits at EOF - treat as if followed by '0'
-                hex_string = hex_chars[0] + '0'
-                byte_value = int(hex_string, 16)
-                dst[target_string.offset + target_string.start + i] = byte_value
-                bytes_read += 1
-                eof_encountered = True
-                break
-            else:
-                # No hex digits found
-                eof_encountered = True
-                break
+        data = ascii_codecs.read_hex_bytes(file_obj, ctxt, bytes_to_read)
+        bytes_read = len(data)
+        start = target_string.offset + target_string.start
+        dst[start:start + bytes_read] = data
         
         # Create substring representing what was actually read
         result_substring = copy.copy(target_string)
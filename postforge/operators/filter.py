@@ -14,6 +14,11 @@ from ..core import types as ps
 from ..core import error as ps_error
 from . import control as ps_control
 
+# Decode filters request source data in chunks of this size and put back
+# whatever follows their end-of-data marker, so reading ahead is safe even
+# from currentfile.
+SOURCE_READ_SIZE = 65536
+
 
 # Filter Implementation Base Classes
 
@@ -36,6 +41,21 @@ class FilterBase:
         """Encode and write data to underlying target"""
         raise NotImplementedError("Subclasses must implement write_data")
 
+    def flush(self, ctxt: ps.Context) -> None:
+        """Deliver output the **filter** is holding back (**flushfile**)"""
+        return None
+
+    def _write_target(self, ctxt: ps.Context, data: bytes | bytearray) -> None:
+        """Write encoded bytes to the underlying target file"""
+        target = self.data_source.source
+        if isinstance(target, ps.File) and data:
+            if target.is_real_file:
+                target.write(ctxt, bytes(data))
+            else:
+                # Filter targets take one byte at a time
+                for byte_val in data:
+                    target.write(ctxt, byte_val)
+
     def close(self, ctxt: ps.Context) -> None:
         """Close **filter** and underlying source/target"""
         if not self.closed:
@@ -94,21 +114,19 @@ class DataSource:
             return b''
 
         if isinstance(self.source, ps.File):
-            # FilterFile sources have their own buffering and EOD handling,
-            # so bulk read is safe and avoids per-byte overhead.
-            # Regular File sources (e.g. currentfile) must NOT be bulk-read
-            # because filters rely on reading small amounts to stop precisely
-            # at EOD markers — excess bytes would be consumed from the stream
-            # and lost.
-            if hasattr(self.source, 'filter'):
-                bytes_to_read = max_bytes if max_bytes is not None else 1024
+            # FilterFile and disk file sources (e.g. currentfile while running
+            # a job) are read in bulk.  Filters put back any bytes past their
+            # EOD, which File.putback returns to the file exactly.
+            if hasattr(self.source, 'filter') or self.source.is_real_file:
+                bytes_to_read = max_bytes if max_bytes is not None else SOURCE_READ_SIZE
                 data = self.source.read_bulk(ctxt, bytes_to_read)
                 if not data:
                     self.exhausted = True
                     return b''
                 return data
             else:
-                # Regular File — return 1 byte to let filters control consumption
+                # Interactive and standard files — return 1 byte so a filter
+                # never blocks waiting for input beyond its EOD
                 data = self.source.read(ctxt)
                 if data is None:
                     self.exhausted = True
@@ -374,11 +392,18 @@ class FilterFile(ps.File):
         """Read up to *count* bytes efficiently.  Returns bytes (may be shorter at EOF)."""
         s = self._state
         result = bytearray()
+        if count <= 0:
+            return b''
+
+        # Return unread byte if available
+        if s.has_unread_byte:
+            s.has_unread_byte = False
+            result.append(s.last_read_byte)
 
         # 1. Drain any buffered bytes first
         buffered = len(s.buffer) - s.buf_pos
         if buffered > 0:
-            take = min(buffered, count)
+            take = min(buffered, count - len(result))
             result.extend(s.buffer[s.buf_pos:s.buf_pos + take])
             s.buf_pos += take
             if s.buf_pos >= len(s.buffer):
@@ -413,6 +438,11 @@ class FilterFile(ps.File):
         except Exception as e:
             return ps_error.e(ctxt, ps_error.IOERROR, "write")
     
+    def flush(self) -> None:
+        """Deliver output held back by an encoding **filter**"""
+        if not self.is_input:
+            self.filter.flush(self.ctxt)
+
     def close(self) -> None:
         """Close **filter** and underlying source"""
         if not hasattr(self, 'closed'):
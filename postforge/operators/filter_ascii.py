@@ -11,6 +11,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from ..core import ascii_codecs
 from ..core import types as ps
 from .filter import FilterBase
 
@@ -23,69 +24,39 @@ class ASCIIHexDecodeFilter(FilterBase):
 
     def __init__(self, data_source: DataSource, params: dict | None = None) -> None:
         super().__init__(data_source, params)
-        self.hex_buffer = bytearray()
+        self.decoder = ascii_codecs.HexDecoder()
+        self.decoded = bytearray()  # Decoded bytes beyond the last request
         self.eod_reached = False
 
     def read_data(self, ctxt: ps.Context, max_bytes: int | None = None) -> bytes:
         """Decode hex data to binary"""
-        if self.eof_reached or self.eod_reached:
-            return b''
-
-        result = bytearray()
+        result = self.decoded
+        self.decoded = bytearray()
         target_bytes = max_bytes or 1024
 
         while len(result) < target_bytes and not self.eof_reached and not self.eod_reached:
-            # Read more data from source
-            source_data = self.data_source.read_data(ctxt, 2048)
+            # Two digits per byte, less a digit carried from the last chunk
+            wanted = 2 * (target_bytes - len(result)) - len(self.decoder.pending)
+            source_data = self.data_source.read_data(ctxt, wanted)
             if not source_data:
+                # Final odd hex digit without '>' is padded with 0
+                result.extend(self.decoder.flush())
                 self.eof_reached = True
                 break
 
-            self.hex_buffer.extend(source_data)
-
-            # Process hex data
-            while len(self.hex_buffer) >= 2 and len(result) < target_bytes:
-                # Skip whitespace
-                while self.hex_buffer and self.hex_buffer[0] in b' \t\n\r\f':
-                    self.hex_buffer.pop(0)
-
-                if not self.hex_buffer:
-                    break
-
-                # Check for EOD marker '>' (only relevant for file/stream sources)
-                if self.hex_buffer[0] == ord('>'):
-                    self.eod_reached = True
-                    # Push back bytes after '>' to the underlying source
-                    if len(self.hex_buffer) > 1:
-                        self.data_source.putback(bytes(self.hex_buffer[1:]))
-                        self.hex_buffer = bytearray()
-                    break
-
-                # Get two hex digits
-                if len(self.hex_buffer) >= 2:
-                    hex1 = self.hex_buffer.pop(0)
-                    hex2 = self.hex_buffer.pop(0)
-
-                    try:
-                        # Convert hex pair to byte
-                        hex_str = bytes([hex1, hex2]).decode('ascii')
-                        byte_val = int(hex_str, 16)
-                        result.append(byte_val)
-                    except (ValueError, UnicodeDecodeError):
-                        # Skip invalid hex digits
-                        continue
-                elif len(self.hex_buffer) == 1:
-                    # Handle final odd hex digit by padding with 0
-                    hex1 = self.hex_buffer.pop(0)
-                    try:
-                        hex_str = bytes([hex1, ord('0')]).decode('ascii')
-                        byte_val = int(hex_str, 16)
-                        result.append(byte_val)
-                        self.eod_reached = True
-                    except (ValueError, UnicodeDecodeError):
-                        pass
-                    break
+            data, end = self.decoder.decode(source_data)
+            result.extend(data)
+            if end >= 0:
+                # EOD marker '>': push back bytes after it to the underlying source
+                self.eod_reached = True
+                if end < len(source_data):
+                    self.data_source.putback(source_data[end:])
+                break
 
+        # Procedure sources may hand back more than was asked for
+        if len(result) > target_bytes:
+            self.decoded = result[target_bytes:]
+            del result[target_bytes:]
         return bytes(result)
 
 
@@ -128,181 +99,75 @@ class NullEncodeFilter(FilterBase):
 class ASCII85DecodeFilter(FilterBase):
     """ASCII85 decode filter - PLRM compliant base-85 ASCII to binary conversion"""
 
+    # Decoded bytes kept ready beyond each request
+    LOOK_AHEAD = 4096
+
     def __init__(self, data_source: DataSource, params: dict | None = None) -> None:
         super().__init__(data_source, params)
-        self.decode_buffer = bytearray()
+        self.decoder = ascii_codecs.A85Decoder()
+        self.decoded = bytearray()  # Decoded bytes beyond the last request
         self.eod_reached = False  # End of ASCII85 data stream (not end of file)
 
     def read_data(self, ctxt: ps.Context, max_bytes: int | None = None) -> bytes:
         """Decode ASCII85 data to binary - PLRM Section 3.13
 
-        Uses a "read all and cache" strategy: on first call, reads and decodes
-        the ENTIRE ASCII85 stream until ~> is found. This guarantees that the
-        ~> end marker is always consumed, preventing issues when **filter** chains
-        are discarded before consuming all data.
+        Decodes the stream a chunk at a time, keeping up to LOOK_AHEAD
+        decoded bytes beyond the request, so memory stays bounded.  Reading
+        ahead means the ~> end marker is consumed while the last bytes are
+        still unread, so it is not left in the source when a **filter**
+        chain stops short of its end (e.g. RunLengthDecode reaching its row
+        length before its EOD byte) and is discarded.
         """
-        # On first call, decode the entire stream into cache
-        if not hasattr(self, '_decoded_cache'):
-            self._decoded_cache = self._decode_entire_stream(ctxt)
-            self._cache_pos = 0
-
-        # Return requested bytes from cache
-        if max_bytes is None:
-            max_bytes = 1024
-
-        start = self._cache_pos
-        end = min(start + max_bytes, len(self._decoded_cache))
-        result = self._decoded_cache[start:end]
-        self._cache_pos = end
-
-        return result
-
-    def _decode_entire_stream(self, ctxt: ps.Context) -> bytes:
-        """Read and decode the entire ASCII85 stream until ~> is found.
+        result = self.decoded
+        self.decoded = bytearray()
+        target_bytes = max_bytes or 1024
+        decoder = self.decoder
+
+        while not self.eod_reached and not self.eof_reached:
+            if decoder.tilde:
+                wanted = 1
+            elif len(result) < target_bytes + self.LOOK_AHEAD:
+                # Five characters per four bytes
+                wanted = max((target_bytes + self.LOOK_AHEAD - len(result)) * 5 // 4, 64)
+            else:
+                break
 
-        Reads source data in large chunks and iterates with an index to avoid
-        per-byte pop(0) overhead.
-        """
-        result = bytearray()
-        ascii85_chars = []
-
-        # Collect all source bytes into a flat buffer first, then decode.
-        # This avoids per-byte read_data calls and pop(0) shifts.
-        buf = bytearray(self.decode_buffer)
-        self.decode_buffer = bytearray()
-        pos = 0
-
-        while not self.eod_reached:
-            # Refill buffer when exhausted
-            if pos >= len(buf):
-                source_data = self.data_source.read_data(ctxt, 4096)
-                if not source_data:
-                    self.eof_reached = True
+            # Sources such as currentfile return a byte per call, so gather a
+            # batch before decoding, stopping at a '~' so that nothing past
+            # the ~> is taken from them.
+            source_data = bytearray()
+            while len(source_data) < wanted:
+                chunk = self.data_source.read_data(ctxt, wanted - len(source_data))
+                if not chunk:
                     break
-                buf = bytearray(source_data)
-                pos = 0
-
-            char = buf[pos]
-
-            # Skip whitespace
-            if char in (32, 9, 10, 13):  # space, tab, LF, CR
-                pos += 1
-                continue
-
-            # Check for EOD marker '~>'
-            if char == 126:  # '~'
-                # Need to check next char
-                if pos + 1 >= len(buf):
-                    # Need more data to see if '>' follows
-                    source_data = self.data_source.read_data(ctxt, 4096)
-                    if source_data:
-                        buf = buf[pos:] + bytearray(source_data)
-                        pos = 0
-                        continue
-                    else:
-                        self.eof_reached = True
-                        break
-
-                if buf[pos + 1] == 62:  # '>'
-                    pos += 2
-                    self.eod_reached = True
+                source_data += chunk
+                if 126 in chunk:  # '~'
                     break
-                else:
-                    # ~ not followed by >, skip the ~
-                    pos += 1
-                    continue
-
-            # Handle special case 'z' (four zero bytes)
-            if char == 122:  # 'z'
-                if ascii85_chars:
-                    if len(ascii85_chars) >= 2:
-                        decoded_bytes = self._decode_ascii85_group(ascii85_chars)
-                        result.extend(decoded_bytes)
-                    ascii85_chars = []
-                result.extend(b'\x00\x00\x00\x00')
-                pos += 1
-                continue
-
-            # Check for valid ASCII85 character (!-u, 33-117)
-            if 33 <= char <= 117:
-                ascii85_chars.append(char - 33)  # Convert to 0-84
-                pos += 1
-
-                # Process complete 5-tuple group
-                if len(ascii85_chars) == 5:
-                    try:
-                        decoded_bytes = self._decode_ascii85_group(ascii85_chars)
-                        result.extend(decoded_bytes)
-                    except (ValueError, OverflowError, IOError) as e:
-                        chars_str = ''.join(chr(c + 33) for c in ascii85_chars)
-                        raise IOError(f"Invalid ASCII85 5-tuple '{chars_str}': {e}")
-                    ascii85_chars = []
-            else:
-                # Invalid character - ignore it (PLRM: ignore all other characters)
-                pos += 1
-
-        # Push any unconsumed bytes back to the data source
-        # This is critical for inline images: bytes after ~> belong to the
-        # PostScript stream and must be available for subsequent reads
-        if pos < len(buf):
-            leftover = buf[pos:]
-            if self.eod_reached:
-                # We found ~>, so push leftover bytes back to source
-                # so they can be read by subsequent operations
-                self.data_source.putback(bytes(leftover))
-            else:
-                # Still decoding (hit EOF without ~>), keep in local buffer
-                self.decode_buffer = leftover
+            if not source_data:
+                self.eof_reached = True
+                try:
+                    result.extend(decoder.flush())
+                except ValueError as e:
+                    raise IOError(f"Invalid ASCII85 data: {e}")
+                break
 
-        # Handle any remaining partial group at end of data
-        if ascii85_chars and len(ascii85_chars) >= 2:
             try:
-                decoded_bytes = self._decode_ascii85_group(ascii85_chars)
-                result.extend(decoded_bytes)
-            except (ValueError, OverflowError) as e:
-                raise IOError(f"Invalid ASCII85 5-tuple value: {e}")
-
+                data, end = decoder.decode(source_data)
+            except ValueError as e:
+                raise IOError(f"Invalid ASCII85 data: {e}")
+            result.extend(data)
+            if end >= 0:
+                # Bytes after ~> belong to the underlying stream (e.g. the
+                # PostScript program after an inline image) - push them back
+                self.eod_reached = True
+                if end < len(source_data):
+                    self.data_source.putback(source_data[end:])
+
+        if len(result) > target_bytes:
+            self.decoded = result[target_bytes:]
+            del result[target_bytes:]
         return bytes(result)
 
-    def _decode_ascii85_group(self, values: list[int]) -> bytes:
-        """Decode ASCII85 5-tuple to 4 bytes - PLRM algorithm"""
-        group_len = len(values)
-
-        # PLRM: Partial final group must have at least 2 characters
-        if group_len == 1:
-            raise ValueError(f"Invalid partial ASCII85 group: got {group_len} character(s), need at least 2")
-
-        # Pad to 5 values if needed (pad with 84 = 'u' - '!')
-        while len(values) < 5:
-            values.append(84)
-
-        # Convert base-85 to 32-bit integer: c1*85^4 + c2*85^3 + c3*85^2 + c4*85^1 + c5*85^0
-        value = 0
-        for digit in values:
-            if digit < 0 or digit > 84:
-                raise ValueError(f"Invalid ASCII85 digit value: {digit} (must be 0-84)")
-            value = value * 85 + digit
-
-        # PLRM: Check for impossible combinations (value > 2^32-1)
-        if value > 0xFFFFFFFF:
-            raise IOError(f"ASCII85 5-tuple value {value} exceeds 2^32-1 (impossible combination)")
-
-        # Convert to 4 bytes (big-endian: most significant byte first)
-        byte1 = (value >> 24) & 0xFF
-        byte2 = (value >> 16) & 0xFF
-        byte3 = (value >> 8) & 0xFF
-        byte4 = value & 0xFF
-
-        # Return appropriate number of bytes for partial groups
-        if group_len == 2:
-            return bytes([byte1])  # 2 chars → 1 byte
-        elif group_len == 3:
-            return bytes([byte1, byte2])  # 3 chars → 2 bytes
-        elif group_len == 4:
-            return bytes([byte1, byte2, byte3])  # 4 chars → 3 bytes
-        else:
-            return bytes([byte1, byte2, byte3, byte4])  # 5 chars → 4 bytes
-
 
 class ASCII85EncodeFilter(FilterBase):
     """ASCII85 encode filter - PLRM compliant binary to base-85 ASCII conversion"""
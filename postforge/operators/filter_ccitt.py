@@ -6,17 +6,14 @@ from __future__ import annotations
 
 # CCITTFax Decode Filter
 #
-# Implements CCITTFaxDecode per PLRM Section 3.13, Table 3.21.
-# Uses Pillow's libtiff backend via TIFF wrapping to decode Group 3/4 fax data.
+# Implements CCITTFaxDecode per PLRM Section 3.13, Table 3.21.  Rows are
+# decoded as the encoded data arrives by the codec in ccitt_codec.
 
-import io
-import struct
 from typing import TYPE_CHECKING
 
-from PIL import Image
-
 from ..core import types as ps
-from .filter import FilterBase
+from . import ccitt_codec
+from .filter import FilterBase, SOURCE_READ_SIZE
 
 if TYPE_CHECKING:
     from .filter import DataSource
@@ -45,8 +42,8 @@ class CCITTFaxDecodeFilter(FilterBase):
     """CCITTFaxDecode filter — PLRM Section 3.13, Table 3.21.
 
     Decodes CCITT Group 3 (1-D and 2-D) and Group 4 fax-encoded data.
-    Implementation wraps encoded data in a minimal TIFF container and
-    uses Pillow's libtiff backend for actual decoding.
+    Decoding stops at the end-of-block pattern, after Rows rows, or at the
+    end of the source; bytes after the encoded data are left in the source.
 
     PLRM Parameters:
         K           int   0      <0=Group4, 0=Group3-1D, >0=Group3-2D
@@ -71,201 +68,41 @@ class CCITTFaxDecodeFilter(FilterBase):
         self.black_is_1 = _extract_param(params, b'BlackIs1', False)
         self.damaged_rows_before_error = _extract_param(params, b'DamagedRowsBeforeError', 0)
 
+        self.decoder = ccitt_codec.CCITTFaxDecoder(
+            self.k, self.columns, self.rows, self.end_of_block, self.end_of_line,
+            self.encoded_byte_align, self.black_is_1, self.damaged_rows_before_error)
         self.output_buffer = bytearray()
-        self._buf_pos = 0
-        self._decoded = False
+        self.input_done = False  # end of block, Rows rows, or end of source reached
 
     def read_data(self, ctxt: ps.Context, max_bytes: int | None = None) -> bytes:
-        """Decode CCITT fax data via TIFF wrapping -- PLRM Section 3.13."""
+        """Decode CCITT fax data to 1-bit rows - PLRM Section 3.13"""
         if self.eof_reached:
             return b''
 
-        if not self._decoded:
-            self._decode_all(ctxt)
-
-        if self._buf_pos >= len(self.output_buffer):
-            self.eof_reached = True
-            return b''
-
-        target = max_bytes or 1024
-        chunk = bytes(self.output_buffer[self._buf_pos:self._buf_pos + target])
-        self._buf_pos += len(chunk)
-
-        if self._buf_pos >= len(self.output_buffer):
-            self.eof_reached = True
-
-        return chunk
-
-    def _decode_all(self, ctxt: ps.Context) -> None:
-        """Read all encoded data from upstream and decode via TIFF wrapping."""
-        self._decoded = True
-
-        # Collect all encoded data
-        chunks = []
-        while True:
-            data = self.data_source.read_data(ctxt, 65536)
-            if not data:
-                break
-            chunks.append(data)
-        encoded = b''.join(chunks)
-
-        if not encoded:
+        target_bytes = max_bytes or 1024
+        row_bytes = self.decoder.row_bytes
+        while len(self.output_buffer) < target_bytes and not self.input_done:
+            # Only decode the rows asked for; the rest wait in the decoder
+            rows_wanted = -(-(target_bytes - len(self.output_buffer)) // row_bytes)
+            source_data = b''
+            final = False
+            if self.decoder.needs_input:
+                source_data = self.data_source.read_data(ctxt, SOURCE_READ_SIZE)
+                final = not source_data
+            try:
+                data = self.decoder.decode(source_data, final, rows_wanted)
+            except ValueError:
+                self.eod_reached = True
+                raise IOError("Damaged CCITTFax data")
+            self.output_buffer.extend(data)
+            if self.decoder.eod:
+                self.input_done = True
+                # Bytes after the encoded data belong to the underlying stream
+                if self.decoder.unused_data:
+                    self.data_source.putback(self.decoder.unused_data)
+
+        result = bytes(self.output_buffer[:target_bytes])
+        del self.output_buffer[:target_bytes]
+        if self.input_done and not self.output_buffer:
             self.eof_reached = True
-            return
-
-        decoded = self._decode_via_tiff(encoded)
-        if decoded is not None:
-            self.output_buffer = bytearray(decoded)
-        else:
-            self.eof_reached = True
-
-    def _decode_via_tiff(self, encoded_data: bytes) -> bytes | None:
-        """Wrap CCITT data in a minimal TIFF and decode with Pillow.
-
-        Returns packed 1-bit data (8 pixels per byte, MSB first, rows padded
-        to byte boundaries) matching PostScript image data conventions.
-        """
-        # Map K parameter to TIFF compression tag
-        if self.k < 0:
-            compression = 4   # Group 4 (T.6)
-        elif self.k == 0:
-            compression = 2   # CCITT Modified Huffman (Group 3 1-D, no EOL)
-        else:
-            compression = 3   # T.4 (Group 3, may be 2-D)
-
-        columns = self.columns
-        rows = self.rows if self.rows > 0 else self._estimate_rows(encoded_data)
-
-        # Always use WhiteIsZero (standard CCITT convention) in TIFF.
-        # We handle BlackIs1 polarity when packing the output bits.
-        photometric = 0  # WhiteIsZero
-
-        tiff_bytes = self._build_tiff(
-            encoded_data, columns, rows, compression, photometric
-        )
-
-        try:
-            img = Image.open(io.BytesIO(tiff_bytes))
-            img.load()
-            return self._pack_image_bits(img)
-        except Exception:
-            # Try with fallback row estimates if Rows was unknown
-            if self.rows <= 0:
-                for divisor in [2, 4, 8]:
-                    fallback_rows = max(1, rows // divisor)
-                    tiff_bytes = self._build_tiff(
-                        encoded_data, columns, fallback_rows,
-                        compression, photometric
-                    )
-                    try:
-                        img = Image.open(io.BytesIO(tiff_bytes))
-                        img.load()
-                        return self._pack_image_bits(img)
-                    except Exception:
-                        continue
-            return None
-
-    def _pack_image_bits(self, img: Image.Image) -> bytes:
-        """Convert Pillow image to packed 1-bit PostScript data.
-
-        Pillow mode '1' tobytes() returns packed bits (8 pixels/byte, MSB first,
-        rows padded to byte boundaries) with CCITT convention: 0=white, 1=black.
-
-        PostScript BlackIs1 polarity:
-          BlackIs1=true: 1=black, 0=white — matches Pillow/CCITT, use as-is
-          BlackIs1=false (default): 0=black, 1=white — inverted from CCITT
-        """
-        if img.mode != '1':
-            img = img.convert('1')
-
-        packed = img.tobytes()
-
-        if not self.black_is_1:
-            # Invert all bits: CCITT 0=white→1, CCITT 1=black→0
-            packed = bytes(b ^ 0xFF for b in packed)
-
-        return packed
-
-    def _estimate_rows(self, encoded_data: bytes) -> int:
-        """Estimate image height when Rows=0.
-
-        Group 4 typically compresses to ~1/10 of raw size for text.
-        Use a generous estimate — libtiff will stop at actual EOB.
-        """
-        raw_bits = len(encoded_data) * 8
-        # Rough estimate: assume ~5:1 compression ratio
-        estimated_pixels = raw_bits * 5
-        rows = max(1, estimated_pixels // max(1, self.columns))
-        # Clamp to a reasonable range
-        return min(rows, 100000)
-
-    def _build_tiff(self, encoded_data: bytes, columns: int, rows: int, compression: int, photometric: int) -> bytes:
-        """Build a minimal TIFF file wrapping the CCITT encoded data."""
-        # IFD tags to include
-        tags = []
-
-        # Tag format: (tag_id, type, count, value)
-        # Types: 3=SHORT(2 bytes), 4=LONG(4 bytes)
-        tags.append((256, 3, 1, columns))           # ImageWidth
-        tags.append((257, 3, 1, rows))              # ImageLength
-        tags.append((258, 3, 1, 1))                 # BitsPerSample
-        tags.append((259, 3, 1, compression))       # Compression
-        tags.append((262, 3, 1, photometric))       # PhotometricInterpretation
-        tags.append((266, 3, 1, 1))                 # FillOrder: MSB first
-        tags.append((277, 3, 1, 1))                 # SamplesPerPixel
-
-        # RowsPerStrip
-        tags.append((278, 4, 1, rows))              # RowsPerStrip
-
-        # T4Options / T6Options
-        if compression == 3:
-            # T4Options: bit 0 = 2D encoding if K > 0
-            t4_options = 1 if self.k > 0 else 0
-            tags.append((292, 4, 1, t4_options))    # T4Options
-        elif compression == 4:
-            tags.append((293, 4, 1, 0))             # T6Options
-
-        # Calculate offsets
-        # Header: 8 bytes
-        # IFD: 2 (count) + num_tags*12 + 4 (next IFD pointer)
-        num_tags = len(tags) + 2  # +2 for StripOffsets and StripByteCounts
-        ifd_offset = 8
-        ifd_size = 2 + num_tags * 12 + 4
-        data_offset = ifd_offset + ifd_size
-
-        # Insert StripOffsets and StripByteCounts into tag list
-        tags.append((273, 4, 1, data_offset))       # StripOffsets
-        tags.append((279, 4, 1, len(encoded_data))) # StripByteCounts
-
-        # Sort tags by tag ID (TIFF requires sorted IFD entries)
-        tags.sort(key=lambda t: t[0])
-
-        # Build binary TIFF
-        buf = io.BytesIO()
-
-        # TIFF header: byte order (little-endian) + magic + IFD offset
-        buf.write(b'II')
-        buf.write(struct.pack('<H', 42))
-        buf.write(struct.pack('<I', ifd_offset))
-
-        # IFD entry count
-        buf.write(struct.pack('<H', len(tags)))
-
-        # IFD entries
-        for tag_id, tag_type, count, value in tags:
-            buf.write(struct.pack('<H', tag_id))
-            buf.write(struct.pack('<H', tag_type))
-            buf.write(struct.pack('<I', count))
-            if tag_type == 3:  # SHORT — value in first 2 bytes, pad with 2 zeros
-                buf.write(struct.pack('<H', value))
-                buf.write(b'\x00\x00')
-            else:  # LONG
-                buf.write(struct.pack('<I', value))
-
-        # Next IFD pointer (0 = no more IFDs)
-        buf.write(struct.pack('<I', 0))
-
-        # CCITT encoded data
-        buf.write(encoded_data)
-
-        return buf.getvalue()
+        return result
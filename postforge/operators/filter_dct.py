@@ -9,11 +9,15 @@ from __future__ import annotations
 # Implements DCTDecode and DCTEncode filters per PLRM Section 3.13.
 # Requires optional jpeglib and numpy dependencies.
 
+import io
+import os
+import tempfile
 from typing import TYPE_CHECKING
 
 from ..core import types as ps
 from ..core import error as ps_error
-from .filter import FilterBase
+from ..utils import worker_pool
+from .filter import FilterBase, SOURCE_READ_SIZE
 
 if TYPE_CHECKING:
     from .filter import DataSource
@@ -37,6 +41,163 @@ except ImportError as e:
     DCT_IMPORT_ERROR = str(e)
 
 
+def jpeg_draft_mode(jpeg_bytes: bytes | bytearray, width: int, height: int, components: int) -> object | None:
+    """
+    Open a JPEG with Pillow if it is a plain grayscale or YCbCr image of the given size.
+
+    For these JPEGs libjpeg's standard color conversion yields exactly the
+    samples decode_jpeg() produces, so they can be decoded at reduced size
+    or passed through to output formats that embed JPEG data.
+
+    Returns:
+        The unloaded PIL image, or None if the JPEG does not qualify.
+    """
+    try:
+        from PIL import Image
+
+        image = Image.open(io.BytesIO(jpeg_bytes))
+    except Exception:
+        return None
+    if image.size != (width, height):
+        return None
+    if components == 1 and image.mode == 'L':
+        return image
+    if (components == 3 and image.mode == 'RGB'
+            and image.info.get('adobe_transform', 1) == 1):
+        return image
+    return None
+
+
+def jpeg_stream_length(data: bytes | bytearray) -> int | None:
+    """
+    Find where the JPEG stream at the start of data ends.
+
+    Walks the marker segments, skipping entropy-coded data after each SOS,
+    until the EOI marker that ends the image.  An EOI inside a segment (such
+    as an embedded thumbnail) is not mistaken for the end.
+
+    Returns:
+        The offset just past EOI, or None if the stream is incomplete or is
+        not well-formed enough to tell.
+    """
+    size = len(data)
+    if data[:2] != b'\xff\xd8':
+        return None
+    pos = 2
+    while pos + 1 < size:
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            # Fill byte before a marker
+            pos += 1
+            continue
+        if marker == 0xD9:
+            return pos + 2
+        if 0xD0 <= marker <= 0xD7 or marker == 0x01:
+            # Markers without a length
+            pos += 2
+            continue
+        if pos + 3 >= size:
+            return None
+        pos += 2 + ((data[pos + 2] << 8) | data[pos + 3])
+        if marker == 0xDA:
+            # Skip entropy-coded data up to the next marker other than a
+            # stuffed zero byte or a restart marker
+            while True:
+                pos = data.find(b'\xff', pos)
+                if pos < 0 or pos + 1 >= size:
+                    return None
+                following = data[pos + 1]
+                if following != 0 and not 0xD0 <= following <= 0xD7:
+                    break
+                pos += 2
+    return None
+
+
+def decode_jpeg(jpeg_bytes: bytes, color_transform: int | None = None) -> tuple[bytes, int, int, int]:
+    """
+    Decode a complete JPEG stream to interleaved 8-bit samples.
+
+    Args:
+        jpeg_bytes: JPEG data
+        color_transform: DCTDecode ColorTransform parameter, None for the default
+
+    Returns:
+        (samples, width, height, components)
+
+    Raises:
+        ValueError: If the data is not a valid JPEG.
+    """
+    try:
+        # Use jpeglib to decode JPEG to spatial (RGB) data
+        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_file:
+            temp_file.write(jpeg_bytes)
+            temp_filename = temp_file.name
+
+        try:
+            jpeg_obj = jpeglib.read_spatial(temp_filename)
+
+            # Extract spatial data from SpatialJPEG object
+            if hasattr(jpeg_obj, 'spatial'):
+                image = jpeg_obj.spatial
+            elif hasattr(jpeg_obj, 'Y') and hasattr(jpeg_obj, 'Cb') and hasattr(jpeg_obj, 'Cr'):
+                # YUV components - combine them
+                image = np.stack([jpeg_obj.Y, jpeg_obj.Cb, jpeg_obj.Cr], axis=-1)
+            elif hasattr(jpeg_obj, 'data'):
+                image = jpeg_obj.data
+            else:
+                # Try to convert to array directly
+                image = np.array(jpeg_obj)
+
+        finally:
+            # Clean up temporary file
+            if os.path.exists(temp_filename):
+                os.unlink(temp_filename)
+
+    except Exception as e:
+        # JPEG decoding failed - probably invalid JPEG data
+        raise ValueError("Invalid JPEG data")
+
+    # Get image information
+    height, width = image.shape[:2]
+    components = image.shape[2] if len(image.shape) > 2 else 1
+
+    # Ensure image is uint8
+    if image.dtype != np.uint8:
+        image = image.astype(np.uint8)
+
+    # jpeglib automatically converts JPEG YUV to RGB spatial data
+    # Only apply ColorTransform if explicitly requested or if JPEG was stored in RGB
+    jpeg_was_yuv = (jpeg_obj.jpeg_color_space.name == 'JCS_YCbCr')
+
+    # If JPEG was YUV and jpeglib converted to RGB, don't apply additional transform
+    # unless explicitly requested via ColorTransform parameter
+    should_transform = False
+    if not jpeg_was_yuv:
+        # JPEG stored in RGB - apply default PostScript ColorTransform logic
+        should_transform = DCTColorTransform.should_apply_transform(components, color_transform)
+    elif color_transform is not None:
+        # ColorTransform explicitly set - honor it regardless of JPEG format
+        should_transform = bool(color_transform)
+
+    if should_transform:
+        image = DCTColorTransform.apply_decode_transform(
+            image, components, color_transform)
+
+    # Convert to interleaved byte stream (PLRM requirement)
+    # PostScript expects samples interleaved on per-sample basis
+    return image.tobytes(), width, height, components
+
+
+def decode_jpeg_samples(jpeg_bytes: bytes) -> bytes | None:
+    """Decode deferred JPEG image data (ImageElement.sample_decoder)."""
+    try:
+        return decode_jpeg(jpeg_bytes)[0]
+    except ValueError:
+        return None
+
+
 class DCTDecodeFilter(FilterBase):
     """DCTDecode filter - JPEG baseline decoding per PLRM Section 3.13"""
 
@@ -56,6 +217,7 @@ class DCTDecodeFilter(FilterBase):
 
         # State for JPEG processing
         self.jpeg_data_buffer = bytearray()
+        self.jpeg_data_complete = False
         self.decoded_data_buffer = bytearray()
         self.decoding_complete = False
         self.image_info = None
@@ -98,66 +260,90 @@ class DCTDecodeFilter(FilterBase):
         except Exception as e:
             return ps_error.e(ctxt, ps_error.IOERROR, "DCTDecode")
 
-    def _read_and_decode_jpeg(self, ctxt: ps.Context) -> None:
-        """Read all JPEG data from source and decode it"""
-        # Read all JPEG data from data source
+    def _read_jpeg_data(self, ctxt: ps.Context) -> None:
+        """Read the JPEG stream from the data source into jpeg_data_buffer"""
+        if self.jpeg_data_complete:
+            return
+        self.jpeg_data_complete = True
+        buffer = self.jpeg_data_buffer
         while not self.data_source.at_eof():
-            chunk = self.data_source.read_data(ctxt, 8192)
+            chunk = self.data_source.read_data(ctxt, SOURCE_READ_SIZE)
 
             if not chunk:
                 break
-            self.jpeg_data_buffer.extend(chunk)
+            search_from = max(len(buffer) - 1, 0)
+            buffer.extend(chunk)
+
+            # Stop at the EOI marker; anything after it belongs to the source
+            if buffer.find(b'\xff\xd9', search_from) >= 0:
+                end = jpeg_stream_length(buffer)
+                if end is not None:
+                    if end < len(buffer):
+                        self.data_source.putback(bytes(buffer[end:]))
+                        del buffer[end:]
+                    break
 
             # Safety check: limit total JPEG data size (64MB max)
-            if len(self.jpeg_data_buffer) > 64 * 1024 * 1024:
+            if len(buffer) > 64 * 1024 * 1024:
                 break
 
-        if not self.jpeg_data_buffer:
-            self.eof_reached = True
-            return
+    def decode_draft(self, ctxt: ps.Context, width: int, height: int, components: int, scale: int) -> tuple[int, int] | None:
+        """
+        Decode the JPEG at reduced size using libjpeg DCT scaling.
 
-        # Decode JPEG using jpeglib
-        jpeg_bytes = bytes(self.jpeg_data_buffer)
+        Used by image downsampling (see image_downsample.py) when the
+        consumer will reduce the image anyway.  Only grayscale and YCbCr
+        JPEGs whose size and component count match the image are decoded
+        this way; for those, Pillow's draft mode produces the same samples
+        as a full decode followed by a 1/scale reduction, without building
+        the full-size image.
+
+        Args:
+            ctxt: Context
+            width, height, components: Image dimensions expected by the consumer
+            scale: Reduction factor, 2, 4 or 8
 
+        Returns:
+            (width, height) of the decoded samples, or None if the JPEG was
+            not decoded (the normal full-size decode then runs on first read).
+        """
+        if not self.available or self.decoding_complete or self.dct_params is not None:
+            return None
+        self._read_jpeg_data(ctxt)
+        if not self.jpeg_data_buffer:
+            return None
+
+        image = jpeg_draft_mode(self.jpeg_data_buffer, width, height, components)
+        if image is None:
+            return None
         try:
-            # Use jpeglib to decode JPEG to spatial (RGB) data
-            import tempfile
-            import os
-
-            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_file:
-                temp_file.write(jpeg_bytes)
-                temp_filename = temp_file.name
-
-            try:
-                jpeg_obj = jpeglib.read_spatial(temp_filename)
-
-                # Adobe APP14 marker parsing for ColorTransform
-                color_transform_from_adobe = self._parse_adobe_app14_marker(jpeg_obj)
-
-                # Extract spatial data from SpatialJPEG object
-                if hasattr(jpeg_obj, 'spatial'):
-                    image = jpeg_obj.spatial
-                elif hasattr(jpeg_obj, 'Y') and hasattr(jpeg_obj, 'Cb') and hasattr(jpeg_obj, 'Cr'):
-                    # YUV components - combine them
-                    image = np.stack([jpeg_obj.Y, jpeg_obj.Cb, jpeg_obj.Cr], axis=-1)
-                elif hasattr(jpeg_obj, 'data'):
-                    image = jpeg_obj.data
-                else:
-                    # Try to convert to array directly
-                    image = np.array(jpeg_obj)
-
-            finally:
-                # Clean up temporary file
-                if os.path.exists(temp_filename):
-                    os.unlink(temp_filename)
+            image.draft(image.mode, (-(-width // scale), -(-height // scale)))
+            decoded_bytes = image.tobytes()
+        except Exception:
+            # Fall back to the full decode, which reports bad data properly
+            return None
 
-        except Exception as e:
-            # JPEG decoding failed - probably invalid JPEG data
-            raise ValueError("Invalid JPEG data")
+        draft_width, draft_height = image.size
+        self.image_info = {
+            'width': draft_width,
+            'height': draft_height,
+            'components': components
+        }
+        self.decoded_data_buffer.extend(decoded_bytes)
+        self.decoding_complete = True
+        return draft_width, draft_height
 
-        # Get image information
-        height, width = image.shape[:2]
-        components = image.shape[2] if len(image.shape) > 2 else 1
+    def _read_and_decode_jpeg(self, ctxt: ps.Context) -> None:
+        """Read all JPEG data from source and decode it"""
+        self._read_jpeg_data(ctxt)
+
+        if not self.jpeg_data_buffer:
+            self.eof_reached = True
+            return
+
+        color_transform = self.dct_params.color_transform if self.dct_params else None
+        decoded_bytes, width, height, components = decode_jpeg(
+            bytes(self.jpeg_data_buffer), color_transform)
 
         self.image_info = {
             'width': width,
@@ -165,46 +351,42 @@ class DCTDecodeFilter(FilterBase):
             'components': components
         }
 
-        # Ensure image is uint8
-        if image.dtype != np.uint8:
-            image = image.astype(np.uint8)
-
-        # Apply ColorTransform if needed
-        color_transform_param = self.dct_params.color_transform if self.dct_params else None
-
-        # Check for Adobe marker override
-        effective_color_transform = color_transform_param
-
-        # jpeglib automatically converts JPEG YUV to RGB spatial data
-        # Only apply ColorTransform if explicitly requested or if JPEG was stored in RGB
-        jpeg_was_yuv = (jpeg_obj.jpeg_color_space.name == 'JCS_YCbCr')
-
-        # If JPEG was YUV and jpeglib converted to RGB, don't apply additional transform
-        # unless explicitly requested via ColorTransform parameter
-        should_transform = False
-        if not jpeg_was_yuv:
-            # JPEG stored in RGB - apply default PostScript ColorTransform logic
-            should_transform = DCTColorTransform.should_apply_transform(components, effective_color_transform)
-        elif effective_color_transform is not None:
-            # ColorTransform explicitly set - honor it regardless of JPEG format
-            should_transform = bool(effective_color_transform)
-
-        if should_transform:
-            image = DCTColorTransform.apply_decode_transform(
-                image, components, effective_color_transform)
-
-        # Convert to interleaved byte stream (PLRM requirement)
-        # PostScript expects samples interleaved on per-sample basis
-        if len(image.shape) == 3:
-            # Multi-component image: flatten to interleaved format
-            decoded_bytes = image.tobytes()
-        else:
-            # Single component: already in correct format
-            decoded_bytes = image.tobytes()
+        self.decoded_data_buffer.extend(decoded_bytes)
+        self.decoding_complete = True
 
+    def take_encoded(self, ctxt: ps.Context, width: int, height: int, components: int) -> bytes | None:
+        """
+        Consume the JPEG stream without decoding it.
 
-        self.decoded_data_buffer.extend(decoded_bytes)
+        Used to defer decoding of image data until render time (see
+        ImageDataProcessor.read_all_image_data).  Only grayscale and YCbCr
+        JPEGs whose size and component count match the image are taken,
+        since those decode to exactly the samples the image expects and
+        can be embedded in PDF output unchanged.  After a successful take
+        the filter reads as being at EOF.
+
+        Returns:
+            The JPEG bytes, or None if the stream was not taken (it is then
+            decoded normally on first read).
+        """
+        if not self.available or self.decoding_complete or self.dct_params is not None:
+            return None
+        self._read_jpeg_data(ctxt)
+        if not self.jpeg_data_buffer:
+            return None
+        if jpeg_draft_mode(self.jpeg_data_buffer, width, height, components) is None:
+            return None
+
+        jpeg_bytes = bytes(self.jpeg_data_buffer)
+        self.jpeg_data_buffer = bytearray()
+        self.image_info = {
+            'width': width,
+            'height': height,
+            'components': components
+        }
         self.decoding_complete = True
+        self.eof_reached = True
+        return jpeg_bytes
 
     def _parse_adobe_app14_marker(self, jpeg_obj: object) -> int | None:
         """
@@ -293,7 +475,17 @@ class DCTDecodeFilter(FilterBase):
 
 
 class DCTEncodeFilter(FilterBase):
-    """DCTEncode filter - JPEG baseline encoding per PLRM Section 3.13"""
+    """
+    DCTEncode filter - JPEG baseline encoding per PLRM Section 3.13
+
+    The image is encoded once all Columns * Rows * Colors samples have
+    been written.  With worker threads enabled the encoding runs on the
+    worker pool while the program goes on, and the JPEG is written to the
+    target at the next operation on the filter: **write**, **flushfile** or
+    **closefile**.  As for any encoding filter (PLRM 3.8.4), the program must
+    flush or close the filter before closing its target, or the JPEG is
+    lost.
+    """
 
     def __init__(self, data_target: DataSource, params: ps.Dict) -> None:
         super().__init__(data_target, params)
@@ -307,20 +499,21 @@ class DCTEncodeFilter(FilterBase):
 
         # Extract parameters (validation already done in ps_filter)
         param_dict = params.val
-        self.columns = param_dict[b'Columns']
-        self.rows = param_dict[b'Rows']
-        self.colors = param_dict[b'Colors']
+        self.dct_params = dct_params.DCTParameters()
+        self.dct_params.columns = _param_value(param_dict, b'Columns', 0)
+        self.dct_params.rows = _param_value(param_dict, b'Rows', 0)
+        self.dct_params.colors = _param_value(param_dict, b'Colors', 0)
+        self.dct_params.qfactor = _param_value(param_dict, b'QFactor', 1.0)
+        self.dct_params.color_transform = _param_value(param_dict, b'ColorTransform', None)
 
         # Calculate exact data requirements
-        columns_val = self.columns.val if hasattr(self.columns, 'val') else self.columns
-        rows_val = self.rows.val if hasattr(self.rows, 'val') else self.rows
-        colors_val = self.colors.val if hasattr(self.colors, 'val') else self.colors
-        self.required_bytes = columns_val * rows_val * colors_val
+        self.required_bytes = self.dct_params.columns * self.dct_params.rows * self.dct_params.colors
 
         # State for JPEG encoding
         self.bytes_received = 0
         self.image_buffer = bytearray()
         self.encoding_complete = False
+        self.pending = None  # Future of a background encoding
 
     def write_data(self, ctxt: ps.Context, data: bytes) -> None:
         """Buffer image data and encode when complete"""
@@ -334,135 +527,118 @@ class DCTEncodeFilter(FilterBase):
 
         # Check if already complete
         if self.encoding_complete:
+            self._write_pending(ctxt)
             return ps_error.e(ctxt, ps_error.IOERROR, "DCTEncode")
 
-        try:
-            # Buffer incoming data
-            self.image_buffer.extend(data)
-            self.bytes_received += len(data)
-
-            # PLRM: DCTEncode requires exact byte count
-            if self.bytes_received > self.required_bytes:
-                return ps_error.e(ctxt, ps_error.IOERROR, "DCTEncode")
-
-            # Encode when we have exactly the right amount
-            if self.bytes_received == self.required_bytes:
-                return self._encode_and_write(ctxt)
+        # Buffer incoming data
+        self.image_buffer.extend(data)
+        self.bytes_received += len(data)
 
-            # Still waiting for more data
-            return None
-
-        except Exception as e:
+        # PLRM: DCTEncode requires exact byte count
+        if self.bytes_received > self.required_bytes:
             return ps_error.e(ctxt, ps_error.IOERROR, "DCTEncode")
 
-    def _encode_and_write(self, ctxt: ps.Context) -> None:
-        """Encode buffered image data to JPEG"""
-        try:
-            # Reshape raw bytes to image array
-            image_data = np.frombuffer(self.image_buffer, dtype=np.uint8)
-
-            # Reshape to proper dimensions
-            if self.dct_params.colors == 1:
-                # Grayscale
-                image_array = image_data.reshape(
-                    (self.dct_params.rows, self.dct_params.columns))
-            else:
-                # Multi-component (RGB, CMYK, etc.)
-                image_array = image_data.reshape(
-                    (self.dct_params.rows, self.dct_params.columns, self.dct_params.colors))
-
-            # Apply ColorTransform if needed (before encoding)
-            if DCTColorTransform.should_apply_transform(
-                self.dct_params.colors, self.dct_params.color_transform):
-                image_array = DCTColorTransform.apply_encode_transform(
-                    image_array, self.dct_params.colors, self.dct_params.color_transform)
-
-            # Prepare jpeglib encoding parameters
-            encode_params = self._prepare_jpeglib_params()
-
-            # Use jpeglib to encode
-            if self.dct_params.colors == 1:
-                # Grayscale encoding
-                jpeg_data = jpeglib.from_spatial(
-                    image_array,
-                    colorspace=jpeglib.JCS_GRAYSCALE,
-                    **encode_params
-                )
-            elif self.dct_params.colors == 3:
-                # RGB encoding
-                jpeg_data = jpeglib.from_spatial(
-                    image_array,
-                    colorspace=jpeglib.JCS_RGB,
-                    **encode_params
-                )
-            elif self.dct_params.colors == 4:
-                # CMYK encoding
-                jpeg_data = jpeglib.from_spatial(
-                    image_array,
-                    colorspace=jpeglib.JCS_CMYK,
-                    **encode_params
-                )
-            else:
-                # 2-component not directly supported by JPEG
-                return ps_error.e(ctxt, ps_error.RANGECHECK, "DCTEncode")
-
-            # Write JPEG data to target
-            jpeg_bytes = jpeg_data.write()
-            result = self._write_to_target(ctxt, jpeg_bytes)
-
+        # Encode when we have exactly the right amount
+        if self.bytes_received == self.required_bytes:
             self.encoding_complete = True
-            return result
-
-        except Exception as e:
-            return ps_error.e(ctxt, ps_error.IOERROR, "DCTEncode")
+            executor = worker_pool.get_executor()
+            if executor is not None:
+                self.pending = executor.submit(self._encode)
+                return None
+            return self._write_jpeg(ctxt, self._encode)
 
-    def _prepare_jpeglib_params(self) -> dict:
-        """Prepare jpeglib encoding parameters from PostScript parameters"""
-        params = {}
+        # Still waiting for more data
+        return None
 
-        # Quality factor
-        if self.dct_params.qfactor != 1.0:
+    def _encode(self) -> bytes:
+        """Encode the buffered image, without touching interpreter state."""
+        params = self.dct_params
+        quality = None
+        if params.qfactor != 1.0:
             # Convert QFactor to quality (simplified mapping)
-            quality = max(1, min(100, int(50 / self.dct_params.qfactor)))
-            params['quality'] = quality
-
-        # Sampling factors
-        if self.dct_params.hsample or self.dct_params.vsample:
-            # jpeglib may support subsampling - check documentation
-            # For now, log that custom sampling was requested
-            pass
-
-        # Custom quantization tables
-        if self.dct_params.quant_tables:
-            # jpeglib supports custom quantization tables
-            # This would require converting PostScript tables to jpeglib format
-            pass
-
-        # Custom Huffman tables
-        if self.dct_params.huff_tables:
-            # jpeglib supports custom Huffman tables
-            # This would require converting PostScript tables to jpeglib format
-            pass
-
-        return params
-
-    def _write_to_target(self, ctxt: ps.Context, jpeg_bytes: bytes) -> None:
-        """Write JPEG bytes to data target"""
-        # Write to underlying data target
-        # This depends on the target type (file, string, procedure)
-
-        # For now, simplified implementation
-        # Full implementation would handle different target types
-        if hasattr(self.data_source, 'write'):
-            self.data_source.write(jpeg_bytes)
+            quality = max(1, min(100, int(50 / params.qfactor)))
+        return encode_jpeg(bytes(self.image_buffer), params.columns, params.rows,
+                           params.colors, params.color_transform, quality)
 
+    def _write_jpeg(self, ctxt: ps.Context, encode) -> None:
+        """Run or collect the encoding and write the JPEG to the target."""
+        try:
+            jpeg_bytes = encode()
+        except Exception:
+            return ps_error.e(ctxt, ps_error.IOERROR, "DCTEncode")
+        self.image_buffer = bytearray()
+        self._write_target(ctxt, jpeg_bytes)
         return None
 
+    def _write_pending(self, ctxt: ps.Context) -> None:
+        """Wait for a background encoding and write its JPEG to the target."""
+        if self.pending is None:
+            return None
+        pending, self.pending = self.pending, None
+        return self._write_jpeg(ctxt, pending.result)
+
+    def flush(self, ctxt: ps.Context) -> None:
+        """Write the JPEG if a background encoding has been started"""
+        return self._write_pending(ctxt)
+
     def close(self, ctxt: ps.Context) -> None:
         """Close **filter** and ensure all data is flushed"""
-        if not self.encoding_complete and self.bytes_received > 0:
+        if self.closed:
+            return None
+        if self.pending is not None:
+            result = self._write_pending(ctxt)
+            if result is not None:
+                return result
+        elif self.available and not self.encoding_complete and self.bytes_received > 0:
             # Data was provided but encoding not complete
-            if self.bytes_received != self.required_bytes:
-                return ps_error.e(ctxt, ps_error.IOERROR, "DCTEncode")
+            return ps_error.e(ctxt, ps_error.IOERROR, "DCTEncode")
 
         super().close(ctxt)
+
+
+def _param_value(param_dict: dict, key: bytes, default: object) -> object:
+    """Value of a parameter dictionary entry, or default if absent."""
+    if key not in param_dict:
+        return default
+    obj = param_dict[key]
+    return obj.val if hasattr(obj, 'val') else obj
+
+
+def encode_jpeg(samples: bytes, columns: int, rows: int, colors: int,
+                color_transform: int | None = None, quality: int | None = None) -> bytes:
+    """
+    Encode interleaved 8-bit samples as a baseline JPEG.
+
+    Three and four component images are stored as YCbCr or YCCK when
+    ColorTransform applies (by default for three), otherwise as is.
+
+    Raises:
+        ValueError: Colors is not 1, 3 or 4.
+    """
+    image = np.frombuffer(samples, dtype=np.uint8).reshape(rows, columns, colors)
+    transform = DCTColorTransform.should_apply_transform(colors, color_transform)
+    if colors == 1:
+        input_space, stored_space = jpeglib.JCS_GRAYSCALE, None
+    elif colors == 3:
+        input_space = jpeglib.JCS_RGB
+        stored_space = jpeglib.JCS_YCbCr if transform else jpeglib.JCS_RGB
+    elif colors == 4:
+        input_space = jpeglib.JCS_CMYK
+        stored_space = jpeglib.JCS_YCCK if transform else jpeglib.JCS_CMYK
+    else:
+        # 2-component not directly supported by JPEG
+        raise ValueError(f"cannot encode {colors} color components as JPEG")
+
+    jpeg = jpeglib.from_spatial(image, input_space)
+    if stored_space is not None:
+        jpeg.jpeg_color_space = stored_space
+
+    # jpeglib only writes to files
+    with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_file:
+        temp_filename = temp_file.name
+    try:
+        jpeg.write_spatial(temp_filename, qt=quality)
+        with open(temp_filename, 'rb') as jpeg_file:
+            return jpeg_file.read()
+    finally:
+        os.unlink(temp_filename)
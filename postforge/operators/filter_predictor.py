@@ -0,0 +1,311 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from __future__ import annotations
+
+# Predictor Functions for FlateDecode/FlateEncode and LZWDecode/LZWEncode
+#
+# Predictor 2 is TIFF horizontal differencing: each component is stored as
+# the difference from the same component of the pixel to its left.
+# Predictors 10-15 are the PNG filters: each row is prefixed with a filter
+# type byte (0 None, 1 Sub, 2 Up, 3 Average, 4 Paeth).  When encoding,
+# 10-14 select that filter for every row and 15 picks the best one per row.
+#
+# Rows are handled in batches of whole rows.  TIFF rows do not depend on
+# each other, so a batch is decoded and encoded with a few NumPy operations
+# for any of 1, 2, 4, 8 or 16 bits per component.  PNG encoding only looks
+# at original samples, so it is vectorized too.  PNG decoding of Sub and Up
+# rows is vectorized per row; Average and Paeth reconstruct each byte from
+# the byte just reconstructed to its left, so they run in _predictor_cy
+# when it is built and in a per-byte loop otherwise.
+
+import numpy as np
+
+from ..core import types as ps
+
+try:
+    from ._predictor_cy import png_decode_rows as _png_decode_rows_cy
+    _CYTHON_PREDICTOR = True
+except ImportError:
+    _CYTHON_PREDICTOR = False
+
+# PNG filter type bytes
+PNG_NONE, PNG_SUB, PNG_UP, PNG_AVERAGE, PNG_PAETH = range(5)
+
+# Filter used by the encoder for each PNG Predictor value (15 = per row)
+_PNG_ENCODE_FILTERS = {10: PNG_NONE, 11: PNG_SUB, 12: PNG_UP, 13: PNG_AVERAGE, 14: PNG_PAETH}
+
+
+def predictor_params(params: dict | ps.Dict | None) -> tuple[int, int, int, int]:
+    """
+    Read the predictor entries of a filter parameter dictionary.
+
+    Returns:
+        (Predictor, Colors, BitsPerComponent, Columns), defaulting to
+        (1, 1, 8, 1) for absent entries.
+    """
+    values = {b'Predictor': 1, b'Colors': 1, b'BitsPerComponent': 8, b'Columns': 1}
+    if params and hasattr(params, 'val'):  # PostScript Dict object
+        param_dict = params.val
+        for key in values:
+            if key in param_dict:
+                obj = param_dict[key]
+                values[key] = obj.val if hasattr(obj, 'val') else int(obj)
+    return (values[b'Predictor'], values[b'Colors'], values[b'BitsPerComponent'],
+            values[b'Columns'])
+
+
+class _PredictorBase:
+    """Row geometry shared by the predictor decoder and encoder."""
+
+    def __init__(self, predictor: int, colors: int = 1, bits_per_component: int = 8,
+                 columns: int = 1) -> None:
+        self.predictor = predictor
+        self.colors = colors
+        self.bits_per_component = bits_per_component
+        self.columns = columns
+        self.png = predictor >= 10
+        self.bpp = max(1, (colors * bits_per_component + 7) // 8)
+        self.row_width = (columns * colors * bits_per_component + 7) // 8
+        self.pending = bytearray()  # bytes of an incomplete row
+        self.prev_row = np.zeros(self.row_width, dtype=np.uint8)  # zeros per PNG spec
+
+    def _tiff_samples(self, rows: np.ndarray) -> np.ndarray | None:
+        """Unpack TIFF rows to (rows, columns, colors) sample values."""
+        bpc = self.bits_per_component
+        count = self.columns * self.colors
+        n = rows.shape[0]
+        if bpc == 8:
+            return rows[:, :count].reshape(n, self.columns, self.colors).copy()
+        if bpc == 16:
+            values = rows[:, :count * 2].copy().view('>u2').astype(np.uint16)
+            return values.reshape(n, self.columns, self.colors)
+        if bpc in (1, 2, 4):
+            values = (rows[:, :, None] >> self._shifts()) & ((1 << bpc) - 1)
+            return values.reshape(n, -1)[:, :count].reshape(n, self.columns, self.colors)
+        return None
+
+    def _shifts(self) -> np.ndarray:
+        """Bit offsets of the samples within a byte, first sample highest."""
+        bpc = self.bits_per_component
+        return np.arange(8 - bpc, -1, -bpc, dtype=np.uint8)
+
+    def _tiff_pack(self, rows: np.ndarray, samples: np.ndarray) -> np.ndarray:
+        """Store sample values back into rows (the inverse of _tiff_samples)."""
+        bpc = self.bits_per_component
+        n = rows.shape[0]
+        count = self.columns * self.colors
+        samples = samples.reshape(n, count)
+        if bpc == 8:
+            rows[:, :count] = samples
+        elif bpc == 16:
+            rows[:, :count * 2] = samples.astype('>u2').view(np.uint8).reshape(n, count * 2)
+        else:
+            width = rows.shape[1]
+            per_byte = 8 // bpc
+            values = np.zeros((n, width * per_byte), dtype=np.uint8)
+            values[:, :count] = samples
+            packed = np.bitwise_or.reduce(values.reshape(n, width, per_byte) << self._shifts(), axis=2)
+            spare = width * per_byte - count
+            if spare:
+                # Keep the padding bits at the end of each row
+                packed[:, -1] |= rows[:, -1] & ((1 << spare * bpc) - 1)
+            rows[:] = packed
+        return rows
+
+
+class PredictorDecoder(_PredictorBase):
+    """
+    Undo a TIFF or PNG predictor on decompressed filter output.
+
+    Data is fed in any size; complete rows are decoded and returned, a
+    partial row is kept until more data arrives.
+    """
+
+    def __init__(self, predictor: int, colors: int = 1, bits_per_component: int = 8,
+                 columns: int = 1) -> None:
+        super().__init__(predictor, colors, bits_per_component, columns)
+        self.raw_row_len = self.row_width + 1 if self.png else self.row_width
+
+    def decode(self, data: bytes) -> bytes:
+        """Decode the complete rows available after appending data."""
+        self.pending.extend(data)
+        nrows = len(self.pending) // self.raw_row_len if self.raw_row_len else 0
+        if not nrows:
+            return b''
+        size = nrows * self.raw_row_len
+        raw = bytes(self.pending[:size])
+        del self.pending[:size]
+
+        if self.png:
+            return self._decode_png(raw, nrows)
+        return self._decode_tiff(raw, nrows)
+
+    def flush(self) -> bytes:
+        """Return a partial final row as-is."""
+        pending = bytes(self.pending)
+        self.pending = bytearray()
+        return pending
+
+    def _decode_png(self, raw: bytes, nrows: int) -> bytes:
+        width = self.row_width
+        if _CYTHON_PREDICTOR:
+            decoded = _png_decode_rows_cy(raw, nrows, width, self.bpp, self.prev_row.tobytes())
+            self.prev_row = np.frombuffer(decoded, dtype=np.uint8, count=width,
+                                          offset=(nrows - 1) * width)
+            return bytes(decoded)
+
+        rows = np.frombuffer(raw, dtype=np.uint8).reshape(nrows, width + 1)
+        out = np.empty((nrows, width), dtype=np.uint8)
+        bpp = self.bpp
+        # Sub works on whole pixels; pad the row to a multiple of bpp
+        padded = -(-width // bpp) * bpp
+        prev = self.prev_row
+        for i in range(nrows):
+            filter_type = rows[i, 0]
+            filtered = rows[i, 1:]
+            row = out[i]
+            if filter_type == PNG_SUB:
+                if padded != width:
+                    filtered = np.concatenate((filtered, np.zeros(padded - width, np.uint8)))
+                row[:] = np.cumsum(filtered.reshape(-1, bpp), axis=0, dtype=np.uint8).ravel()[:width]
+            elif filter_type == PNG_UP:
+                np.add(filtered, prev, out=row)
+            elif filter_type == PNG_AVERAGE:
+                row[:] = np.frombuffer(_average_row(filtered.tobytes(), prev.tobytes(), bpp), np.uint8)
+            elif filter_type == PNG_PAETH:
+                row[:] = np.frombuffer(_paeth_row(filtered.tobytes(), prev.tobytes(), bpp), np.uint8)
+            else:
+                # None, or an unknown filter type passed through as-is
+                row[:] = filtered
+            prev = row
+        self.prev_row = prev.copy()
+        return out.tobytes()
+
+    def _decode_tiff(self, raw: bytes, nrows: int) -> bytes:
+        rows = np.frombuffer(raw, dtype=np.uint8).reshape(nrows, self.row_width).copy()
+        samples = self._tiff_samples(rows)
+        if samples is None:
+            # Unsupported bit depth - pass through as-is
+            return raw
+        dtype = np.uint16 if self.bits_per_component == 16 else np.uint8
+        summed = np.cumsum(samples, axis=1, dtype=dtype)
+        if self.bits_per_component < 8:
+            summed &= (1 << self.bits_per_component) - 1
+        return self._tiff_pack(rows, summed).tobytes()
+
+
+class PredictorEncoder(_PredictorBase):
+    """
+    Apply a TIFF or PNG predictor to data before compression.
+
+    Data is fed in any size; complete rows are encoded and returned, a
+    partial row is kept until more data arrives or flush() pads it.
+    """
+
+    def encode(self, data: bytes) -> bytes:
+        """Encode the complete rows available after appending data."""
+        self.pending.extend(data)
+        width = self.row_width
+        nrows = len(self.pending) // width if width else 0
+        if not nrows:
+            return b''
+        rows = np.frombuffer(bytes(self.pending[:nrows * width]), dtype=np.uint8).reshape(nrows, width)
+        del self.pending[:nrows * width]
+        if self.png:
+            return self._encode_png(rows)
+        return self._encode_tiff(rows)
+
+    def flush(self) -> bytes:
+        """Encode a partial final row, padded with zeros to the row width."""
+        if not self.pending:
+            return b''
+        self.pending.extend(bytes(self.row_width - len(self.pending)))
+        return self.encode(b'')
+
+    def _encode_png(self, rows: np.ndarray) -> bytes:
+        nrows, width = rows.shape
+        bpp = self.bpp
+        cur = rows.astype(np.int16)
+        up = np.vstack((self.prev_row[None, :], rows[:-1])).astype(np.int16)
+        left = np.zeros_like(cur)
+        left[:, bpp:] = cur[:, :-bpp]
+        upleft = np.zeros_like(cur)
+        upleft[:, bpp:] = up[:, :-bpp]
+        self.prev_row = rows[-1].copy()
+
+        def paeth():
+            p = left + up - upleft
+            pa = np.abs(p - left)
+            pb = np.abs(p - up)
+            pc = np.abs(p - upleft)
+            return np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, upleft))
+
+        predictions = {
+            PNG_NONE: lambda: 0,
+            PNG_SUB: lambda: left,
+            PNG_UP: lambda: up,
+            PNG_AVERAGE: lambda: (left + up) >> 1,
+            PNG_PAETH: paeth,
+        }
+        out = np.empty((nrows, width + 1), dtype=np.uint8)
+        filter_type = _PNG_ENCODE_FILTERS.get(self.predictor)
+        if filter_type is not None:
+            out[:, 0] = filter_type
+            out[:, 1:] = (cur - predictions[filter_type]()) & 0xFF
+            return out.tobytes()
+
+        # Optimum: per row, the filter with the smallest sum of absolute
+        # differences taken as signed bytes (the PNG specification heuristic)
+        candidates = np.stack([(cur - predictions[t]()) & 0xFF for t in range(5)]).astype(np.uint8)
+        costs = np.abs(candidates.view(np.int8).astype(np.int32)).sum(axis=2)
+        best = np.argmin(costs, axis=0)
+        out[:, 0] = best
+        out[:, 1:] = candidates[best, np.arange(nrows)]
+        return out.tobytes()
+
+    def _encode_tiff(self, rows: np.ndarray) -> bytes:
+        rows = rows.copy()
+        samples = self._tiff_samples(rows)
+        if samples is None:
+            # Unsupported bit depth - pass through as-is
+            return rows.tobytes()
+        diffs = samples.copy()
+        diffs[:, 1:] -= samples[:, :-1]
+        if self.bits_per_component < 8:
+            diffs &= (1 << self.bits_per_component) - 1
+        return self._tiff_pack(rows, diffs).tobytes()
+
+
+def _average_row(filtered: bytes, prev: bytes, bpp: int) -> bytearray:
+    """Reconstruct a PNG Average row: Recon[i] = Filt[i] + (Recon[i-bpp] + Prior[i]) // 2."""
+    row = bytearray(filtered)
+    for i in range(bpp):
+        row[i] = (row[i] + (prev[i] >> 1)) & 0xFF
+    for i in range(bpp, len(row)):
+        row[i] = (row[i] + ((row[i - bpp] + prev[i]) >> 1)) & 0xFF
+    return row
+
+
+def _paeth_row(filtered: bytes, prev: bytes, bpp: int) -> bytearray:
+    """Reconstruct a PNG Paeth row: Recon[i] = Filt[i] + PaethPredictor(a, b, c)."""
+    row = bytearray(filtered)
+    for i in range(bpp):
+        # a = c = 0, so the predictor is b
+        row[i] = (row[i] + prev[i]) & 0xFF
+    for i in range(bpp, len(row)):
+        a = row[i - bpp]
+        b = prev[i]
+        c = prev[i - bpp]
+        p = a + b - c
+        pa = abs(p - a)
+        pb = abs(p - b)
+        pc = abs(p - c)
+        if pa <= pb and pa <= pc:
+            row[i] = (row[i] + a) & 0xFF
+        elif pb <= pc:
+            row[i] = (row[i] + b) & 0xFF
+        else:
+            row[i] = (row[i] + c) & 0xFF
+    return row
@@ -9,9 +9,15 @@ from __future__ import annotations
 # Implements PostScript Language Reference Manual Section 4.10 image processing
 # operators: image, imagemask, colorimage following PLRM specifications
 
+import numpy as np
+
 from ..core import types as ps
 from ..core import color_space
 from ..core import error as ps_error
+from ..core import proc_table
+from ..core.display_list_builder import image_device_bbox
+from . import color_ops
+from . import image_downsample
 from .image_data import ImageDataProcessor
 from .image_type3 import _image_type3_dict_form
 
@@ -141,10 +147,13 @@ def _image_five_operand_form(ctxt: ps.Context, ostack: ps.Stack) -> None:
     image_element.ictm = the_ictm
 
     # STEP 9: Read ALL image data immediately - no VM references in display list
-    if not ImageDataProcessor.read_all_image_data(data_source, image_element, ctxt):
+    defer = image_downsample.prepare_image_source(ctxt, data_source, image_element)
+    if not ImageDataProcessor.read_all_image_data(data_source, image_element, ctxt, defer):
         return ps_error.e(ctxt, ps_error.IOERROR, "image")
+    image_downsample.downsample_image(ctxt, image_element)
 
     # STEP 10: Add to display list for device rendering (VM-independent)
+    image_element.device_bbox = image_device_bbox(image_element)
     ctxt.display_list.append(image_element)
 
 
@@ -309,13 +318,66 @@ def _image_dict_form(ctxt: ps.Context, ostack: ps.Stack) -> None:
             return ps_error.e(ctxt, ps_error.IOERROR, "image")
     else:
         # Single data source
-        if not ImageDataProcessor.read_all_image_data(data_source, image_element, ctxt):
+        defer = image_downsample.prepare_image_source(ctxt, data_source, image_element)
+        if not ImageDataProcessor.read_all_image_data(data_source, image_element, ctxt, defer):
             return ps_error.e(ctxt, ps_error.IOERROR, "image")
+    image_downsample.downsample_image(ctxt, image_element)
+    _convert_tint_image(ctxt, image_element)
 
     # Add to display list (VM-independent)
+    image_element.device_bbox = image_device_bbox(image_element)
     ctxt.display_list.append(image_element)
 
 
+def _convert_tint_image(ctxt: ps.Context, image_element: ps.ImageElement) -> None:
+    """
+    Replace 8-bit Separation/DeviceN samples with alternative space samples.
+
+    The tint transform can only run while the interpreter is available, so
+    the samples are mapped here rather than at render time: each distinct
+    sample value is run through the transform, unless there are more of them
+    than points in its sampled table, which is then used instead.  Images
+    with other depths, deferred samples, a color key mask or too many inputs
+    to sample are left as they are.
+    """
+    cs = image_element.color_space
+    if (not cs or cs[0] not in ("Separation", "DeviceN") or len(cs) != 4
+            or image_element.bits_per_component != 8 or image_element.mask_color is not None
+            or image_element.sample_data is None):
+        return
+    alt_space_name = color_ops._get_color_space_name(cs[2])
+    n_out = color_space.ColorSpaceEngine.COMPONENT_COUNTS.get(alt_space_name)
+    n_in = image_element.components
+    num_pixels = image_element.width * image_element.height
+    if (n_out is None or n_in > proc_table.MAX_INPUTS
+            or len(image_element.sample_data) < num_pixels * n_in):
+        return
+
+    samples = np.frombuffer(image_element.sample_data, dtype=np.uint8,
+                            count=num_pixels * n_in).reshape(num_pixels, n_in)
+    if n_in == 1:
+        # Sample values index the distinct values directly, without a sort
+        used = np.bincount(samples[:, 0], minlength=256) > 0
+        values = np.flatnonzero(used)[:, None]
+        inverse = (np.cumsum(used) - 1)[samples[:, 0]]
+    else:
+        values, inverse = np.unique(samples, axis=0, return_inverse=True)
+    decode = np.array(image_element.decode_array[:2 * n_in], dtype=np.float64)
+    tints = np.clip(decode[0::2] + (values / 255.0) * (decode[1::2] - decode[0::2]), 0.0, 1.0)
+    if len(values) > proc_table.grid_points(n_in):
+        colors = color_ops.tint_table(ctxt, cs[3], n_in, n_out).evaluate_array(tints)
+    else:
+        colors = np.array([color_ops.evaluate_tint_transform(ctxt, cs[3], [float(t) for t in row], n_out)
+                           for row in tints])
+    alt = colors[inverse.reshape(-1)]
+
+    image_element.sample_data = np.clip(alt * 255 + 0.5, 0, 255).astype(np.uint8).tobytes()
+    image_element.sample_digest = None
+    image_element.components = n_out
+    image_element.decode_array = [0.0, 1.0] * n_out
+    image_element.color_space = [alt_space_name]
+
+
 def ps_imagemask(ctxt: ps.Context, ostack: ps.Stack) -> None:
     """
     bool width height polarity matrix datasrc **imagemask** –
@@ -410,6 +472,7 @@ def _imagemask_five_operand_form(ctxt: ps.Context, ostack: ps.Stack) -> None:
         return ps_error.e(ctxt, ps_error.IOERROR, "imagemask")
 
     # Add to display list (VM-independent)
+    mask_element.device_bbox = image_device_bbox(mask_element)
     ctxt.display_list.append(mask_element)
 
 
@@ -510,6 +573,7 @@ def _imagemask_dict_form(ctxt: ps.Context, ostack: ps.Stack) -> None:
         return ps_error.e(ctxt, ps_error.IOERROR, "imagemask")
 
     # Add to display list (VM-independent)
+    mask_element.device_bbox = image_device_bbox(mask_element)
     ctxt.display_list.append(mask_element)
 
 
@@ -654,8 +718,11 @@ def ps_colorimage(ctxt: ps.Context, ostack: ps.Stack) -> None:
     color_element.ictm = the_ictm
 
     # STEP 11: Read ALL color image data immediately - no VM references in display list
-    if not ImageDataProcessor.read_all_colorimage_data(data_sources, color_element, ctxt, multi):
+    defer = not multi and image_downsample.prepare_image_source(ctxt, data_sources[0], color_element)
+    if not ImageDataProcessor.read_all_colorimage_data(data_sources, color_element, ctxt, multi, defer):
         return ps_error.e(ctxt, ps_error.IOERROR, "colorimage")
+    image_downsample.downsample_image(ctxt, color_element)
 
     # STEP 12: Add to display list (VM-independent)
+    color_element.device_bbox = image_device_bbox(color_element)
     ctxt.display_list.append(color_element)
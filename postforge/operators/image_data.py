@@ -11,10 +11,149 @@ from __future__ import annotations
 # colorimage multi-source interleaving and transfer function application.
 
 import copy
+import hashlib
+from collections import OrderedDict
 
+from ..core import ascii_codecs
 from ..core import types as ps
 from ..core import error as ps_error
 from . import control as ps_control
+from . import dict as ps_dict
+from . import file as ps_file
+from . import operand_stack as ps_ostack
+
+
+# Job-scoped store of image sample data, keyed by content digest.  Programs
+# that draw the same image repeatedly (procedures instead of execform, page
+# loops) get one shared bytes object instead of a copy per occurrence, and
+# the digest on the element lets the renderer reuse converted surfaces and
+# emit a single PDF image XObject per unique image.  Byte-limited LRU.
+_SAMPLE_STORE_MAX_BYTES = 64 * 1024 * 1024
+_sample_store = OrderedDict()
+_sample_store_bytes = 0
+_sample_store_stats = {'unique': 0, 'shared': 0, 'bytes_shared': 0}
+
+
+def get_sample_store_stats() -> dict:
+    """Return image sample deduplication statistics for the current job."""
+    return {
+        'entries': len(_sample_store),
+        'bytes': _sample_store_bytes,
+        **_sample_store_stats,
+    }
+
+
+def clear_sample_store() -> None:
+    """Drop all interned sample data and reset statistics (called per job)."""
+    global _sample_store_bytes
+    _sample_store.clear()
+    _sample_store_bytes = 0
+    for key in _sample_store_stats:
+        _sample_store_stats[key] = 0
+
+
+def _intern(data: bytes) -> tuple[bytes, bytes]:
+    """Return (shared_data, digest) for data, adding it to the store if new."""
+    global _sample_store_bytes
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    key = (digest, len(data))
+    shared = _sample_store.get(key)
+    if shared is not None:
+        _sample_store.move_to_end(key)
+        _sample_store_stats['shared'] += 1
+        _sample_store_stats['bytes_shared'] += len(data)
+        data = shared
+    else:
+        _sample_store_stats['unique'] += 1
+        if len(data) <= _SAMPLE_STORE_MAX_BYTES // 4:
+            while _sample_store and _sample_store_bytes + len(data) > _SAMPLE_STORE_MAX_BYTES:
+                _, evicted = _sample_store.popitem(last=False)
+                _sample_store_bytes -= len(evicted)
+            _sample_store[key] = data
+            _sample_store_bytes += len(data)
+    return data, digest
+
+
+def intern_sample_data(image_element: ps.ImageElement, data: bytes) -> None:
+    """Set an element's sample data, sharing an identical earlier buffer if one exists.
+
+    Also records the content digest as image_element.sample_digest.
+    """
+    image_element.sample_data, image_element.sample_digest = _intern(data)
+
+
+def _set_sample_data(image_element: ps.ImageElement, data: bytes) -> None:
+    """Store data read for an element; temporary elements are not interned."""
+    if image_element.image_type == 'temp':
+        image_element.sample_data = data
+    else:
+        intern_sample_data(image_element, data)
+
+
+# Largest single read when pulling image data straight from currentfile
+_BULK_READ_SIZE = 1024 * 1024
+
+
+def _match_currentfile_procedure(procedure: ps.PSObject, ctxt: ps.Context) -> tuple[ps.String, bool] | None:
+    """Recognize the {currentfile string readstring pop} data procedure idiom.
+
+    Matches procedures of exactly that shape, bound or unbound, with the
+    string given literally or by name, and the readhexstring variant.
+
+    Returns:
+        (string, is_hex) for a matching procedure, else None.
+    """
+    if procedure.length != 4:
+        return None
+    items = []
+    for item in procedure.val[procedure.start:procedure.start + 4]:
+        if item.TYPE == ps.T_NAME and item.attrib == ps.ATTRIB_EXEC:
+            item = ps_dict.lookup(ctxt, item)
+            if item is None:
+                return None
+        items.append(item)
+    current, string, reader, pop = items
+    if (current.TYPE != ps.T_OPERATOR or current.val is not ps_file.currentfile
+            or pop.TYPE != ps.T_OPERATOR or pop.val is not ps_ostack.pop
+            or reader.TYPE != ps.T_OPERATOR
+            or reader.val not in (ps_file.readstring, ps_file.readhexstring)):
+        return None
+    if string.TYPE != ps.T_STRING or not string.length or string.access < ps.ACCESS_WRITE_ONLY:
+        return None
+    return string, reader.val is ps_file.readhexstring
+
+
+def _current_input_file(ctxt: ps.Context) -> ps.File | None:
+    """Return the file **currentfile** would push, if it is readable."""
+    for i in range(len(ctxt.e_stack) - 1, -1, -1):
+        if isinstance(ctxt.e_stack[i], (ps.File, ps.Run)):
+            file_obj = ctxt.e_stack[i]
+            return file_obj if file_obj.access >= ps.ACCESS_READ_ONLY else None
+    return None
+
+
+def _read_file_data(file_obj: ps.File, count: int, is_hex: bool, ctxt: ps.Context) -> bytes:
+    """Read count bytes as repeated readstring or readhexstring calls would.
+
+    Hex data is requested only as many bytes as digits are still missing,
+    so nothing past the last digit is consumed.  Returns fewer bytes at EOF.
+    """
+    if is_hex:
+        return ascii_codecs.read_hex_bytes(file_obj, ctxt, count)
+    data = bytearray()
+    while len(data) < count:
+        chunk = file_obj.read_bulk(ctxt, min(count - len(data), _BULK_READ_SIZE))
+        if not chunk:
+            break
+        data.extend(chunk)
+    return bytes(data)
+
+
+def _store_string(string: ps.String, data: bytes, ctxt: ps.Context) -> None:
+    """Write data to the start of a string, as the last read(hex)string call would."""
+    strings = ps.global_resources.global_strings if string.is_global else ctxt.local_strings
+    start = string.offset + string.start
+    strings[start:start + len(data)] = data
 
 
 class ImageDataProcessor:
@@ -70,8 +209,39 @@ class ImageDataProcessor:
         return True
 
     @staticmethod
-    def read_all_image_data(data_source: ps.PSObject, image_element: ps.ImageElement, ctxt: ps.Context) -> bool:
-        """Read ALL image data immediately - no VM references in display list"""
+    def _defer_encoded_data(data_source: ps.PSObject, image_element: ps.ImageElement, ctxt: ps.Context) -> bool:
+        """Keep a DCTDecode image's JPEG data on the element instead of decoding it.
+
+        The compressed bytes are VM-independent like decoded samples, and are
+        decoded by the renderer on demand (ImageElement.get_sample_data), so
+        a page of large JPEGs holds only their compressed size.  The PDF
+        device also embeds them unchanged.
+        """
+        take_encoded = getattr(getattr(data_source, 'filter', None), 'take_encoded', None)
+        if take_encoded is None or image_element.bits_per_component != 8:
+            return False
+        state = data_source._state
+        if len(state.buffer) > state.buf_pos:
+            return False  # Decoded bytes already read from the filter
+        encoded = take_encoded(ctxt, image_element.width, image_element.height,
+                               image_element.components)
+        if encoded is None:
+            return False
+
+        # Deferred import: filter_dct imports the filter module, which imports this one
+        from .filter_dct import decode_jpeg_samples
+        image_element.encoded_data, image_element.sample_digest = _intern(encoded)
+        image_element.encoded_format = 'jpeg'
+        image_element.sample_decoder = decode_jpeg_samples
+        return True
+
+    @staticmethod
+    def read_all_image_data(data_source: ps.PSObject, image_element: ps.ImageElement, ctxt: ps.Context, defer: bool = False) -> bool:
+        """Read ALL image data immediately - no VM references in display list
+
+        With defer=True, a DCTDecode data source may instead leave its
+        compressed data on the element for decoding at render time.
+        """
 
         # Calculate total bytes needed
         # PLRM: Each row of sample data is padded to a byte boundary
@@ -86,12 +256,15 @@ class ImageDataProcessor:
                 sample_bytes = data_source.byte_string()
                 if len(sample_bytes) >= bytes_needed:
                     # Make an explicit copy to ensure data is preserved
-                    image_element.sample_data = bytes(sample_bytes[:bytes_needed])
+                    _set_sample_data(image_element, bytes(sample_bytes[:bytes_needed]))
                     return True
                 else:
                     return False
 
             elif data_source.TYPE == ps.T_FILE:
+                if defer and ImageDataProcessor._defer_encoded_data(data_source, image_element, ctxt):
+                    return True
+
                 # File data source - read all bytes now (includes FilterFile)
                 # Use bulk read when available (FilterFile and real File both support it)
                 if hasattr(data_source, 'read_bulk'):
@@ -115,7 +288,7 @@ class ImageDataProcessor:
                         remaining -= 1
 
                 if len(sample_bytes) >= bytes_needed:
-                    image_element.sample_data = bytes(sample_bytes[:bytes_needed])
+                    _set_sample_data(image_element, bytes(sample_bytes[:bytes_needed]))
                     return True
                 else:
                     return False
@@ -131,10 +304,62 @@ class ImageDataProcessor:
         except Exception:
             return False
 
+    @staticmethod
+    def _read_from_currentfile(procedures: list[ps.PSObject], bytes_per_source: int, ctxt: ps.Context) -> list[bytes] | None:
+        """Read the data of currentfile procedures directly from the file.
+
+        Covers one or more {currentfile string read(hex)string pop}
+        procedures called in rotation on the same file, with strings of
+        equal length.  The file is read in bulk, consuming exactly what
+        the procedure calls would, and each string is left holding its
+        last chunk.
+
+        Returns:
+            The data for each procedure, short if the file ended early, or
+            None if the procedures do not all match (the caller then
+            executes them).
+        """
+        matches = [_match_currentfile_procedure(proc, ctxt) for proc in procedures]
+        if None in matches:
+            return None
+        chunk_size = matches[0][0].length
+        is_hex = matches[0][1]
+        if any(string.length != chunk_size or hex_flag != is_hex for string, hex_flag in matches):
+            return None
+        file_obj = _current_input_file(ctxt)
+        if file_obj is None:
+            return None
+
+        # Each procedure is called until it has supplied bytes_per_source bytes
+        rounds = -(-bytes_per_source // chunk_size)
+        row = chunk_size * len(procedures)
+        data = _read_file_data(file_obj, rounds * row, is_hex, ctxt)
+
+        results = []
+        for index, (string, _) in enumerate(matches):
+            if len(procedures) == 1:
+                source = data
+            else:
+                source = b"".join(data[r * row + index * chunk_size:r * row + (index + 1) * chunk_size]
+                                  for r in range(rounds))
+            if rounds:
+                last = (rounds - 1) * row + index * chunk_size
+                _store_string(string, data[last:last + chunk_size], ctxt)
+            results.append(source[:bytes_per_source])
+        return results
+
     @staticmethod
     def _read_from_procedure(procedure: ps.PSObject, image_element: ps.ImageElement, ctxt: ps.Context, bytes_needed: int) -> bool:
         """Read from PostScript procedure data source - with proper error handling"""
         try:
+            # {currentfile picstr readhexstring pop} and friends: read directly
+            bulk = ImageDataProcessor._read_from_currentfile([procedure], bytes_needed, ctxt)
+            if bulk is not None:
+                if len(bulk[0]) < bytes_needed:
+                    return False
+                _set_sample_data(image_element, bulk[0])
+                return True
+
             # Execute procedure multiple times to get strings until we have enough data
             sample_bytes = bytearray()
             max_iterations = 1000000  # Prevent infinite loops
@@ -173,7 +398,7 @@ class ImageDataProcessor:
                     # No string returned - might be end of data or error
                     break
             if len(sample_bytes) >= bytes_needed:
-                image_element.sample_data = bytes(sample_bytes[:bytes_needed])
+                _set_sample_data(image_element, bytes(sample_bytes[:bytes_needed]))
                 return True
             else:
                 return False
@@ -255,7 +480,7 @@ class ImageDataProcessor:
             return None
 
     @staticmethod
-    def read_all_colorimage_data(data_sources: list[ps.PSObject], color_element: ps.ColorImageElement, ctxt: ps.Context, multi: bool) -> bool:
+    def read_all_colorimage_data(data_sources: list[ps.PSObject], color_element: ps.ColorImageElement, ctxt: ps.Context, multi: bool, defer: bool = False) -> bool:
         """Read ALL **colorimage** data immediately - handles multiple data sources
 
         For multi=true with procedures: Uses round-robin reading to support procedures
@@ -287,33 +512,38 @@ class ImageDataProcessor:
                     bits_per_row = width * bits
                     bytes_per_row = (bits_per_row + 7) // 8
                     bytes_per_component = bytes_per_row * height
-                    component_data = [bytearray() for _ in range(ncomp)]
-
-                    max_iterations = bytes_per_component * ncomp * 10  # Safety limit
-                    iteration = 0
-
-                    while iteration < max_iterations:
-                        iteration += 1
-
-                        # Check if all components have enough data
-                        if all(len(component_data[i]) >= bytes_per_component for i in range(ncomp)):
-                            break
-
-                        # Read from each component in round-robin fashion
-                        any_progress = False
-                        for comp_idx, procedure in enumerate(data_sources):
-                            if len(component_data[comp_idx]) >= bytes_per_component:
-                                continue  # Already have enough for this component
-
-                            # Execute procedure once
-                            result = ImageDataProcessor._execute_procedure_once(procedure, ctxt)
-                            if result and len(result) > 0:
-                                component_data[comp_idx].extend(result)
-                                any_progress = True
-
-                        if not any_progress:
-                            # No procedure returned data - all sources exhausted
-                            break
+                    # Procedures that all read currentfile: read the file directly
+                    bulk = ImageDataProcessor._read_from_currentfile(data_sources, bytes_per_component, ctxt)
+                    if bulk is not None:
+                        component_data = bulk
+                    else:
+                        component_data = [bytearray() for _ in range(ncomp)]
+
+                        max_iterations = bytes_per_component * ncomp * 10  # Safety limit
+                        iteration = 0
+
+                        while iteration < max_iterations:
+                            iteration += 1
+
+                            # Check if all components have enough data
+                            if all(len(component_data[i]) >= bytes_per_component for i in range(ncomp)):
+                                break
+
+                            # Read from each component in round-robin fashion
+                            any_progress = False
+                            for comp_idx, procedure in enumerate(data_sources):
+                                if len(component_data[comp_idx]) >= bytes_per_component:
+                                    continue  # Already have enough for this component
+
+                                # Execute procedure once
+                                result = ImageDataProcessor._execute_procedure_once(procedure, ctxt)
+                                if result and len(result) > 0:
+                                    component_data[comp_idx].extend(result)
+                                    any_progress = True
+
+                            if not any_progress:
+                                # No procedure returned data - all sources exhausted
+                                break
 
                     # Check if we got enough data
                     if not all(len(component_data[i]) >= bytes_per_component for i in range(ncomp)):
@@ -325,8 +555,10 @@ class ImageDataProcessor:
                     interleaved_data = ImageDataProcessor._interleave_component_data(
                         component_data_list, ncomp, width, height, bits
                     )
-                    color_element.sample_data = interleaved_data
-                    return interleaved_data is not None
+                    if interleaved_data is None:
+                        return False
+                    _set_sample_data(color_element, bytes(interleaved_data))
+                    return True
 
                 else:
                     # Non-procedure sources - read sequentially (strings, files)
@@ -347,15 +579,17 @@ class ImageDataProcessor:
                     interleaved_data = ImageDataProcessor._interleave_component_data(
                         component_data_list, ncomp, width, height, bits
                     )
-                    color_element.sample_data = interleaved_data
-                    return interleaved_data is not None
+                    if interleaved_data is None:
+                        return False
+                    _set_sample_data(color_element, bytes(interleaved_data))
+                    return True
 
             else:
                 # Single interleaved data source
                 if len(data_sources) != 1:
                     return False
 
-                return ImageDataProcessor.read_all_image_data(data_sources[0], color_element, ctxt)
+                return ImageDataProcessor.read_all_image_data(data_sources[0], color_element, ctxt, defer)
 
         except Exception:
             return False
@@ -530,7 +764,7 @@ class ImageDataProcessor:
 
 def _read_raw_bytes(data_source: ps.PSObject, count: int, ctxt: ps.Context) -> bytes | None:
     """Read exactly count bytes from a data source using a temporary ImageElement."""
-    temp = ps.ImageElement([0], ctxt.gstate, 'image')
+    temp = ps.ImageElement([0], ctxt.gstate, 'temp')
     temp.width = count
     temp.height = 1
     temp.bits_per_component = 8
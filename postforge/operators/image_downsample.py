@@ -0,0 +1,261 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from __future__ import annotations
+
+# Resolution-Aware Image Downsampling
+#
+# Scanned pages and photos are often placed with far more samples than the
+# output device can show.  Every sample is still decoded, color converted
+# and handed to Cairo, which then throws most of them away.  This module
+# reduces such images right after their data is read, so everything
+# downstream works on at most ImageDownsampleLimit samples per device pixel
+# along each image axis.
+#
+# The footprint of one sample is taken from the image matrix and the CTM.
+# Continuous-tone images are box filtered.  Indexed, Separation, DeviceN
+# and color-keyed (ImageType 4) images are subsampled, because averaging
+# their sample values would produce colors or keys that are not in the
+# image.  DCTDecode sources are decoded at a reduced size via libjpeg's
+# DCT scaling before any full-size samples exist.
+#
+# The limit comes from the ImageDownsampleLimit page device key (set per
+# device in resources/OutputDevice, overridable with --image-downsample).
+# Zero disables downsampling.  Content captured for forms and patterns is
+# never downsampled since its CTM is not the final device transform.
+
+import math
+
+import numpy as np
+
+from ..core import types as ps
+from . import image_data
+
+# Color spaces whose samples may be averaged.  Everything else is subsampled.
+_CONTINUOUS_SPACES = frozenset((
+    "DeviceGray", "DeviceRGB", "DeviceCMYK",
+    "CIEBasedA", "CIEBasedABC", "CIEBasedDEF", "CIEBasedDEFG", "ICCBased",
+))
+
+# Downsampling statistics (reported by --cache-stats)
+_downsample_stats = {'images': 0, 'dct_draft': 0, 'bytes_saved': 0}
+
+
+def get_image_downsample_stats() -> dict:
+    """Return image downsampling statistics."""
+    return dict(_downsample_stats)
+
+
+def clear_image_downsample_stats() -> None:
+    """Reset image downsampling statistics."""
+    for key in _downsample_stats:
+        _downsample_stats[key] = 0
+
+
+def _downsample_limit(ctxt: ps.Context) -> float:
+    """Return the ImageDownsampleLimit page device value, 0 when disabled."""
+    display_list = ctxt.display_list
+    if display_list is None or not getattr(display_list, 'device_space', True):
+        return 0.0
+    page_device = getattr(ctxt.gstate, 'page_device', {})
+    if hasattr(page_device, 'TYPE') and page_device.TYPE == ps.T_DICT:
+        page_device = page_device.val
+    limit = page_device.get(b'ImageDownsampleLimit')
+    if limit is None or limit.TYPE not in ps.NUMERIC_TYPES:
+        return 0.0
+    return max(float(limit.val), 0.0)
+
+
+def downsample_factors(ctxt: ps.Context, image_element: ps.ImageElement) -> tuple[int, int]:
+    """
+    Compute integer reduction factors for an image from its device footprint.
+
+    Args:
+        ctxt: Context (supplies the page device limit)
+        image_element: Image element with width, height, image_matrix and ctm
+
+    Returns:
+        (fx, fy) — sample columns and rows merged into one; (1, 1) when the
+        image is not over-sampled or downsampling is disabled.
+    """
+    limit = _downsample_limit(ctxt)
+    if not limit or image_element.image_matrix is None or image_element.ctm is None:
+        return 1, 1
+    try:
+        image_to_user = image_element._calculate_inverse_matrix(image_element.image_matrix)
+    except ValueError:
+        return 1, 1
+    a, b, c, d, _, _ = image_element._matrix_multiply(image_to_user, list(image_element.ctm))
+
+    # Device pixels covered by one step along each image axis.  The epsilon
+    # absorbs CTM rounding so exact 2x, 3x, ... placements are not missed.
+    step_u = math.hypot(a, b)
+    step_v = math.hypot(c, d)
+    fx = int(1.0 / (step_u * limit) + 1e-6) if step_u > 0 else 1
+    fy = int(1.0 / (step_v * limit) + 1e-6) if step_v > 0 else 1
+    return (max(1, min(fx, image_element.width)),
+            max(1, min(fy, image_element.height)))
+
+
+def _can_downsample(image_element: ps.ImageElement) -> bool:
+    """Whether the element's samples are in a layout this module handles."""
+    return (image_element.bits_per_component == 8
+            and image_element.components > 0
+            and getattr(image_element, 'stencil_mask', None) is None)
+
+
+def _color_space_family(image_element: ps.ImageElement) -> str | None:
+    if image_element.image_type == 'colorimage':
+        # colorimage always uses the device space implied by its component count
+        return image_element.color_space_name
+    color_space = getattr(image_element, 'color_space', None)
+    if color_space and isinstance(color_space, list) and isinstance(color_space[0], str):
+        return color_space[0]
+    return None
+
+
+def _rescale_image_matrix(image_element: ps.ImageElement, new_width: int, new_height: int) -> None:
+    """
+    Resize an element's sample grid, keeping its placement on the page.
+
+    The new grid spans the same unit square as the old one, so each new
+    sample covers width / new_width old columns and height / new_height old
+    rows, which need not be whole numbers.
+    """
+    sx = new_width / image_element.width
+    sy = new_height / image_element.height
+    a, b, c, d, tx, ty = image_element.image_matrix
+    image_element.image_matrix = [a * sx, b * sy, c * sx, d * sy, tx * sx, ty * sy]
+    image_element.width = new_width
+    image_element.height = new_height
+
+
+def _box_filter_axis(samples: np.ndarray, axis: int, new_n: int) -> np.ndarray:
+    """
+    Average samples along one axis over new_n equal spans.
+
+    Spans need not fall on sample boundaries; a sample straddling two spans
+    contributes to each in proportion to its overlap.
+
+    Returns:
+        float64 array with new_n entries along axis
+    """
+    n = samples.shape[axis]
+    span = n / new_n
+    edges = np.arange(new_n + 1) * span
+    index = np.minimum(edges.astype(np.intp), n - 1)
+    frac_shape = [1] * samples.ndim
+    frac_shape[axis] = new_n + 1
+    frac = (edges - index).reshape(frac_shape)
+    # Exclusive prefix sums: the total of all samples before each one
+    prefix = np.cumsum(samples, axis=axis,
+                       dtype=np.uint32 if samples.dtype == np.uint8 else np.float64)
+    prefix -= samples
+    totals = np.take(prefix, index, axis=axis) + frac * np.take(samples, index, axis=axis)
+    return np.diff(totals, axis=axis) / span
+
+
+def prepare_image_source(ctxt: ps.Context, data_source: ps.PSObject, image_element: ps.ImageElement) -> bool:
+    """
+    Reduce a DCTDecode image at decode time when it will be downsampled.
+
+    Called before the image data is read.  When the data source is an
+    unread DCTDecode filter and the image is over-sampled by at least 2x
+    in both directions, the JPEG is decoded at 1/2, 1/4 or 1/8 size and
+    the element's dimensions and image matrix are updated to match.
+
+    Args:
+        ctxt: Context
+        data_source: Image data source operand
+        image_element: Image element about to be read
+
+    Returns:
+        True if the image will not be downsampled after it is read, so its
+        samples may stay encoded until render time.
+    """
+    if not _can_downsample(image_element):
+        return True
+    fx, fy = downsample_factors(ctxt, image_element)
+    if fx < 2 and fy < 2:
+        return True
+
+    dct_filter = getattr(data_source, 'filter', None)
+    decode_draft = getattr(dct_filter, 'decode_draft', None)
+    if decode_draft is None:
+        return False
+    state = getattr(data_source, '_state', None)
+    if state is not None and len(state.buffer) > state.buf_pos:
+        return False
+
+    factor = min(fx, fy)
+    if factor < 2:
+        return False
+    scale = 8 if factor >= 8 else 4 if factor >= 4 else 2
+
+    full_bytes = image_element.width * image_element.height * image_element.components
+    size = decode_draft(ctxt, image_element.width, image_element.height,
+                        image_element.components, scale)
+    if size is None:
+        return False
+    _rescale_image_matrix(image_element, size[0], size[1])
+    _downsample_stats['dct_draft'] += 1
+    _downsample_stats['bytes_saved'] += full_bytes - size[0] * size[1] * image_element.components
+    return False
+
+
+def downsample_image(ctxt: ps.Context, image_element: ps.ImageElement) -> None:
+    """
+    Downsample an image element's samples to its device footprint.
+
+    Called after the sample data has been read.  Only 8-bit images are
+    reduced; the element's width, height, image matrix and sample_data are
+    replaced in place.
+
+    Args:
+        ctxt: Context
+        image_element: Image element with sample_data
+    """
+    if not _can_downsample(image_element) or image_element.sample_data is None:
+        return
+    fx, fy = downsample_factors(ctxt, image_element)
+    if fx < 2 and fy < 2:
+        return
+
+    width = image_element.width
+    height = image_element.height
+    ncomp = image_element.components
+    if len(image_element.sample_data) < width * height * ncomp:
+        return
+    samples = np.frombuffer(image_element.sample_data, dtype=np.uint8,
+                            count=width * height * ncomp).reshape(height, width, ncomp)
+    new_width = -(-width // fx)
+    new_height = -(-height // fy)
+
+    family = _color_space_family(image_element)
+    # The rescaled image matrix spreads the new samples evenly over the
+    # image, so when a dimension is not a multiple of its factor each new
+    # sample covers a little less than a whole block.  Both branches take
+    # their values from exactly the area each new sample is placed over.
+    if (getattr(image_element, 'mask_color', None) is not None
+            or (family is not None and family not in _CONTINUOUS_SPACES)):
+        # Subsample: keep the sample under the centre of each new sample
+        rows = ((np.arange(new_height) + 0.5) * (height / new_height)).astype(np.intp)
+        cols = ((np.arange(new_width) + 0.5) * (width / new_width)).astype(np.intp)
+        reduced = samples[np.minimum(rows, height - 1)][:, np.minimum(cols, width - 1)]
+    elif width % fx or height % fy:
+        # Box filter over fractional spans
+        reduced = _box_filter_axis(samples, 1, new_width)
+        reduced = _box_filter_axis(reduced, 0, new_height)
+        reduced = np.rint(reduced).astype(np.uint8)
+    else:
+        # Box filter over whole blocks
+        blocks = samples.reshape(new_height, fy, new_width, fx, ncomp)
+        sums = blocks.sum(axis=(1, 3), dtype=np.uint32)
+        area = fx * fy
+        reduced = ((sums + area // 2) // area).astype(np.uint8)
+
+    _downsample_stats['images'] += 1
+    _downsample_stats['bytes_saved'] += len(image_element.sample_data) - reduced.nbytes
+    image_data.intern_sample_data(image_element, reduced.tobytes())
+    _rescale_image_matrix(image_element, new_width, new_height)
@@ -13,7 +13,8 @@ from __future__ import annotations
 from ..core import types as ps
 from ..core import color_space
 from ..core import error as ps_error
-from .image_data import ImageDataProcessor, _read_raw_bytes
+from ..core.display_list_builder import image_device_bbox
+from .image_data import ImageDataProcessor, _read_raw_bytes, intern_sample_data
 
 
 def _image_type3_dict_form(ctxt: ps.Context, ostack: ps.Stack) -> None:
@@ -196,6 +197,7 @@ def _image_type3_dict_form(ctxt: ps.Context, ostack: ps.Stack) -> None:
         image_element.stencil_mask_polarity = mask_polarity
 
     # Add to display list
+    image_element.device_bbox = image_device_bbox(image_element)
     ctxt.display_list.append(image_element)
 
 
@@ -298,7 +300,7 @@ def _separate_interleave_type1(raw_data: bytes, image_element: ps.ImageElement,
             image_data.extend(img_row[:img_bytes_per_row])
             mask_data.extend(mask_row[:mask_bytes_per_row])
 
-    image_element.sample_data = bytes(image_data)
+    intern_sample_data(image_element, bytes(image_data))
 
     # Convert mask: for InterleaveType 1, mask BPS matches image BPS
     # All bits must be same value; treat any nonzero as "paint" (1)
@@ -404,7 +406,7 @@ def _read_interleave_type2(data_source: ps.PSObject, image_element: ps.ImageElem
             img_data.extend(raw_data[offset:offset + img_bytes_per_row])
             offset += img_bytes_per_row
 
-    image_element.sample_data = bytes(img_data)
+    intern_sample_data(image_element, bytes(img_data))
     image_element.stencil_mask = bytes(mask_data)
     image_element.stencil_mask_width = mask_width
     image_element.stencil_mask_height = mask_height
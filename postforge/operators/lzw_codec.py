@@ -0,0 +1,236 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from __future__ import annotations
+
+# LZW Codec for the LZWDecode and LZWEncode Filters
+#
+# Codes start UnitLength + 1 bits wide and grow to at most 12 bits.  Code
+# 2^UnitLength clears the table, the next one marks end of data.  With
+# EarlyChange 1 (the default) the width grows one code before the table
+# actually needs it, as in TIFF and most PostScript producers.
+#
+# The decoder and encoder are incremental: data is fed in any size and the
+# bytes produced so far are returned.  The table-driven versions in _lzw_cy
+# are used when that extension is built; the classes here are the pure
+# Python fallback with the same interface.
+#
+# The decoder is always one table entry behind the encoder (it only learns
+# an entry's last byte from the following code), so the encoder widens its
+# codes when the decoder will, not when its own table grows.
+
+try:
+    from ._lzw_cy import LZWDecoder as _LZWDecoderCy, LZWEncoder as _LZWEncoderCy
+    _CYTHON_LZW = True
+except ImportError:
+    _CYTHON_LZW = False
+
+MAX_CODE_LENGTH = 12
+TABLE_SIZE = 1 << MAX_CODE_LENGTH
+
+
+class _LZWDecoderPy:
+    """
+    Incremental LZW decoder.
+
+    Attributes:
+        eod: The end-of-data code has been read.
+        unused: After eod, the number of bytes at the end of the last chunk
+            that followed the byte holding the end-of-data code.
+    """
+
+    def __init__(self, unit_length: int = 8, early_change: int = 1,
+                 low_bit_first: bool = False) -> None:
+        self.unit_length = unit_length
+        self.early_change = early_change
+        self.low_bit_first = low_bit_first
+        self.clear_code = 1 << unit_length
+        self.eod_code = self.clear_code + 1
+        self.eod = False
+        self.unused = 0
+        self.bit_buffer = 0
+        self.bits = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        # Clear and EOD codes hold empty placeholders so codes index the list
+        self.table = [bytes((i,)) for i in range(self.clear_code)] + [b'', b'']
+        self.code_length = self.unit_length + 1
+        self.prev = None
+
+    def decode(self, data: bytes) -> bytes:
+        """
+        Decode a chunk of LZW data.
+
+        Raises:
+            ValueError: A code refers to a table entry that does not exist.
+        """
+        out = []
+        if self.eod:
+            return b''
+        table = self.table
+        buffer = self.bit_buffer
+        bits = self.bits
+        code_length = self.code_length
+        prev = self.prev
+        low_bit_first = self.low_bit_first
+        clear_code = self.clear_code
+        early_change = self.early_change
+
+        for index, byte in enumerate(data):
+            if low_bit_first:
+                buffer |= byte << bits
+            else:
+                buffer = (buffer << 8) | byte
+            bits += 8
+            while bits >= code_length:
+                bits -= code_length
+                if low_bit_first:
+                    code = buffer & ((1 << code_length) - 1)
+                    buffer >>= code_length
+                else:
+                    code = buffer >> bits
+                    buffer &= (1 << bits) - 1
+
+                if code == clear_code:
+                    self._reset()
+                    table = self.table
+                    code_length = self.code_length
+                    prev = None
+                    continue
+                if code == self.eod_code:
+                    self.eod = True
+                    self.unused = len(data) - index - 1
+                    self.bit_buffer = self.bits = 0
+                    self.prev = prev
+                    self.code_length = code_length
+                    return b''.join(out)
+
+                next_code = len(table)
+                if code < next_code:
+                    entry = table[code]
+                    if prev is not None and next_code < TABLE_SIZE:
+                        table.append(table[prev] + entry[:1])
+                elif code == next_code and prev is not None:
+                    entry = table[prev]
+                    entry += entry[:1]
+                    if next_code < TABLE_SIZE:
+                        table.append(entry)
+                else:
+                    raise ValueError("invalid LZW code")
+                out.append(entry)
+                prev = code
+                if (code_length < MAX_CODE_LENGTH
+                        and len(table) + early_change >= 1 << code_length):
+                    code_length += 1
+
+        self.bit_buffer = buffer
+        self.bits = bits
+        self.code_length = code_length
+        self.prev = prev
+        return b''.join(out)
+
+
+class _LZWEncoderPy:
+    """Incremental LZW encoder.  The output starts with a clear-table code."""
+
+    def __init__(self, unit_length: int = 8, early_change: int = 1,
+                 low_bit_first: bool = False) -> None:
+        self.unit_length = unit_length
+        self.early_change = early_change
+        self.low_bit_first = low_bit_first
+        self.clear_code = 1 << unit_length
+        self.eod_code = self.clear_code + 1
+        self.bit_buffer = 0
+        self.bits = 0
+        self.output = bytearray()
+        self.prefix = -1  # code of the string matched so far, -1 for none
+        self._reset()
+        self._write_code(self.clear_code)
+
+    def _reset(self) -> None:
+        # (prefix code << 8 | next byte) -> code of the extended string
+        self.table = {}
+        self.next_code = self.clear_code + 2
+        self.code_length = self.unit_length + 1
+
+    def _write_code(self, code: int) -> None:
+        if self.low_bit_first:
+            self.bit_buffer |= code << self.bits
+            self.bits += self.code_length
+            while self.bits >= 8:
+                self.output.append(self.bit_buffer & 0xFF)
+                self.bit_buffer >>= 8
+                self.bits -= 8
+        else:
+            self.bit_buffer = (self.bit_buffer << self.code_length) | code
+            self.bits += self.code_length
+            while self.bits >= 8:
+                self.bits -= 8
+                self.output.append((self.bit_buffer >> self.bits) & 0xFF)
+            self.bit_buffer &= (1 << self.bits) - 1
+
+    def _take_output(self) -> bytes:
+        output = bytes(self.output)
+        self.output.clear()
+        return output
+
+    def encode(self, data: bytes) -> bytes:
+        """Encode a chunk of data, returning the complete bytes produced."""
+        table = self.table
+        prefix = self.prefix
+        mask = self.clear_code - 1
+        for byte in data:
+            byte &= mask
+            if prefix < 0:
+                prefix = byte
+                continue
+            key = (prefix << 8) | byte
+            code = table.get(key)
+            if code is not None:
+                prefix = code
+                continue
+
+            self._write_code(prefix)
+            if self.next_code < TABLE_SIZE:
+                table[key] = self.next_code
+                self.next_code += 1
+                # The decoder adds this entry one code later
+                if (self.code_length < MAX_CODE_LENGTH
+                        and self.next_code - 1 + self.early_change >= 1 << self.code_length):
+                    self.code_length += 1
+            else:
+                # Table full - issue clear-table code and reset
+                self._write_code(self.clear_code)
+                self._reset()
+                table = self.table
+            prefix = byte
+        self.prefix = prefix
+        return self._take_output()
+
+    def finish(self) -> bytes:
+        """Flush the pending string and write end of data, padded to a byte."""
+        if self.prefix >= 0:
+            self._write_code(self.prefix)
+            self.prefix = -1
+            # The decoder adds an entry on reading that code
+            if (self.code_length < MAX_CODE_LENGTH
+                    and self.next_code + self.early_change >= 1 << self.code_length):
+                self.code_length += 1
+        self._write_code(self.eod_code)
+        if self.bits:
+            if self.low_bit_first:
+                self.output.append(self.bit_buffer & 0xFF)
+            else:
+                self.output.append((self.bit_buffer << (8 - self.bits)) & 0xFF)
+            self.bit_buffer = self.bits = 0
+        return self._take_output()
+
+
+if _CYTHON_LZW:
+    LZWDecoder = _LZWDecoderCy
+    LZWEncoder = _LZWEncoderCy
+else:
+    LZWDecoder = _LZWDecoderPy
+    LZWEncoder = _LZWEncoderPy
@@ -13,6 +13,7 @@ from ..core import icc_profile
 from ..core import mesh_shading
 from ..core import ps_function
 from ..core import types as ps
+from .color_ops import evaluate_tint_transform
 from .matrix import _transform_delta, _transform_point, itransform
 from .path import newpath
 from .strokepath import strokepath
@@ -1185,8 +1186,6 @@ def _tint_transform_to_rgb(components: list[float], cs_array: ps.PSObject, ctxt:
                   or [/Separation name altSpace tintTransform]
         ctxt: PS context for executing the tint **transform** procedure
     """
-    from . import control as ps_control
-
     # Extract alternative space and tint transform from CS array
     alt_space_obj = cs_array.val[cs_array.start + 2]
     tint_transform = cs_array.val[cs_array.start + 3]
@@ -1199,25 +1198,10 @@ def _tint_transform_to_rgb(components: list[float], cs_array: ps.PSObject, ctxt:
 
     alt_ncomps = {"DeviceGray": 1, "DeviceRGB": 3, "DeviceCMYK": 4}.get(alt_name, 3)
 
-    # Push tint values and execute tint transform
-    for tint in components:
-        ctxt.o_stack.append(ps.Real(max(0.0, min(1.0, float(tint)))))
-
-    ctxt.e_stack.append(ps.HardReturn())
-    ctxt.e_stack.append(copy(tint_transform))
-    ps_control.exec_exec(ctxt, ctxt.o_stack, ctxt.e_stack)
-
-    # Pop results from operand stack
-    result = []
-    for _ in range(alt_ncomps):
-        if ctxt.o_stack:
-            val = ctxt.o_stack.pop()
-            if hasattr(val, 'val'):
-                result.insert(0, max(0.0, min(1.0, float(val.val))))
-            else:
-                result.insert(0, 0.0)
-        else:
-            result.insert(0, 0.0)
+    # Map the tints through the tint transform, or its sampled table once
+    # the shading has asked for enough distinct tints
+    tints = [max(0.0, min(1.0, float(tint))) for tint in components]
+    result = evaluate_tint_transform(ctxt, tint_transform, tints, alt_ncomps, sampled=True)
 
     # Convert alternative space color to RGB
     return _color_to_rgb(result, alt_name)
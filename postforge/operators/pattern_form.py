@@ -9,6 +9,7 @@ import math
 
 from ..core import error as ps_error
 from ..core import types as ps
+from ..core.display_list_builder import image_device_bbox, path_device_bbox, stroke_device_bbox
 from .graphics_state import gsave, grestore
 from .matrix import _setCTM
 
@@ -188,6 +189,7 @@ def makepattern(ctxt: ps.Context, ostack: ps.Stack) -> None:
                 # Create new display list for pattern cell rendering
                 # Use a reasonable size - actual scaling happens at render time
                 ctxt.display_list = ps.DisplayList(100, 100)
+                ctxt.display_list.device_space = False
 
                 # Use the saved graphics state for PaintProc
                 ctxt.gstate = saved_gstate.copy()
@@ -422,8 +424,13 @@ def _replay_form_elements(cached_elements: list, ctm: ps.Array, display_list: ps
                 elif isinstance(elem, ps.ClosePath):
                     new_sp.append(ps.ClosePath())
             new_path.append(new_sp)
+        new_path.device_bbox = path_device_bbox(new_path)
         return new_path
 
+    # Nested execform markers must stay paired; devices match a FormStart to
+    # its FormEnd by nesting depth.
+    open_forms = 0
+
     for elem in cached_elements:
         if isinstance(elem, ps.Path):
             display_list.append(xform_path(elem))
@@ -434,6 +441,9 @@ def _replay_form_elements(cached_elements: list, ctm: ps.Array, display_list: ps
         elif isinstance(elem, ps.Stroke):
             s = copy.copy(elem)
             s.ctm = _compose_ctm_tuple(elem.ctm, ctm_tuple)
+            s.device_bbox = None
+            if display_list and isinstance(display_list[-1], ps.Path):
+                s.device_bbox = stroke_device_bbox(display_list[-1].device_bbox, s)
             display_list.append(s)
 
         elif isinstance(elem, ps.ClipElement):
@@ -478,6 +488,7 @@ def _replay_form_elements(cached_elements: list, ctm: ps.Array, display_list: ps
             img.CTM = list(composed)
             img.ctm = composed
             img.ictm = None  # Recomputed lazily if needed
+            img.device_bbox = image_device_bbox(img)
             display_list.append(img)
 
         elif isinstance(elem, ps.GlyphRef):
@@ -505,6 +516,20 @@ def _replay_form_elements(cached_elements: list, ctm: ps.Array, display_list: ps
             sf.ctm = _compose_ctm_tuple(elem.ctm, ctm_tuple)
             display_list.append(sf)
 
+        elif isinstance(elem, ps.FormStart):
+            # Nested execform inside this form's PaintProc
+            fs = copy.copy(elem)
+            fs.ctm = _compose_ctm_tuple(elem.ctm, ctm_tuple)
+            display_list.append(fs)
+            open_forms += 1
+
+        elif isinstance(elem, ps.FormEnd):
+            # Drop an end marker without a start rather than closing the
+            # form this replay is nested in
+            if open_forms:
+                display_list.append(elem)
+                open_forms -= 1
+
         elif isinstance(elem, (ps.ErasePage, ps.ShowPage)):
             pass  # Skip - shouldn't appear in form PaintProc
 
@@ -512,6 +537,10 @@ def _replay_form_elements(cached_elements: list, ctm: ps.Array, display_list: ps
             # Unknown element type - append as-is rather than silently dropping
             display_list.append(elem)
 
+    # Close nested forms whose end marker is missing
+    for _ in range(open_forms):
+        display_list.append(ps.FormEnd())
+
 
 def execform(ctxt: ps.Context, ostack: ps.Stack) -> None:
     """
@@ -657,6 +686,7 @@ def execform(ctxt: ps.Context, ostack: ps.Stack) -> None:
         saved_display_list = ctxt.display_list
         ctxt.display_list = ps.DisplayList(
             saved_display_list.width, saved_display_list.height)
+        ctxt.display_list.device_space = False
 
         # Push form dict onto ostack for PaintProc
         ostack.append(form_dict)
@@ -691,11 +721,17 @@ def execform(ctxt: ps.Context, ostack: ps.Stack) -> None:
         form_dict.val[b'Implementation'] = ps.Name(b'_form_impl')
         form_dict.access = ps.ACCESS_READ_ONLY
 
-    # Replay cached elements transformed to device space.
+    # Replay cached elements transformed to device space, bracketed by form
+    # markers so vector devices can emit the form once and reference it.
     # In both paths, ctxt.gstate.CTM holds the real CTM at this point:
     # - first_invocation: restored via _setCTM(ctxt, real_ctm_vals)
     # - subsequent: never changed (concat + rectclip already set it)
-    _replay_form_elements(_form_cache[id(form_dict.val)], ctxt.gstate.CTM, ctxt.display_list)
+    cached_elements = _form_cache[id(form_dict.val)]
+    ctxt.display_list.append(ps.FormStart(
+        cached_elements, (llx, lly, urx, ury),
+        tuple(float(v.val) for v in ctxt.gstate.CTM.val)))
+    _replay_form_elements(cached_elements, ctxt.gstate.CTM, ctxt.display_list)
+    ctxt.display_list.append(ps.FormEnd())
 
     # grestore
     grestore(ctxt, ostack)
@@ -11,6 +11,7 @@ import pickle
 import sys
 
 from ..core import error as ps_error
+from ..core import proc_table
 from ..core import types as ps
 from .graphics_state import grestoreall
 from . import dict as ps_dict
@@ -494,6 +495,12 @@ def restore(ctxt: ps.Context, ostack: ps.Stack) -> None:
     else:
         ctxt.save_id = max(ctxt.active_saves)
 
+    # Sampled procedures built since the save may no longer match, nor
+    # device colors converted since then
+    proc_table.discard_newer(ctxt.save_id)
+    if ctxt.device_color_cache is not None:
+        ctxt.device_color_cache.clear_entries()
+
     # Clean up the current save's snapshot
     _vm_snapshots.pop(snapshot_key, None)
 
@@ -0,0 +1,50 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from __future__ import annotations
+
+# Shared Worker Thread Pool
+#
+# zlib, libjpeg and most NumPy kernels release the GIL, so large blocks of
+# compression or conversion work can run on worker threads while the
+# interpreter thread carries on.  Callers submit work here and collect the
+# results in their own order.
+#
+# The pool is created on first use with DEFAULT_WORKERS threads, one per
+# CPU beyond the interpreter's own up to four (overridable with --threads).
+# With a worker count of 0, the default on a single CPU, get_executor()
+# returns None and callers do the work inline.
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORKERS = max(0, min(4, (os.cpu_count() or 1) - 1))
+
+_worker_count = DEFAULT_WORKERS
+_executor: ThreadPoolExecutor | None = None
+
+
+def worker_count() -> int:
+    """Return the number of worker threads, 0 when background work is off."""
+    return _worker_count
+
+
+def set_worker_count(count: int) -> None:
+    """Set the number of worker threads, shutting down the current pool."""
+    global _worker_count, _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+    _worker_count = max(0, count)
+
+
+def get_executor() -> ThreadPoolExecutor | None:
+    """Return the shared pool, or None if background work is off."""
+    global _executor
+    if _worker_count == 0:
+        return None
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=_worker_count,
+                                       thread_name_prefix='postforge-worker')
+    return _executor
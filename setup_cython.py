@@ -17,14 +17,34 @@ from setuptools import setup, Extension
 from Cython.Build import cythonize
 
 extensions = [
+    Extension(
+        "postforge.core._type1_decrypt_cy",
+        ["postforge/core/_type1_decrypt_cy.pyx"],
+    ),
+    Extension(
+        "postforge.operators._ccitt_cy",
+        ["postforge/operators/_ccitt_cy.pyx"],
+    ),
     Extension(
         "postforge.operators._control_cy",
         ["postforge/operators/_control_cy.pyx"],
     ),
+    Extension(
+        "postforge.operators._lzw_cy",
+        ["postforge/operators/_lzw_cy.pyx"],
+    ),
+    Extension(
+        "postforge.operators._predictor_cy",
+        ["postforge/operators/_predictor_cy.pyx"],
+    ),
     Extension(
         "postforge.devices.common._image_conv_cy",
         ["postforge/devices/common/_image_conv_cy.pyx"],
     ),
+    Extension(
+        "postforge.devices.common._path_emit_cy",
+        ["postforge/devices/common/_path_emit_cy.pyx"],
+    ),
 ]
 
 setup(
@@ -0,0 +1,162 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""
+Shared helpers for the Python unit tests.
+
+The tests exercise internals (display list builder, renderer dispatch,
+caches) that are not observable from PostScript.  A single interpreter
+context is created on first use and reused by every test module, since the
+number of contexts is fixed.  It is set up for the pdf device, which
+records strokes as Stroke elements rather than filled stroke outlines.
+"""
+
+import atexit
+import shutil
+
+from postforge.core import types as ps
+from postforge.core.context_init import create_context, init_system_params
+from postforge.operators.control import exec_exec
+
+_context = None
+
+
+def get_context() -> ps.Context:
+    """Return the shared PostScript context, creating it on first use."""
+    global _context
+    if _context is None:
+        ctxt, err_string = create_context(init_system_params())
+        if err_string:
+            raise RuntimeError(err_string)
+        atexit.register(shutil.rmtree, ctxt.system_params["VMDir"], ignore_errors=True)
+        _context = ctxt
+        run_ps("/pdf /OutputDevice findresource setpagedevice")
+    return _context
+
+
+def run_ps(source: str) -> list:
+    """
+    Execute PostScript source in the shared context.
+
+    Returns:
+        The operand stack contents left by the source, which are cleared
+
+    Raises:
+        RuntimeError: if the source raises a PostScript error
+    """
+    ctxt = get_context()
+    _execute(ctxt, "{ " + source + " } stopped")
+    failed = ctxt.o_stack.pop()
+    if failed.val:
+        _execute(ctxt, "$error /errorname get")
+        error_name = ctxt.o_stack.pop()
+        ctxt.o_stack.clear()
+        raise RuntimeError(f"PostScript error {error_name.val.decode()} in: {source}")
+    results = list(ctxt.o_stack)
+    ctxt.o_stack.clear()
+    return results
+
+
+def _execute(ctxt: ps.Context, source: str) -> None:
+    data = source.encode("latin-1")
+    strings = ctxt.local_strings
+    offset = len(strings)
+    strings += data
+    ctxt.e_stack.append(ps.String(ctxt.id, offset=offset, length=len(data),
+                                  attrib=ps.ATTRIB_EXEC, is_global=False))
+    exec_exec(ctxt, ctxt.o_stack, ctxt.e_stack)
+
+
+def page_elements(source: str) -> list:
+    """
+    Execute PostScript source on an empty page with device space as user space.
+
+    Returns:
+        The display list elements the source produced
+    """
+    run_ps("initgraphics erasepage [1 0 0 1 0 0] setmatrix " + source)
+    return list(get_context().display_list)
+
+
+class RecordingContext:
+    """
+    Stand-in for a cairo.Context that records the calls made on it.
+
+    Tracks the current path's extents and narrows its clip extents on
+    clip(), so clip handling can be observed; fill extents are fixed.
+    Every other method is recorded by name and returns None.
+    """
+
+    def __init__(self, clip: tuple = (0.0, 0.0, 100.0, 100.0)) -> None:
+        self.initial_clip = clip
+        self.clip_bbox = clip
+        self.points = []
+        self.calls = []
+
+    def clip_extents(self) -> tuple:
+        return self.clip_bbox
+
+    def path_extents(self) -> tuple:
+        if not self.points:
+            return (0.0, 0.0, 0.0, 0.0)
+        xs = [x for x, _ in self.points]
+        ys = [y for _, y in self.points]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    def fill_extents(self) -> tuple:
+        return (0.0, 0.0, 1.0, 1.0)
+
+    def copy_path(self) -> list:
+        return []
+
+    def get_target(self) -> object:
+        return None
+
+    def move_to(self, x: float, y: float) -> None:
+        self.calls.append(('move_to', x, y))
+        self.points.append((x, y))
+
+    def line_to(self, x: float, y: float) -> None:
+        self.calls.append(('line_to', x, y))
+        self.points.append((x, y))
+
+    def curve_to(self, x1: float, y1: float, x2: float, y2: float, x3: float, y3: float) -> None:
+        self.calls.append(('curve_to', x1, y1, x2, y2, x3, y3))
+        self.points.extend([(x1, y1), (x2, y2), (x3, y3)])
+
+    def rectangle(self, x: float, y: float, width: float, height: float) -> None:
+        self.calls.append(('rectangle', x, y, width, height))
+        self.points.extend([(x, y), (x + width, y + height)])
+
+    def new_path(self) -> None:
+        self.calls.append(('new_path',))
+        self.points = []
+
+    def fill(self) -> None:
+        self.calls.append(('fill',))
+        self.points = []
+
+    def stroke(self) -> None:
+        self.calls.append(('stroke',))
+        self.points = []
+
+    def clip(self) -> None:
+        self.calls.append(('clip',))
+        x1, y1, x2, y2 = self.path_extents()
+        cx1, cy1, cx2, cy2 = self.clip_bbox
+        self.clip_bbox = (max(x1, cx1), max(y1, cy1), min(x2, cx2), min(y2, cy2))
+        self.points = []
+
+    def reset_clip(self) -> None:
+        self.calls.append(('reset_clip',))
+        self.clip_bbox = self.initial_clip
+
+    def __getattr__(self, name: str):
+        def record(*args):
+            self.calls.append((name,) + args)
+        return record
+
+    def count(self, name: str) -> int:
+        """Return how many times the named method was called."""
+        return sum(1 for call in self.calls if call[0] == name)
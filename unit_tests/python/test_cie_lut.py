@@ -0,0 +1,68 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""CIE image conversion tables (core/cie_lut.py) against the exact conversion.
+
+The color spaces are the ones measured by benchmarks/cie_lut_bench.py; the
+exact path is the per-pixel ColorSpaceEngine conversion setcolor uses.
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+from postforge.core import cie_lut
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "benchmarks"))
+import cie_lut_bench  # noqa: E402
+
+
+def _differences(name: str, samples: np.ndarray) -> np.ndarray:
+    """Absolute table - exact differences in 8-bit levels for a benchmark case."""
+    space, entries, extra, components, _ = cie_lut_bench.CASES[name]
+    cie_dict = cie_lut_bench._cie_dict(entries, extra)
+    decode = ([cie_dict[b'RangeABC'].val[i].val for i in range(6)]
+              if space == 'CIEBasedABC' and b'RangeABC' in cie_dict else [0, 1] * components)
+    exact = cie_lut_bench._exact(space, samples, cie_dict)
+    table = cie_lut_bench._lut(space, samples, cie_dict, decode)
+    return np.abs(table.astype(int) - exact)
+
+
+def _random_samples(components: int, count: int = 2000) -> np.ndarray:
+    samples = np.random.default_rng(components).integers(0, 256, (count, components), dtype=np.uint8)
+    # The corners of the sample cube
+    corners = np.array(np.meshgrid(*[[0, 255]] * components, indexing='ij')).reshape(components, -1).T
+    return np.vstack([samples, corners.astype(np.uint8)])
+
+
+class CIETableAccuracyTests(unittest.TestCase):
+
+    def setUp(self):
+        cie_lut.clear_cache()
+
+    def test_lab_is_exact(self):
+        self.assertEqual(_differences('lab', _random_samples(3)).max(), 0)
+
+    def test_calrgb_is_exact(self):
+        self.assertEqual(_differences('calrgb', _random_samples(3)).max(), 0)
+
+    def test_calgray_is_exact(self):
+        levels = np.arange(256, dtype=np.uint8)[:, None]
+        self.assertEqual(_differences('calgray', levels).max(), 0)
+
+    def test_defg_lab_is_exact(self):
+        self.assertEqual(_differences('defg-lab', _random_samples(4)).max(), 0)
+
+    def test_def_lab_within_bounds(self):
+        # DEF interpolates converted table entries where setcolor converts
+        # the interpolated ABC values
+        diff = _differences('def-lab', _random_samples(3, 5000))
+        self.assertLessEqual(diff.max(), 5)
+        self.assertLessEqual(diff.mean(), 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Clip culling in the Cairo renderer's display list dispatch."""
+
+import unittest
+from unittest import mock
+
+from ps_support import RecordingContext, page_elements
+
+try:
+    from postforge.devices.common import cairo_renderer
+except ImportError:
+    cairo_renderer = None
+
+from postforge.core import types as ps
+from postforge.core.display_list_builder import stroke_device_bbox
+
+# Clip extents of the recording context: device space (0, 0)-(100, 100)
+_PATTERN = ("<< /PatternType 1 /PaintType 1 /TilingType 1 /BBox [0 0 10 10] "
+            "/XStep 10 /YStep 10 /PaintProc { pop 0 0 5 5 rectfill } >> "
+            "matrix makepattern setpattern ")
+
+
+def _render(elements: list) -> tuple[RecordingContext, int, int]:
+    """Render elements into a recording context; returns it and the cull counts."""
+    cairo_renderer.clear_cull_stats()
+    cairo_ctx = RecordingContext()
+    cairo_renderer._render_elements(None, cairo_ctx, elements, 100, 1.0,
+                                    None, False, False)
+    stats = cairo_renderer.get_cull_stats()
+    return cairo_ctx, stats['tested'], stats['culled']
+
+
+@unittest.skipIf(cairo_renderer is None, "pycairo is not installed")
+class ClipCullingTests(unittest.TestCase):
+
+    def test_fill_outside_clip_is_skipped(self):
+        cairo_ctx, tested, culled = _render(page_elements("150 150 20 20 rectfill"))
+        self.assertEqual((tested, culled), (1, 1))
+        self.assertEqual(cairo_ctx.count('move_to'), 0)
+        self.assertEqual(cairo_ctx.count('fill'), 0)
+
+    def test_fill_inside_clip_is_kept(self):
+        cairo_ctx, tested, culled = _render(page_elements("10 10 20 20 rectfill"))
+        self.assertEqual((tested, culled), (1, 0))
+        self.assertEqual(cairo_ctx.count('fill'), 1)
+
+    def test_fill_straddling_clip_is_kept(self):
+        cairo_ctx, tested, culled = _render(page_elements("90 90 20 20 rectfill"))
+        self.assertEqual(culled, 0)
+        self.assertEqual(cairo_ctx.count('fill'), 1)
+
+    def test_element_after_culled_pair_is_rendered(self):
+        elements = page_elements("0.5 setgray 150 150 20 20 rectfill 0 setgray 10 10 20 20 rectfill")
+        cairo_ctx, tested, culled = _render(elements)
+        self.assertEqual((tested, culled), (2, 1))
+        self.assertEqual(cairo_ctx.count('fill'), 1)
+        self.assertIn(('move_to', 10.0, 10.0), cairo_ctx.calls)
+
+    def test_stroke_uses_stroke_bbox(self):
+        # The path lies outside the clip but the wide stroke reaches into it
+        elements = page_elements("10 setlinewidth 0 setlinejoin "
+                                 "newpath 105 10 moveto 140 10 lineto stroke")
+        path, stroke = elements[-2], elements[-1]
+        self.assertEqual(stroke.DL_TYPE, ps.DL_STROKE)
+        self.assertEqual(stroke.device_bbox, stroke_device_bbox(path.device_bbox, stroke))
+        self.assertLess(stroke.device_bbox[0], 100)
+        cairo_ctx, tested, culled = _render(elements)
+        self.assertEqual((tested, culled), (1, 0))
+        self.assertEqual(cairo_ctx.count('stroke'), 1)
+
+    def test_stroke_outside_clip_is_skipped(self):
+        elements = page_elements("1 setlinewidth newpath 150 10 moveto 160 10 lineto stroke")
+        cairo_ctx, tested, culled = _render(elements)
+        self.assertEqual((tested, culled), (1, 1))
+        self.assertEqual(cairo_ctx.count('stroke'), 0)
+
+    def test_pattern_fill_after_culled_path_is_skipped(self):
+        elements = page_elements(_PATTERN + "150 150 20 20 rectfill 0 setgray 10 10 20 20 rectfill")
+        self.assertIn(ps.DL_PATTERN_FILL, [element.DL_TYPE for element in elements])
+        with mock.patch.object(cairo_renderer, '_render_pattern_fill') as render_pattern:
+            cairo_ctx, tested, culled = _render(elements)
+        render_pattern.assert_not_called()
+        self.assertEqual((tested, culled), (2, 1))
+        self.assertEqual(cairo_ctx.count('fill'), 1)
+
+    def test_pattern_fill_inside_clip_is_kept(self):
+        elements = page_elements(_PATTERN + "10 10 20 20 rectfill")
+        with mock.patch.object(cairo_renderer, '_render_pattern_fill') as render_pattern:
+            cairo_ctx, tested, culled = _render(elements)
+        render_pattern.assert_called_once()
+        self.assertEqual(culled, 0)
+
+    def test_clip_change_updates_culling_bounds(self):
+        # A fill drawn before a smaller clip is kept; after the clip, a fill
+        # outside it is culled and one inside it is kept
+        # The gray levels keep the fills from merging into one compound path
+        elements = page_elements("10 10 20 20 rectfill 50 50 50 50 rectclip "
+                                 "0.5 setgray 10 10 20 20 rectfill 0 setgray 60 60 10 10 rectfill")
+        self.assertIn(ps.DL_CLIP, [element.DL_TYPE for element in elements])
+        cairo_ctx, tested, culled = _render(elements)
+        self.assertEqual((tested, culled), (3, 1))
+        self.assertEqual(cairo_ctx.clip_extents(), (50.0, 50.0, 100.0, 100.0))
+        self.assertEqual(cairo_ctx.count('fill'), 2)
+        fills = [call[1:] for call in cairo_ctx.calls if call[0] == 'move_to']
+        self.assertEqual(fills[0], (10.0, 10.0))
+        self.assertEqual(fills[-1], (60.0, 60.0))
+
+    def test_initclip_restores_culling_bounds(self):
+        elements = page_elements("50 50 50 50 rectclip 0.5 setgray 10 10 20 20 rectfill "
+                                 "initclip 0 setgray 10 10 20 20 rectfill")
+        cairo_ctx, tested, culled = _render(elements)
+        self.assertEqual((tested, culled), (2, 1))
+        self.assertEqual(cairo_ctx.count('fill'), 1)
+
+if __name__ == '__main__':
+    unittest.main()
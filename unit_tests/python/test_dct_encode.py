@@ -0,0 +1,78 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""DCTEncode output delivery with and without the worker pool."""
+
+import os
+import tempfile
+import unittest
+
+from ps_support import run_ps
+
+from postforge.operators import filter_dct
+from postforge.utils import worker_pool
+
+# 16 x 16 gray ramp written through DCTEncode; the target is closed
+# only after the filter has been flushed or closed.  Both files are then
+# removed from userdict, so that a later restore in the shared context
+# does not reopen the deleted target.
+_ENCODE = """
+/dct_target ({path}) (w) file def
+/dct_filter dct_target << /Columns 16 /Rows 16 /Colors 1 >> /DCTEncode filter def
+0 1 255 {{ dct_filter exch write }} for
+{finish}
+dct_target closefile
+userdict /dct_target undef userdict /dct_filter undef
+"""
+
+
+@unittest.skipUnless(filter_dct.DCT_AVAILABLE, "jpeglib is not installed")
+class DCTEncodeDeliveryTests(unittest.TestCase):
+
+    def setUp(self):
+        self.saved_workers = worker_pool.worker_count()
+        handle, self.path = tempfile.mkstemp(suffix='.jpg')
+        os.close(handle)
+
+    def tearDown(self):
+        worker_pool.set_worker_count(self.saved_workers)
+        os.unlink(self.path)
+
+    def encode(self, finish: str) -> bytes:
+        run_ps(_ENCODE.format(path=self.path, finish=finish))
+        with open(self.path, 'rb') as jpeg_file:
+            return jpeg_file.read()
+
+    def assert_jpeg(self, data: bytes) -> None:
+        self.assertTrue(data.startswith(b'\xff\xd8'))
+        samples, width, height, components = filter_dct.decode_jpeg(data)
+        self.assertEqual((width, height, components), (16, 16, 1))
+
+    def test_close_inline(self):
+        worker_pool.set_worker_count(0)
+        self.assert_jpeg(self.encode("dct_filter closefile"))
+
+    def test_close_with_workers(self):
+        worker_pool.set_worker_count(2)
+        self.assert_jpeg(self.encode("dct_filter closefile"))
+
+    def test_flushfile_with_workers(self):
+        # The filter is never closed; flushfile delivers the JPEG
+        worker_pool.set_worker_count(2)
+        self.assert_jpeg(self.encode("dct_filter flushfile"))
+
+    def test_extra_write_with_workers(self):
+        # Writing past the image is an ioerror, but the JPEG is still delivered
+        worker_pool.set_worker_count(2)
+        self.assert_jpeg(self.encode("{ dct_filter 0 write } stopped pop"))
+
+    def test_workers_match_inline(self):
+        worker_pool.set_worker_count(0)
+        inline = self.encode("dct_filter closefile")
+        worker_pool.set_worker_count(2)
+        self.assertEqual(self.encode("dct_filter closefile"), inline)
+
+
+if __name__ == '__main__':
+    unittest.main()
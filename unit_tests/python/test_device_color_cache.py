@@ -0,0 +1,68 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Memoized device color conversion (DeviceColorCache)."""
+
+import unittest
+
+from ps_support import get_context, page_elements, run_ps
+
+from postforge.core import color_space
+from postforge.core import types as ps
+
+# An ICCBased space without a profile, converted through its /N or /Alternate
+_ICC_SPACE = "/icc << /N 3 >> def [/ICCBased icc] setcolorspace 0.2 0.4 0.6 setcolor "
+
+
+def _fill_colors(elements: list) -> list:
+    return [element.color for element in elements if element.DL_TYPE == ps.DL_FILL]
+
+
+class DeviceColorCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = color_space.get_device_color_cache(get_context())
+        self.cache.clear()
+
+    def test_gsave_copies_hit(self):
+        page_elements("[/Separation /Spot /DeviceCMYK { 0 0 0 4 -1 roll }] setcolorspace 0.5 setcolor "
+                      "200 { gsave 0 0 1 1 rectfill grestore } repeat")
+        stats = self.cache.stats()
+        self.assertEqual((stats['entries'], stats['misses'], stats['hits']), (1, 1, 199))
+
+    def test_spaces_with_same_alternative_share_entries(self):
+        page_elements("[/Separation /A /DeviceCMYK { 0 0 0 4 -1 roll }] setcolorspace 0.5 setcolor "
+                      "0 0 1 1 rectfill "
+                      "[/Separation /B /DeviceCMYK { 0 0 4 -1 roll 0 }] setcolorspace 0.5 setcolor "
+                      "0 0 1 1 rectfill")
+        stats = self.cache.stats()
+        self.assertEqual((stats['entries'], stats['misses']), (2, 2))
+
+    def test_space_changed_in_place(self):
+        colors = _fill_colors(page_elements(
+            _ICC_SPACE + "0 0 1 1 rectfill icc /Alternate /DeviceGray put 0 0 1 1 rectfill"))
+        self.assertEqual(colors, [[0.2, 0.4, 0.6], [0.2, 0.2, 0.2]])
+
+    def test_space_reverted_by_restore(self):
+        colors = _fill_colors(page_elements(
+            _ICC_SPACE + "save icc /Alternate /DeviceGray put 0 0 1 1 rectfill restore 0 0 1 1 rectfill"))
+        self.assertEqual(colors, [[0.2, 0.2, 0.2], [0.2, 0.4, 0.6]])
+
+    def test_restore_clears_entries(self):
+        # The same conversion before and after the restore misses both times
+        run_ps("save 0.5 setgray 0 0 1 1 rectfill 0 0 1 1 rectfill restore 0.5 setgray 0 0 1 1 rectfill")
+        stats = self.cache.stats()
+        self.assertEqual((stats['entries'], stats['misses'], stats['hits']), (1, 2, 1))
+
+    def test_bounded(self):
+        cache = color_space.DeviceColorCache(max_entries=2)
+        for gray in (0.1, 0.2, 0.3):
+            cache.put(('DeviceRGB', 'DeviceGray', (gray,)), [gray] * 3)
+        self.assertIsNone(cache.get(('DeviceRGB', 'DeviceGray', (0.1,))))
+        self.assertEqual(cache.get(('DeviceRGB', 'DeviceGray', (0.3,))), (0.3, 0.3, 0.3))
+        self.assertEqual(cache.stats()['entries'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
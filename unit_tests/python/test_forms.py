@@ -0,0 +1,132 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""FormStart/FormEnd bracketing of execform in the display list."""
+
+import types
+import unittest
+from unittest import mock
+
+from ps_support import get_context, page_elements
+
+from postforge.core import types as ps
+from postforge.operators.pattern_form import _replay_form_elements
+
+try:
+    from postforge.devices.common import cairo_renderer
+except ImportError:
+    cairo_renderer = None
+
+_FORMS = """
+/inner << /FormType 1 /BBox [0 0 10 10] /Matrix [1 0 0 1 0 0]
+          /PaintProc { pop 0 0 5 5 rectfill } >> def
+/outer << /FormType 1 /BBox [0 0 100 100] /Matrix [1 0 0 1 0 0]
+          /PaintProc { pop inner execform 20 0 translate inner execform 30 30 5 5 rectfill } >> def
+"""
+
+
+def _form_markers(elements: list) -> list:
+    """Return the FormStart/FormEnd sequence as '(' and ')' characters."""
+    markers = []
+    for element in elements:
+        if element.DL_TYPE == ps.DL_FORM_START:
+            markers.append('(')
+        elif element.DL_TYPE == ps.DL_FORM_END:
+            markers.append(')')
+    return ''.join(markers)
+
+
+def _balanced(markers: str) -> bool:
+    depth = 0
+    for marker in markers:
+        depth += 1 if marker == '(' else -1
+        if depth < 0:
+            return False
+    return depth == 0
+
+
+class FormMarkerTests(unittest.TestCase):
+
+    def test_repeated_execform(self):
+        elements = page_elements(_FORMS + "inner execform 50 50 translate inner execform")
+        self.assertEqual(_form_markers(elements), '()()')
+        starts = [element for element in elements if element.DL_TYPE == ps.DL_FORM_START]
+        # Both invocations share the form-space elements
+        self.assertIs(starts[0].elements, starts[1].elements)
+        self.assertEqual(starts[1].ctm[4:], (50.0, 50.0))
+
+    def test_nested_execform(self):
+        elements = page_elements(_FORMS + "outer execform 100 0 translate outer execform")
+        self.assertEqual(_form_markers(elements), '(()())(()())')
+        starts = [element for element in elements if element.DL_TYPE == ps.DL_FORM_START]
+        # Inner placements compose the inner CTM with the outer one
+        self.assertEqual([start.ctm[4] for start in starts], [0.0, 0.0, 20.0, 100.0, 100.0, 120.0])
+        self.assertEqual(_form_markers(starts[0].elements), '()()')
+
+    def test_nested_execform_inside_gsave(self):
+        elements = page_elements(_FORMS + "gsave outer execform grestore inner execform")
+        self.assertEqual(_form_markers(elements), '(()())()')
+
+    def test_replay_pairs_markers(self):
+        # A stray end marker is dropped and an unclosed start is closed
+        ctm = ps.Array(get_context().id)
+        ctm.setval([ps.Real(1.0), ps.Real(0.0), ps.Real(0.0),
+                    ps.Real(1.0), ps.Real(0.0), ps.Real(0.0)])
+        cached = [ps.FormEnd(),
+                  ps.FormStart([], (0, 0, 1, 1), (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)),
+                  ps.FormStart([], (0, 0, 1, 1), (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)),
+                  ps.FormEnd()]
+        display_list = ps.DisplayList()
+        _replay_form_elements(cached, ctm, display_list)
+        markers = _form_markers(display_list)
+        self.assertEqual(markers, '(())')
+        self.assertTrue(_balanced(markers))
+
+
+@unittest.skipIf(cairo_renderer is None, "pycairo is not installed")
+class FormSurfaceTests(unittest.TestCase):
+
+    def setUp(self):
+        cairo_renderer._form_surface_cache.clear()
+        self.elements = [ps.FormEnd()]
+        self.recorded_widths = []
+
+    def place(self, scale: float, min_line_width: float = 1.0):
+        """Request the form's surface for a placement at the given scale."""
+        rs = types.SimpleNamespace(
+            ctxt=None, page_height=100, min_line_width=min_line_width,
+            deferred_text_objs=None, defer_all_text=False,
+            cairo_ctx=types.SimpleNamespace(get_tolerance=lambda: 0.1))
+        item = ps.FormStart(self.elements, (0, 0, 10, 10), (scale, 0.0, 0.0, scale, 0.0, 0.0))
+
+        def record(ctxt, cairo_ctx, elements, page_height, min_line_width, *args):
+            self.recorded_widths.append(min_line_width)
+        with mock.patch.object(cairo_renderer, '_render_elements', record):
+            return cairo_renderer._form_surface(rs, item)
+
+    def test_same_scale_reuses_recording(self):
+        first = self.place(2.0)
+        self.assertIs(self.place(2.0), first)
+        self.assertEqual(self.recorded_widths, [0.5])
+
+    def test_other_scale_records_again(self):
+        first = self.place(1.0)
+        second = self.place(4.0)
+        self.assertIsNot(second, first)
+        self.assertEqual(self.recorded_widths, [1.0, 0.25])
+        self.assertIs(self.place(1.0), first)
+
+    def test_no_minimum_line_width_shares_recording(self):
+        first = self.place(1.0, min_line_width=0.0)
+        self.assertIs(self.place(4.0, min_line_width=0.0), first)
+        self.assertEqual(len(self.recorded_widths), 1)
+
+    def test_singular_ctm_is_expanded(self):
+        self.assertIsNone(self.place(0.0))
+        self.assertEqual(self.recorded_widths, [])
+        self.assertEqual(len(cairo_renderer._form_surface_cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Detection of stepped-color gradient strips (replace_gradient_strips)."""
+
+import unittest
+
+from ps_support import page_elements
+
+from postforge.core import types as ps
+from postforge.core.display_list_builder import MIN_STRIP_RUN, replace_gradient_strips
+
+
+def _strips(count: int, width: str = "pop 1", step: str = "0.01", advance: str | None = None,
+            height: int = 50, setup: str = "") -> list:
+    """
+    Page elements for count gray strips drawn with rectfill.
+
+    width, step and advance are PostScript expressions that replace the
+    strip index on the stack with a value; advance defaults to width.
+    """
+    advance = advance or width
+    return page_elements(
+        f"{setup} /x 10 def 0 1 {count - 1} {{ "
+        f"dup {step} setgray dup x 10 3 -1 roll {width} {height} rectfill "
+        f"{advance} x add /x exch def }} for")
+
+
+class GradientStripTests(unittest.TestCase):
+
+    def test_thin_uniform_strips_are_replaced(self):
+        elements = _strips(40, step="0.01 mul")
+        out, runs, strips = replace_gradient_strips(elements)
+        self.assertEqual((runs, strips), (1, 40))
+        self.assertEqual(len(out), 1)
+        shading = out[0]
+        self.assertEqual(shading.DL_TYPE, ps.DL_AXIAL_SHADING)
+        self.assertAlmostEqual(shading.x1, 40.0)
+        self.assertEqual(shading.ctm[4:], (10.0, 10.0))
+        # Collinear stops collapse to the end points
+        self.assertEqual(len(shading.color_stops), 2)
+        self.assertAlmostEqual(shading.color_stops[-1][1][0], 0.39)
+
+    def test_overlapping_strips_are_replaced(self):
+        # Each strip runs to the end of the band; only its first unit shows
+        elements = _strips(20, width="20 exch sub", step="0.01 mul", advance="pop 1")
+        out, runs, strips = replace_gradient_strips(elements)
+        self.assertEqual((runs, strips), (1, 20))
+
+    def test_rotated_strips_are_replaced(self):
+        elements = _strips(20, step="0.01 mul", setup="100 100 translate 30 rotate")
+        out, runs, strips = replace_gradient_strips(elements)
+        self.assertEqual(runs, 1)
+        self.assertAlmostEqual(out[0].ctm[0], 0.8660254, places=6)
+
+    def test_input_is_not_modified(self):
+        elements = _strips(20, step="0.01 mul")
+        before = list(elements)
+        replace_gradient_strips(elements)
+        self.assertEqual(elements, before)
+
+    def test_short_run_is_kept(self):
+        elements = _strips(MIN_STRIP_RUN - 1, step="0.01 mul")
+        out, runs, strips = replace_gradient_strips(elements)
+        self.assertEqual(runs, 0)
+        self.assertEqual(out, elements)
+
+    def test_wide_bars_are_kept(self):
+        # A bar chart of similar colors: each bar is far wider than a strip
+        elements = _strips(20, width="pop 20", step="0.01 mul")
+        out, runs, strips = replace_gradient_strips(elements)
+        self.assertEqual(runs, 0)
+        self.assertEqual(out, elements)
+
+    def test_uneven_widths_are_kept(self):
+        elements = _strips(20, width="2 mod 2 mul 1 add", step="0.01 mul")
+        out, runs, strips = replace_gradient_strips(elements)
+        self.assertEqual(runs, 0)
+
+    def test_uneven_color_steps_are_kept(self):
+        # Steps alternate between 0.002 and 0.014
+        elements = _strips(20, step="dup 0.008 mul exch 2 mod 0.006 mul add")
+        out, runs, strips = replace_gradient_strips(elements)
+        self.assertEqual(runs, 0)
+
+    def test_large_color_steps_are_kept(self):
+        elements = _strips(20, step="0.05 mul")
+        out, runs, strips = replace_gradient_strips(elements)
+        self.assertEqual(runs, 0)
+
+    def test_uniform_color_is_kept(self):
+        elements = _strips(20, step="pop 0.5")
+        out, runs, strips = replace_gradient_strips(elements)
+        self.assertEqual(runs, 0)
+
+    def test_reversing_colors_end_run(self):
+        # Up for ten strips then down: the rising and falling parts form
+        # separate runs
+        elements = _strips(20, step="dup 10 lt { 0.01 mul } { 19 exch sub 0.01 mul } ifelse")
+        out, runs, strips = replace_gradient_strips(elements)
+        self.assertEqual((runs, strips), (2, 20))
+        rising, falling = out
+        self.assertGreater(rising.color_stops[-1][1][0], rising.color_stops[0][1][0])
+        self.assertLess(falling.color_stops[-1][1][0], falling.color_stops[0][1][0])
+
+    def test_wide_last_strip_is_not_absorbed(self):
+        elements = page_elements(
+            "/x 10 def 0 1 19 { dup 0.01 mul setgray x 10 1 50 rectfill 1 x add /x exch def } for "
+            "0.2 setgray x 10 30 50 rectfill")
+        out, runs, strips = replace_gradient_strips(elements)
+        self.assertEqual((runs, strips), (1, 20))
+        self.assertEqual([element.DL_TYPE for element in out],
+                         [ps.DL_AXIAL_SHADING, ps.DL_PATH, ps.DL_FILL])
+
+
+if __name__ == '__main__':
+    unittest.main()
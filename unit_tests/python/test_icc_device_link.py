@@ -0,0 +1,160 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""ICC device links, their on-disk cache and tiled image conversion.
+
+The profiles are the synthetic ones built by benchmarks/icc_bench.py, so
+no system profile is needed.
+"""
+
+import glob
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from postforge.core import icc_profile
+from postforge.utils import worker_pool
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "benchmarks"))
+import icc_bench  # noqa: E402
+
+# Most a CMYK device link may differ from the transform, in 8-bit levels
+_CMYK_TOLERANCE = 3
+
+
+@unittest.skipUnless(icc_profile.is_available(), "Pillow ImageCms is not available")
+class DeviceLinkTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.saved_dir = icc_profile._device_link_dir
+        self.saved_workers = worker_pool.worker_count()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        icc_profile.set_device_link_dir(self.cache_dir.name)
+        icc_profile._device_links.clear()
+        icc_profile._color_cache.clear()
+        self.cmyk = icc_bench._register(icc_bench._cmyk_profile())
+        self.gray = icc_bench._register(icc_bench._gray_profile())
+
+    def tearDown(self):
+        icc_profile.set_device_link_dir(self.saved_dir)
+        icc_profile._device_links.clear()
+        icc_profile._color_cache.clear()
+        worker_pool.set_worker_count(self.saved_workers)
+        self.cache_dir.cleanup()
+
+    def path(self, profile_hash: bytes, n_components: int) -> str:
+        return os.path.join(self.cache_dir.name, f"{profile_hash.hex()}-{n_components}-v"
+                            f"{icc_profile._DEVICE_LINK_VERSION}.npy")
+
+    def levels(self, rgb: tuple) -> np.ndarray:
+        return np.round(np.array(rgb) * 255).astype(int)
+
+
+class DeviceLinkAccuracyTests(DeviceLinkTestCase):
+
+    def test_gray_is_exact(self):
+        device_link = icc_profile.get_device_link(self.gray, 1)
+        for level in range(256):
+            exact = icc_profile._transform_color(self.gray, 1, (level,))
+            np.testing.assert_array_equal(self.levels(device_link.convert((level,))), self.levels(exact))
+
+    def test_cmyk_within_tolerance(self):
+        device_link = icc_profile.get_device_link(self.cmyk, 4)
+        colors = np.random.default_rng(4).integers(0, 256, (500, 4))
+        # Grid points and the corners of the cube are included
+        colors = np.vstack([colors, [[0, 0, 0, 0], [255, 255, 255, 255], [15, 30, 255, 0]]])
+        worst = 0
+        for color in colors:
+            quantized = tuple(int(c) for c in color)
+            exact = icc_profile._transform_color(self.cmyk, 4, quantized)
+            diff = np.abs(self.levels(device_link.convert(quantized)) - self.levels(exact))
+            worst = max(worst, int(diff.max()))
+        self.assertLessEqual(worst, _CMYK_TOLERANCE)
+
+    def test_convert_color_uses_device_link(self):
+        rgb = icc_profile.icc_convert_color(self.cmyk, 4, [0.2, 0.4, 0.6, 0.1])
+        quantized = (51, 102, 153, 26)
+        self.assertEqual(rgb, icc_profile.get_device_link(self.cmyk, 4).convert(quantized))
+
+
+class DeviceLinkCacheTests(DeviceLinkTestCase):
+
+    def test_round_trip(self):
+        built = icc_profile.get_device_link(self.cmyk, 4)
+        path = self.path(self.cmyk, 4)
+        self.assertTrue(os.path.exists(path))
+        icc_profile._device_links.clear()
+        with mock.patch.object(icc_profile, '_build_device_link') as build:
+            loaded = icc_profile.get_device_link(self.cmyk, 4)
+        build.assert_not_called()
+        self.assertIsNot(loaded, built)
+        self.assertEqual(loaded.values, built.values)
+
+    def assert_rebuilt(self, content: bytes) -> None:
+        path = self.path(self.cmyk, 4)
+        with open(path, 'wb') as f:
+            f.write(content)
+        device_link = icc_profile.get_device_link(self.cmyk, 4)
+        self.assertIsNotNone(device_link)
+        samples = np.load(path)
+        self.assertEqual(samples.shape, (icc_profile._DEVICE_LINK_GRID[4] ** 4, 3))
+
+    def test_empty_file_is_rebuilt(self):
+        self.assert_rebuilt(b'')
+
+    def test_corrupt_file_is_rebuilt(self):
+        self.assert_rebuilt(b'\x93NUMPY\x01\x00garbage')
+
+    def test_wrongly_shaped_file_is_rebuilt(self):
+        path = self.path(self.cmyk, 4)
+        np.save(path, np.zeros((10, 3), dtype=np.uint8))
+        with open(path, 'rb') as f:
+            content = f.read()
+        self.assert_rebuilt(content)
+
+    def test_failed_save_leaves_no_temporary_file(self):
+        with mock.patch.object(icc_profile.np, 'save', side_effect=OSError("disk full")):
+            self.assertIsNotNone(icc_profile.get_device_link(self.cmyk, 4))
+        self.assertEqual(os.listdir(self.cache_dir.name), [])
+
+    def test_no_cache_directory(self):
+        icc_profile.set_device_link_dir(None)
+        self.assertIsNotNone(icc_profile.get_device_link(self.cmyk, 4))
+        self.assertEqual(glob.glob(os.path.join(self.cache_dir.name, '*')), [])
+
+
+class TiledConversionTests(DeviceLinkTestCase):
+
+    def convert(self, workers: int, samples: bytes, width: int, height: int) -> bytearray:
+        worker_pool.set_worker_count(workers)
+        return icc_profile.icc_convert_image(self.cmyk, 4, samples, width, height, 8, [1, 0] * 4)
+
+    @mock.patch.object(icc_profile, '_TILE_PIXELS', 64)
+    def test_convert_image_tiles_match(self):
+        width, height = 37, 29
+        self.assertGreater(len(icc_profile._row_bands(width, height)), 1)
+        samples = np.random.default_rng(5).integers(0, 256, width * height * 4, dtype=np.uint8).tobytes()
+        single = self.convert(0, samples, width, height)
+        self.assertEqual(len(single), width * height * 4)
+        self.assertEqual(self.convert(2, samples, width, height), single)
+
+    @mock.patch.object(icc_profile, '_TILE_PIXELS', 64)
+    def test_apply_transform_tiles_match(self):
+        from PIL import Image
+        width, height = 41, 23
+        samples = np.random.default_rng(6).integers(0, 256, width * height * 4, dtype=np.uint8).tobytes()
+        img = Image.frombytes('CMYK', (width, height), samples)
+        transform = icc_profile.get_transform(self.cmyk, 4)
+        worker_pool.set_worker_count(0)
+        single = icc_profile.apply_transform(img, transform, 'RGB').tobytes()
+        worker_pool.set_worker_count(2)
+        self.assertEqual(icc_profile.apply_transform(img, transform, 'RGB').tobytes(), single)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Image downsampling factors, matrix rescaling and partial blocks."""
+
+import unittest
+
+import numpy as np
+
+from ps_support import get_context, run_ps
+
+from postforge.core import types as ps
+from postforge.core.display_list_builder import image_device_bbox
+from postforge.operators import image_downsample
+
+
+def _image(width: int, height: int, ctm: tuple = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0),
+           scale: tuple = (1.0, 1.0), ncomp: int = 1) -> ps.ImageElement:
+    """An 8-bit image placed over scale[0] x scale[1] user units."""
+    element = ps.ImageElement([0.0], get_context().gstate, 'image')
+    element.width = width
+    element.height = height
+    element.bits_per_component = 8
+    element.components = ncomp
+    element.color_space = ['DeviceGray'] if ncomp == 1 else ['DeviceRGB']
+    element.image_matrix = [width / scale[0], 0.0, 0.0, height / scale[1], 0.0, 0.0]
+    element.ctm = ctm
+    return element
+
+
+def _user_point(element: ps.ImageElement, x: float, y: float) -> tuple:
+    """Map a point in image sample space to user space."""
+    a, b, c, d, tx, ty = element._calculate_inverse_matrix(element.image_matrix)
+    return (a * x + c * y + tx, b * x + d * y + ty)
+
+
+class DownsampleTestCase(unittest.TestCase):
+
+    def setUp(self):
+        run_ps("initgraphics")
+        self.page_device = get_context().gstate.page_device
+        self.saved_limit = self.page_device.get(b'ImageDownsampleLimit')
+        self.set_limit(1)
+
+    def tearDown(self):
+        if self.saved_limit is None:
+            self.page_device.pop(b'ImageDownsampleLimit', None)
+        else:
+            self.page_device[b'ImageDownsampleLimit'] = self.saved_limit
+
+    def set_limit(self, limit: float) -> None:
+        self.page_device[b'ImageDownsampleLimit'] = ps.Real(float(limit))
+
+
+class DownsampleFactorTests(DownsampleTestCase):
+
+    def test_not_oversampled(self):
+        # 100 samples over 100 device pixels
+        self.assertEqual(image_downsample.downsample_factors(get_context(), _image(100, 100, scale=(100, 100))),
+                         (1, 1))
+
+    def test_oversampled(self):
+        # 400 x 200 samples over 100 x 100 device pixels
+        element = _image(400, 200, scale=(100, 100))
+        self.assertEqual(image_downsample.downsample_factors(get_context(), element), (4, 2))
+        self.set_limit(2)
+        self.assertEqual(image_downsample.downsample_factors(get_context(), element), (2, 1))
+
+    def test_fractional_oversampling_rounds_down(self):
+        element = _image(350, 100, scale=(100, 100))
+        self.assertEqual(image_downsample.downsample_factors(get_context(), element), (3, 1))
+
+    def test_ctm_scale_and_rotation(self):
+        # 90 degree rotation at 2x: 400 samples over 200 device pixels
+        element = _image(400, 400, ctm=(0.0, 2.0, -2.0, 0.0, 300.0, 0.0), scale=(100, 100))
+        self.assertEqual(image_downsample.downsample_factors(get_context(), element), (2, 2))
+
+    def test_factor_capped_at_image_size(self):
+        element = _image(4, 3, scale=(0.1, 0.1))
+        self.assertEqual(image_downsample.downsample_factors(get_context(), element), (4, 3))
+
+    def test_disabled(self):
+        element = _image(400, 400, scale=(100, 100))
+        self.set_limit(0)
+        self.assertEqual(image_downsample.downsample_factors(get_context(), element), (1, 1))
+        del self.page_device[b'ImageDownsampleLimit']
+        self.assertEqual(image_downsample.downsample_factors(get_context(), element), (1, 1))
+
+    def test_form_capture_is_not_downsampled(self):
+        element = _image(400, 400, scale=(100, 100))
+        display_list = get_context().display_list
+        display_list.device_space = False
+        try:
+            self.assertEqual(image_downsample.downsample_factors(get_context(), element), (1, 1))
+        finally:
+            display_list.device_space = True
+
+    def test_singular_matrix(self):
+        element = _image(400, 400, scale=(100, 100))
+        element.image_matrix = [0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+        self.assertEqual(image_downsample.downsample_factors(get_context(), element), (1, 1))
+
+
+class RescaleImageMatrixTests(DownsampleTestCase):
+
+    def test_whole_blocks_keep_placement(self):
+        element = _image(8, 6, ctm=(2.0, 0.0, 0.0, 2.0, 5.0, 7.0), scale=(4, 3))
+        bbox = image_device_bbox(element)
+        image_downsample._rescale_image_matrix(element, 4, 3)
+        self.assertEqual((element.width, element.height), (4, 3))
+        self.assertEqual(image_device_bbox(element), bbox)
+        # New sample 1 covers old samples 2 and 3
+        self.assertEqual(_user_point(element, 1, 1), (1.0, 1.0))
+
+    def test_partial_blocks_keep_placement(self):
+        element = _image(10, 7, scale=(10, 7))
+        bbox = image_device_bbox(element)
+        image_downsample._rescale_image_matrix(element, 3, 2)
+        self.assertEqual((element.width, element.height), (3, 2))
+        for got, want in zip(image_device_bbox(element), bbox):
+            self.assertAlmostEqual(got, want)
+        # The far corner still maps to the far corner of the original image
+        x, y = _user_point(element, 3, 2)
+        self.assertAlmostEqual(x, 10.0)
+        self.assertAlmostEqual(y, 7.0)
+        # Each new sample spans 10/3 old columns and 3.5 old rows
+        x, y = _user_point(element, 1, 1)
+        self.assertAlmostEqual(x, 10.0 / 3)
+        self.assertAlmostEqual(y, 3.5)
+
+
+class DownsampleImageTests(DownsampleTestCase):
+
+    def test_whole_blocks_average(self):
+        element = _image(4, 2, scale=(1, 1))
+        element.sample_data = bytes([0, 10, 20, 30, 40, 50, 60, 70])
+        image_downsample.downsample_image(get_context(), element)
+        self.assertEqual((element.width, element.height), (1, 1))
+        self.assertEqual(element.sample_data, bytes([35]))
+
+    def test_partial_blocks_average_their_span(self):
+        # 10 columns reduced by 4 give 3 samples, each spanning 10/3 columns
+        columns = np.arange(10, dtype=np.float64) * 20
+        element = _image(10, 1, scale=(2.5, 1))
+        element.sample_data = columns.astype(np.uint8).tobytes()
+        bbox = image_device_bbox(element)
+        self.assertEqual(image_downsample.downsample_factors(get_context(), element), (4, 1))
+        image_downsample.downsample_image(get_context(), element)
+        self.assertEqual((element.width, element.height), (3, 1))
+        for got, want in zip(image_device_bbox(element), bbox):
+            self.assertAlmostEqual(got, want)
+        span = 10 / 3
+        expected = []
+        for k in range(3):
+            lo, hi = k * span, (k + 1) * span
+            total = sum(columns[i] * (min(hi, i + 1) - max(lo, i))
+                        for i in range(10) if i + 1 > lo and i < hi)
+            expected.append(int(np.rint(total / span)))
+        self.assertEqual(list(element.sample_data), expected)
+
+    def test_partial_blocks_rgb(self):
+        rng = np.random.default_rng(7)
+        samples = rng.integers(0, 256, size=(5, 7, 3), dtype=np.uint8)
+        element = _image(7, 5, scale=(2, 2), ncomp=3)
+        element.sample_data = samples.tobytes()
+        image_downsample.downsample_image(get_context(), element)
+        # Factors 3 x 2 leave partial blocks on both axes
+        self.assertEqual((element.width, element.height), (3, 3))
+        self.assertEqual(len(element.sample_data), 27)
+        reduced = np.frombuffer(element.sample_data, dtype=np.uint8).reshape(3, 3, 3)
+        # The whole-image mean is preserved by equal spans
+        self.assertLessEqual(abs(reduced.mean() - samples.mean()), 0.5)
+
+    def test_indexed_partial_blocks_subsample_centres(self):
+        element = _image(10, 1, scale=(2.5, 1))
+        element.color_space = ['Indexed']
+        element.sample_data = bytes(range(10))
+        image_downsample.downsample_image(get_context(), element)
+        # Centres of the spans [0, 3.3), [3.3, 6.7), [6.7, 10)
+        self.assertEqual(list(element.sample_data), [1, 5, 8])
+
+    def test_indexed_whole_blocks_subsample_centres(self):
+        element = _image(8, 1, scale=(2, 1))
+        element.color_space = ['Indexed']
+        element.sample_data = bytes(range(8))
+        image_downsample.downsample_image(get_context(), element)
+        self.assertEqual(list(element.sample_data), [2, 6])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Cairo image surface cache keys, hits and eviction."""
+
+import unittest
+from unittest import mock
+
+from ps_support import RecordingContext, page_elements
+
+from postforge.core import types as ps
+
+try:
+    from postforge.devices.common import cairo_images
+except ImportError:
+    cairo_images = None
+
+# 4-bit Separation images keep their tint transform in the display list
+_SEPARATION = "[/Separation /Spot /DeviceGray {tint}] setcolorspace "
+_IMAGE = ("<< /ImageType 1 /Width 4 /Height 1 /BitsPerComponent 4 /Decode [0 1] "
+          "/ImageMatrix [4 0 0 1 0 0] /DataSource <{data}> >> image ")
+
+
+def _images(source: str) -> list:
+    return [element for element in page_elements(source) if element.DL_TYPE == ps.DL_IMAGE]
+
+
+def _render(elements: list) -> dict:
+    for element in elements:
+        cairo_images._render_image_element(element, RecordingContext(), 100)
+    return cairo_images.get_image_surface_cache_stats()
+
+
+@unittest.skipIf(cairo_images is None, "pycairo is not installed")
+class ImageSurfaceCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        cairo_images.clear_image_surface_cache()
+
+    def test_gsave_copy_of_tint_transform_hits(self):
+        image = _IMAGE.format(data="0f5a")
+        images = _images(_SEPARATION.format(tint="{ 1 exch sub }") + image
+                         + "gsave " + image + "grestore gsave " + image + "grestore")
+        self.assertEqual(len(images), 3)
+        stats = _render(images)
+        self.assertEqual((stats['image_misses'], stats['image_hits'], stats['entries']), (1, 2, 1))
+
+    def test_cie_dictionary_copy_hits(self):
+        image = _IMAGE.format(data="0f5a")
+        images = _images("[/CIEBasedA << /WhitePoint [0.9505 1 1.089] /DecodeA { dup mul } >>] "
+                         "setcolorspace " + image + "gsave " + image + "grestore")
+        stats = _render(images)
+        self.assertEqual((stats['image_misses'], stats['image_hits']), (1, 1))
+
+    def test_different_tint_transform_misses(self):
+        image = _IMAGE.format(data="0f5a")
+        images = _images(_SEPARATION.format(tint="{ 1 exch sub }") + image
+                         + _SEPARATION.format(tint="{ dup mul }") + image)
+        stats = _render(images)
+        self.assertEqual((stats['image_misses'], stats['image_hits'], stats['entries']), (2, 0, 2))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        images = _images(_SEPARATION.format(tint="{ 1 exch sub }")
+                         + "".join(_IMAGE.format(data=data) for data in ("0000", "1111", "2222")))
+        with mock.patch.object(cairo_images, '_IMAGE_SURFACE_CACHE_MAX_ENTRIES', 2):
+            # Reusing the first image keeps it; the third evicts the second
+            stats = _render([images[0], images[1], images[0], images[2], images[0]])
+            self.assertEqual((stats['image_misses'], stats['image_hits'], stats['entries']), (3, 2, 2))
+            stats = _render([images[1]])
+        self.assertEqual((stats['image_misses'], stats['image_hits'], stats['entries']), (4, 2, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
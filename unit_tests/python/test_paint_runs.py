@@ -0,0 +1,112 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Merging of identically painted fill and stroke runs (merge_paint_runs)."""
+
+import unittest
+
+from ps_support import page_elements
+
+from postforge.core import types as ps
+from postforge.core.display_list_builder import MAX_FILL_RUN, merge_paint_runs
+
+
+def _types(elements: list) -> list:
+    return [element.DL_TYPE for element in elements]
+
+
+class MergePaintRunsTests(unittest.TestCase):
+
+    def test_disjoint_fills_merge(self):
+        elements = page_elements("0 0 10 10 rectfill 20 0 10 10 rectfill 40 0 10 10 rectfill")
+        merged, fills, strokes = merge_paint_runs(elements)
+        self.assertEqual((fills, strokes), (2, 0))
+        self.assertEqual(_types(merged), [ps.DL_PATH, ps.DL_FILL])
+        path = merged[0]
+        self.assertEqual(len(path), 3)
+        self.assertEqual(path[1][0].p.x, 20.0)
+        self.assertEqual(path.device_bbox, (0.0, 0.0, 50.0, 10.0))
+
+    def test_input_is_not_modified(self):
+        elements = page_elements("0 0 10 10 rectfill 20 0 10 10 rectfill")
+        before = list(elements)
+        merge_paint_runs(elements)
+        self.assertEqual(elements, before)
+        self.assertEqual(len(elements[0]), 1)
+
+    def test_overlapping_fill_ends_run(self):
+        elements = page_elements("0 0 10 10 rectfill 20 0 10 10 rectfill "
+                                 "25 5 10 10 rectfill 50 0 10 10 rectfill")
+        merged, fills, strokes = merge_paint_runs(elements)
+        # The third fill overlaps the second and starts a new run
+        self.assertEqual(fills, 2)
+        self.assertEqual(_types(merged), [ps.DL_PATH, ps.DL_FILL] * 2)
+        self.assertEqual(len(merged[0]), 2)
+        self.assertEqual(len(merged[2]), 2)
+        self.assertEqual(merged[2][0][0].p.x, 25.0)
+
+    def test_touching_fills_merge(self):
+        elements = page_elements("0 0 10 10 rectfill 10 0 10 10 rectfill")
+        merged, fills, strokes = merge_paint_runs(elements)
+        self.assertEqual(fills, 1)
+
+    def test_mixed_fill_rules_do_not_merge(self):
+        elements = page_elements("/box { newpath moveto 10 0 rlineto 0 10 rlineto -10 0 rlineto "
+                                 "closepath } def 0 0 box fill 20 0 box eofill 40 0 box eofill")
+        merged, fills, strokes = merge_paint_runs(elements)
+        self.assertEqual(fills, 1)
+        self.assertEqual(_types(merged), [ps.DL_PATH, ps.DL_FILL] * 2)
+        self.assertEqual(merged[1].winding_rule, ps.WINDING_NON_ZERO)
+        self.assertEqual(merged[3].winding_rule, ps.WINDING_EVEN_ODD)
+        self.assertEqual(len(merged[2]), 2)
+
+    def test_color_change_ends_run(self):
+        elements = page_elements("0 0 10 10 rectfill 0.5 setgray 20 0 10 10 rectfill")
+        merged, fills, strokes = merge_paint_runs(elements)
+        self.assertEqual(fills, 0)
+        self.assertEqual(len(merged), 4)
+
+    def test_zero_area_fill_is_not_merged(self):
+        elements = page_elements("0 0 10 10 rectfill newpath 20 0 moveto 30 0 lineto fill "
+                                 "40 0 10 10 rectfill")
+        merged, fills, strokes = merge_paint_runs(elements)
+        self.assertEqual(fills, 0)
+        self.assertEqual(len(merged), 6)
+
+    def test_fill_run_is_capped(self):
+        count = 2 * MAX_FILL_RUN + 22
+        elements = page_elements(f"0 1 {count - 1} {{ 2 mul 0 1 1 rectfill }} for")
+        merged, fills, strokes = merge_paint_runs(elements)
+        self.assertEqual(_types(merged), [ps.DL_PATH, ps.DL_FILL] * 3)
+        self.assertEqual([len(merged[k]) for k in (0, 2, 4)], [MAX_FILL_RUN, MAX_FILL_RUN, 22])
+        self.assertEqual(fills, count - 3)
+
+    def test_overlapping_strokes_merge(self):
+        elements = page_elements("newpath 0 0 moveto 50 50 lineto stroke "
+                                 "newpath 0 50 moveto 50 0 lineto stroke")
+        merged, fills, strokes = merge_paint_runs(elements)
+        self.assertEqual((fills, strokes), (0, 1))
+        self.assertEqual(_types(merged), [ps.DL_PATH, ps.DL_STROKE])
+        self.assertEqual(len(merged[0]), 2)
+        # The merged stroke is a copy covering both strokes
+        self.assertIsNot(merged[1], elements[1])
+        self.assertEqual(merged[1].device_bbox[0], elements[1].device_bbox[0])
+        self.assertEqual(merged[1].device_bbox[3], elements[3].device_bbox[3])
+
+    def test_stroke_state_change_ends_run(self):
+        elements = page_elements("newpath 0 0 moveto 50 0 lineto stroke "
+                                 "2 setlinewidth newpath 0 10 moveto 50 10 lineto stroke")
+        merged, fills, strokes = merge_paint_runs(elements)
+        self.assertEqual(strokes, 0)
+        self.assertEqual(len(merged), 4)
+
+    def test_fill_and_stroke_do_not_merge(self):
+        elements = page_elements("0 0 10 10 rectfill newpath 20 0 moveto 30 10 lineto stroke")
+        merged, fills, strokes = merge_paint_runs(elements)
+        self.assertEqual((fills, strokes), (0, 0))
+        self.assertEqual(_types(merged), [ps.DL_PATH, ps.DL_FILL, ps.DL_PATH, ps.DL_STROKE])
+
+
+if __name__ == '__main__':
+    unittest.main()
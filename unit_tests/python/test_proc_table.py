@@ -0,0 +1,143 @@
+# PostForge - A PostScript Interpreter
+# Copyright (c) 2025-2026 Scott Bowman
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+"""Sampled procedure tables, content keys and the tint transform memo."""
+
+import copy
+import itertools
+import unittest
+
+import numpy as np
+
+from ps_support import get_context, page_elements, run_ps
+
+from postforge.core import proc_table
+from postforge.core import types as ps
+from postforge.operators import color_ops
+
+# A Separation space whose tint transform counts its calls
+_COUNTING_SPACE = """
+/tint_calls 0 def
+[/Separation /Spot /DeviceGray { /tint_calls tint_calls 1 add store 1 exch sub }] setcolorspace
+"""
+
+
+def _procedure(source: str) -> ps.Array:
+    return run_ps("{ " + source + " }")[0]
+
+
+class ContentKeyTests(unittest.TestCase):
+
+    def test_deep_copy_has_same_key(self):
+        proc = _procedure("dup mul 0.5 [1 (ab) /x] pop")
+        self.assertEqual(proc_table.content_key(copy.deepcopy(proc)), proc_table.content_key(proc))
+
+    def test_changed_procedure_has_new_key(self):
+        proc = _procedure("pop 0.25")
+        key = proc_table.content_key(proc)
+        proc.val[proc.start + 1] = ps.Real(0.75)
+        self.assertNotEqual(proc_table.content_key(proc), key)
+
+    def test_int_and_real_differ(self):
+        self.assertNotEqual(proc_table.content_key(_procedure("1")),
+                            proc_table.content_key(_procedure("1.0")))
+
+    def test_cycle(self):
+        array = run_ps("[0 0] dup dup 1 exch put")[0]
+        self.assertEqual(hash(proc_table.content_key(array)), hash(proc_table.content_key(array)))
+
+
+class TintMemoTests(unittest.TestCase):
+
+    def setUp(self):
+        color_ops._tint_memo.clear()
+        proc_table.clear_cache()
+
+    def test_gsave_copies_hit_memo(self):
+        # The initial tint 1.0, then 0.5 and 0.3 once each
+        calls = run_ps(_COUNTING_SPACE + "0.5 setcolor 0 0 1 1 rectfill "
+                       "20 { gsave 0.5 setcolor 0 0 1 1 rectfill 0.3 setcolor 0 0 1 1 rectfill grestore } repeat "
+                       "tint_calls")[0]
+        self.assertEqual(calls.val, 3)
+
+    def test_setcolor_stays_exact(self):
+        # After many distinct tints a step transform still gives exact results
+        elements = page_elements("[/Separation /Spot /DeviceGray { 0.5 gt { 1 } { 0 } ifelse }] setcolorspace "
+                                 "0 1 40 { 40 div setcolor 0 0 1 1 rectfill } for "
+                                 "0.501 setcolor 0 0 1 1 rectfill")
+        self.assertEqual(elements[-1].color, [1.0, 1.0, 1.0])
+        self.assertEqual(len(proc_table._table_cache), 0)
+
+    def test_changed_procedure_is_rerun(self):
+        proc = _procedure("pop 0.25")
+        ctxt = get_context()
+        self.assertEqual(color_ops.evaluate_tint_transform(ctxt, proc, [0.5], 1), [0.25])
+        proc.val[proc.start + 1] = ps.Real(0.75)
+        self.assertEqual(color_ops.evaluate_tint_transform(ctxt, proc, [0.5], 1), [0.75])
+
+    def test_sampled_after_grid_points(self):
+        proc = _procedure("dup mul")
+        ctxt = get_context()
+        grid = proc_table.grid_points(1)
+        for k in range(grid):
+            color_ops.evaluate_tint_transform(ctxt, proc, [k / (grid - 1)], 1, sampled=True)
+        self.assertIsNone(proc_table.lookup(proc, 1, 1))
+        color_ops.evaluate_tint_transform(ctxt, proc, [0.001], 1, sampled=True)
+        self.assertIsNotNone(proc_table.lookup(proc, 1, 1))
+        # setcolor keeps using the exact results
+        self.assertEqual(color_ops.evaluate_tint_transform(ctxt, proc, [0.001], 1), [0.001 * 0.001])
+
+    def test_image_tints_are_exact(self):
+        elements = page_elements(
+            "[/DeviceN [/A /B] /DeviceGray { mul dup mul }] setcolorspace "
+            "<< /ImageType 1 /Width 3 /Height 1 /BitsPerComponent 8 /Decode [0 1 0 1] "
+            "/ImageMatrix [3 0 0 1 0 0] /DataSource <80ff 4040 80ff> >> image")
+        image = [element for element in elements if element.DL_TYPE == ps.DL_IMAGE][0]
+        expected = [round(((a / 255) * (b / 255)) ** 2 * 255) for a, b in ((0x80, 0xff), (0x40, 0x40))]
+        self.assertEqual(list(image.sample_data), [expected[0], expected[1], expected[0]])
+
+
+class ProcTableAccuracyTests(unittest.TestCase):
+
+    def setUp(self):
+        proc_table.clear_cache()
+
+    def table(self, function, n_in: int) -> proc_table.ProcTable:
+        return proc_table.get_table(_procedure(f"{n_in} {function.__name__}"), function, n_in, 1)
+
+    def points(self, n_in: int) -> np.ndarray:
+        return np.random.default_rng(n_in).random((50, n_in))
+
+    def test_multilinear_functions_are_exact(self):
+        def product(point):
+            return [float(np.prod(point)) * 0.5 + point[0] * 0.25]
+        for n_in in range(1, proc_table.MAX_INPUTS + 1):
+            table = self.table(product, n_in)
+            points = self.points(n_in)
+            for point in points:
+                self.assertAlmostEqual(table.evaluate(list(point))[0], product(point)[0], places=12)
+            np.testing.assert_allclose(table.evaluate_array(points)[:, 0],
+                                       [product(point)[0] for point in points], atol=1e-12)
+
+    def test_smooth_function_error_is_bounded(self):
+        def squares(point):
+            return [float(np.mean(np.square(point)))]
+        for n_in in range(2, proc_table.MAX_INPUTS + 1):
+            table = self.table(squares, n_in)
+            step = 1.0 / (proc_table.GRID_SIZES[n_in] - 1)
+            for point in self.points(n_in):
+                self.assertLessEqual(abs(table.evaluate(list(point))[0] - squares(point)[0]),
+                                     step * step / 4 + 1e-12)
+
+    def test_grid_points_and_corners(self):
+        def corners(point):
+            return [point[0] + 2 * point[-1]]
+        table = self.table(corners, 3)
+        self.assertEqual(len(table.values), proc_table.grid_points(3))
+        for corner in itertools.product((0.0, 1.0), repeat=3):
+            self.assertAlmostEqual(table.evaluate(list(corner))[0], corners(corner)[0])
+
+
+if __name__ == '__main__':
+    unittest.main()